@@ -30,15 +30,18 @@ from NeoVintageous.nv.ex.completions import parse_for_fs
 from NeoVintageous.nv.ex.completions import parse_for_setting
 from NeoVintageous.nv.ex_cmds import do_ex_cmd_edit_wrap
 from NeoVintageous.nv.ex_cmds import do_ex_cmdline
+from NeoVintageous.nv.ex_cmds import do_ex_substitute_confirmed
 from NeoVintageous.nv.ex_cmds import do_ex_command
 from NeoVintageous.nv.ex_cmds import do_ex_user_cmdline
-from NeoVintageous.nv.history import history_get
 from NeoVintageous.nv.history import history_get_type
-from NeoVintageous.nv.history import history_len
 from NeoVintageous.nv.history import history_update
+from NeoVintageous.nv.history import HistoryRecall
 from NeoVintageous.nv.mappings import Mapping
 from NeoVintageous.nv.mappings import mappings_is_incomplete
 from NeoVintageous.nv.mappings import mappings_resolve
+from NeoVintageous.nv.profiler import span
+from NeoVintageous.nv.shell import append_output
+from NeoVintageous.nv.shell import finish_filter
 from NeoVintageous.nv.state import init_state
 from NeoVintageous.nv.state import State
 from NeoVintageous.nv.ui import ui_blink
@@ -52,6 +55,8 @@ from NeoVintageous.nv.vi.keys import key_names
 from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
 from NeoVintageous.nv.vi.keys import to_bare_command_name
 from NeoVintageous.nv.vi.settings import iter_settings
+from NeoVintageous.nv.vi.settings import start_caching
+from NeoVintageous.nv.vi.settings import stop_caching
 from NeoVintageous.nv.vi.utils import gluing_undo_groups
 from NeoVintageous.nv.vi.utils import next_non_white_space_char
 from NeoVintageous.nv.vi.utils import regions_transformer
@@ -72,6 +77,7 @@ __all__ = [
     '_nv_cmdline',
     '_nv_cmdline_feed_key',
     '_nv_ex_cmd_edit_wrap',
+    '_nv_ex_substitute_confirmed',
     '_nv_feed_key',
     '_nv_fix_st_eol_caret',
     '_nv_fs_completion',
@@ -80,6 +86,8 @@ __all__ = [
     '_nv_replace_line',
     '_nv_run_cmds',
     '_nv_setting_completion',
+    '_nv_shell_filter',
+    '_nv_shell_output',
     '_nv_write_fs_completion',
     'NeovintageousOpenMyRcFileCommand',
     'NeovintageousReloadMyRcFileCommand',
@@ -94,6 +102,7 @@ _log = logging.getLogger(__name__)
 class _nv_cmdline_feed_key(TextCommand):
 
     LAST_HISTORY_ITEM_INDEX = None
+    HISTORY_RECALL = None
 
     def run(self, edit, key):
         if self.view.size() == 0:
@@ -156,40 +165,38 @@ class _nv_cmdline_feed_key(TextCommand):
         if not history_get_type(firstc):
             raise RuntimeError('expected a valid command-line')
 
+        # The text typed before the first recall is the prefix that recalled
+        # items must begin with. It's restored when recalling past the newest.
         if _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX is None:
-            _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX = -1 if backwards else 0
-        else:
-            _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX += -1 if backwards else 1
-
-        count = history_len(firstc)
-        if count == 0:
-            _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX = None
-
-            return ui_blink()
+            _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX = 0
+            _nv_cmdline_feed_key.HISTORY_RECALL = HistoryRecall(firstc, self.view.substr(Region(1, self.view.size())))
 
-        if abs(_nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX) > count:
-            _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX = -count
+        recall = _nv_cmdline_feed_key.HISTORY_RECALL
+        index = _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX + (-1 if backwards else 1)
 
-            return ui_blink()
+        if index >= 0:
+            if _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX >= 0:
+                return ui_blink()
 
-        if _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX >= 0:
             _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX = 0
-
-            if self.view.size() > 1:
-                return self.view.erase(edit, Region(1, self.view.size()))
-            else:
+            item = recall.prefix
+        else:
+            item = recall.get(-index)
+            if item is None:
                 return ui_blink()
 
+            _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX = index
+
         if self.view.size() > 1:
             self.view.erase(edit, Region(1, self.view.size()))
 
-        item = history_get(firstc, _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX)
         if item:
             self.view.insert(edit, 1, item)
 
     @staticmethod
     def reset_last_history_index():  # type: () -> None
         _nv_cmdline_feed_key.LAST_HISTORY_ITEM_INDEX = None
+        _nv_cmdline_feed_key.HISTORY_RECALL = None
 
 
 # TODO Replace with a functional api that commands can use directly.
@@ -261,197 +268,215 @@ class _nv_feed_key(ViWindowCommandBase):
 
         _log.info('key evt: %s repeat_count=%s do_eval=%s check_user_mappings=%s', key, repeat_count, do_eval, check_user_mappings)  # noqa: E501
 
+        # The state is read and written many times while handling a key, so
+        # serve it from memory and only write it back once the key is handled.
+        start_caching()
+
         try:
-            self._feed_key(key, repeat_count, do_eval, check_user_mappings)
-        except Exception as e:
-            print('NeoVintageous: An error occurred during key press handle:')
-            _log.exception(e)
+            with span(key, 'key'):
+                _feed_key(self.window, self.state, key, repeat_count, do_eval, check_user_mappings)
 
-            import sublime
-            for window in sublime.windows():
-                for view in window.views():
-                    settings = view.settings()
-                    settings.set('command_mode', False)
-                    settings.set('inverse_caret_state', False)
-                    settings.erase('vintage')
+            stop_caching()
+        except Exception as e:
+            stop_caching(write_back=False)
+            _reset_after_error(e)
 
         _log.debug('key evt took %ss (key=%s repeat_count=%s do_eval=%s check_user_mappings=%s)', '{:.4f}'.format(time.time() - start_time), key, repeat_count, do_eval, check_user_mappings)  # noqa: E501
 
-    def _feed_key(self, key, repeat_count=None, do_eval=True, check_user_mappings=True):
-        # Args:
-        #   key (str): Key pressed.
-        #   repeat_count (int): Count to be used when repeating through the '.' command.
-        #   do_eval (bool): Whether to evaluate the global state when it's in a
-        #       runnable state. Most of the time, the default value of `True` should
-        #       be used. Set to `False` when you want to manually control the global
-        #       state's evaluation. For example, this is what the _nv_feed_key
-        #       command does.
-        #   check_user_mappings (bool):
-        state = self.state
-
-        mode = state.mode
-
-        _log.debug('mode: %s', mode)
-
-        # If the user has made selections with the mouse, we may be in an
-        # inconsistent state. Try to remedy that.
-        if (state.view.has_non_empty_selection_region() and mode not in (VISUAL, VISUAL_LINE, VISUAL_BLOCK, SELECT)):
-            init_state(state.view)
-
-        if key.lower() == '<esc>':
-            self.window.run_command('_enter_normal_mode', {'mode': mode})
-            state.reset_command_data()
 
-            return
-
-        state.sequence += key
-        state.display_status()
+def _reset_after_error(e):
+    # Reset the state of all views after an error handling keys, so that the
+    # editor is left usable rather than in a half-updated mode.
+    print('NeoVintageous: An error occurred during key press handle:')
+    _log.exception(e)
+
+    import sublime
+    for window in sublime.windows():
+        for view in window.views():
+            settings = view.settings()
+            settings.set('command_mode', False)
+            settings.set('inverse_caret_state', False)
+            settings.erase('vintage')
+
+
+def _feed_key(window, state, key, repeat_count=None, do_eval=True, check_user_mappings=True):
+    # Feed a key to the state machine.
+    #
+    # Args:
+    #   window (sublime.Window):
+    #   state (State):
+    #   key (str): Key pressed.
+    #   repeat_count (int): Count to be used when repeating through the '.' command.
+    #   do_eval (bool): Whether to evaluate the global state when it's in a
+    #       runnable state. Most of the time, the default value of `True` should
+    #       be used. Set to `False` when you want to manually control the global
+    #       state's evaluation. For example, this is what the _nv_feed_key
+    #       command does.
+    #   check_user_mappings (bool):
+    mode = state.mode
+
+    _log.debug('mode: %s', mode)
+
+    # If the user has made selections with the mouse, we may be in an
+    # inconsistent state. Try to remedy that.
+    if (state.view.has_non_empty_selection_region() and mode not in (VISUAL, VISUAL_LINE, VISUAL_BLOCK, SELECT)):
+        init_state(state.view)
+
+    if key.lower() == '<esc>':
+        window.run_command('_enter_normal_mode', {'mode': mode})
+        state.reset_command_data()
+
+        return
+
+    state.sequence += key
+    state.display_status()
+
+    if state.must_capture_register_name:
+        _log.debug('capturing register name...')
+        state.register = key
+        state.partial_sequence = ''
+
+        return
+
+    if state.must_collect_input:
+        _log.debug('collecting input...')
+        state.process_input(key)
+        if state.runnable():
+            _log.debug('state is runnable')
+            if do_eval:
+                _log.debug('evaluating state...')
+                state.eval()
+                state.reset_command_data()
 
-        if state.must_capture_register_name:
-            _log.debug('capturing register name...')
-            state.register = key
-            state.partial_sequence = ''
+        return
 
-            return
+    if repeat_count:
+        state.action_count = str(repeat_count)
 
-        if state.must_collect_input:
-            _log.debug('collecting input...')
-            state.process_input(key)
-            if state.runnable():
-                _log.debug('state is runnable')
-                if do_eval:
-                    _log.debug('evaluating state...')
-                    state.eval()
-                    state.reset_command_data()
+    if _handle_count(state, key, repeat_count):
+        _log.debug('handled count')
 
-            return
+        return
 
-        if repeat_count:
-            state.action_count = str(repeat_count)
+    state.partial_sequence += key
 
-        if self._handle_count(state, key, repeat_count):
-            _log.debug('handled count')
+    if check_user_mappings and mappings_is_incomplete(state.mode, state.partial_sequence):
+        _log.debug('found incomplete mapping')
 
-            return
+        return
 
-        state.partial_sequence += key
+    command = mappings_resolve(state, check_user_mappings=check_user_mappings)
+    _log.debug('command %s %s', command, command.__class__.__mro__)
 
-        if check_user_mappings and mappings_is_incomplete(state.mode, state.partial_sequence):
-            _log.debug('found incomplete mapping')
+    if isinstance(command, ViOpenRegister):
+        _log.debug('opening register...')
+        state.must_capture_register_name = True
 
-            return
+        return
 
-        command = mappings_resolve(state, check_user_mappings=check_user_mappings)
-        _log.debug('command %s %s', command, command.__class__.__mro__)
+    # XXX: This doesn't seem to be correct. If we are in OPERATOR_PENDING mode, we should
+    # most probably not have to wipe the state.
+    if isinstance(command, Mapping):
+        _log.debug('found user mapping...')
 
-        if isinstance(command, ViOpenRegister):
-            _log.debug('opening register...')
-            state.must_capture_register_name = True
+        if do_eval:
+            _log.debug('evaluating user mapping (mode=%s)...', state.mode)
 
-            return
+            new_keys = command.mapping
+            if state.mode == OPERATOR_PENDING:
+                new_keys = state.sequence[:-len(state.partial_sequence)] + command.mapping
+            reg = state.register
+            acount = state.action_count
+            mcount = state.motion_count
+            state.reset_command_data()
+            state.register = reg
+            state.motion_count = mcount
+            state.action_count = acount
 
-        # XXX: This doesn't seem to be correct. If we are in OPERATOR_PENDING mode, we should
-        # most probably not have to wipe the state.
-        if isinstance(command, Mapping):
-            _log.debug('found user mapping...')
+            _log.info('user mapping %s -> %s', command.sequence, new_keys)
 
-            if do_eval:
-                _log.debug('evaluating user mapping (mode=%s)...', state.mode)
-
-                new_keys = command.mapping
-                if state.mode == OPERATOR_PENDING:
-                    new_keys = state.sequence[:-len(state.partial_sequence)] + command.mapping
-                reg = state.register
-                acount = state.action_count
-                mcount = state.motion_count
-                state.reset_command_data()
-                state.register = reg
-                state.motion_count = mcount
-                state.action_count = acount
+            if ':' in new_keys:
+                do_ex_user_cmdline(window, new_keys)
 
-                _log.info('user mapping %s -> %s', command.sequence, new_keys)
+                return
 
-                if ':' in new_keys:
-                    do_ex_user_cmdline(self.window, new_keys)
+            _process_notation(window, state, new_keys, check_user_mappings=False)
 
-                    return
+        return
 
-                self.window.run_command('_nv_process_notation', {'keys': new_keys, 'check_user_mappings': False})
+    if isinstance(command, ViOpenNameSpace):
+        # Keep collecting input to complete the sequence. For example, we
+        # may have typed 'g'
+        _log.info('opening namespace')
 
-            return
+        return
 
-        if isinstance(command, ViOpenNameSpace):
-            # Keep collecting input to complete the sequence. For example, we
-            # may have typed 'g'
-            _log.info('opening namespace')
+    elif isinstance(command, ViMissingCommandDef):
+        _log.info('found missing command...')
 
-            return
+        bare_seq = to_bare_command_name(state.sequence)
+        if state.mode == OPERATOR_PENDING:
+            # We might be looking at a command like 'dd'. The first 'd' is
+            # mapped for normal mode, but the second is missing in
+            # operator pending mode, so we get a missing command. Try to
+            # build the full command now.
+            #
+            # Exclude user mappings, since they've already been given a
+            # chance to evaluate.
+            command = mappings_resolve(state, sequence=bare_seq, mode=NORMAL, check_user_mappings=False)
+        else:
+            command = mappings_resolve(state, sequence=bare_seq)
 
-        elif isinstance(command, ViMissingCommandDef):
-            _log.info('found missing command...')
+        if isinstance(command, ViMissingCommandDef):
+            _log.debug('unmapped sequence %s', state.sequence)
+            state.mode = NORMAL
+            state.reset_command_data()
 
-            bare_seq = to_bare_command_name(state.sequence)
-            if state.mode == OPERATOR_PENDING:
-                # We might be looking at a command like 'dd'. The first 'd' is
-                # mapped for normal mode, but the second is missing in
-                # operator pending mode, so we get a missing command. Try to
-                # build the full command now.
-                #
-                # Exclude user mappings, since they've already been given a
-                # chance to evaluate.
-                command = mappings_resolve(state, sequence=bare_seq, mode=NORMAL, check_user_mappings=False)
-            else:
-                command = mappings_resolve(state, sequence=bare_seq)
+            return ui_blink()
 
-            if isinstance(command, ViMissingCommandDef):
-                _log.debug('unmapped sequence %s', state.sequence)
-                state.mode = NORMAL
-                state.reset_command_data()
+    if (state.mode == OPERATOR_PENDING and isinstance(command, ViOperatorDef)):
+        _log.info('found operator pending...')
+        # TODO: This may be unreachable code by now. ???
+        # we're expecting a motion, but we could still get an action.
+        # For example, dd, g~g~ or g~~
+        # remove counts
+        action_seq = to_bare_command_name(state.sequence)
+        _log.debug('action sequence %s', action_seq)
+        command = mappings_resolve(state, sequence=action_seq, mode=NORMAL)
+        if isinstance(command, ViMissingCommandDef):
+            _log.debug('unmapped sequence %s', state.sequence)
+            state.reset_command_data()
 
-                return ui_blink()
+            return
 
-        if (state.mode == OPERATOR_PENDING and isinstance(command, ViOperatorDef)):
-            _log.info('found operator pending...')
-            # TODO: This may be unreachable code by now. ???
-            # we're expecting a motion, but we could still get an action.
-            # For example, dd, g~g~ or g~~
-            # remove counts
-            action_seq = to_bare_command_name(state.sequence)
-            _log.debug('action sequence %s', action_seq)
-            command = mappings_resolve(state, sequence=action_seq, mode=NORMAL)
-            if isinstance(command, ViMissingCommandDef):
-                _log.debug('unmapped sequence %s', state.sequence)
-                state.reset_command_data()
+        if not command['motion_required']:
+            state.mode = NORMAL
 
-                return
+    state.set_command(command)
 
-            if not command['motion_required']:
-                state.mode = NORMAL
+    if state.mode == OPERATOR_PENDING:
+        state.reset_partial_sequence()
 
-        state.set_command(command)
+    if do_eval:
+        _log.info('evaluating state...')
+        state.eval()
 
-        if state.mode == OPERATOR_PENDING:
-            state.reset_partial_sequence()
 
-        if do_eval:
-            _log.info('evaluating state...')
-            state.eval()
+def _handle_count(state, key, repeat_count):
+    """Return True if the processing of the current key needs to stop."""
+    if not state.action and key.isdigit():
+        if not repeat_count and (key != '0' or state.action_count):
+            _log.debug('action count digit %s', key)
+            state.action_count += key
 
-    def _handle_count(self, state, key, repeat_count):
-        """Return True if the processing of the current key needs to stop."""
-        if not state.action and key.isdigit():
-            if not repeat_count and (key != '0' or state.action_count):
-                _log.debug('action count digit %s', key)
-                state.action_count += key
+            return True
 
-                return True
+    if (state.action and (state.mode == OPERATOR_PENDING) and key.isdigit()):
+        if not repeat_count and (key != '0' or state.motion_count):
+            _log.debug('motion count digit %s', key)
+            state.motion_count += key
 
-        if (state.action and (state.mode == OPERATOR_PENDING) and key.isdigit()):
-            if not repeat_count and (key != '0' or state.motion_count):
-                _log.debug('motion count digit %s', key)
-                state.motion_count += key
-
-                return True
+            return True
 
 
 class _nv_process_notation(ViWindowCommandBase):
@@ -463,140 +488,174 @@ class _nv_process_notation(ViWindowCommandBase):
         #       '.' command.
         #   check_user_mappings (bool): Whether user mappings should be
         #       consulted to expand key sequences.
-        state = self.state
-        initial_mode = state.mode
-        # Disable interactive prompts. For example, to supress interactive
-        # input collection in /foo<CR>.
-        state.non_interactive = True
-
-        _log.debug('process notation keys %s for initial mode %s', keys, initial_mode)
-
-        # First, run any motions coming before the first action. We don't keep
-        # these in the undo stack, but they will still be repeated via '.'.
-        # This ensures that undoing will leave the caret where the  first
-        # editing action started. For example, 'lldl' would skip 'll' in the
-        # undo history, but store the full sequence for '.' to use.
-        leading_motions = ''
-        for key in KeySequenceTokenizer(keys).iter_tokenize():
-            self.window.run_command('_nv_feed_key', {
-                'key': key,
-                'do_eval': False,
-                'repeat_count': repeat_count,
-                'check_user_mappings': check_user_mappings
-            })
-            if state.action:
-                # The last key press has caused an action to be primed. That
-                # means there are no more leading motions. Break out of here.
-                _log.debug('first action found in %s', state.sequence)
-                state.reset_command_data()
-                if state.mode == OPERATOR_PENDING:
-                    state.mode = NORMAL
+        # The keys are not fed by _nv_feed_key, so handle errors as it does.
+        start_caching()
+        try:
+            with span('_nv_process_notation', 'notation', {'keys': keys}):
+                _process_notation(self.window, self.state, keys, repeat_count, check_user_mappings)
 
-                break
+            stop_caching()
+        except Exception as e:
+            stop_caching(write_back=False)
+            _reset_after_error(e)
 
-            elif state.runnable():
-                # Run any primed motion.
-                leading_motions += state.sequence
-                state.eval()
-                state.reset_command_data()
 
-            else:
-                # XXX: When do we reach here?
-                state.eval()
+# Run a key sequence, e.g. a user mapping, or the keys repeated by ".".
+#
+# The keys are fed to the state machine directly rather than by running the
+# _nv_feed_key command for each key, so a replay doesn't go through the command
+# dispatch of Sublime Text, nor create a new State, for every key. The
+# characters typed in INSERT mode are inserted with one insert command.
+def _process_notation(window, state, keys, repeat_count=None, check_user_mappings=True):
+    initial_mode = state.mode
+    # Disable interactive prompts. For example, to supress interactive
+    # input collection in /foo<CR>.
+    state.non_interactive = True
+
+    _log.debug('process notation keys %s for initial mode %s', keys, initial_mode)
+
+    # First, run any motions coming before the first action. We don't keep
+    # these in the undo stack, but they will still be repeated via '.'.
+    # This ensures that undoing will leave the caret where the  first
+    # editing action started. For example, 'lldl' would skip 'll' in the
+    # undo history, but store the full sequence for '.' to use.
+    #
+    # The keys are tokenized once; start is the index of the first key after
+    # the leading motions.
+    tokens = list(KeySequenceTokenizer(keys).iter_tokenize())
+    leading_motions = ''
+    start = 0
+    for i, key in enumerate(tokens):
+        _feed_key(window, state, key, repeat_count, False, check_user_mappings)
+        if state.action:
+            # The last key press has caused an action to be primed. That
+            # means there are no more leading motions. Break out of here.
+            _log.debug('first action found in %s', state.sequence)
+            state.reset_command_data()
+            if state.mode == OPERATOR_PENDING:
+                state.mode = NORMAL
 
-        if state.must_collect_input:
-            # State is requesting more input, so this is the last command in
-            # the sequence and it needs more input.
-            self.collect_input()
+            break
+
+        elif state.runnable():
+            # Run any primed motion.
+            leading_motions += state.sequence
+            start = i + 1
+            state.eval()
+            state.reset_command_data()
+
+        else:
+            # XXX: When do we reach here?
+            state.eval()
+
+    if state.must_collect_input:
+        # State is requesting more input, so this is the last command in
+        # the sequence and it needs more input.
+        _collect_input(window, state)
+        return
+
+    # Strip the already run commands
+    if leading_motions:
+        if start == len(tokens) and not state.must_collect_input:
+            state.non_interactive = False
             return
 
-        # Strip the already run commands
-        if leading_motions:
-            if ((len(leading_motions) == len(keys)) and (not state.must_collect_input)):
-                state.non_interactive = False
-                return
+        _log.debug('original keys/leading-motions: %s/%s', keys, leading_motions)
+        tokens = tokens[start:]
+        keys = ''.join(tokens)
+        _log.debug('keys stripped to %s', keys)
 
-            _log.debug('original keys/leading-motions: %s/%s', keys, leading_motions)
-            keys = keys[len(leading_motions):]
-            _log.debug('keys stripped to %s', keys)
-
-        if not (state.motion and not state.action):
-            with gluing_undo_groups(self.window.active_view(), state):
-                try:
-                    for key in KeySequenceTokenizer(keys).iter_tokenize():
-                        if key.lower() == key_names.ESC:
-                            # XXX: We should pass a mode here?
-                            self.window.run_command('_enter_normal_mode')
-                            continue
-
-                        elif state.mode not in (INSERT, REPLACE):
-                            self.window.run_command('_nv_feed_key', {
-                                'key': key,
-                                'repeat_count': repeat_count,
-                                'check_user_mappings': check_user_mappings
-                            })
+    if not (state.motion and not state.action):
+        with gluing_undo_groups(window.active_view(), state):
+            try:
+                characters = []
+                for key in tokens:
+                    if key.lower() == key_names.ESC:
+                        _insert_characters(window, characters)
+                        # XXX: We should pass a mode here?
+                        window.run_command('_enter_normal_mode')
+                        continue
+
+                    elif state.mode not in (INSERT, REPLACE):
+                        _feed_key(window, state, key, repeat_count, True, check_user_mappings)
+                    else:
+                        char = translate_char(key)
+
+                        # Newlines are auto-indented, and characters typed in
+                        # REPLACE mode overwrite, so insert those on their own.
+                        if char == '\n' or state.mode == REPLACE:
+                            _insert_characters(window, characters)
+                            _insert_characters(window, [char])
                         else:
-                            self.window.run_command('insert', {
-                                'characters': translate_char(key)
-                            })
+                            characters.append(char)
 
-                    if not state.must_collect_input:
-                        return
+                _insert_characters(window, characters)
 
-                finally:
-                    state.non_interactive = False
-                    # Ensure we set the full command for "." to use, but don't
-                    # store "." alone.
-                    if (leading_motions + keys) not in ('.', 'u', '<C-r>'):
-                        state.repeat_data = ('vi', (leading_motions + keys), initial_mode, None)
+                if not state.must_collect_input:
+                    return
 
-        # We'll reach this point if we have a command that requests input whose
-        # input parser isn't satistied. For example, `/foo`. Note that
-        # `/foo<CR>`, on the contrary, would have satisfied the parser.
+            finally:
+                state.non_interactive = False
+                # Ensure we set the full command for "." to use, but don't
+                # store "." alone.
+                if (leading_motions + keys) not in ('.', 'u', '<C-r>'):
+                    state.repeat_data = ('vi', (leading_motions + keys), initial_mode, None)
 
-        _log.debug('unsatisfied parser action = %s, motion=%s', state.action, state.motion)
+    # We'll reach this point if we have a command that requests input whose
+    # input parser isn't satistied. For example, `/foo`. Note that
+    # `/foo<CR>`, on the contrary, would have satisfied the parser.
 
-        if (state.action and state.motion):
-            # We have a parser an a motion that can collect data. Collect data
-            # interactively.
-            motion_data = state.motion.translate(state) or None
+    _log.debug('unsatisfied parser action = %s, motion=%s', state.action, state.motion)
 
-            if motion_data is None:
-                state.reset_command_data()
+    if (state.action and state.motion):
+        # We have a parser an a motion that can collect data. Collect data
+        # interactively.
+        motion_data = state.motion.translate(state) or None
 
-                return ui_blink()
+        if motion_data is None:
+            state.reset_command_data()
 
-            motion_data['motion_args']['default'] = state.motion._inp
+            return ui_blink()
 
-            self.window.run_command(motion_data['motion'], motion_data['motion_args'])
+        motion_data['motion_args']['default'] = state.motion._inp
 
-            return
+        window.run_command(motion_data['motion'], motion_data['motion_args'])
 
-        self.collect_input()
+        return
 
-    def collect_input(self):
-        try:
-            command = None
-            if self.state.motion and self.state.action:
-                if self.state.motion.accept_input:
-                    command = self.state.motion
-                else:
-                    command = self.state.action
+    _collect_input(window, state)
+
+
+def _insert_characters(window, characters):
+    # Insert the pending characters typed in INSERT mode, if any.
+    if characters:
+        window.run_command('insert', {'characters': ''.join(characters)})
+        del characters[:]
+
+
+def _collect_input(window, state):
+    try:
+        command = None
+        if state.motion and state.action:
+            if state.motion.accept_input:
+                command = state.motion
             else:
-                command = self.state.action or self.state.motion
+                command = state.action
+        else:
+            command = state.action or state.motion
 
-            parser_def = command.input_parser
-            if parser_def.interactive_command:
+        parser_def = command.input_parser
+        if parser_def.interactive_command:
 
-                self.window.run_command(
-                    parser_def.interactive_command,
-                    {parser_def.input_param: command._inp}
-                )
-        except IndexError:
-            _log.debug('could not find a command to collect more user input')
-            ui_blink()
-        finally:
-            self.state.non_interactive = False
+            window.run_command(
+                parser_def.interactive_command,
+                {parser_def.input_param: command._inp}
+            )
+    except IndexError:
+        _log.debug('could not find a command to collect more user input')
+        ui_blink()
+    finally:
+        state.non_interactive = False
 
 
 class _nv_replace_line(TextCommand):
@@ -618,6 +677,33 @@ class _nv_ex_cmd_edit_wrap(TextCommand):
         do_ex_cmd_edit_wrap(self, edit, **kwargs)
 
 
+class _nv_ex_substitute_confirmed(TextCommand):
+
+    # Makes the substitutions confirmed by :substitute with the [c] flag. They
+    # are confirmed asynchronously, after the ex command has returned, so they
+    # need an edit token of their own.
+
+    def run(self, edit):
+        do_ex_substitute_confirmed(self.view, edit)
+
+
+class _nv_shell_filter(TextCommand):
+
+    # Applies the output of a shell filter, e.g. :{range}!, that finished
+    # after the ex command that started it returned, see nv.shell.
+
+    def run(self, edit):
+        finish_filter(self.view, edit)
+
+
+class _nv_shell_output(TextCommand):
+
+    # Appends the output of :!{cmd} to the output panel, see nv.shell.
+
+    def run(self, edit, characters):
+        append_output(self.view, edit, characters)
+
+
 class _nv_cmdline(WindowCommand):
 
     interactive_call = True
@@ -31,6 +31,7 @@ from NeoVintageous.nv.ui import ui_blink
 from NeoVintageous.nv.vi import search
 from NeoVintageous.nv.vi import units
 from NeoVintageous.nv.vi import utils
+from NeoVintageous.nv.vi.macros import compile_macro
 from NeoVintageous.nv.vi.core import IrreversibleTextCommand
 from NeoVintageous.nv.vi.core import ViTextCommandBase
 from NeoVintageous.nv.vi.core import ViWindowCommandBase
@@ -2311,23 +2312,38 @@ class _vi_at(IrreversibleTextCommand):
         if not cmds:
             return ui_blink()
 
+        ops = compile_macro(cmds)
+
         self.__class__._last_used = name
 
         state = State(self.view)
 
-        for i in range(count):
-            for cmd, args in cmds:
-                # TODO Is this robust enough?
-                if 'xpos' in args:
-                    state.update_xpos(force=True)
-                    args['xpos'] = State(self.view).xpos
-                elif args.get('motion') and 'xpos' in args.get('motion'):
-                    state.update_xpos(force=True)
-                    motion = args.get('motion')
-                    motion['motion_args']['xpos'] = State(self.view).xpos
-                    args['motion'] = motion
-
-                self.view.run_command(cmd, args)
+        # A macro run by a replay, e.g. "@q" in a mapping or repeated by ".",
+        # is already in the undo group of the replay.
+        if state.processing_notation:
+            return self._run_ops(state, ops, count)
+
+        with utils.gluing_undo_groups(self.view, state):
+            self._run_ops(state, ops, count)
+
+    def _run_ops(self, state, ops, count):
+        sel = self.view.sel()
+        try:
+            for i in range(count):
+                for cmd, args, xpos_args, can_fail in ops:
+                    if xpos_args is not None:
+                        xpos_args['xpos'] = utils.get_xpos(self.view)
+
+                    if can_fail:
+                        before = list(sel)
+
+                    self.view.run_command(cmd, args)
+
+                    if can_fail and list(sel) == before:
+                        # A motion failed, abort the macro.
+                        return ui_blink()
+        finally:
+            state.update_xpos(force=True)
 
 
 class _enter_visual_block_mode(ViTextCommandBase):
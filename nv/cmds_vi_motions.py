@@ -41,17 +41,17 @@ from NeoVintageous.nv.vi.search import ExactWordBufferSearchBase
 from NeoVintageous.nv.vi.search import find_in_range
 from NeoVintageous.nv.vi.search import find_wrapping
 from NeoVintageous.nv.vi.search import reverse_find_wrapping
-from NeoVintageous.nv.vi.search import reverse_search_by_pt
-from NeoVintageous.nv.vi.text_objects import find_containing_tag
+from NeoVintageous.nv.vi.text_objects import bracket_index
 from NeoVintageous.nv.vi.text_objects import find_next_lone_bracket
 from NeoVintageous.nv.vi.text_objects import find_prev_lone_bracket
 from NeoVintageous.nv.vi.text_objects import find_sentences_backward
 from NeoVintageous.nv.vi.text_objects import find_sentences_forward
-from NeoVintageous.nv.vi.text_objects import get_closest_tag
 from NeoVintageous.nv.vi.text_objects import get_text_object_region
+from NeoVintageous.nv.vi.text_objects import tag_index
 from NeoVintageous.nv.vi.text_objects import word_end_reverse
 from NeoVintageous.nv.vi.text_objects import word_reverse
 from NeoVintageous.nv.vi.utils import get_bol
+from NeoVintageous.nv.vi.utils import line_index
 from NeoVintageous.nv.vi.utils import next_non_blank
 from NeoVintageous.nv.vi.utils import next_non_white_space_char
 from NeoVintageous.nv.vi.utils import regions_transformer
@@ -483,14 +483,17 @@ class _vi_j(ViMotionCommand):
 
     def calculate_xpos(self, start, xpos):
         size = self.view.settings().get('tab_size')
-        if self.view.line(start).empty():
+        line = self.view.line(start)
+        if line.empty():
             return start, 0
         else:
-            eol = self.view.line(start).b - 1
+            eol = line.b - 1
+        # Every char is at least one column wide, so xpos chars is enough.
+        text = self.view.substr(Region(start, start + xpos))
         pt = 0
         chars = 0
         while (pt < xpos):
-            if self.view.substr(start + chars) == '\t':
+            if text[chars:chars + 1] == '\t':
                 pt += size
             else:
                 pt += 1
@@ -568,20 +571,27 @@ class _vi_j(ViMotionCommand):
                 return
 
             if state.visual_block_direction == DIRECTION_DOWN:
+                # The size of the rectangle and the position of the last row only change by the regions added
+                # below, so they're tracked here rather than read back from the selection for every row.
+                sel = self.view.sel()
+                max_size = max(r.size() for r in sel)
+                row, rect_b = self.view.rowcol(sel[-1].b - 1)
+                row_a, col = self.view.rowcol(sel[-1].a)
+                lines = line_index(self.view, min(row, row_a), max(row, row_a) + count + 1)
+
                 for i in range(count):
                     # FIXME: When there are multiple rectangular selections, S3 considers sel 0 to be the
                     # active one in all cases, so we can't know the 'direction' of such a selection and,
                     # therefore, we can't shrink it when we press k or j. We can only easily expand it.
                     # We could, however, have some more global state to keep track of the direction of
                     # visual block selections.
-                    row, rect_b = self.view.rowcol(self.view.sel()[-1].b - 1)
 
                     # Don't do anything if the next row is empty or too short. Vim does a crazy thing: it
                     # doesn't select it and it doesn't include it in actions, but you have to still navigate
                     # your way through them.
                     # TODO: Match Vim's behavior.
-                    next_line = self.view.line(self.view.text_point(row + 1, 0))
-                    if next_line.empty() or self.view.rowcol(next_line.b)[1] < rect_b:
+                    next_line = lines.line(row + 1)
+                    if next_line.empty() or lines.rowcol(next_line.b)[1] < rect_b:
                         # TODO Fix Visual block select stops at empty lines.
                         # See https://github.com/NeoVintageous/NeoVintageous/issues/227.
                         # self.view.sel().add(next_line.begin())
@@ -589,11 +599,11 @@ class _vi_j(ViMotionCommand):
                         # See https://github.com/NeoVintageous/NeoVintageous/issues/195.
                         return
 
-                    max_size = max(r.size() for r in self.view.sel())
-                    row, col = self.view.rowcol(self.view.sel()[-1].a)
-                    start = self.view.text_point(row + 1, col)
+                    start = lines.text_point(row_a + 1, col)
                     new_region = Region(start, start + max_size)
-                    self.view.sel().add(new_region)
+                    sel.add(new_region)
+                    row, rect_b = lines.rowcol(new_region.b - 1)
+                    row_a, col = lines.rowcol(new_region.a)
                     # FIXME: Perhaps we should scroll into view in a more general way...
 
                 self.view.show(new_region, False)
@@ -621,14 +631,17 @@ class _vi_k(ViMotionCommand):
         return pt
 
     def calculate_xpos(self, start, xpos):
-        if self.view.line(start).empty():
+        line = self.view.line(start)
+        if line.empty():
             return start, 0
         size = self.view.settings().get('tab_size')
-        eol = self.view.line(start).b - 1
+        eol = line.b - 1
+        # Every char is at least one column wide, so xpos chars is enough.
+        text = self.view.substr(Region(start, start + xpos))
         pt = 0
         chars = 0
         while (pt < xpos):
-            if self.view.substr(start + chars) == '\t':
+            if text[chars:chars + 1] == '\t':
                 pt += size
             else:
                 pt += 1
@@ -707,20 +720,26 @@ class _vi_k(ViMotionCommand):
                 return
 
             if state.visual_block_direction == DIRECTION_UP:
+                # The size of the rectangle and the position of the first row only change by the regions added
+                # above, so they're tracked here rather than read back from the selection for every row.
+                sel = self.view.sel()
+                rect_b = max(self.view.rowcol(r.b - 1)[1] for r in sel)
+                rect_size = max(r.size() for r in sel)
+                row, rect_a = self.view.rowcol(sel[0].a)
+                lines = line_index(self.view, row - count - 1, row)
 
                 for i in range(count):
-                    rect_b = max(self.view.rowcol(r.b - 1)[1] for r in self.view.sel())
-                    row, rect_a = self.view.rowcol(self.view.sel()[0].a)
-                    previous_line = self.view.line(self.view.text_point(row - 1, 0))
+                    previous_line = lines.line(row - 1)
                     # Don't do anything if previous row is empty. Vim does crazy stuff in that case.
                     # Don't do anything either if the previous line can't accomodate a rectangular selection
                     # of the required size.
-                    if (previous_line.empty() or self.view.rowcol(previous_line.b)[1] < rect_b):
+                    if (previous_line.empty() or lines.rowcol(previous_line.b)[1] < rect_b):
                         return
-                    rect_size = max(r.size() for r in self.view.sel())
-                    rect_a_pt = self.view.text_point(row - 1, rect_a)
+                    rect_a_pt = lines.text_point(row - 1, rect_a)
                     new_region = Region(rect_a_pt, rect_a_pt + rect_size)
-                    self.view.sel().add(new_region)
+                    sel.add(new_region)
+                    rect_b = max(rect_b, lines.rowcol(new_region.b - 1)[1])
+                    row, rect_a = lines.rowcol(new_region.a)
                     # FIXME: We should probably scroll into view in a more general way.
                     #        Or maybe every motion should handle this on their own.
 
@@ -1084,16 +1103,7 @@ class _vi_percent(ViMotionCommand):
         if any([self.view.substr(pt) in p for p in self.pairs]):
             return None
 
-        _, closest_tag = get_closest_tag(self.view, pt)
-        if not closest_tag:
-            return None
-
-        if closest_tag.contains(pt):
-            begin_tag, end_tag, _ = find_containing_tag(self.view, pt)
-            if begin_tag:
-                return begin_tag if end_tag.contains(pt) else end_tag
-
-        return None
+        return tag_index(self.view).pair(pt)
 
     def run(self, percent=None, mode=None):
         # Args:
@@ -1119,10 +1129,7 @@ class _vi_percent(ViMotionCommand):
                     if not bracket:
                         return
 
-                    if bracket == brackets[0]:
-                        return self.find_balanced_closing_bracket(bracket_pt + 1, brackets)
-                    else:
-                        return self.find_balanced_opening_bracket(bracket_pt, brackets)
+                    return bracket_index(self.view, brackets[0], brackets[1]).pair(bracket_pt)
 
                 if mode == VISUAL:
                     found = find_bracket_location(s)
@@ -1235,79 +1242,6 @@ class _vi_percent(ViMotionCommand):
         return (found_brackets[1], (bracket_a, bracket_b),
                 self.view.text_point(caret_row, caret_col + found_brackets[0]))
 
-    def find_balanced_closing_bracket(self, start, brackets, unbalanced=0):
-        # Returns:
-        #   Region|None
-        new_start = start
-        for i in range(unbalanced or 1):
-            next_closing_bracket = find_in_range(
-                self.view,
-                brackets[1],
-                start=new_start,
-                end=self.view.size(),
-                flags=LITERAL
-            )
-
-            if next_closing_bracket is None:  # Unbalanced brackets; nothing we can do.
-                return
-
-            new_start = next_closing_bracket.end()
-
-        nested = 0
-        while True:
-            next_opening_bracket = find_in_range(
-                self.view,
-                brackets[0],
-                start=start,
-                end=next_closing_bracket.end(),
-                flags=LITERAL
-            )
-
-            if not next_opening_bracket:
-                break
-
-            nested += 1
-            start = next_opening_bracket.end()
-
-        if nested > 0:
-            return self.find_balanced_closing_bracket(
-                next_closing_bracket.end(),
-                brackets,
-                nested
-            )
-        else:
-            return next_closing_bracket.begin()
-
-    def find_balanced_opening_bracket(self, start, brackets, unbalanced=0):
-        new_start = start
-        for i in range(unbalanced or 1):
-            prev_opening_bracket = reverse_search_by_pt(self.view, brackets[0],
-                                                        start=0,
-                                                        end=new_start,
-                                                        flags=LITERAL)
-            if prev_opening_bracket is None:
-                # Unbalanced brackets; nothing we can do.
-                return
-            new_start = prev_opening_bracket.begin()
-
-        nested = 0
-        while True:
-            next_closing_bracket = reverse_search_by_pt(self.view, brackets[1],
-                                                        start=prev_opening_bracket.a,
-                                                        end=start,
-                                                        flags=LITERAL)
-            if not next_closing_bracket:
-                break
-            nested += 1
-            start = next_closing_bracket.begin()
-
-        if nested > 0:
-            return self.find_balanced_opening_bracket(prev_opening_bracket.begin(),
-                                                      brackets,
-                                                      nested)
-        else:
-            return prev_opening_bracket.begin()
-
 
 def highlow_visible_rows(view):
     visible_region = view.visible_region()
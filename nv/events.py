@@ -22,9 +22,10 @@ from sublime_plugin import EventListener
 from NeoVintageous.nv.ex.completions import wants_fs_completions
 from NeoVintageous.nv.ex.completions import wants_setting_completions
 from NeoVintageous.nv.modeline import do_modeline
+from NeoVintageous.nv.shell import cancel_filter
+from NeoVintageous.nv.state import destroy_state
 from NeoVintageous.nv.state import init_state
 from NeoVintageous.nv.state import State
-from NeoVintageous.nv.vi import settings
 from NeoVintageous.nv.vi.utils import is_view
 from NeoVintageous.nv.vim import NORMAL
 from NeoVintageous.nv.vim import VISUAL
@@ -249,7 +250,8 @@ class NeoVintageousEvents(EventListener):
         view.run_command('_nv_fix_st_eol_caret', {'mode': State(view).mode})
 
     def on_close(self, view):
-        settings.destroy(view)
+        cancel_filter(view)
+        destroy_state(view)
 
     def on_activated(self, view):
 
@@ -15,6 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import OrderedDict
+import copy
 import logging
 
 from NeoVintageous.nv.ex.nodes import CommandLineNode
@@ -36,6 +38,11 @@ from NeoVintageous.nv.ex.tokens import TokenSemicolon
 
 _log = logging.getLogger(__name__)
 
+# Parsed command lines keyed by source, least recently used first. Ex commands
+# from mappings, the history, and repeats (@:) are parsed over and over again.
+_cache = OrderedDict()  # type: OrderedDict
+_CACHE_SIZE = 128
+
 
 class _ParserState:
 
@@ -57,6 +64,38 @@ class _ParserState:
 def parse_command_line(source):
     # type: (str) -> CommandLineNode
 
+    # Returns a copy of the cached parse tree for the source, parsing it if it
+    # hasn't been seen recently. A copy is returned because callers are free
+    # to mutate the command params. Sources that fail to parse are not cached.
+    try:
+        command_line = _cache.pop(source)
+    except KeyError:
+        command_line = _parse_command_line(source)
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    _cache[source] = command_line
+
+    return _copy_command_line(command_line)
+
+
+def _copy_command_line(command_line):
+    # type: (CommandLineNode) -> CommandLineNode
+    line_range = command_line.line_range
+    if line_range is not None:
+        line_range = RangeNode(list(line_range.start), list(line_range.end), line_range.separator)
+
+    command = command_line.command
+    if command is not None:
+        command = copy.copy(command)
+        command.params = dict(command.params)
+
+    return CommandLineNode(line_range, command)
+
+
+def _parse_command_line(source):
+    # type: (str) -> CommandLineNode
+
     # The parser works its way through the command line by passing the current
     # state to the next parsing function. It stops when no parsing funcion is
     # returned from the previous one.
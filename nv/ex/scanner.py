@@ -31,6 +31,69 @@ from NeoVintageous.nv.ex.tokens import TokenSemicolon
 from NeoVintageous.nv.ex_routes import ex_routes
 
 
+# Compiled regular expressions indexed by pattern. The scanner matches the same
+# small set of patterns over and over, e.g. when loading a .vintageousrc file.
+_patterns = {}  # type: dict
+
+
+def _compile(pattern):
+    try:
+        return _patterns[pattern]
+    except KeyError:
+        _patterns[pattern] = compiled = re.compile(pattern)
+
+        return compiled
+
+
+def _route_first_chars(route):
+    # Return the set of characters a route can start with, or None if it can't
+    # be determined, in which case the route is tried for any character.
+    if route.startswith('^'):
+        route = route[1:]
+
+    if route.startswith('(?:'):
+        depth = 0
+        for i, c in enumerate(route):
+            if c == '(':
+                depth += 1
+            elif c == ')':
+                depth -= 1
+                if depth == 0:
+                    alternatives = route[3:i].split('|')
+                    break
+        else:
+            return None
+
+        if all(x and (x[0].isalnum() or x[0] in '!&') for x in alternatives):
+            return set(x[0] for x in alternatives)
+
+        return None
+
+    if route and (route[0].isalnum() or route[0] in '!&'):
+        return set(route[0])
+
+    return None
+
+
+def _build_routes(routes):
+    # Compile the routes and index them by the characters they can start
+    # with. Each index keeps the routes in their original order, because the
+    # first matching route wins e.g. ":s" is ":substitute" and not ":set".
+    compiled = []
+    for route, command in routes.items():
+        compiled.append((_route_first_chars(route), _compile(route), command))
+
+    any_char = [(pattern, command) for (chars, pattern, command) in compiled if chars is None]
+    by_char = {}
+    for c in set(c for (chars, _, _) in compiled if chars for c in chars):
+        by_char[c] = [(pattern, command) for (chars, pattern, command) in compiled if chars is None or c in chars]
+
+    return by_char, any_char
+
+
+_routes_by_char, _routes_any_char = _build_routes(ex_routes)
+
+
 class _ScannerState:
 
     EOF = '__EOF__'
@@ -138,7 +201,7 @@ class _ScannerState:
         # Raises:
         #   ValueError: If item does not match.
         #   on_error (callable): If item does not match.
-        m = re.compile(pattern).match(self.source, self.position)
+        m = _compile(pattern).match(self.source, self.position)
         if m:
             self.position += m.end() - m.start()
 
@@ -160,7 +223,7 @@ class _ScannerState:
         #
         # Args:
         #     pattern (str): A regular expression.
-        m = re.compile(pattern).match(self.source, self.position)
+        m = _compile(pattern).match(self.source, self.position)
         if m:
             self.position += m.end() - m.start()
 
@@ -334,8 +397,11 @@ def _scan_command(state):
     #
     # Returns:
     #   Tuple[None, list(TokenEof)]
-    for route, command in ex_routes.items():
-        if state.match(route):
+    routes = _routes_by_char.get(state.source[state.position:state.position + 1], _routes_any_char)
+    for pattern, command in routes:
+        m = pattern.match(state.source, state.position)
+        if m:
+            state.position += m.end() - m.start()
             state.ignore()
 
             return command(state)
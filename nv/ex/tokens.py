@@ -57,14 +57,13 @@ class TokenCommand(Token):
         #                           command "name".
         #   :addressable (bool): Indicates if the command accepts ranges.
         #   :cooperates_with_global (bool): Indicates if the command cooperates
-        #       with the :global command. This is special flag, because ex
-        #       commands don't yet support a global_lines argument. It seems
-        #       that, in Vim, some ex commands work well with :global and others
-        #       ignore :global ranges. However, according to the docs, all ex
-        #       commands should work with :global ranges. At the time of
-        #       writing, the only command that supports the global_lines
-        #       argument is the "print" command e.g. print all lines matching
-        #       \d+ into new buffer: ":%global/\d+/print".
+        #       with the :global command. A command that cooperates is run once
+        #       with a global_lines argument, the list of lines marked by
+        #       :global, instead of once for each line, e.g. print all lines
+        #       matching \d+ into new buffer: ":%global/\d+/print". The result
+        #       must be the same as running the command on each line in turn.
+        #       A command with a range of its own, e.g. ":g/x/.,+1d", is always
+        #       run once for each line.
 
         super().__init__(content=name)
 
@@ -17,6 +17,7 @@
 
 from functools import wraps
 import inspect
+import itertools
 import logging
 import os
 import re
@@ -27,14 +28,15 @@ import sys
 from sublime import ENCODED_POSITION
 from sublime import find_resources
 from sublime import FORCE_GROUP
+from sublime import HIDDEN
 from sublime import LITERAL
 from sublime import load_resource
 from sublime import MONOSPACE_FONT
-from sublime import ok_cancel_dialog
 from sublime import platform
 from sublime import Region
 from sublime import set_timeout
 
+from NeoVintageous.nv import profiler
 from NeoVintageous.nv import shell
 from NeoVintageous.nv import variables
 from NeoVintageous.nv.ex.nodes import RangeNode
@@ -44,12 +46,16 @@ from NeoVintageous.nv.jumplist import jumplist_update
 from NeoVintageous.nv.mappings import mappings_add
 from NeoVintageous.nv.mappings import mappings_remove
 from NeoVintageous.nv.state import State
+from NeoVintageous.nv.substitute import apply_substitutions
+from NeoVintageous.nv.substitute import count_lines
+from NeoVintageous.nv.substitute import find_substitutions
+from NeoVintageous.nv.substitute import shift_point
+from NeoVintageous.nv.substitute import substitute
 from NeoVintageous.nv.ui import ui_blink
 from NeoVintageous.nv.vi import utils
-from NeoVintageous.nv.vi.search import find_all_in_range
+from NeoVintageous.nv.vi.search import find_lines_in_range
 from NeoVintageous.nv.vi.settings import set_global
 from NeoVintageous.nv.vi.settings import set_local
-from NeoVintageous.nv.vi.utils import adding_regions
 from NeoVintageous.nv.vi.utils import first_sel
 from NeoVintageous.nv.vi.utils import has_dirty_buffers
 from NeoVintageous.nv.vi.utils import resolve_insertion_point_at_b
@@ -71,6 +77,13 @@ from NeoVintageous.nv.window import WindowAPI
 
 _log = logging.getLogger(__name__)
 
+# Command lines already parsed by do_ex_cmdline() that are waiting to be picked
+# up by the **_nv_ex_cmd_edit_wrap** command, keyed by an integer handle. Sublime
+# Text command args only accept simple data types, so the handle is passed
+# through instead of the parsed object.
+_cmdline_handles = {}  # type: dict
+_cmdline_handle_ids = itertools.count(1)
+
 
 def _changing_cd(f, *args, **kwargs):
 
@@ -279,7 +292,7 @@ def ex_close(window, forceit=False, **kwargs):
 
 
 @_serialize_deserialize
-def ex_copy(view, edit, address, line_range, **kwargs):
+def ex_copy(view, edit, address, line_range, global_lines=None, **kwargs):
     # Copy the lines given by [range] to below the line given by {address}.
     def _calculate_address(address):
         # TODO: must calc only the first line ref?
@@ -305,6 +318,12 @@ def ex_copy(view, edit, address, line_range, **kwargs):
     # TODO: how do we signal row 0?
     target_region = unresolved.resolve(view)
 
+    if global_lines:
+        lines = [Region(a, b) for (a, b) in global_lines]
+        pt = _copy_lines(view, edit, lines, _below(view, target_region), reverse=address != '$')
+
+        return _set_next_sel(view, [(pt, pt)])
+
     if target_region == Region(-1, -1):
         address = 0
     else:
@@ -330,30 +349,133 @@ def ex_cquit(window, **kwargs):
 
 
 @_serialize_deserialize
-def ex_delete(view, edit, register, line_range, **kwargs):
+def ex_delete(view, edit, register, line_range, global_lines=None, **kwargs):
+    if global_lines:
+        return _delete_lines(view, edit, [Region(a, b) for (a, b) in global_lines], register)
+
     r = line_range.resolve(view)
     if r == Region(-1, -1):
         r = view.full_line(0)
 
-    def _select(view, regions, register):
-        view.sel().clear()
-        to_store = []
-        for r in regions:
-            view.sel().add(r)
-            if register:
-                to_store.append(view.substr(view.full_line(r)))
+    _delete_lines(view, edit, [r], register)
 
-        if register:
-            text = ''.join(to_store)
-            if not text.endswith('\n'):
-                text = text + '\n'
 
-            state = State(view)
-            state.registers[register] = [text]
+# The line primitives below work on a list of full lines, e.g. the lines marked
+# by :global, in one pass: the text of the lines is read and joined once, and
+# the lines are erased from the last, so the positions of the lines before are
+# unchanged and no positions need to be recalculated between edits.
+#
+# The lines are regions of whole lines, sorted and not overlapping. The last
+# line of the view may not end with a newline.
+
+
+def _delete_lines(view, edit, lines, register):
+    # Delete the lines, as if by deleting each one in turn, from the first.
+    # Each delete replaces the register, except that an uppercase register is
+    # appended to, so only the last line is kept unless the register is
+    # uppercase.
+    if register:
+        if register.isupper():
+            text = _join_lines(view, lines)
+        else:
+            text = _join_lines(view, lines[-1:])
+
+        State(view).registers[register] = [text]
+
+    pt = lines[-1].b - _erase_lines(view, edit, lines)
+    _set_next_sel(view, [(pt, pt)])
+
+
+def _copy_lines(view, edit, lines, pt, reverse=False):
+    # type: (...) -> int
+    # Copy the lines to pt, the start of a line or the end of the view, as if
+    # by copying each one in turn to pt. Each copy to the same line is put
+    # above the ones before it, so reverse is True unless pt is the end of the
+    # view, which moves down with each copy.
+    #
+    # Returns:
+    #   int: The start of the line copied last.
+    first, last = _insert_lines(view, edit, pt, _join_lines(view, lines[::-1] if reverse else lines))
+
+    return first if reverse else last
+
+
+def _move_lines(view, edit, lines, pt, reverse=False):
+    # type: (...) -> int
+    # Move the lines to pt, the start of a line or the end of the view, as if
+    # by moving each one in turn to pt. The reverse argument is as for
+    # _copy_lines(). The point must not be inside one of the lines.
+    #
+    # Returns:
+    #   int: The start of the line moved last.
+    text = _join_lines(view, lines[::-1] if reverse else lines)
+    eol = view.substr(view.size() - 1) == '\n'
+    _erase_lines(view, edit, [line for line in lines if line.b > pt])
+    pt -= _erase_lines(view, edit, [line for line in lines if line.b <= pt])
+    first, last = _insert_lines(view, edit, pt, text)
+
+    # Moving the last line of a view that doesn't end with a newline.
+    if not eol and view.substr(view.size() - 1) == '\n':
+        view.erase(edit, Region(view.size() - 1, view.size()))
+
+    return first if reverse else last
 
-    _select(view, [r], register)
-    view.erase(edit, r)
-    _set_next_sel(view, [(r.a, r.a)])
+
+def _join_lines(view, lines):
+    # type: (...) -> str
+    # Returns the text of the lines, each ending with a newline.
+    return ''.join(text if text.endswith('\n') else text + '\n' for text in map(view.substr, lines))
+
+
+def _insert_lines(view, edit, pt, text):
+    # type: (...) -> tuple
+    # Insert the text of lines, from _join_lines(), at pt.
+    #
+    # Returns:
+    #   tuple(int, int): The start of the first and last lines inserted.
+    first = pt
+    if pt >= view.size() and view.size() and view.substr(view.size() - 1) != '\n':
+        pt = view.size()
+        first = pt + 1
+        text = '\n' + text[:-1]
+
+    view.insert(edit, pt, text)
+
+    return first, view.line(pt + len(text) - 1).begin()
+
+
+def _erase_lines(view, edit, lines):
+    # type: (...) -> int
+    # Erase the lines, from the last, and adjacent lines together.
+    #
+    # Returns:
+    #   int: The number of characters erased.
+    erased = 0
+    end = None
+    for line in reversed(lines):
+        if end is None:
+            begin, end = line.a, line.b
+        elif line.b == begin:
+            begin = line.a
+        else:
+            view.erase(edit, Region(begin, end))
+            erased += end - begin
+            begin, end = line.a, line.b
+
+    if end is not None:
+        view.erase(edit, Region(begin, end))
+        erased += end - begin
+
+    return erased
+
+
+def _below(view, region):
+    # type: (...) -> int
+    # Returns the start of the line below a resolved address, 0 for line 0.
+    if region == Region(-1, -1):
+        return 0
+
+    return view.full_line(region.begin()).end()
 
 
 def ex_double_ampersand(view, edit, flags, count, line_range, **kwargs):
@@ -465,10 +587,19 @@ def ex_file(view, **kwargs):
 _ex_global_most_recent_pat = None
 
 
-# At the time of writing, the only command that supports :global is the
-# "print" command e.g. print all lines matching \d+ into new buffer:
-#   :%global/\d+/print
-def ex_global(window, view, pattern, cmd, line_range, **kwargs):
+# The :global command works in two passes, see |:global|. First the lines in
+# the range that match the pattern are found, or the lines that don't match
+# for :global! and :vglobal. Then the command is run on each of those lines in
+# turn, with the cursor on the line.
+#
+# The lines are tracked by regions added to the view, so that they move with
+# the changes made by the commands run before them, and lines that are deleted
+# are skipped. Commands that cooperate with :global (see TokenCommand) are run
+# once for all the lines, with the lines as a global_lines argument.
+#
+# The command is run with the edit token of :global, so everything it changes
+# is undone in one go.
+def ex_global(window, view, edit, pattern, cmd, line_range, forceit=False, **kwargs):
     if line_range.is_empty:
         global_range = Region(0, view.size())
     else:
@@ -480,31 +611,93 @@ def ex_global(window, view, pattern, cmd, line_range, **kwargs):
     else:
         pattern = _ex_global_most_recent_pat
 
+    if not pattern:
+        return message('E35: No previous regular expression')
+
     if not cmd:
         cmd = 'print'
 
-    cmd = parse_command_line(cmd).command
+    try:
+        cmdline = parse_command_line(cmd)
+    except Exception as e:
+        return message(str(e))
+
+    if not cmdline.command:
+        return message('E492: Not an editor command: {}'.format(cmd))
+
+    if cmdline.command.target == 'global':
+        return message('E147: Cannot do :global recursive')
 
     try:
-        matches = find_all_in_range(view, pattern, global_range.begin(), global_range.end())
+        lines = find_lines_in_range(view, pattern, global_range.begin(), global_range.end())
     except Exception as e:
         return message("(global): %s ... in pattern '%s'" % (str(e), pattern))
 
-    # The cooperates_with_global attribute indicates if the command supports
-    # the :global command. This is special flag, because all ex commands
-    # don't yet support a global_lines argument. See TokenOfCommand. At time
-    # of writing, the only command that supports the global_lines argument
-    # is the "print" command e.g. print all lines matching \d+ into new
-    # buffer: ":%global/\d+/print".
-    if not matches or not cmd.cooperates_with_global:
-        return message("command does not support :global")
+    if forceit:
+        lines = _other_lines(view, global_range, lines)
+        if not lines:
+            return message('Pattern found in every line: {}'.format(pattern))
+    elif not lines:
+        return message('Pattern not found: {}'.format(pattern))
+
+    ex_cmd = _get_ex_cmd(cmdline.command.target)
+
+    args = cmdline.command.params
+    if 'forceit' not in args:
+        args['forceit'] = cmdline.command.forced
+
+    if 'edit' in inspect.signature(ex_cmd).parameters:
+        args['edit'] = edit
+
+    # A command with a range of its own, e.g. :g/x/.,+1d, is run on each line,
+    # because the range is relative to the line.
+    if cmdline.command.cooperates_with_global and cmdline.line_range.is_empty:
+        args['global_lines'] = [[r.a, r.b] for r in lines]
+
+        return ex_cmd(window=window, view=view, line_range=cmdline.line_range, **args)
+
+    # The lines are kept as regions, so that they follow the changes made by
+    # the command. The regions are only read again after a change.
+    view.add_regions('_nv_global', lines, '', '', HIDDEN)
+
+    try:
+        regions = lines
+        change_count = view.change_count()
+        for i, line in enumerate(lines):
+            if view.change_count() != change_count:
+                regions = view.get_regions('_nv_global')
+                change_count = view.change_count()
+
+            # The line has been deleted.
+            if regions[i].empty() and not line.empty():
+                continue
+
+            view.sel().clear()
+            view.sel().add(regions[i].begin())
+
+            ex_cmd(window=window, view=view, line_range=cmdline.line_range, **args)
+    finally:
+        view.erase_regions('_nv_global')
 
-    matches = [view.full_line(r.begin()) for r in matches]
-    matches = [[r.a, r.b] for r in matches]
 
-    cmd.params['global_lines'] = matches
+def _other_lines(view, region, lines):
+    # type: (...) -> list
+    # Returns the full lines in the region that are not in lines.
+    text = view.substr(region)
+    if text.endswith('\n'):
+        text = text[:-1]
 
-    do_ex_command(window, cmd.target, cmd.params)
+    other = []
+    found = set(line.a for line in lines)
+    a = region.begin()
+    for line in text.split('\n'):
+        b = min(a + len(line) + 1, region.end())
+        if a not in found:
+            other.append(Region(a, b))
+
+        a = b
+
+    return other
 
 
 _ex_help_tags_cache = {}
@@ -624,11 +817,21 @@ def ex_let(name, value, **kwargs):
 
 
 @_serialize_deserialize
-def ex_move(view, edit, address, line_range, **kwargs):
+def ex_move(view, edit, address, line_range, global_lines=None, **kwargs):
     # Move the lines given by [range] to below the line given by {address}.
     if address is None:
         return message("E14: Invalid address")
 
+    if global_lines:
+        lines = [Region(a, b) for (a, b) in global_lines]
+        pt = _below(view, parse_command_line_address(address).line_range.resolve(view))
+        if any(line.a < pt < line.b for line in lines):
+            return message("E134: Move lines into themselves")
+
+        pt = _move_lines(view, edit, lines, pt, reverse=address != '$')
+
+        return _set_next_sel(view, [(pt, pt)])
+
     source = line_range.resolve(view)
     if any(s.contains(source) for s in view.sel()):
         return message("E134: Move lines into themselves")
@@ -756,6 +959,53 @@ def ex_print(window, view, flags, line_range, global_lines=None, **kwargs):
         display.run_command('append', {'characters': characters})
 
 
+# The file the profile is written to, see ex_profile().
+_profile_fname = None
+
+
+def ex_profile(window, subcommand, fname=None, **kwargs):
+    # Profile the handling of keys, see the profiler module.
+    #
+    # :prof[ile] start {fname}  Start profiling, write the trace to {fname}.
+    # :prof[ile] pause          Don't profile until :profile continue.
+    # :prof[ile] continue       Continue profiling after :profile pause.
+    # :prof[ile] dump           Write the trace and show a summary.
+    # :prof[ile] stop           Write the trace and stop profiling.
+    global _profile_fname
+
+    if subcommand == 'start':
+        if not fname:
+            return message('E471: Argument required')
+
+        _profile_fname = os.path.expanduser(fname)
+        profiler.start()
+
+        return
+
+    if not profiler.is_profiling():
+        return message('E750: First use ":profile start {fname}"')
+
+    if subcommand == 'pause':
+        profiler.pause()
+    elif subcommand == 'continue':
+        profiler.resume()
+    else:
+        try:
+            profiler.write_trace(_profile_fname)
+        except OSError:
+            message("E482: Can't create file {}".format(_profile_fname))
+
+        if subcommand == 'stop':
+            profiler.stop()
+        else:
+            panel = window.create_output_panel('vi_out')
+            panel.settings().set("line_numbers", False)
+            panel.settings().set("gutter", False)
+            panel.settings().set("scroll_past_end", False)
+            panel.run_command('append', {'characters': profiler.format_summary(), 'force': True})
+            window.run_command("show_panel", {"panel": "output.vi_out"})
+
+
 @_changing_cd
 def ex_pwd(**kwargs):
     status_message(os.getcwd())
@@ -796,40 +1046,16 @@ def ex_quit(window, view, forceit=False, **kwargs):
 
 
 # TODO [review] This command looks unused
-# TODO [refactor] shell commands to use common os nv.ex.shell commands
 @_changing_cd
 def ex_read(view, edit, cmd, line_range, **kwargs):
     r = line_range.resolve(view)
     target_point = min(r.end(), view.size())
 
     if cmd:
-        if platform() == 'linux':
-            # TODO: make shell command configurable.
-            shell_cmd = view.settings().get('linux_shell')
-            shell_cmd = shell_cmd or os.path.expandvars("$SHELL")
-            if not shell_cmd:
-                return message('no shell found')
-
-            try:
-                p = subprocess.Popen([shell_cmd, '-c', cmd], stdout=subprocess.PIPE)
-            except Exception as e:
-                return message('error executing command through shell {}'.format(e))
-
-            view.insert(edit, target_point, p.communicate()[0][:-1].decode('utf-8').strip() + '\n')
-
-        elif platform() == 'windows':
-            # TODO [refactor] shell commands to use common os nv.ex.shell commands
-            from NeoVintageous.nv.shell_windows import get_oem_cp
-            from NeoVintageous.nv.shell_windows import get_startup_info
-            p = subprocess.Popen(['cmd.exe', '/C', cmd],
-                                 stdout=subprocess.PIPE,
-                                 startupinfo=get_startup_info())
-            cp = 'cp' + get_oem_cp()
-            rv = p.communicate()[0].decode(cp)[:-2].strip()
-            view.insert(edit, target_point, rv.strip() + '\n')
-
-        else:
-            return message('not implemented')
+        try:
+            shell.read_thru_shell(view, edit, target_point, cmd)
+        except OSError as e:
+            return message('error executing command through shell {}'.format(e))
     else:
         # Read a file into the current view.
         # According to Vim's help, :r should read the current file's content
@@ -957,19 +1183,14 @@ def ex_shell_out(view, edit, cmd, line_range, **kwargs):
                 cmd=cmd
             )
         else:
-            output = shell.run_and_read(view, cmd)
-            output_view = view.window().create_output_panel('vi_out')
-            output_view.settings().set("line_numbers", False)
-            output_view.settings().set("gutter", False)
-            output_view.settings().set("scroll_past_end", False)
-            output_view = view.window().create_output_panel('vi_out')
-            output_view.run_command('append', {'characters': output, 'force': True, 'scroll_to_end': True})
-            view.window().run_command("show_panel", {"panel": "output.vi_out"})
+            shell.run_to_panel(view.window(), view, cmd)
 
         # TODO: store only successful commands.
         _ex_shell_last_command = cmd
     except NotImplementedError:
         message('not implemented')
+    except OSError as e:
+        message('error executing command through shell {}'.format(e))
 
 
 def ex_snoremap(keys, command, **kwargs):
@@ -988,7 +1209,7 @@ _ex_substitute_last_pattern = None
 _ex_substitute_last_replacement = ''
 
 
-def ex_substitute(view, edit, line_range, pattern=None, replacement='', flags=0, count=1, **kwargs):
+def ex_substitute(view, edit, line_range, pattern=None, replacement='', flags=0, count=1, global_lines=None, **kwargs):
     global _ex_substitute_last_pattern, _ex_substitute_last_replacement
 
     # Repeat last substitute with same search
@@ -1018,80 +1239,218 @@ def ex_substitute(view, edit, line_range, pattern=None, replacement='', flags=0,
     except Exception as e:
         return message('[regex error]: {} ... in pattern {}'.format((str(e), pattern)))
 
-    target_region = line_range.resolve(view)
-    if target_region.empty():
-        return status_message('E486: Pattern not found: {}'.format(pattern))
+    if global_lines:
+        regions = [Region(a, b) for (a, b) in global_lines]
+    else:
+        target_region = line_range.resolve(view)
+        if target_region.empty():
+            return status_message('E486: Pattern not found: {}'.format(pattern))
+
+        regions = [target_region]
 
     replace_count = 0 if (flags and 'g' in flags) else 1
 
     if 'c' in flags:
+        substitutions = find_substitutions(view, regions, compiled_pattern, replacement, replace_count)
+
+        return _SubstituteConfirm(view, substitutions, pattern).start()
 
-        def _replace_confirming(view, edit, pattern, compiled_pattern,
-                                replacement, replace_count, target_region):
+    try:
+        if 'n' in flags:
+            matches = list(find_substitutions(view, regions, compiled_pattern, replacement, replace_count))
+            count, lines = len(matches), count_lines(matches)
+        else:
+            count, lines, last_line = substitute(
+                view, edit, regions, compiled_pattern, replacement, replace_count)
+    except (re.error, IndexError) as e:
+        return message('[regex error]: {} ... in replacement {}'.format(str(e), replacement))
+
+    if not count:
+        return status_message('E486: Pattern not found: {}'.format(pattern))
+
+    if 'n' in flags:
+        return status_message('{} {} on {} {}'.format(
+            count, 'match' if count == 1 else 'matches', lines, 'line' if lines == 1 else 'lines'))
+
+    status_message('{} {} on {} {}'.format(
+        count, 'substitution' if count == 1 else 'substitutions', lines, 'line' if lines == 1 else 'lines'))
+
+    # TODO Refactor set position cursor after operation into reusable api.
+    # Put cursor on first non-whitespace char of the last line.
+    line = view.line(last_line)
+    pt = line.begin()
+    if line.size() > 0:
+        pt = view.find('^\\s*', line.begin()).end()
 
-            last_row = row_at(view, target_region.b - 1)
-            start = target_region.begin()
+    view.sel().clear()
+    view.sel().add(pt)
 
-            while True:
-                if start >= view.size():
-                    break
+    # TODO [review] enter normal mode dependency
+    view.run_command('_enter_normal_mode')
 
-                match = view.find(pattern, start)
 
-                # no match or match out of range -- stop
-                if (match == Region(-1)) or (row_at(view, match.a) > last_row):
-                    view.show(first_sel(view).begin())
-                    return
+# Substitutions waiting for confirmation, see ex_substitute() [c] flag, keyed
+# by view id. The confirmed substitutions are picked up by the
+# **_nv_ex_substitute_confirmed** command, which makes them as one edit.
+_substitute_confirms = {}  # type: dict
 
-                size_before = view.size()
 
-                with adding_regions(view, 's_confirm', [match], 'comment'):
-                    view.show(match.a, True)
-                    if ok_cancel_dialog("Confirm replacement?"):
-                        text = view.substr(match)
-                        substituted = re.sub(compiled_pattern, replacement, text, count=replace_count)
-                        view.replace(edit, match, substituted)
+class _SubstituteConfirm:
 
-                start = match.b + (view.size() - size_before) + 1
+    # Asks whether to make each substitution, see |:s_c|. The substitutions are
+    # found lazily, as they are asked about. None are made until the end, so
+    # the matches still to be asked about don't move, and the confirmed ones
+    # are made together as one edit.
 
-        return _replace_confirming(view, edit, pattern, compiled_pattern, replacement, replace_count, target_region)
+    def __init__(self, view, substitutions, pattern):
+        self.view = view
+        self.substitutions = substitutions
+        self.pattern = pattern
+        self.current = None
+        self.confirmed = []
+        self.found = 0
+        self.prompts = 0
+        self.finished = False
+        self.change_count = view.change_count()
 
-    lines = view.lines(target_region)
-    if not lines:
-        return status_message('E486: Pattern not found: {}'.format(pattern))
+    def start(self):
+        # type: () -> None
+        previous = _substitute_confirms.get(self.view.id())
+        if previous:
+            previous.finished = True
 
-    new_lines = []
-    dirty = False
-    for line in lines:
-        line_str = view.substr(line)
-        new_line_str = re.sub(compiled_pattern, replacement, line_str, count=replace_count)
-        new_lines.append(new_line_str)
-        if new_line_str != line_str:
-            dirty = True
+        _substitute_confirms[self.view.id()] = self
 
-    new_region_text = '\n'.join(new_lines)
-    if view.size() > line.end():
-        new_region_text += '\n'
+        self.next()
 
-    if not dirty:
-        return status_message('E486: Pattern not found: {}'.format(pattern))
+    def next(self):
+        # type: () -> None
+        try:
+            self.current = next(self.substitutions, None)
+        except (re.error, IndexError) as e:
+            message('[regex error]: {} ... in replacement'.format(str(e)))
+            self.current = None
 
-    # Reposition cursor before replacing target region so that the cursor
-    # will auto adjust in sync with the replacement.
-    view.sel().clear()
-    view.sel().add(line.begin())
+        if self.current is None:
+            return self.done()
 
-    view.replace(edit, target_region, new_region_text)
+        self.found += 1
 
-    # TODO Refactor set position cursor after operation into reusable api.
-    # Put cursor on first non-whitespace char of current line.
-    line = view.line(view.sel()[0].b)
+        region = Region(self.current.begin, self.current.end)
+        self.view.add_regions('s_confirm', [region], 'comment')
+        self.view.show(region, True)
+
+        self.prompt()
+
+    def prompt(self):
+        # type: () -> None
+        self.prompts += 1
+        prompt = self.prompts
+
+        def on_change(text):
+            # Keys typed ahead are queued, each one answers the next prompt.
+            if text and prompt == self.prompts:
+                set_timeout(lambda: self.on_key(text[-1]), 0)
+
+        def on_cancel():
+            if prompt == self.prompts:
+                self.on_key('q')
+
+        window = self.view.window()
+        if not window:
+            return self.done()
+
+        window.show_input_panel(
+            'replace with {} (y/n/a/q/l)?'.format(self.current.text),
+            '',
+            lambda text: on_cancel(),
+            on_change,
+            on_cancel
+        )
+
+    def on_key(self, key):
+        # type: (str) -> None
+        if self.finished:
+            return
+
+        # Any callbacks from the current prompt are now stale.
+        self.prompts += 1
+
+        if key == 'y':
+            self.confirmed.append(self.current)
+            self.next()
+        elif key == 'n':
+            self.next()
+        elif key == 'a':
+            self.confirmed.append(self.current)
+            try:
+                self.confirmed.extend(self.substitutions)
+            except (re.error, IndexError) as e:
+                message('[regex error]: {} ... in replacement'.format(str(e)))
+
+            self.done()
+        elif key == 'l':
+            self.confirmed.append(self.current)
+            self.done()
+        elif key == 'q':
+            self.done()
+        else:
+            self.prompt()
+
+    def done(self):
+        # type: () -> None
+        if self.finished:
+            return
+
+        self.finished = True
+        self.view.erase_regions('s_confirm')
+
+        window = self.view.window()
+        if window and self.prompts:
+            window.run_command('hide_panel', {'cancel': True})
+
+        if not self.found:
+            _substitute_confirms.pop(self.view.id(), None)
+
+            return status_message('E486: Pattern not found: {}'.format(self.pattern))
+
+        if not self.confirmed:
+            _substitute_confirms.pop(self.view.id(), None)
+            self.view.show(first_sel(self.view).begin())
+
+            return
+
+        self.view.run_command('_nv_ex_substitute_confirmed')
+
+
+def do_ex_substitute_confirmed(view, edit):
+    # This function is used by the command **_nv_ex_substitute_confirmed** to
+    # make the substitutions confirmed by a _SubstituteConfirm.
+    confirm = _substitute_confirms.pop(view.id(), None)
+    if not confirm or not confirm.confirmed:
+        return
+
+    if view.change_count() != confirm.change_count:
+        return status_message('substitute cancelled, the buffer was changed')
+
+    substitutions = confirm.confirmed
+
+    apply_substitutions(view, edit, substitutions)
+
+    line = view.line(shift_point(substitutions, substitutions[-1].line))
+    pt = line.begin()
     if line.size() > 0:
         pt = view.find('^\\s*', line.begin()).end()
-        view.sel().clear()
-        view.sel().add(pt)
 
-    # TODO [review] enter normal mode dependency
+    view.sel().clear()
+    view.sel().add(pt)
+    view.show(pt)
+
+    count = len(substitutions)
+    lines = count_lines(substitutions)
+    status_message('{} {} on {} {}'.format(
+        count, 'substitution' if count == 1 else 'substitutions', lines, 'line' if lines == 1 else 'lines'))
+
     view.run_command('_enter_normal_mode')
 
 
@@ -1472,8 +1831,8 @@ def _get_ex_cmd(name):
 #
 # Arguments belonging to this function are underscored to avoid collisions with
 # the ex command args in kwargs.
-def do_ex_cmd_edit_wrap(self, edit, _name=None, _line=None, **kwargs):
-    _log.debug('do ex cmd edit wrap _name=%s _line=%s kwargs=%s', _name, _line, kwargs)
+def do_ex_cmd_edit_wrap(self, edit, _name=None, _line=None, _handle=None, **kwargs):
+    _log.debug('do ex cmd edit wrap _name=%s _line=%s _handle=%s kwargs=%s', _name, _line, _handle, kwargs)
 
     if _name:
         ex_cmd = _get_ex_cmd(_name)
@@ -1492,7 +1851,12 @@ def do_ex_cmd_edit_wrap(self, edit, _name=None, _line=None, **kwargs):
         ex_cmd(view=self.view, edit=edit, line_range=RangeNode(), **args)
 
     elif _line:
-        cmdline = parse_command_line(_line[1:])
+        # The handle is missing when the command is replayed by Sublime Text,
+        # for example from a macro, in which case the line is parsed again.
+        cmdline = _cmdline_handles.pop(_handle, None)
+        if cmdline is None:
+            cmdline = parse_command_line(_line[1:])
+
         ex_cmd = _get_ex_cmd(cmdline.command.target)
 
         args = cmdline.command.params
@@ -1682,9 +2046,17 @@ def do_ex_cmdline(window, line):
 
     ex_cmd = _get_ex_cmd(cmdline.command.target)
 
-    # TODO [review] Objects like the RangeNode() can't be passed through Sublime Text  commands, command args only accept simple data types, which is why we send the line which will be parsed again by the wrapper command. Ideally we wouldn't need to parse the line again.  # noqa: E501
+    # Objects like the RangeNode() can't be passed through Sublime Text
+    # commands, command args only accept simple data types, which is why the
+    # parsed command line is passed by handle. The line is sent too, in case
+    # the wrapper command is replayed after the handle has been released.
     if 'edit' in inspect.signature(ex_cmd).parameters:
-        return window.run_command('_nv_ex_cmd_edit_wrap', {'_line': line})
+        handle = next(_cmdline_handle_ids)
+        _cmdline_handles[handle] = cmdline
+        try:
+            return window.run_command('_nv_ex_cmd_edit_wrap', {'_line': line, '_handle': handle})
+        finally:
+            _cmdline_handles.pop(handle, None)
 
     args = cmdline.command.params
 
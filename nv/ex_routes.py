@@ -166,6 +166,10 @@ def _ex_route_copy(state):
     params.update(m.groupdict())
 
     command.params = params
+    # The lines marked by :global can be copied together to an address that
+    # doesn't move with them. Not if the command has a range of its own, see
+    # ex_global().
+    command.cooperates_with_global = params['address'] == '$' or params['address'].isdigit()
 
     return None, [command, TokenEof()]
 
@@ -181,6 +185,7 @@ def _ex_route_cquit(state):
 def _ex_route_delete(state):
     command = TokenCommand('delete')
     command.addressable = True
+    command.cooperates_with_global = True
 
     params = {'register': '"', 'count': None}
 
@@ -436,6 +441,13 @@ def _ex_route_global(state):
     return None, [command, TokenEof()]
 
 
+def _ex_route_vglobal(state):
+    _, tokens = _ex_route_global(state)
+    tokens[0].forced = True
+
+    return None, tokens
+
+
 def _ex_route_help(state):
     command = TokenCommand('help')
     match = state.expect_match(r'(?P<bang>!)?\s*(?P<subject>.+)?$').groupdict()
@@ -477,6 +489,10 @@ def _ex_route_move(state):
         params['address'] = address_command_line
 
     command.params = params
+    # The lines marked by :global can be moved together to an address that
+    # doesn't move with them. Not if the command has a range of its own, see
+    # ex_global().
+    command.cooperates_with_global = params['address'] in ('0', '$')
 
     return None, [command, TokenEof()]
 
@@ -642,6 +658,21 @@ def _ex_route_print(state):
     return None, [command, TokenEof()]
 
 
+def _ex_route_profile(state):
+    command = TokenCommand('profile')
+    params = {'subcommand': None, 'fname': None}
+
+    m = state.expect_match(
+        r'\s*(?P<subcommand>start|stop|pause|continue|dump)(?:\s+(?P<fname>.+?))?\s*$',
+        on_error=lambda: Exception("E475: Invalid argument"))
+
+    params.update(m.groupdict())
+
+    command.params = params
+
+    return None, [command, TokenEof()]
+
+
 def _ex_route_pwd(state):
     command = TokenCommand('pwd')
 
@@ -842,6 +873,7 @@ def _ex_route_split(state):
 def _ex_route_substitute(state):
     command = TokenCommand('substitute')
     command.addressable = True
+    command.cooperates_with_global = True
 
     delim = state.consume()
 
@@ -1268,7 +1300,6 @@ def _ex_route_yank(state):
     return None, [command, TokenEof()]
 
 
-# TODO: compile regexes. ??
 ex_routes = OrderedDict()
 ex_routes[r'!(?=.+)'] = _ex_route_shell_out
 ex_routes[r'&&?'] = _ex_route_double_ampersand
@@ -1303,6 +1334,7 @@ ex_routes[r'ono(?:remap)?'] = _ex_route_onoremap
 ex_routes[r'on(?:ly)?(?=!$|$)'] = _ex_route_only
 ex_routes[r'ou(nmap)?'] = _ex_route_ounmap
 ex_routes[r'p(?:rint)?$'] = _ex_route_print
+ex_routes[r'prof(?:ile)?(?=\s|$)'] = _ex_route_profile
 ex_routes[r'pwd?$'] = _ex_route_pwd
 ex_routes[r'q(?!a)(?:uit)?'] = _ex_route_quit
 ex_routes[r'qa(?:ll)?'] = _ex_route_qall
@@ -1323,10 +1355,12 @@ ex_routes[r'tabo(?:nly)?'] = _ex_route_tabonly
 ex_routes[r'tabp(?:revious)?'] = _ex_route_tabprevious
 ex_routes[r'tabN(?:ext)?'] = _ex_route_tabprevious
 ex_routes[r'tabr(?:ewind)?'] = _ex_route_tabfirst
+ex_routes[r't(?![a-zA-Z])'] = _ex_route_copy
 ex_routes[r'unm(?:ap)?'] = _ex_route_unmap
 ex_routes[r'unvsplit$'] = _ex_route_unvsplit
 ex_routes[r'vn(?:oremap)?'] = _ex_route_vnoremap
 ex_routes[r'vu(?:nmap)?'] = _ex_route_vunmap
+ex_routes[r'v(?:global)?(?=[^a-zA-Z ])'] = _ex_route_vglobal
 ex_routes[r'w(?:rite)?(?=(?:!?(?:\+\+|>>| |$)))'] = _ex_route_write
 ex_routes[r'wqa(?:ll)?'] = _ex_route_wqall
 ex_routes[r'xa(?:ll)?'] = _ex_route_wqall
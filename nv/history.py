@@ -15,6 +15,11 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import OrderedDict
+from itertools import islice
+
+from NeoVintageous.nv import viminfo
+
 
 # TODO Implement 'history' option so that the number of history entries
 # remembered can be configured.
@@ -49,27 +54,64 @@ _NAME2TYPE = {
 }
 
 
+class _HistoryItems(OrderedDict):
+
+    # History entries keyed by number, oldest first. A reverse index from item
+    # to number is maintained so that duplicates can be found without a scan.
+    # Numbers are always added in increasing order, so the first key is the
+    # oldest entry and the last key is the newest.
+
+    def __init__(self, *args, **kwargs):
+        self._numbers = {}
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, number, item):
+        if number in self:
+            del self[number]
+        super().__setitem__(number, item)
+        self._numbers[item] = number
+
+    def __delitem__(self, number):
+        item = self[number]
+        super().__delitem__(number)
+        if self._numbers.get(item) == number:
+            del self._numbers[item]
+
+    def clear(self):
+        super().clear()
+        self._numbers.clear()
+
+    def number_of(self, item):
+        # type: (str) -> int
+        # Returns the number of the item, or None if it's not in the history.
+        return self._numbers.get(item)
+
+    def first(self):
+        # type: () -> int
+        return next(iter(self))
+
+    def last(self):
+        # type: () -> int
+        return next(reversed(self))
+
+    def nth_last(self, n):
+        # type: (int) -> int
+        # Returns the nth newest number (1 is the newest). The cost is relative
+        # to n, not to the size of the history.
+        return next(islice(reversed(self), n - 1, None))
+
+
+def _new_history():
+    # type: () -> dict
+    return {'num': 0, 'items': _HistoryItems()}
+
+
 _storage = {
-    _HIST_CMD: {
-        'num': 0,
-        'items': {}
-    },
-    _HIST_SEARCH: {
-        'num': 0,
-        'items': {}
-    },
-    _HIST_EXPR: {
-        'num': 0,
-        'items': {}
-    },
-    _HIST_INPUT: {
-        'num': 0,
-        'items': {}
-    },
-    _HIST_DEBUG: {
-        'num': 0,
-        'items': {}
-    }
+    _HIST_CMD: _new_history(),
+    _HIST_SEARCH: _new_history(),
+    _HIST_EXPR: _new_history(),
+    _HIST_INPUT: _new_history(),
+    _HIST_DEBUG: _new_history()
 }
 
 
@@ -142,25 +184,39 @@ def history_add(history, item):
     if _MAX_ITEMS == 0:
         return 0
 
+    viminfo.load()
+
     history_type = history_get_type(history)
+    _add(history_type, item)
+    viminfo.write('history', history_type, item)
+
+    return 1
 
-    pending_deletes = [k for k, v in _storage[history_type]['items'].items() if v == item]
-    for pending_delete in pending_deletes:
-        del _storage[history_type]['items'][pending_delete]
 
-    _storage[history_type]['num'] += 1
-    _storage[history_type]['items'][_storage[history_type]['num']] = item
+def _add(history_type, item):
+    # type: (int, str) -> None
+    if _MAX_ITEMS == 0:
+        return
 
-    if len(_storage[history_type]['items']) > _MAX_ITEMS:
-        del _storage[history_type]['items'][min(_storage[history_type]['items'].keys())]
+    items = _storage[history_type]['items']
 
-    return 1
+    number = items.number_of(item)
+    if number is not None:
+        del items[number]
+
+    _storage[history_type]['num'] += 1
+    items[_storage[history_type]['num']] = item
+
+    if len(items) > _MAX_ITEMS:
+        del items[items.first()]
 
 
 def history_clear():
     # type: () -> None
+    viminfo.load()
     for key in _storage:
-        _storage[key] = {'num': 0, 'items': {}}
+        _storage[key] = _new_history()
+        viminfo.write('histdel', key, None)
 
 
 def history_del(history, item=None):
@@ -183,22 +239,21 @@ def history_del(history, item=None):
     if history_type == _HIST_INVALID:
         return 0
 
+    viminfo.load()
+
     if item is None:
-        _storage[history_type]['num'] = 0
-        _storage[history_type]['items'] = {}
+        _storage[history_type] = _new_history()
+        viminfo.write('histdel', history_type, None)
         ret = 1
     else:
         if isinstance(item, int):
+            items = _storage[history_type]['items']
             try:
-                if item >= 0:
-                    del _storage[history_type]['items'][item]
-                    ret = 1
-                else:
-                    keys = sorted(_storage[history_type]['items'].keys())
-                    key_index = keys[item]
-                    del _storage[history_type]['items'][key_index]
-                    ret = 1
-            except (KeyError, IndexError):
+                number = item if item >= 0 else items.nth_last(-item)
+                viminfo.write('histdel', history_type, items[number])
+                del items[number]
+                ret = 1
+            except (KeyError, StopIteration):
                 ret = 0
         else:
             raise NotImplementedError('history_del(history, item) where item is regular expression')
@@ -225,14 +280,15 @@ def history_get(history, index=-1):
     if history_type == _HIST_INVALID:
         return ''
 
+    viminfo.load()
+
     try:
         # A positive int represents the absolute index of an entry.
         if index >= 0:
             ret = _storage[history_type]['items'][index]
         else:
-            keys = sorted(_storage[history_type]['items'].keys())
-            key_index = keys[index]
-            ret = _storage[history_type]['items'][key_index]
+            items = _storage[history_type]['items']
+            ret = items[items.nth_last(-index)]
 
     except Exception:
         ret = ''
@@ -242,6 +298,8 @@ def history_get(history, index=-1):
 
 def history_len(history):
     # type: (str) -> int
+    viminfo.load()
+
     return len(_storage[history_get_type(history)]['items'])
 
 
@@ -259,9 +317,11 @@ def history_nr(history):
     if history_type == _HIST_INVALID:
         return -1
 
-    items = _storage[history_type]['items'].keys()
+    viminfo.load()
+
+    items = _storage[history_type]['items']
     if len(items) > 0:
-        num = max(items)
+        num = items.last()
     else:
         num = -1
 
@@ -290,6 +350,8 @@ def _history(history):
 
         history_types = [history_type]
 
+    viminfo.load()
+
     buf = []
 
     type2name = {
@@ -307,10 +369,67 @@ def _history(history):
 
         # TODO initial padding should be size of max history width
         buf.append('%6s  %s history' % ('#', name))
-        for i, number in enumerate(sorted(contents, reverse=False), start=1):
+        for i, number in enumerate(contents, start=1):
             if i == count:
                 buf.append('>%5d  %s' % (number, contents[number]))
             else:
                 buf.append('%6d  %s' % (number, contents[number]))
 
     return '\n'.join(buf)
+
+
+class HistoryRecall:
+
+    # Recall items from a history whose beginning matches a prefix, newest
+    # first, e.g. for <Up> and <Down> in the command-line. Matches are found
+    # lazily as the history is walked, so recalling a recent item doesn't scan
+    # the whole history. The history must not be changed while recalling.
+
+    def __init__(self, history, prefix=''):
+        # type: (str, str) -> None
+        self.prefix = prefix
+        self._matches = []  # type: list
+        history_type = history_get_type(history)
+        if history_type == _HIST_INVALID:
+            self._items = iter(())
+        else:
+            viminfo.load()
+            items = _storage[history_type]['items']
+            self._items = (items[n] for n in reversed(items) if items[n].startswith(prefix))
+
+    def get(self, n):
+        # type: (int) -> str
+        # Returns the nth newest matching item (1 is the newest), or None if
+        # there are less than n matches.
+        if n < 1:
+            return None
+
+        while len(self._matches) < n:
+            try:
+                self._matches.append(next(self._items))
+            except (StopIteration, RuntimeError):
+                return None
+
+        return self._matches[n - 1]
+
+
+def _viminfo_delete(history_type, item):
+    # type: (int, str) -> None
+    if item is None:
+        _storage[history_type] = _new_history()
+    else:
+        items = _storage[history_type]['items']
+        number = items.number_of(item)
+        if number is not None:
+            del items[number]
+
+
+def _viminfo_dump():
+    # type: () -> list
+    return [['history', history_type, item]
+            for history_type in sorted(_storage)
+            for item in _storage[history_type]['items'].values()]
+
+
+viminfo.register('history', _add, _viminfo_dump)
+viminfo.register('histdel', _viminfo_delete, list)
@@ -17,6 +17,7 @@
 
 import logging
 
+from NeoVintageous.nv.profiler import span
 from NeoVintageous.nv.variables import expand_keys
 from NeoVintageous.nv.vi.cmd_base import CMD_TYPE_USER
 from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
@@ -58,13 +59,106 @@ class Mapping:
             raise ValueError('no mapping found')
 
 
+class _Trie:
+    # Prefix tree of key sequences.
+    #
+    # Answers whether a sequence is a complete match, a strict prefix of longer
+    # sequences, or no match, in time proportional to the length of the
+    # sequence rather than to the number of sequences.
+
+    _VALUE = 0
+    _CHILDREN = 1
+
+    def __init__(self, items=()):
+        self._root = [None, {}]
+        for seq, value in items:
+            self.add(seq, value)
+
+    def add(self, seq, value):
+        # type: (str, object) -> None
+        node = self._root
+        for c in seq:
+            try:
+                node = node[self._CHILDREN][c]
+            except KeyError:
+                child = [None, {}]
+                node[self._CHILDREN][c] = child
+                node = child
+
+        node[self._VALUE] = value
+
+    def _find_node(self, seq):
+        node = self._root
+        for c in seq:
+            try:
+                node = node[self._CHILDREN][c]
+            except KeyError:
+                return None
+
+        return node
+
+    def get(self, seq):
+        # type: (str) -> object
+        # Returns:
+        #   The value of the sequence, or None if not found.
+        node = self._find_node(seq)
+        if node is not None:
+            return node[self._VALUE]
+
+    def has_longer(self, seq):
+        # type: (str) -> bool
+        # Returns:
+        #   True if there are sequences that start with, and are longer than,
+        #   the sequence, False otherwise.
+        node = self._find_node(seq)
+
+        return node is not None and bool(node[self._CHILDREN])
+
+    def iter_prefixed(self, seq):
+        # Yield all sequences that start with the sequence, in sorted order.
+        node = self._find_node(seq)
+        if node is None:
+            return
+
+        stack = [(seq, node)]
+        while stack:
+            prefix, node = stack.pop()
+            if node[self._VALUE] is not None:
+                yield prefix
+
+            for c in sorted(node[self._CHILDREN], reverse=True):
+                stack.append((prefix + c, node[self._CHILDREN][c]))
+
+
+# Prefix trees of the mappings indexed by mode. Each tree is stored with the
+# mappings dict it was built from, and is rebuilt on first use after the
+# mappings change.
+_tries = {}  # type: dict
+
+
+def _get_trie(mode):
+    # type: (str) -> _Trie
+    mappings = _mappings[mode]
+    try:
+        source, trie = _tries[mode]
+        if source is mappings:
+            return trie
+    except KeyError:
+        pass
+
+    trie = _Trie(mappings.items())
+    _tries[mode] = (mappings, trie)
+
+    return trie
+
+
 def _get_seqs(mode):
     # TODO [review] Do the mappings need to be sorted?
     return sorted(_mappings[mode])
 
 
 def _find_partial_match(mode, seq):
-    return [x for x in _get_seqs(mode) if x.startswith(seq)]
+    return list(_get_trie(mode).iter_prefixed(seq))
 
 
 # TODO [review] Should this really accept empty string i.e. if seq='' then this all sequences for the mode are returned? # noqa
@@ -76,27 +170,19 @@ def _find_full_match(mode, seq):
     #
     # Returns:
     #   A 2-tuple Tuple[str, str], Tuple[None, None] if not found.
-    #
-    # Raises:
-    #   IndexError: If has partial sequences found, but not a full match.
-
-    # TODO [refactor] There doesn't look there is a need to use partials.
-    partials = _find_partial_match(mode, seq)
-
-    try:
-
-        name = [x for x in partials if x == seq][0]
-
-        return (name, _mappings[mode][name])
-    except IndexError:
+    mapped_to = _get_trie(mode).get(seq)
+    if mapped_to is None:
         return (None, None)
 
+    return (seq, mapped_to)
+
 
 def mappings_add(mode, new, target):
     # type: (str, str, str) -> None
     # Raises:
     #   KeyError: If mode does not exist.
     _mappings[mode][expand_keys(new)] = {'name': target, 'type': CMD_TYPE_USER}
+    _tries.pop(mode, None)
 
 
 def mappings_remove(mode, new):
@@ -108,6 +194,8 @@ def mappings_remove(mode, new):
     except KeyError:
         raise KeyError('mapping not found')
 
+    _tries.pop(mode, None)
+
 
 def mappings_clear():
     # type: () -> None
@@ -123,10 +211,12 @@ def _can_be_long_user_mapping(mode, key):
     #
     # Returns:
     #   2-tuple (True, str) or (False, True) if not _can_be_long_user_mapping.
-    full_match = _find_full_match(mode, key)
-    partial_matches = _find_partial_match(mode, key)
-    if partial_matches:
-        return (True, full_match[0])
+    trie = _get_trie(mode)
+    if trie.get(key) is not None:
+        return (True, key)
+
+    if trie.has_longer(key):
+        return (True, None)
 
     return (False, True)
 
@@ -138,21 +228,20 @@ def _expand_first(mode, seq):
     #
     # Returns:
     #   Mapping or None if no mapping for mode and seq found.
-    head = ''
+    trie = _get_trie(mode)
 
-    keys, mapped_to = _find_full_match(mode, seq)
-    if keys:
-        return Mapping(seq, mapped_to['name'], seq[len(keys):])
+    mapped_to = trie.get(seq)
+    if mapped_to is not None:
+        return Mapping(seq, mapped_to['name'], '')
 
-    for key in KeySequenceTokenizer(seq).iter_tokenize():
-        head += key
-        keys, mapped_to = _find_full_match(mode, head)
-        if keys:
+    for head in KeySequenceTokenizer(seq).iter_tokenize():
+        mapped_to = trie.get(head)
+        if mapped_to is not None:
             return Mapping(head, mapped_to['name'], seq[len(head):])
-        else:
-            break
 
-    if _find_partial_match(mode, seq):
+        break
+
+    if trie.has_longer(seq):
         return Mapping(seq, '', '')
 
 
@@ -193,12 +282,13 @@ def mappings_resolve(state, sequence=None, mode=None, check_user_mappings=True):
 
     # TODO: Use same structure as in mappings (nested dict).
     command = None
-    if check_user_mappings:
-        # TODO: We should be able to force a mode here too as, below.
-        command = _expand_first(state.mode, seq)
+    with span('mappings_resolve', 'mappings', {'sequence': seq}):
+        if check_user_mappings:
+            # TODO: We should be able to force a mode here too as, below.
+            command = _expand_first(state.mode, seq)
 
-    if not command:
-        command = seq_to_command(state, seq, mode=mode)
+        if not command:
+            command = seq_to_command(state, seq, mode=mode)
 
     _log.debug('resolved %s (sequence) -> %s -> %s', sequence, seq, command)
 
@@ -43,6 +43,31 @@ mappings = {
 classes = {}
 
 
+# The command definitions registered with register(), see create_definition().
+#
+# 'mode' ==> 'key sequence' ==> (class, args, kwargs)
+#
+_definitions = {}  # type: dict
+
+
+def create_definition(mode, seq):
+    # Create the command definition registered for the sequence in the mode,
+    # and add it to the mappings. Like the builtin commands, plugin commands
+    # are only created the first time they're looked up.
+    #
+    # Returns:
+    #   Mapping:
+    #   None: If not found.
+    definition = _definitions.get(mode, {}).get(seq)
+    if not definition:
+        return None
+
+    cls, args, kwargs = definition
+    command = mappings[mode][seq] = cls(*args, **kwargs)
+
+    return command
+
+
 def register(seq, modes, *args, **kwargs):
     """
     Register a 'key sequence' to 'command' mapping with NeoVintageous.
@@ -50,7 +75,8 @@ def register(seq, modes, *args, **kwargs):
     The registered key sequence must be known to NeoVintageous. The
     registered command must be a ViMotionDef or ViOperatorDef.
 
-    The decorated class is instantiated with `*args` and `**kwargs`.
+    The decorated class is instantiated with `*args` and `**kwargs`, the
+    first time the key sequence is looked up, see create_definition().
 
     @keys
       A list of (`mode`, `sequence`) pairs to map the decorated
@@ -58,7 +84,8 @@ def register(seq, modes, *args, **kwargs):
     """
     def inner(cls):
         for mode in modes:
-                mappings[mode][seq] = cls(*args, **kwargs)
-                classes[cls.__name__] = cls
+            _definitions.setdefault(mode, {})[seq] = (cls, args, kwargs)
+            mappings[mode].pop(seq, None)
+            classes[cls.__name__] = cls
         return cls
     return inner
@@ -36,6 +36,7 @@ from NeoVintageous.nv.plugin import VISUAL
 from NeoVintageous.nv.plugin import VISUAL_BLOCK
 from NeoVintageous.nv.vi.core import ViTextCommandBase
 from NeoVintageous.nv.vi.search import reverse_search
+from NeoVintageous.nv.vi.text_objects import bracket_index
 from NeoVintageous.nv.vi.utils import translate_char
 
 
@@ -344,6 +345,13 @@ def _do_surround_cs(view, edit, target, replacement, mode=None):
                     prev_ = reverse_search(view, open_, end=next_.begin(), start=0)
                 else:
                     prev_ = None
+            elif old in target_pairs:
+                begin, end = bracket_index(view, open_, close_).enclosing(s.b)
+                if begin is not None and end is not None:
+                    prev_ = Region(begin, begin + 1)
+                    next_ = Region(end, end + 1)
+                else:
+                    prev_ = next_ = None
             else:
                 next_ = view.find(close_, s.b, flags=LITERAL)
                 if next_:
@@ -428,6 +436,23 @@ def _do_surround_ds(view, edit, target, mode=None):
                 # TODO test dst works when cursor position is inside tag end   <abc>x</a|bc> -> dst -> |x
                 t_region_end = view.find('<\\/.*?>', s.b)
                 t_region_begin = reverse_search(view, '<.*?>', start=0, end=s.b)
+            elif target in punctuation_marks:
+                begin, end = bracket_index(view, t_char_begin, t_char_end).enclosing(s.begin())
+                if begin is None or end is None:
+                    return s
+
+                t_region_begin = Region(begin, begin + 1)
+                t_region_end = Region(end, end + 1)
+
+                if trim_contained_whitespace:
+                    t_region_begin_ws = _find(view, '\\s*.', start=t_region_begin.end())
+                    t_region_end_ws = _rfind(view, '.\\s*', start=t_region_begin.end(), end=t_region_end.begin())
+
+                    if t_region_begin_ws.size() > 1:
+                        t_region_begin = Region(t_region_begin.begin(), t_region_begin_ws.end() - 1)
+
+                    if t_region_end_ws.size() > 1:
+                        t_region_end = Region(t_region_end_ws.begin() + 1, t_region_end.end())
             else:
                 current = view.substr(s.begin())
                 # TODO test ds{char} works when cursor position is on target begin |"x" -> ds" -> |x
@@ -450,16 +475,6 @@ def _do_surround_ds(view, edit, target, mode=None):
                     if t_region_end_rowcol[0] != s_rowcol_end[0]:
                         return s
 
-                if trim_contained_whitespace:
-                    t_region_begin_ws = _find(view, '\\s*.', start=t_region_begin.end())
-                    t_region_end_ws = _rfind(view, '.\\s*', start=t_region_begin.end(), end=t_region_end.begin())
-
-                    if t_region_begin_ws.size() > 1:
-                        t_region_begin = Region(t_region_begin.begin(), t_region_begin_ws.end() - 1)
-
-                    if t_region_end_ws.size() > 1:
-                        t_region_end = Region(t_region_end_ws.begin() + 1, t_region_end.end())
-
             # Note: Be careful using boolean evaluation on a Region because an empty
             # Region evaluates to False. It evaluates to False because Region
             # invokes `__len__()` which will be zero if the Region is empty e.g.
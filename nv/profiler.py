@@ -0,0 +1,253 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Measure where the time goes while keys are handled, see :profile.
+#
+# While profiling, the code that handles a key is timed in spans: the key
+# itself, resolving the mappings, loading and writing back the state,
+# evaluating the state, and the commands run. A span also counts the calls
+# made to the methods of the Sublime Text API objects. The spans are kept in a
+# ring buffer of the last _MAX_SPANS, and can be written as a Chrome trace
+# (chrome://tracing) or summarised as percentiles of the time of each span.
+#
+# Spans cost next to nothing while not profiling.
+
+from collections import deque
+from functools import wraps
+from math import ceil
+import json
+import os
+import time
+
+import sublime
+
+
+_MAX_SPANS = 100000
+
+# The API objects whose method calls are counted. Functions of the sublime
+# module aren't counted, because they're imported by name.
+_API_CLASSES = ('Selection', 'Settings', 'View', 'Window')
+
+# The special methods that call the API.
+_API_SPECIAL_METHODS = ('__getitem__', '__iter__', '__len__')
+
+# Finished spans, oldest first: (name, category, start, duration, api calls,
+# args). Times are in seconds.
+_spans = deque(maxlen=_MAX_SPANS)  # type: deque
+
+# The number of API calls made since profiling started.
+_api_calls = 0
+
+# The original methods of the API objects, while they're counted.
+_api_methods = []  # type: list
+
+_profiling = False
+_paused = False
+
+
+class _Span():
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.api_calls = _api_calls
+        self.start = time.perf_counter()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self.start
+        if _profiling:
+            _spans.append((self.name, self.category, self.start, duration, _api_calls - self.api_calls, self.args))
+
+
+class _NullSpan():
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, category, args=None):
+    # Returns a context manager that times the code run in it, if profiling.
+    #
+    # Args:
+    #   name (str): e.g. the name of the command.
+    #   category (str): The kind of span, e.g. "key" or "command".
+    #   args (dict): Shown with the span in the trace.
+    #
+    # >>> with span('_vi_j', 'command'):
+    # ...     view.run_command('_vi_j')
+    if not _profiling or _paused:
+        return _NULL_SPAN
+
+    return _Span(name, category, args)
+
+
+def is_profiling():
+    # type: () -> bool
+    return _profiling
+
+
+def start():
+    # type: () -> None
+    # Start profiling. The spans of an earlier profile are discarded.
+    global _profiling, _paused
+
+    _spans.clear()
+    if not _profiling:
+        _count_api_calls()
+
+    _profiling = True
+    _paused = False
+
+
+def stop():
+    # type: () -> None
+    global _profiling, _paused
+
+    if _profiling:
+        _restore_api_methods()
+
+    _profiling = False
+    _paused = False
+
+
+def pause():
+    # type: () -> None
+    global _paused
+
+    _paused = True
+
+
+def resume():
+    # type: () -> None
+    global _paused
+
+    _paused = False
+
+
+def _count_api_calls():
+    for class_name in _API_CLASSES:
+        cls = getattr(sublime, class_name, None)
+        if cls is None:
+            continue
+
+        for name, method in list(vars(cls).items()):
+            if callable(method) and (not name.startswith('_') or name in _API_SPECIAL_METHODS):
+                # A method can still be counted by an earlier load of this
+                # module, if the plugin was reloaded while profiling, so count
+                # the original method instead.
+                while hasattr(method, '__wrapped__'):
+                    method = method.__wrapped__
+
+                _api_methods.append((cls, name, method))
+                setattr(cls, name, _counted(method))
+
+
+def _counted(method):
+    @wraps(method)
+    def counted(*args, **kwargs):
+        global _api_calls
+        _api_calls += 1
+
+        return method(*args, **kwargs)
+
+    return counted
+
+
+def _restore_api_methods():
+    while _api_methods:
+        cls, name, method = _api_methods.pop()
+        setattr(cls, name, method)
+
+
+def to_trace():
+    # type: () -> dict
+    # Returns the spans as a Chrome trace, in the JSON object format.
+    pid = os.getpid()
+    origin = _spans[0][2] if _spans else 0
+    events = []
+    for name, category, start, duration, api_calls, args in _spans:
+        event_args = {'api_calls': api_calls}
+        if args:
+            event_args.update(args)
+
+        events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round((start - origin) * 1000000, 3),
+            'dur': round(duration * 1000000, 3),
+            'pid': pid,
+            'tid': 1,
+            'args': event_args
+        })
+
+    return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write_trace(fname):
+    # type: (str) -> None
+    # Raises:
+    #   OSError: If the file can't be written.
+    with open(fname, 'w', encoding='utf-8') as f:
+        json.dump(to_trace(), f)
+
+
+def _percentile(durations, percent):
+    # The nearest-rank percentile of the sorted durations.
+    return durations[max(0, int(ceil(percent / 100.0 * len(durations))) - 1)]
+
+
+def summary():
+    # type: () -> list
+    # Returns the number of spans, the 50th, 95th and 99th percentiles, and the
+    # maximum of their time in milliseconds, and the mean number of API calls,
+    # of each span name. The slowest at the 95th percentile first.
+    durations = {}  # type: dict
+    api_calls = {}  # type: dict
+    for name, category, start, duration, calls, args in _spans:
+        durations.setdefault((category, name), []).append(duration * 1000)
+        api_calls[(category, name)] = api_calls.get((category, name), 0) + calls
+
+    rows = []
+    for key, values in durations.items():
+        values.sort()
+        rows.append((key[0], key[1], len(values), _percentile(values, 50), _percentile(values, 95),
+                     _percentile(values, 99), values[-1], api_calls[key] / len(values)))
+
+    return sorted(rows, key=lambda row: row[4], reverse=True)
+
+
+def format_summary():
+    # type: () -> str
+    lines = ['{:<10} {:<40} {:>7} {:>9} {:>9} {:>9} {:>9} {:>9}'.format(
+        'category', 'name', 'count', 'p50 ms', 'p95 ms', 'p99 ms', 'max ms', 'api calls')]
+
+    for row in summary():
+        lines.append('{:<10} {:<40} {:>7} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.1f}'.format(*row))
+
+    return '\n'.join(lines) + '\n'
@@ -15,10 +15,15 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import deque
 import sys
+import threading
+import time
 
 from sublime import platform
 from sublime import Region
+from sublime import set_timeout
+from sublime import status_message
 
 _PLATFORM = platform()
 
@@ -32,33 +37,354 @@ else:
     raise ImportError('no os specific module found')
 
 
+# Size of the chunks written to and read from a filter process.
+_CHUNK_SIZE = 65536
+
+# Seconds to wait for a filter before leaving it to finish in the background.
+# A filter that finishes in time changes the view before the ex command that
+# started it returns, as if it had run synchronously.
+_WAIT = 0.5
+
+# Seconds after which a filter is cancelled.
+_TIMEOUT = 60
+
+# The running filter of each view, indexed by view id.
+_filters = {}  # type: dict
+
+# Number of characters of output kept by the output panel of :!{cmd}.
+_OUTPUT_SIZE = 1048576
+
+# Milliseconds between appends to the output panel of :!{cmd}.
+_OUTPUT_INTERVAL = 100
+
+# The running :!{cmd} of each window, indexed by window id.
+_outputs = {}  # type: dict
+
+
 # TODO [review] Function looks unused.
 def run_and_wait(view, cmd):
     # type: (...) -> None
     _shell.run_and_wait(view, cmd)
 
 
-def run_and_read(view, cmd):
-    # type: (...) -> str
-    return _shell.run_and_read(view, cmd)
+def filter_thru_shell(view, edit, regions, cmd):
+    # type: (...) -> None
+    # Replace each region with the output of the command, given the text of the
+    # region as input. The regions are filtered concurrently, see _Filter.
+    #
+    # Raises:
+    #   OSError: If the command can't be started.
+    regions = sorted(regions, key=lambda r: r.begin())
+
+    def _replace(view, edit, outputs):
+        # Replace from the last region, so the regions before are unmoved, and
+        # move the cursor(s) to the beginning of the replacement(s).
+        new_points = []
+        delta = 0
+        for region, output in zip(regions, outputs):
+            new_points.append(region.begin() + delta)
+            delta += len(output.rstrip()) + 1 - region.size()
+
+        for region, output in reversed(list(zip(regions, outputs))):
+            view.replace(edit, region, output.rstrip() + '\n')
 
+        view.run_command('_enter_normal_mode')
+        view.sel().clear()
+        view.sel().add_all(new_points)
 
-def filter_thru_shell(view, edit, regions, cmd):
+    _Filter(view, cmd, [view.substr(r) for r in regions], _replace).run(edit)
+
+
+def read_thru_shell(view, edit, pt, cmd):
     # type: (...) -> None
-    filter_func = _shell.filter_region
-
-    # Maintain text size delta as we replace each selection going forward. We
-    # can't simply go in reverse because cursor positions will be incorrect.
-    accumulated_delta = 0
-    new_points = []
-    for r in regions:
-        r_shifted = Region(r.begin() + accumulated_delta, r.end() + accumulated_delta)
-        rv = filter_func(view, view.substr(r_shifted), cmd).rstrip() + '\n'
-        view.replace(edit, r_shifted, rv)
-        new_points.append(r_shifted.a)
-        accumulated_delta += len(rv) - r_shifted.size()
-
-    # Switch to normal mode and move cursor(s) to beginning of replacement(s).
-    view.run_command('_enter_normal_mode')
-    view.sel().clear()
-    view.sel().add_all(new_points)
+    # Insert the output of the command at pt.
+    #
+    # Raises:
+    #   OSError: If the command can't be started.
+    def _insert(view, edit, outputs):
+        view.insert(edit, pt, outputs[0].strip() + '\n')
+
+    _Filter(view, cmd, [None], _insert).run(edit)
+
+
+def finish_filter(view, edit):
+    # type: (...) -> None
+    # Apply the output of the filter of the view, if it finished after the ex
+    # command that started it returned.
+    running = _filters.get(view.id())
+    if running and running.done.is_set():
+        running.finish(edit)
+
+
+def cancel_filter(view):
+    # type: (...) -> None
+    running = _filters.pop(view.id(), None)
+    if running:
+        running.cancel()
+
+
+def run_to_panel(window, view, cmd):
+    # type: (...) -> None
+    # Run the command and show its output in the output panel, see _Output.
+    #
+    # Raises:
+    #   OSError: If the command can't be started.
+    _Output(window, view, cmd).run()
+
+
+def append_output(view, edit, characters):
+    # type: (...) -> None
+    # Append output to the output panel, and trim the panel to the last
+    # _OUTPUT_SIZE characters, from the start of a line.
+    view.insert(edit, view.size(), characters)
+    if view.size() > _OUTPUT_SIZE:
+        view.erase(edit, Region(0, view.line(view.size() - _OUTPUT_SIZE).begin()))
+
+    view.show(view.size())
+
+
+def cancel_output(window):
+    # type: (...) -> None
+    running = _outputs.pop(window.id(), None)
+    if running:
+        running.cancel()
+
+
+class _Output():
+
+    # Run a shell command and stream its output to the output panel.
+    #
+    # The output is read a line at a time by a worker thread, and appended to
+    # the panel in batches every _OUTPUT_INTERVAL milliseconds, by the
+    # _nv_shell_output command. Only the last _OUTPUT_SIZE characters are kept,
+    # both in the panel and in the output waiting to be appended, so a command
+    # that prints a lot doesn't use a lot of memory.
+    #
+    # If the command finishes within _WAIT seconds, its output is appended
+    # before the ex command returns, as if it had run synchronously. A command
+    # that is still running when another one is started in the window is
+    # killed.
+
+    def __init__(self, window, view, cmd):
+        self.window = window
+        self.view = view
+        self.cmd = cmd
+        self.process = None
+        self.panel = None
+        self.lines = deque()
+        self.size = 0
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+
+    def run(self):
+        cancel_output(self.window)
+
+        self.process = _shell.filter_process(self.view, self.cmd)
+        self.process.stdin.close()
+
+        self.panel = self.window.create_output_panel('vi_out')
+        self.panel.settings().set("line_numbers", False)
+        self.panel.settings().set("gutter", False)
+        self.panel.settings().set("scroll_past_end", False)
+        self.window.run_command("show_panel", {"panel": "output.vi_out"})
+
+        _outputs[self.window.id()] = self
+
+        reader = threading.Thread(target=self._read)
+        reader.daemon = True
+        reader.start()
+
+        self.done.wait(_WAIT)
+        self.flush()
+
+    def flush(self):
+        if _outputs.get(self.window.id()) is not self:
+            return
+
+        with self.lock:
+            done = self.done.is_set()
+            characters = ''.join(self.lines)
+            self.lines.clear()
+            self.size = 0
+
+        if characters:
+            self.panel.run_command('_nv_shell_output', {'characters': characters})
+
+        if done:
+            del _outputs[self.window.id()]
+        else:
+            set_timeout(self.flush, _OUTPUT_INTERVAL)
+
+    def cancel(self):
+        try:
+            self.process.kill()
+        except OSError:
+            pass
+
+    def _read(self):
+        try:
+            while True:
+                line = self.process.stdout.readline(_CHUNK_SIZE)
+                if not line:
+                    break
+
+                line = _shell.filter_output(line)
+                with self.lock:
+                    self.lines.append(line)
+                    self.size += len(line)
+                    while self.size > _OUTPUT_SIZE and len(self.lines) > 1:
+                        self.size -= len(self.lines.popleft())
+
+            self.process.wait()
+        finally:
+            self.done.set()
+
+
+class _Filter():
+
+    # Run a shell command for each of the inputs, and apply the outputs in one
+    # edit when all the commands have finished.
+    #
+    # The commands run concurrently. Each command has a thread that streams its
+    # input to its stdin, and one that reads its stdout in chunks, so a command
+    # that writes before it has read all its input doesn't block. Nothing is
+    # done on the UI thread while the commands run.
+    #
+    # If the commands finish within _WAIT seconds, the outputs are applied with
+    # the edit of the ex command. Otherwise the filter finishes in the
+    # background, and the outputs are applied by the _nv_shell_filter command,
+    # unless the view has changed in the meantime. The commands are killed if
+    # they don't finish within _TIMEOUT seconds, if another filter is started
+    # in the view, or if the view is closed.
+    #
+    # Args:
+    #   :view (sublime.View):
+    #   :cmd (str): The shell command.
+    #   :inputs (list[str|None]): The input of each command, None for none.
+    #   :on_done (callable): Called with the view, an edit, and the list of
+    #       outputs, in the order of the inputs.
+
+    def __init__(self, view, cmd, inputs, on_done):
+        self.view = view
+        self.cmd = cmd
+        self.inputs = inputs
+        self.on_done = on_done
+        self.change_count = view.change_count()
+        self.processes = []
+        self.outputs = [''] * len(inputs)
+        self.error = None
+        self.cancelled = False
+        self.timed_out = False
+        self.background = False
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+
+    def run(self, edit):
+        cancel_filter(self.view)
+
+        try:
+            for i in range(len(self.inputs)):
+                self.processes.append(_shell.filter_process(self.view, self.cmd))
+        except Exception:
+            self.cancel()
+            raise
+
+        threads = []
+        for i, (process, text) in enumerate(zip(self.processes, self.inputs)):
+            threads.append(threading.Thread(target=self._read, args=(i, process)))
+            threads.append(threading.Thread(target=self._write, args=(process, text)))
+
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        _filters[self.view.id()] = self
+
+        waiter = threading.Thread(target=self._wait, args=(threads,))
+        waiter.daemon = True
+        waiter.start()
+
+        self.done.wait(_WAIT)
+        with self.lock:
+            if not self.done.is_set():
+                self.background = True
+                status_message('running {} ...'.format(self.cmd))
+                return
+
+        self.finish(edit)
+
+    def finish(self, edit):
+        if _filters.get(self.view.id()) is self:
+            del _filters[self.view.id()]
+
+        if self.timed_out:
+            return status_message('shell command timed out: {}'.format(self.cmd))
+
+        if self.cancelled:
+            return
+
+        if self.error:
+            return status_message('error reading output of shell command: {}'.format(self.error))
+
+        if self.view.change_count() != self.change_count:
+            return status_message('buffer changed, discarded output of shell command: {}'.format(self.cmd))
+
+        self.on_done(self.view, edit, self.outputs)
+
+    def cancel(self):
+        self.cancelled = True
+        for process in self.processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+    def _write(self, process, text):
+        try:
+            if text:
+                data = text.encode('utf-8')
+                for i in range(0, len(data), _CHUNK_SIZE):
+                    process.stdin.write(data[i:i + _CHUNK_SIZE])
+        except OSError:
+            # The command exited without reading all of its input.
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    def _read(self, i, process):
+        chunks = []
+        try:
+            while True:
+                chunk = process.stdout.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+
+                chunks.append(chunk)
+
+            process.wait()
+            self.outputs[i] = _shell.filter_output(b''.join(chunks))
+        except Exception as e:
+            self.error = e
+
+    def _wait(self, threads):
+        deadline = time.time() + _TIMEOUT
+        for thread in threads:
+            thread.join(max(0, deadline - time.time()))
+
+        if any(thread.is_alive() for thread in threads):
+            self.timed_out = True
+            self.cancel()
+
+            # The children of a killed shell may keep its stdout open.
+            for thread in threads:
+                thread.join(1)
+
+        with self.lock:
+            self.done.set()
+            background = self.background
+
+        if background:
+            set_timeout(lambda: self.view.run_command('_nv_shell_filter'), 0)
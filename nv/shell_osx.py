@@ -23,11 +23,11 @@ def run_and_wait(view, cmd):
     shell_unixlike.run_and_wait(view, cmd, 'VintageousEx_osx_terminal')
 
 
-def run_and_read(view, cmd):
-    # type: (...) -> str
-    return shell_unixlike.run_and_read(view, cmd)
+def filter_process(view, command):
+    # type: (...) -> subprocess.Popen
+    return shell_unixlike.filter_process(view, command, 'VintageousEx_osx_shell')
 
 
-def filter_region(view, text, command):
-    # type: (...) -> str
-    return shell_unixlike.filter_region(view, text, command, 'VintageousEx_osx_shell')
+def filter_output(data):
+    # type: (bytes) -> str
+    return shell_unixlike.filter_output(data)
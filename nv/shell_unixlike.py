@@ -30,32 +30,19 @@ def run_and_wait(view, cmd, terminal_setting_name):
     ]).wait()
 
 
-def run_and_read(view, cmd):
-    # type: (...) -> str
-    out, err = subprocess.Popen([cmd],
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                shell=True).communicate()
-
-    try:
-        return (out or err).decode('utf-8')
-    except AttributeError:
-        return ''
-
-
-def filter_region(view, text, command, shell_setting_name):
-    # type: (...) -> str
+def filter_process(view, command, shell_setting_name):
+    # type: (...) -> subprocess.Popen
     shell = view.settings().get(shell_setting_name)
     shell = shell or os.path.expandvars("$SHELL")
 
     # Redirect STDERR to STDOUT to capture both.
     # This seems to be the behavior of vim as well.
-    p = subprocess.Popen([shell, '-c', command],
-                         stdin=subprocess.PIPE,
-                         stdout=subprocess.PIPE,
-                         stderr=subprocess.STDOUT)
+    return subprocess.Popen([shell, '-c', command],
+                            stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT)
 
-    # Pass in text as input: saves having to deal with quoting stuff.
-    out, _ = p.communicate(text.encode('utf-8'))
 
-    return out.decode('utf-8', errors='backslashreplace')
+def filter_output(data):
+    # type: (bytes) -> str
+    return data.decode('utf-8', errors='backslashreplace')
@@ -15,9 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
-import os
 import subprocess
-import tempfile
 
 
 try:
@@ -48,39 +46,15 @@ def run_and_wait(view, cmd):
     subprocess.Popen(['cmd.exe', '/c', cmd + '&& pause']).wait()
 
 
-def run_and_read(view, cmd):
-    # type: (...) -> str
-    out, err = subprocess.Popen(['cmd.exe', '/c', cmd],
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE,
-                                shell=True,
-                                startupinfo=get_startup_info()).communicate()
-
-    try:
-        return (out or err).decode(get_oem_cp()).replace('\r\n', '\n')
-    except AttributeError:
-        return ''
-
-
-def filter_region(view, txt, command):
-    # type: (...) -> str
-    try:
-        contents = tempfile.NamedTemporaryFile(suffix='.txt', delete=False)
-        contents.write(txt.encode('utf-8'))
-        contents.close()
-
-        script = tempfile.NamedTemporaryFile(suffix='.bat', delete=False)
-        script.write(('@echo off\ntype %s | %s' % (contents.name, command)).encode('utf-8'))
-        script.close()
-
-        p = subprocess.Popen([script.name],
-                             stdout=subprocess.PIPE,
-                             stderr=subprocess.PIPE,
-                             startupinfo=get_startup_info())
+def filter_process(view, command):
+    # type: (...) -> subprocess.Popen
+    return subprocess.Popen(['cmd.exe', '/c', command],
+                            stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT,
+                            startupinfo=get_startup_info())
 
-        out, err = p.communicate()
 
-        return (out or err).decode(get_oem_cp()).replace('\r\n', '\n')[:-1].strip()
-    finally:
-        os.remove(script.name)
-        os.remove(contents.name)
+def filter_output(data):
+    # type: (bytes) -> str
+    return data.decode(get_oem_cp()).replace('\r\n', '\n')
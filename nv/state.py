@@ -15,13 +15,15 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
-from collections import Counter
+from collections import defaultdict
 import logging
 
 from sublime import active_window
 from sublime import Region
 
 from NeoVintageous.nv import plugin
+from NeoVintageous.nv import viminfo
+from NeoVintageous.nv.profiler import span
 from NeoVintageous.nv.vi import cmd_defs
 from NeoVintageous.nv.vi import settings
 from NeoVintageous.nv.vi import utils
@@ -57,6 +59,10 @@ from NeoVintageous.nv.vim import VISUAL_LINE
 
 _log = logging.getLogger(__name__)
 
+# Decoded action and motion command definitions indexed by view.id(). See
+# State._get_command_def().
+_command_defs = defaultdict(dict)  # type: dict
+
 
 class State(object):
     """
@@ -281,33 +287,61 @@ class State(object):
 
     @property
     def action(self):
-        action = self.settings.vi['action'] or None
-        if action:
-            cls = getattr(cmd_defs, action['name'], None)
-            if cls is None:
-                cls = plugin.classes.get(action['name'], None)
-            if cls is None:
-                ValueError('unknown action: %s' % action)
-            return cls.from_json(action['data'])
+        return self._get_command_def('action')
 
     @action.setter
     def action(self, value):
-        serialized = value.serialize() if value else None
-        self.settings.vi['action'] = serialized
+        self._set_command_def('action', value)
 
     @property
     def motion(self):
-        motion = self.settings.vi['motion'] or None
-
-        if motion:
-            cls = getattr(cmd_defs, motion['name'])
-
-            return cls.from_json(motion['data'])
+        return self._get_command_def('motion')
 
     @motion.setter
     def motion(self, value):
+        self._set_command_def('motion', value)
+
+    def _get_command_def(self, name):
+        # type: (str) -> ViCommandDefBase
+        # The action and motion are read many times per key, so the decoded
+        # command definition is kept and returned for as long as the serialized
+        # definition stays the same. It is only decoded again when it's set.
+        serialized = self.settings.vi[name] or None
+        if not serialized:
+            return None
+
+        decoded = _command_defs[self.view.id()]
+        try:
+            cached_serialized, command = decoded[name]
+            if cached_serialized is serialized or cached_serialized == serialized:
+                return command
+        except KeyError:
+            pass
+
+        cls = getattr(cmd_defs, serialized['name'], None)
+        if cls is None:
+            cls = plugin.classes.get(serialized['name'], None)
+        if cls is None:
+            raise ValueError('unknown %s: %s' % (name, serialized))
+
+        command = cls.from_json(serialized['data'])
+        decoded[name] = (serialized, command)
+
+        return command
+
+    def _set_command_def(self, name, value):
+        # type: (str, ViCommandDefBase) -> None
         serialized = value.serialize() if value else None
-        self.settings.vi['motion'] = serialized
+
+        # Keep the decoded command if it is the one being stored e.g. after it
+        # has accepted input. Any other command may be shared, for example the
+        # instances in the key mappings, so it's decoded again on next access.
+        decoded = _command_defs[self.view.id()]
+        cached = decoded.pop(name, None)
+        if cached and cached[1] is value:
+            decoded[name] = (serialized, value)
+
+        self.settings.vi[name] = serialized
 
     @property
     def motion_count(self):
@@ -611,15 +645,7 @@ class State(object):
         if force or self.must_update_xpos:
             try:
                 # TODO: we should check the current mode instead. ============
-                sel = self.view.sel()[0]
-                pos = sel.b
-                if not sel.empty():
-                    if sel.a < sel.b:
-                        pos -= 1
-
-                counter = Counter(self.view.substr(Region(self.view.line(pos).a, pos)))
-                tab_size = self.view.settings().get('tab_size')
-                self.xpos = (self.view.rowcol(pos)[1] + ((counter['\t'] * tab_size) - counter['\t']))
+                self.xpos = utils.get_xpos(self.view)
             except Exception:
                 # TODO [review] Exception handling
                 _log.debug('error updating xpos; default to 0')
@@ -797,6 +823,11 @@ class State(object):
     def eval(self):
         # type: () -> None
         # Run data as a command if possible.
+        with span('eval', 'eval'):
+            self._eval()
+
+    def _eval(self):
+        # type: () -> None
         if not self.runnable():
             return
 
@@ -894,6 +925,21 @@ class State(object):
         self.reset_command_data()
 
 
+viminfo.register('macro', State.macro_registers.__setitem__, State.macro_registers.viminfo_dump)
+
+
+def destroy_state(view):
+    # type: (...) -> None
+    # Release view state.
+    #
+    # Runs when a view is closed.
+    #
+    # Args:
+    #   :view (sublime.View):
+    _command_defs.pop(view.id(), None)
+    settings.destroy(view)
+
+
 def init_state(view):
     # type: (...) -> None
     # Initialise view state.
@@ -0,0 +1,236 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# The :substitute engine, see |:substitute|.
+#
+# The lines are read from the view in large line aligned chunks. Each chunk is
+# scanned with one pass of the pattern, and only the matched spans are
+# replaced, so the cost of a substitution depends on the number of matches
+# rather than the number of lines.
+#
+# A pattern is matched against each line on its own, as if by re.sub() on the
+# text of the line. A pattern that can't match or look across the end of a line
+# finds the same matches in a chunk of lines, any other pattern is matched one
+# line at a time.
+#
+# A substitution without the [c] flag can't be aborted part way, because
+# Sublime Text doesn't handle keys while a command runs. With the [c] flag the
+# substitutions are found as they're confirmed, so quitting stops the scan.
+
+from collections import namedtuple
+
+from sublime import Region
+
+
+# Size of the chunks of text read from the view. A chunk is extended to the end
+# of the line it ends in, so a chunk is never less than a whole line.
+_CHUNK_SIZE = 262144
+
+
+# A match of a substitution.
+#
+# Attributes:
+#   :begin (int): The start of the match.
+#   :end (int): The end of the match.
+#   :line (int): The start of the line of the match.
+#   :text (str): The replacement for the match.
+#   :changed (bool): Whether the replacement differs from the matched text.
+Substitution = namedtuple('Substitution', 'begin end line text changed')
+
+
+def find_substitutions(view, regions, pattern, replacement, count=0):
+    # Generate the substitutions in the lines of the regions, in order.
+    #
+    # The text is read a chunk at a time, so a consumer that stops early only
+    # reads as much of the view as it needs.
+    #
+    # Args:
+    #   :view (sublime.View):
+    #   :regions (list[sublime.Region]): The lines to substitute in, in order.
+    #   :pattern (re.RegexObject): The compiled pattern.
+    #   :replacement (str): A re.sub() template.
+    #   :count (int): The maximum number of substitutions per line, 0 for all.
+    #
+    # Raises:
+    #   re.error or IndexError if the replacement has an invalid group
+    #   reference. Nothing is generated for the chunk the error is in.
+    line_safe = _is_line_safe(pattern.pattern)
+
+    for begin, text in (chunk for region in regions for chunk in _chunks(view, region)):
+        if line_safe:
+            for substitution in _substitutions(pattern, replacement, count, text, begin):
+                yield substitution
+        else:
+            for line in text.split('\n'):
+                for substitution in _substitutions(pattern, replacement, count, line, begin):
+                    yield substitution
+
+                begin += len(line) + 1
+
+
+def substitute(view, edit, regions, pattern, replacement, count=0):
+    # Substitute the matches in the lines of the regions.
+    #
+    # All the substitutions are found before the view is changed, so if the
+    # replacement is invalid nothing is changed.
+    #
+    # Returns:
+    #   tuple(int, int, int): The number of substitutions, the number of lines
+    #       they are on, and the start of the last line of the last region after
+    #       the substitution.
+    substitutions = list(find_substitutions(view, regions, pattern, replacement, count))
+    last_line = view.line(max(regions[-1].begin(), regions[-1].end() - 1)).begin()
+
+    apply_substitutions(view, edit, substitutions)
+
+    return len(substitutions), count_lines(substitutions), shift_point(substitutions, last_line)
+
+
+def apply_substitutions(view, edit, substitutions):
+    # Replace the matches of the substitutions that change the text. The
+    # substitutions must be in order, and found in the current text.
+    #
+    # Replace from the last match, so the matches before it are unmoved.
+    for substitution in reversed(substitutions):
+        if substitution.changed:
+            view.replace(edit, Region(substitution.begin, substitution.end), substitution.text)
+
+
+def count_lines(substitutions):
+    # type: (list) -> int
+    # Returns the number of lines the substitutions are on.
+    lines = 0
+    line = -1
+    for substitution in substitutions:
+        if substitution.line != line:
+            line = substitution.line
+            lines += 1
+
+    return lines
+
+
+def shift_point(substitutions, pt):
+    # type: (list, int) -> int
+    # Returns the point after applying the substitutions, of a point before.
+    for substitution in substitutions:
+        if substitution.begin >= pt:
+            break
+
+        if substitution.changed:
+            pt += len(substitution.text) - (substitution.end - substitution.begin)
+
+    return pt
+
+
+def _chunks(view, region):
+    # Generate the text of the lines of the region in line aligned chunks, as
+    # (begin, text) tuples. The newline at the end of the last line of a chunk
+    # is not part of the chunk text.
+    begin = region.begin()
+    end = region.end()
+
+    if begin == end:
+        line = view.line(begin)
+        yield line.begin(), view.substr(line)
+        return
+
+    while begin < end:
+        chunk_end = min(begin + _CHUNK_SIZE, end)
+        if chunk_end < end:
+            chunk_end = min(view.full_line(chunk_end).end(), end)
+
+        text = view.substr(Region(begin, chunk_end))
+        if text.endswith('\n'):
+            text = text[:-1]
+
+        yield begin, text
+
+        begin = chunk_end
+
+
+def _substitutions(pattern, replacement, count, text, offset):
+    # Find the substitutions in the lines of the text.
+    #
+    # The matches are found by re.sub() rather than re.finditer(), because the
+    # two don't agree on empty matches next to a previous match in all Python
+    # versions, and the substitutions should be the ones re.sub() would make.
+    substitutions = []
+    expand = '\\' in replacement
+    line = 0
+    line_count = 0
+    scanned = 0
+
+    def _on_match(match):
+        nonlocal line, line_count, scanned
+
+        start = match.start()
+        newline = text.rfind('\n', scanned, start)
+        scanned = start
+        if newline >= 0:
+            line = newline + 1
+            line_count = 0
+
+        if count and line_count >= count:
+            return ''
+
+        line_count += 1
+
+        matched = match.group(0)
+        new_text = match.expand(replacement) if expand else replacement
+        substitutions.append(Substitution(
+            offset + start,
+            offset + match.end(),
+            offset + line,
+            new_text,
+            new_text != matched
+        ))
+
+        return ''
+
+    pattern.sub(_on_match, text)
+
+    return substitutions
+
+
+def _is_line_safe(term):
+    # type: (str) -> bool
+    # Returns True if the pattern can't match a newline or see past one, in
+    # which case it finds the same matches in a chunk of lines as it does in
+    # each of the lines. Errs on the side of False.
+    i = 0
+    size = len(term)
+    while i < size:
+        c = term[i]
+        n = term[i + 1] if i + 1 < size else ''
+        if c == '\\':
+            if n < ' ' or (n.isalnum() and n not in 'bdSw123456789'):
+                return False
+
+            i += 2
+            continue
+
+        if c < ' ':
+            return False
+        elif c == '(' and n == '?':
+            if not term.startswith(('(?:', '(?=', '(?!', '(?<=', '(?<!', '(?P<', '(?P=', '(?#'), i):
+                return False
+        elif c == '[' and n == '^':
+            return False
+
+        i += 1
+
+    return True
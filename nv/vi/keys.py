@@ -316,14 +316,14 @@ def seq_to_command(state, seq, mode=None):
     command = None
 
     if mode in plugin.mappings:
-        command = plugin.mappings[mode].get(seq, None)
+        command = plugin.mappings[mode].get(seq) or plugin.create_definition(mode, seq)
 
         # The plugin command might only be enabled under certain conditions
         if command and hasattr(command, 'is_enabled') and (not command.is_enabled(state)):
             command = None
 
     if not command and mode in mappings:
-        command = mappings[mode].get(seq, cmd_base.ViMissingCommandDef())
+        command = mappings[mode].get(seq) or _create_definition(mode, seq)
 
     if command:
         return command
@@ -347,6 +347,32 @@ mappings = {
 }
 
 
+# The command definitions registered with assign(). A definition is only
+# created the first time it's looked up, because most of them are never used
+# in a session, see _create_definition().
+#
+# 'mode' ==> 'key sequence' ==> (class, args, kwargs)
+#
+_definitions = {}  # type: dict
+
+
+def _create_definition(mode, seq):
+    # Create the command definition registered for the sequence in the mode,
+    # and add it to the mappings.
+    #
+    # Returns:
+    #   Mapping:
+    #   ViMissingCommandDef: If not found.
+    definition = _definitions.get(mode, {}).get(seq)
+    if not definition:
+        return cmd_base.ViMissingCommandDef()
+
+    cls, args, kwargs = definition
+    command = mappings[mode][seq] = cls(*args, **kwargs)
+
+    return command
+
+
 EOF = -2
 
 
@@ -551,7 +577,8 @@ def assign(seq, modes, *args, **kwargs):
     The registered key sequence must be known to NeoVintageous. The
     registered command must be a ViMotionDef or ViOperatorDef.
 
-    The decorated class is instantiated with `*args` and `**kwargs`.
+    The decorated class is instantiated with `*args` and `**kwargs`, the
+    first time the key sequence is looked up, see seq_to_command().
 
     @keys
       A list of (`mode:tuple`, `sequence:string`) pairs to map the decorated
@@ -559,6 +586,7 @@ def assign(seq, modes, *args, **kwargs):
     """
     def inner(cls):
         for mode in modes:
-            mappings[mode][seq] = cls(*args, **kwargs)
+            _definitions.setdefault(mode, {})[seq] = (cls, args, kwargs)
+            mappings[mode].pop(seq, None)
         return cls
     return inner
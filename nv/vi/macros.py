@@ -15,6 +15,43 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from copy import deepcopy
+
+from NeoVintageous.nv import viminfo
+
+
+# Motions that fail when they don't move the cursor. For example, "j" on the
+# last line, or "fx" when there is no "x" after the cursor. As in Vim, a motion
+# that fails aborts the macro.
+#
+# Searches, e.g. "n" and "*", aren't included, because they can wrap around to
+# the match the cursor is on, which isn't a failure. Nor is "%", because with
+# a count it goes to a line, which can be the line the cursor is on.
+_FAILING_MOTIONS = frozenset((
+    '_vi_b',
+    '_vi_big_b',
+    '_vi_big_e',
+    '_vi_big_w',
+    '_vi_e',
+    '_vi_enter',
+    '_vi_find_in_line',
+    '_vi_g_big_e',
+    '_vi_ge',
+    '_vi_gj',
+    '_vi_gk',
+    '_vi_h',
+    '_vi_j',
+    '_vi_k',
+    '_vi_l',
+    '_vi_left_brace',
+    '_vi_left_paren',
+    '_vi_minus',
+    '_vi_reverse_find_in_line',
+    '_vi_right_brace',
+    '_vi_right_paren',
+    '_vi_w',
+))
+
 
 class MacroRegisters(dict):
     """Crude implementation of macro registers."""
@@ -27,11 +64,52 @@ class MacroRegisters(dict):
             raise ValueError('invalid register key: %s' % key)
         # TODO further restrict valid register names.
         # TODO implement a vs A register.
+        viminfo.load()
         super().__setitem__(key.lower(), value)
+        viminfo.write('macro', key.lower(), value)
 
     def __getitem__(self, key):
         if key in ('%', '#'):
             raise ValueError('unsupported key: %s' % key)
         # TODO further restrict valid register names.
         # TODO implement a vs A register.
+        viminfo.load()
         return super().__getitem__(key.lower())
+
+    def viminfo_dump(self):
+        """Return the macros as viminfo records."""
+        return [['macro', key, value] for key, value in sorted(self.items())]
+
+
+def compile_macro(steps):
+    # Compile the recorded steps of a macro into the ops to run.
+    #
+    # The args are copied, so running the ops doesn't change the register.
+    # Consecutive inserts are merged, and the args that take the xpos of the
+    # caret are found once, rather than each time the macro is run.
+    #
+    # Args:
+    #   steps (list): The (command, args) steps of a macro register.
+    #
+    # Returns:
+    #   list[tuple]: The (command, args, xpos_args, can_fail) ops. The xpos of
+    #       the caret is to be set in xpos_args before running the command, if
+    #       not None. The command is a motion that fails if it doesn't move the
+    #       caret, if can_fail.
+    ops = []
+    for cmd, args in steps:
+        args = deepcopy(args) if args else {}
+
+        if cmd == 'insert' and ops and ops[-1][0] == 'insert':
+            ops[-1][1]['characters'] += args.get('characters', '')
+            continue
+
+        xpos_args = None
+        if 'xpos' in args:
+            xpos_args = args
+        elif args.get('motion') and 'xpos' in args['motion'].get('motion_args', {}):
+            xpos_args = args['motion']['motion_args']
+
+        ops.append((cmd, args, xpos_args, cmd in _FAILING_MOTIONS))
+
+    return ops
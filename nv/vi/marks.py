@@ -17,17 +17,24 @@
 
 from sublime import Region
 
+from NeoVintageous.nv import viminfo
 from NeoVintageous.nv.jumplist import jumplist_back
 
 # store: window, view, rowcol
 
 _MARKS = {}
 
+# File marks (A-Z) remembered from a previous session, see |viminfo|. They are
+# replaced when the mark is set again.
+# store: file name, rowcol
+_FILE_MARKS = {}
+
 
 class Marks(object):
 
     def __get__(self, instance, owner):
         self.state = instance
+        viminfo.load()
 
         return self
 
@@ -37,6 +44,12 @@ class Marks(object):
         win, view, rowcol = view.window(), view, view.rowcol(view.sel()[0].b)
         _MARKS[name] = win, view, rowcol
 
+        if name.isupper():
+            _FILE_MARKS.pop(name, None)
+            file_name = view.file_name()
+            if file_name:
+                viminfo.write('mark', name, file_name, rowcol[0], rowcol[1])
+
     def get_as_encoded_address(self, name, exact=False):
         """
         Return an address for the mark @name.
@@ -59,6 +72,13 @@ class Marks(object):
         else:
             win, view, rowcol = _MARKS.get(name, (None,) * 3)
 
+        if not win and name in _FILE_MARKS:
+            fname, rowcol = _FILE_MARKS[name]
+            if not exact:
+                rowcol = (rowcol[0], 0)
+
+            return "{0}:{1}".format(fname, ':'.join(str(i) for i in rowcol))
+
         if win:
             if exact:
                 rowcol_encoded = ':'.join(str(i) for i in rowcol)
@@ -80,3 +100,19 @@ class Marks(object):
                     return "{0}:{1}".format(fname, rowcol_encoded)
                 else:
                     return "<untitled {0}>:{1}".format(view.buffer_id(), rowcol_encoded)
+
+
+def _viminfo_set(name, file_name, row, col):
+    _FILE_MARKS[name] = file_name, (row, col)
+
+
+def _viminfo_dump():
+    marks = dict(_FILE_MARKS)
+    for name, (win, view, rowcol) in _MARKS.items():
+        if name.isupper() and view.file_name():
+            marks[name] = view.file_name(), rowcol
+
+    return [['mark', name, file_name, rowcol[0], rowcol[1]] for name, (file_name, rowcol) in sorted(marks.items())]
+
+
+viminfo.register('mark', _viminfo_set, _viminfo_dump)
@@ -21,6 +21,7 @@ import itertools
 from sublime import get_clipboard
 from sublime import set_clipboard
 
+from NeoVintageous.nv import viminfo
 from NeoVintageous.nv.vim import is_visual_mode
 from NeoVintageous.nv.vim import VISUAL_LINE
 
@@ -115,10 +116,18 @@ def _reset_data():
 
 def _shift_numbered_register(content):
     _data['1-9'].appendleft(content)
+    viminfo.write('register_shift', content)
 
 
 def _set_numbered_register(number, values):
     _data['1-9'][int(number) - 1] = values
+    viminfo.write('register', str(number), values, False)
+
+
+def _set_data(name, values, linewise=False):
+    _data[name] = values
+    _linewise[name] = linewise
+    viminfo.write('register', name, values, linewise)
 
 
 def _get_numbered_register(number):
@@ -185,6 +194,7 @@ class Registers:
     def __get__(self, instance, owner):
         self.view = instance.view
         self.settings = instance.settings
+        viminfo.load()
 
         return self
 
@@ -218,9 +228,11 @@ class Registers:
 
         if name.isdigit() and name != '0':
             _set_numbered_register(name, values)
-        else:
+        elif name == _EXPRESSION:
             _data[name] = values
             _linewise[name] = linewise
+        else:
+            _set_data(name, values, linewise)
 
         if name not in (_EXPRESSION,):
             self._set_unnamed(values, linewise)
@@ -228,8 +240,7 @@ class Registers:
 
     def _set_unnamed(self, values, linewise=False):
         assert isinstance(values, list)
-        _data[_UNNAMED] = [str(v) for v in values]
-        _linewise[_UNNAMED] = linewise
+        _set_data(_UNNAMED, [str(v) for v in values], linewise)
 
     def set_expression(self, values):
         # Coerce all values into strings.
@@ -243,7 +254,7 @@ class Registers:
         new_values = itertools.zip_longest(existing_values, suffixes, fillvalue='')
         new_values = [(prefix + suffix) for (prefix, suffix) in new_values]
 
-        _data[name.lower()] = new_values
+        _set_data(name.lower(), new_values, _is_register_linewise(name.lower()))
 
         self._set_unnamed(new_values)
         self._maybe_set_sys_clipboard(name, new_values)
@@ -436,3 +447,27 @@ class Registers:
         except AttributeError:
             # TODO [review] Looks like a bug: If set() above raises AttributeError so will this.
             self._set(key, value)
+
+
+def _viminfo_set(name, values, linewise):
+    if name.isdigit() and name != '0':
+        _set_numbered_register(name, values)
+    else:
+        _set_data(name, values, linewise)
+
+
+def _viminfo_dump():
+    records = []
+    for name, values in sorted(_data.items()):
+        if name not in ('1-9', _EXPRESSION) and values is not None:
+            records.append(['register', name, values, _is_register_linewise(name)])
+
+    # Oldest first, so that they can be shifted in order when replayed.
+    for values in reversed(_data['1-9']):
+        records.append(['register_shift', values])
+
+    return records
+
+
+viminfo.register('register', _viminfo_set, _viminfo_dump)
+viminfo.register('register_shift', _shift_numbered_register, list)
@@ -15,11 +15,15 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
 import re
 
 from sublime import IGNORECASE
 from sublime import LITERAL
 from sublime import Region
+from sublime import set_timeout
 import sublime_plugin
 
 from NeoVintageous.nv.ui import ui_region_flags
@@ -51,6 +55,57 @@ def find_all_in_range(view, term, start, end, flags=0):
         start = m.end()
 
 
+def find_lines_in_range(view, term, start, end, flags=0):
+    # Find the lines between start and end that have a match starting on them.
+    #
+    # Returns:
+    #   list[Region]: The full lines, in order.
+    pattern = _compile(term, flags)
+    if not pattern:
+        return _find_lines_in_view(view, term, start, end, flags)
+
+    text = view.substr(Region(start, end))
+    lines = []
+    pos = 0
+    while True:
+        match = pattern.search(text, pos)
+        if not match:
+            break
+
+        # The empty line after a trailing newline is not one of the lines.
+        if match.start() == len(text) and text.endswith('\n'):
+            break
+
+        a = max(pos, text.rfind('\n', pos, match.start()) + 1)
+        b = text.find('\n', match.start())
+        if b < 0:
+            lines.append(Region(start + a, end))
+            break
+
+        lines.append(Region(start + a, start + b + 1))
+        pos = b + 1
+
+    return lines
+
+
+def _find_lines_in_view(view, term, start, end, flags):
+    lines = []
+    pt = start
+    while pt < end:
+        match = view.find(term, pt, flags)
+        if match is None or match.a < 0 or match.a >= end:
+            break
+
+        line = view.full_line(match.a)
+        lines.append(Region(max(line.a, start), min(line.b, end)))
+        if line.b <= pt:
+            break
+
+        pt = line.b
+
+    return lines
+
+
 def find_wrapping(view, term, start, end, flags=0, times=1):
     try:
         current_sel = view.sel()[0]
@@ -134,28 +189,11 @@ def reverse_search(view, term, start, end, flags=0):
     if start < 0 or end > view.size():
         return None
 
-    lo_line = view.full_line(start)
-    hi_line = view.full_line(end)
-
-    while True:
-        low_row, hi_row = view.rowcol(lo_line.a)[0], view.rowcol(hi_line.a)[0]
-        middle_row = (low_row + hi_row) // 2
-
-        middle_line = view.full_line(view.text_point(middle_row, 0))
-
-        lo_region = Region(lo_line.a, middle_line.b)
-        hi_region = Region(middle_line.b, min(hi_line.b, end))
-
-        if find_in_range(view, term, hi_region.a, hi_region.b, flags):
-            lo_line = view.full_line(middle_line.b)
-        elif find_in_range(view, term, lo_region.a, lo_region.b, flags):
-            hi_line = view.full_line(middle_line.a)
-        else:
-            return None
+    pattern = _compile(term, flags)
+    if pattern:
+        return _reverse_search_in_chunks(view, pattern, view.line(start).a, end)
 
-        if lo_line == hi_line:
-            # we found the line we were looking for, now extract the match.
-            return find_last_in_range(view, term, hi_line.a, min(hi_line.b, end), flags)
+    return _reverse_search_by_lines(view, term, start, end, flags, linewise=True)
 
 
 def reverse_search_by_pt(view, term, start, end, flags=0):
@@ -168,6 +206,109 @@ def reverse_search_by_pt(view, term, start, end, flags=0):
     if start < 0 or end > view.size():
         return None
 
+    pattern = _compile(term, flags)
+    if pattern:
+        return _reverse_search_in_chunks(view, pattern, start, end)
+
+    return _reverse_search_by_lines(view, term, start, end, flags, linewise=False)
+
+
+# Size of the first chunk of text read by a reverse search. Each following
+# chunk is four times the size of the previous one, so the text before the end
+# position is read and scanned less than twice however far back the match is.
+_REVERSE_SEARCH_CHUNK_SIZE = 65536
+
+# Size of the text read either side of a chunk, so that anchors, lookbehinds
+# and lookaheads see the same text as they would when searching the view.
+_REVERSE_SEARCH_CONTEXT = 256
+
+
+# Python's re module and the regex engine used by view.find() agree on most
+# syntax, but not all, e.g. "\<" is a word boundary for view.find() and a "<"
+# for re. Only patterns that are known to mean the same thing to both are
+# compiled, reverse searches for any other pattern fall back to view.find().
+@lru_cache(maxsize=64)
+def _compile(term, flags):
+    # Returns:
+    #   A compiled pattern, or None if the pattern is not portable.
+    if flags & LITERAL:
+        term = re.escape(term)
+    elif not _is_portable(term):
+        return None
+
+    try:
+        return re.compile(term, re.MULTILINE | (re.IGNORECASE if flags & IGNORECASE else 0))
+    except (re.error, OverflowError, RuntimeError):
+        return None
+
+
+def _is_portable(term):
+    # type: (str) -> bool
+    i = 0
+    size = len(term)
+    while i < size:
+        c = term[i]
+        n = term[i + 1] if i + 1 < size else ''
+        if c == '\\':
+            if n.isalnum():
+                if n == 'x':
+                    if not re.match('[0-9a-fA-F]{2}', term[i + 2:i + 4]):
+                        return False
+                elif n not in 'bBdDfnrsStwW123456789':
+                    return False
+            elif n in '<>\'`':
+                return False
+            i += 2
+            continue
+
+        if c == '(' and n == '?':
+            if not term.startswith(('(?:', '(?=', '(?!', '(?<=', '(?<!'), i):
+                return False
+        elif c == '[' and n == ':':
+            return False
+        elif c in '*+?}' and n == '+':
+            # Possessive quantifier.
+            return False
+
+        i += 1
+
+    return True
+
+
+def _reverse_search_in_chunks(view, pattern, start, end):
+    # Find the last match in the forward scan of the text between start and
+    # end, reading the text backwards from end in increasingly large chunks.
+    if start > end:
+        return None
+
+    size = _REVERSE_SEARCH_CHUNK_SIZE
+    text_end = min(end + _REVERSE_SEARCH_CONTEXT, view.size())
+
+    while True:
+        # Chunks start at the beginning of a line so that matches on each line
+        # are the same however many times the text is read.
+        chunk_start = max(start, view.line(max(start, end - size)).a)
+        text_start = max(0, chunk_start - _REVERSE_SEARCH_CONTEXT)
+        text = view.substr(Region(text_start, text_end))
+
+        last = None
+        for match in pattern.finditer(text, chunk_start - text_start):
+            if text_start + match.end() > end:
+                break
+
+            last = match
+
+        if last:
+            return Region(text_start + last.start(), text_start + last.end())
+
+        if chunk_start == start:
+            return None
+
+        size *= 4
+
+
+def _reverse_search_by_lines(view, term, start, end, flags, linewise):
+    # Binary search the lines for the last one with a match, using view.find().
     lo_line = view.full_line(start)
     hi_line = view.full_line(end)
 
@@ -189,9 +330,210 @@ def reverse_search_by_pt(view, term, start, end, flags=0):
 
         if lo_line == hi_line:
             # we found the line we were looking for, now extract the match.
+            if linewise:
+                return find_last_in_range(view, term, hi_line.a, min(hi_line.b, end), flags)
+
             return find_last_in_range(view, term, max(hi_line.a, start), min(hi_line.b, end), flags)
 
 
+def _find_matches(view, term, flags, start, end):
+    # Find the matches that start between start and end, in the same way as
+    # view.find_all() would find them.
+    #
+    # Returns:
+    #   tuple(list, int): The matches, and the point to continue from. The
+    #       point is before end if the last match may continue beyond the text
+    #       that was read, in which case it should be found again by a search
+    #       with a larger end. Matches that need more than a little of the text
+    #       after end to match, e.g. long matches spanning lines, are not found.
+    pattern = _compile(term, flags)
+    if not pattern:
+        return _find_matches_in_view(view, term, flags, start, end)
+
+    size = view.size()
+    text_start = max(0, start - _REVERSE_SEARCH_CONTEXT)
+    text_end = min(end + _REVERSE_SEARCH_CONTEXT, size)
+    text = view.substr(Region(text_start, text_end))
+
+    matches = []
+    next_pt = end
+    for match in pattern.finditer(text, start - text_start):
+        a = text_start + match.start()
+        if a >= end:
+            break
+
+        b = text_start + match.end()
+        if b > end and text_end < size:
+            return matches, a
+
+        matches.append(Region(a, b))
+        next_pt = max(end, b)
+
+    return matches, next_pt
+
+
+def _find_matches_in_view(view, term, flags, start, end):
+    matches = []
+    pt = start
+    while pt < end:
+        match = view.find(term, pt, flags)
+        if match is None or match.a < 0 or match.a >= end:
+            break
+
+        matches.append(match)
+        pt = match.b if match.b > match.a else match.b + 1
+
+    return matches, max(end, pt)
+
+
+def _current_matches(matches, starts, sels):
+    # Returns the matches that contain a selection.
+    #
+    # Args:
+    #   :matches (list): Sorted and non-overlapping matches.
+    #   :starts (list): The start point of each match.
+    #   :sels (list):
+    current = []
+    for sel in sels:
+        i = bisect_right(starts, sel.begin()) - 1
+        # Adjacent and empty matches can contain the same empty selection.
+        while i >= 0 and matches[i].end() >= sel.end():
+            if matches[i].contains(sel):
+                current.append(matches[i])
+            i -= 1
+
+    return current
+
+
+# Highlighting of search matches, see 'hlsearch'.
+#
+# The first slice of the buffer is searched straight away. If there is more of
+# the buffer to search then the matches in the visible region are highlighted,
+# and the rest of the buffer is searched in slices from set_timeout()
+# callbacks, so that a pattern with lots of matches in a large buffer doesn't
+# block the UI. All of the matches are highlighted once the whole buffer has
+# been searched.
+#
+# The matches are cached by pattern, flags, and change count, so repeating a
+# search, e.g. with n and N, only needs to find the current match.
+
+# Number of characters searched by each time slice.
+_HILITE_SLICE_SIZE = 1048576
+
+# Number of views for which matches are cached.
+_HILITE_CACHE_SIZE = 8
+
+_hilite_cache = OrderedDict()  # type: OrderedDict
+
+
+class _HiliteMatches:
+
+    def __init__(self, view, term, flags):
+        self.view = view
+        self.key = (term, flags, view.change_count())
+        self.matches = []  # type: list
+        self.starts = []  # type: list
+        self.next_pt = 0
+        self.slice_size = _HILITE_SLICE_SIZE
+        self.complete = False
+
+    def fill(self):
+        # Search the next slice of the buffer, and highlight all of the matches
+        # once the whole buffer has been searched.
+        view = self.view
+        term, flags, change_count = self.key
+
+        if _hilite_cache.get(view.id()) is not self:
+            return
+
+        if not view.is_valid() or view.change_count() != change_count:
+            del _hilite_cache[view.id()]
+            return
+
+        size = view.size()
+        start = self.next_pt
+        end = min(view.full_line(min(start + self.slice_size, size)).b, size)
+
+        matches, next_pt = _find_matches(view, term, flags, start, end)
+        if next_pt > start:
+            self.slice_size = _HILITE_SLICE_SIZE
+        else:
+            self.slice_size *= 2
+
+        self.matches.extend(matches)
+        self.next_pt = next_pt
+
+        if next_pt < size:
+            set_timeout(self.fill, 0)
+            return
+
+        self.complete = True
+        self.starts = [match.a for match in self.matches]
+        _hilite_add_regions(view, self.matches, _current_matches(self.matches, self.starts, view.sel()))
+
+
+def _hilite(view, term, flags):
+    key = (term, flags, view.change_count())
+    hilite_matches = _hilite_cache.get(view.id())
+    if hilite_matches and hilite_matches.key == key:
+        _hilite_cache.move_to_end(view.id())
+        if hilite_matches.complete:
+            _hilite_add_regions(
+                view,
+                hilite_matches.matches,
+                _current_matches(hilite_matches.matches, hilite_matches.starts, view.sel()))
+
+            return
+    else:
+        hilite_matches = _HiliteMatches(view, term, flags)
+        _hilite_cache[view.id()] = hilite_matches
+        while len(_hilite_cache) > _HILITE_CACHE_SIZE:
+            _hilite_cache.popitem(last=False)
+
+        # Buffers that fit in one slice are highlighted straight away.
+        hilite_matches.fill()
+        if hilite_matches.complete:
+            return
+
+    # Highlight the matches in the visible region, and on the lines of the
+    # selections, until the whole buffer has been searched.
+    lines = [view.line(view.visible_region())] + [view.line(sel) for sel in view.sel()]
+    lines.sort(key=lambda line: line.a)
+
+    matches = []
+    end = 0
+    for line in lines:
+        found, next_pt = _find_matches(view, term, flags, max(line.a, end), line.b)
+        matches.extend(found)
+        end = max(end, next_pt)
+
+    _hilite_add_regions(view, matches, _current_matches(matches, [match.a for match in matches], view.sel()))
+
+
+def _hilite_add_regions(view, matches, current):
+    if not matches:
+        view.erase_regions('vi_search')
+        view.erase_regions('vi_search_current')
+        return
+
+    # The scopes are prefixed with common color scopes so that color schemes
+    # have sane default colors. Color schemes can progressively enhance
+    # support by using the nv_* scopes.
+    view.add_regions(
+        'vi_search',
+        matches,
+        scope='string neovintageous_search_occ',
+        flags=ui_region_flags(view.settings().get('neovintageous_search_occ_style'))
+    )
+
+    view.add_regions(
+        'vi_search_current',
+        current,
+        scope='support.function neovintageous_search_cur',
+        flags=ui_region_flags(view.settings().get('neovintageous_search_cur_style'))
+    )
+
+
 # TODO [refactor] Move to commands module
 class BufferSearchBase(sublime_plugin.TextCommand):
     def __init__(self, *args, **kwargs):
@@ -225,40 +567,12 @@ class BufferSearchBase(sublime_plugin.TextCommand):
         return query
 
     def hilite(self, query):
-        regions = self.view.find_all(
-            self.build_pattern(query),
-            self.calculate_flags(query)
-        )
-
-        if not regions:
+        if not self.view.settings().get('vintageous_hlsearch'):
             self.view.erase_regions('vi_search')
             self.view.erase_regions('vi_search_current')
             return
 
-        sels = self.view.sel()
-        regions_current = []
-        for region in regions:
-            for sel in sels:
-                if region.contains(sel):
-                    regions_current.append(region)
-
-        # The scopes are prefixed with common color scopes so that color schemes
-        # have sane default colors. Color schemes can progressively enhance
-        # support by using the nv_* scopes.
-        if self.view.settings().get('vintageous_hlsearch'):
-            self.view.add_regions(
-                'vi_search',
-                regions,
-                scope='string neovintageous_search_occ',
-                flags=ui_region_flags(self.view.settings().get('neovintageous_search_occ_style'))
-            )
-
-            self.view.add_regions(
-                'vi_search_current',
-                regions_current,
-                scope='support.function neovintageous_search_cur',
-                flags=ui_region_flags(self.view.settings().get('neovintageous_search_cur_style'))
-            )
+        _hilite(self.view, self.build_pattern(query), self.calculate_flags(query))
 
 
 # TODO [refactor] Move to commands module
@@ -22,6 +22,8 @@ from collections import namedtuple
 from sublime import load_settings
 from sublime import save_settings
 
+from NeoVintageous.nv.profiler import span
+
 _vi_user_setting = namedtuple('vi_editor_setting', 'scope values default parser action negatable')
 
 _WINDOW_SETTINGS = [
@@ -47,6 +49,45 @@ def destroy(view):
     except KeyError:
         pass
 
+    _VintageSettings._cache.pop(view.id(), None)
+    _VintageSettings._dirty.discard(view.id())
+
+
+def start_caching():
+    # Start serving vintage settings from memory.
+    #
+    # While caching is active the vintage settings of a view are read from
+    # view.settings() once, on first access, and from then on all reads and
+    # writes go to an in-memory dict indexed by view.id(). Calls can be nested,
+    # only the outermost call to stop_caching() writes the settings back.
+    _VintageSettings._cache_depth += 1
+
+
+def stop_caching(write_back=True):
+    # Stop serving vintage settings from memory.
+    #
+    # Args:
+    #   write_back (bool): Whether the settings modified since caching started
+    #       should be written back to view.settings(). Pass False if the
+    #       settings have been reset and the cache is to be discarded; the
+    #       cache is discarded immediately, even by nested calls.
+    if _VintageSettings._cache_depth > 0:
+        _VintageSettings._cache_depth -= 1
+
+    if _VintageSettings._cache_depth > 0 and write_back:
+        return
+
+    try:
+        if write_back:
+            with span('write_back', 'state'):
+                for view_id in _VintageSettings._dirty:
+                    view, data = _VintageSettings._cache[view_id]
+                    if view.is_valid():
+                        view.settings().set('vintage', data)
+    finally:
+        _VintageSettings._cache.clear()
+        _VintageSettings._dirty.clear()
+
 
 def _set_generic_view_setting(view, name, value, opt, globally=False):
     if opt.scope == _SCOPE_VI_VIEW:
@@ -259,10 +300,18 @@ class _VintageSettings():
     _volatile_settings = []
     # Stores volatile settings indexed by view.id().
     _volatile = defaultdict(dict)
+    # Stores (view, settings) indexed by view.id() while caching is active. See
+    # start_caching() and stop_caching().
+    _cache = {}
+    _cache_depth = 0
+    _dirty = set()
 
     def __init__(self, view=None):
         self.view = view
 
+        if view is not None and view.id() in _VintageSettings._cache:
+            return
+
         if view is not None and not isinstance(self.view.settings().get('vintage'), dict):
             self.view.settings().set('vintage', dict())
 
@@ -289,7 +338,7 @@ class _VintageSettings():
                 try:
                     return self._get_volatile(key)
                 except KeyError:
-                    value = self.view.settings().get('vintage').get(key)
+                    value = self._get_vintage().get(key)
             else:
                 value = self.view.window().settings().get('vintage').get(key)
 
@@ -303,6 +352,12 @@ class _VintageSettings():
             if key in _VintageSettings._volatile_settings:
                 self._set_volatile(key, value)
                 return
+
+            if _VintageSettings._cache_depth > 0:
+                self._get_vintage()[key] = value
+                _VintageSettings._dirty.add(self.view.id())
+                return
+
             setts, target = self.view.settings().get('vintage'), self.view
         else:
             setts, target = self.view.window().settings().get('vintage'), self.view.window()
@@ -310,6 +365,23 @@ class _VintageSettings():
         setts[key] = value
         target.settings().set('vintage', setts)
 
+    def _get_vintage(self):
+        if _VintageSettings._cache_depth == 0:
+            return self.view.settings().get('vintage')
+
+        try:
+            return _VintageSettings._cache[self.view.id()][1]
+        except KeyError:
+            with span('load', 'state'):
+                data = self.view.settings().get('vintage')
+
+            if not isinstance(data, dict):
+                data = {}
+
+            _VintageSettings._cache[self.view.id()] = (self.view, data)
+
+            return data
+
     def _get_volatile(self, key):
         try:
             return _VintageSettings._volatile[self.view.id()][key]
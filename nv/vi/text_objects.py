@@ -15,6 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_right
+from collections import OrderedDict
 import re
 
 from sublime import CLASS_EMPTY_LINE
@@ -24,7 +26,6 @@ from sublime import CLASS_PUNCTUATION_END
 from sublime import CLASS_PUNCTUATION_START
 from sublime import CLASS_WORD_END
 from sublime import CLASS_WORD_START
-from sublime import IGNORECASE
 from sublime import Region
 
 from NeoVintageous.nv.vi import units
@@ -390,115 +391,137 @@ def get_text_object_region(view, s, text_object, inclusive=False, count=1):
     return s
 
 
-def find_next_lone_bracket(view, start, items, unbalanced=0):
-    # TODO: Extract common functionality from here and the % motion instead of
-    # duplicating code.
-    new_start = start
-    for i in range(unbalanced or 1):
-        next_closing_bracket = find_in_range(
-            view,
-            items[1],
-            start=new_start,
-            end=view.size(),
-            flags=IGNORECASE
-        )
-
-        if next_closing_bracket is None:
-            # Unbalanced items; nothing we can do.
-            return
-
-        while view.substr(next_closing_bracket.begin() - 1) == '\\':
-            next_closing_bracket = find_in_range(view, items[1],
-                                                 start=next_closing_bracket.end(),
-                                                 end=view.size(),
-                                                 flags=IGNORECASE)
-            if next_closing_bracket is None:
-                return
-
-        new_start = next_closing_bracket.end()
-
-    if view.substr(start) == items[0][-1]:
-        start += 1
-
-    nested = 0
-    while True:
-        next_opening_bracket = find_in_range(view, items[0],
-                                             start=start,
-                                             end=next_closing_bracket.b,
-                                             flags=IGNORECASE)
-        if not next_opening_bracket:
-            break
+class BracketIndex:
 
-        nested += 1
-        start = next_opening_bracket.end()
+    # The pairs of brackets in a view, found by reading the view once and
+    # matching the brackets with a stack, so that finding the pair of a bracket
+    # or the pair enclosing a point is a bisect rather than a search of the
+    # view for each level of nesting. Brackets escaped by a backslash are
+    # skipped. Use bracket_index() to get one.
 
-    if nested > 0:
-        return find_next_lone_bracket(view, next_closing_bracket.end(),
-                                      items,
-                                      nested)
+    def __init__(self, view, open_, close):
+        # type: (...) -> None
+        self.view_id = view.id()
+        self.change_count = view.change_count()
+
+        positions = []  # type: list
+        is_open = []  # type: list
+        pairs = []  # type: list
+        enclosing = []  # type: list
+        stack = []  # type: list
+        for match in re.finditer(r'\\[\s\S]|[' + re.escape(open_ + close) + ']', view.substr(Region(0, view.size()))):
+            if len(match.group()) > 1:
+                continue
+
+            i = len(positions)
+            positions.append(match.start())
+            if match.group() == open_:
+                is_open.append(True)
+                pairs.append(None)
+                stack.append(i)
+            else:
+                is_open.append(False)
+                if stack:
+                    j = stack.pop()
+                    pairs[j] = i
+                    pairs.append(j)
+                else:
+                    pairs.append(None)
+
+            # The open bracket of the innermost pair enclosing the bracket.
+            enclosing.append(stack[-1] if stack else None)
+
+        self._positions = positions
+        self._is_open = is_open
+        self._pairs = pairs
+        self._enclosing = enclosing
+
+        # Close brackets without an open bracket enclose everything before them.
+        self._lone_closes = [positions[i] for i in range(len(positions)) if not is_open[i] and pairs[i] is None]
+
+    def is_valid(self, view):
+        # type: (...) -> bool
+        return self.view_id == view.id() and self.change_count == view.change_count()
+
+    def pair(self, pt):
+        # type: (int) -> int
+        # Returns the point of the bracket paired with the bracket at pt, or
+        # None if there is no bracket at pt or it isn't paired.
+        i = bisect_right(self._positions, pt) - 1
+        if i < 0 or self._positions[i] != pt or self._pairs[i] is None:
+            return None
+
+        return self._positions[self._pairs[i]]
+
+    def enclosing(self, pt):
+        # type: (int) -> tuple
+        # Returns the points of the open and close brackets of the innermost
+        # pair enclosing pt, where a bracket at pt encloses pt. Either bracket
+        # is None if there is no such bracket e.g. if the brackets are
+        # unbalanced.
+        i = bisect_right(self._positions, pt) - 1
+        if i >= 0 and self._positions[i] == pt and not self._is_open[i]:
+            j = self._pairs[i]
+            return (self._positions[j] if j is not None else None), pt
+
+        j = self._enclosing[i] if i >= 0 else None
+        if j is None:
+            k = bisect_right(self._lone_closes, pt)
+            return None, (self._lone_closes[k] if k < len(self._lone_closes) else None)
+
+        k = self._pairs[j]
+
+        return self._positions[j], (self._positions[k] if k is not None else None)
+
+
+_BRACKET_INDEX_CACHE_SIZE = 8
+
+_bracket_indexes = OrderedDict()  # type: OrderedDict
+
+
+def bracket_index(view, open_, close):
+    # type: (...) -> BracketIndex
+    # Returns a BracketIndex of the brackets. Indexes are reused for as long as
+    # the view hasn't been modified (tracked by its change count).
+    key = (view.id(), open_, close)
+    index = _bracket_indexes.get(key)
+    if index is None or not index.is_valid(view):
+        index = BracketIndex(view, open_, close)
+        _bracket_indexes[key] = index
+        while len(_bracket_indexes) > _BRACKET_INDEX_CACHE_SIZE:
+            _bracket_indexes.popitem(last=False)
     else:
-        return next_closing_bracket
-
-
-def find_prev_lone_bracket(view, start, tags, unbalanced=0):
-    # TODO: Extract common functionality from here and the % motion instead of
-    # duplicating code.
-
-    # XXX: refactor this
-    if view.substr(start) == (tags[0][1] if len(tags[0]) > 1 else tags[0]):
-        if not unbalanced and view.substr(start - 1) != '\\':
-            return Region(start, start + 1)
-
-    new_start = start
-    for i in range(unbalanced or 1):
-        prev_opening_bracket = reverse_search_by_pt(view, tags[0],
-                                                    start=0,
-                                                    end=new_start,
-                                                    flags=IGNORECASE)
-
-        if prev_opening_bracket is None:
-            # Check whether the caret is exactly at a bracket.
-            # Tag names may be escaped, so slice them.
-            if (i == 0 and view.substr(start) == tags[0][-1] and
-               view.substr(start - 1) != '\\'):
-                    return Region(start, start + 1)
-            # Unbalanced tags; nothing we can do.
-            return
-
-        while view.substr(prev_opening_bracket.begin() - 1) == '\\':
-            prev_opening_bracket = reverse_search_by_pt(
-                view,
-                tags[0],
-                start=0,
-                end=prev_opening_bracket.begin(),
-                flags=IGNORECASE
-            )
+        _bracket_indexes.move_to_end(key)
 
-            if prev_opening_bracket is None:
-                return
+    return index
 
-        new_start = prev_opening_bracket.begin()
 
-    nested = 0
-    while True:
-        next_closing_bracket = reverse_search_by_pt(view,
-                                                    tags[1],
-                                                    start=prev_opening_bracket.a,
-                                                    end=start,
-                                                    flags=IGNORECASE)
-        if not next_closing_bracket:
-            break
+def find_next_lone_bracket(view, start, items):
+    # Args:
+    #   :items (tuple): The open and close brackets. They may be escaped as
+    #       regular expressions e.g. ('\\(', '\\)').
+    #
+    # Returns:
+    #   Region|None: The close bracket of the pair enclosing start.
+    close = bracket_index(view, items[0][-1], items[1][-1]).enclosing(start)[1]
+    if close is None:
+        return None
 
-        nested += 1
-        start = next_closing_bracket.begin()
+    return Region(close, close + 1)
 
-    if nested > 0:
-        return find_prev_lone_bracket(view,
-                                      prev_opening_bracket.begin(),
-                                      tags,
-                                      nested)
-    else:
-        return prev_opening_bracket
+
+def find_prev_lone_bracket(view, start, tags):
+    # Args:
+    #   :tags (tuple): The open and close brackets. They may be escaped as
+    #       regular expressions e.g. ('\\(', '\\)').
+    #
+    # Returns:
+    #   Region|None: The open bracket of the pair enclosing start.
+    open_ = bracket_index(view, tags[0][-1], tags[1][-1]).enclosing(start)[0]
+    if open_ is None:
+        return None
+
+    return Region(open_, open_ + 1)
 
 
 def find_paragraph_text_object(view, s, inclusive=True, count=1):
@@ -518,27 +541,104 @@ def find_paragraph_text_object(view, s, inclusive=True, count=1):
     return Region(begin, end)
 
 
+class SentenceIndex:
+
+    # The ends of sentences in a view, found by reading the view once, so that
+    # moving over sentences is a bisect per sentence rather than a search of
+    # the view. Only the positions of the ends are kept, not the text. Use
+    # sentence_index() to get one.
+
+    def __init__(self, view):
+        # type: (...) -> None
+        self.view = view
+        self.view_id = view.id()
+        self.change_count = view.change_count()
+        self._begins = []  # type: list
+        self._ends = []  # type: list
+        for match in _RXC_SENTENCE_END.finditer(view.substr(Region(0, view.size()))):
+            self._begins.append(match.start())
+            self._ends.append(match.end())
+
+    def is_valid(self, view):
+        # type: (...) -> bool
+        return self.view_id == view.id() and self.change_count == view.change_count()
+
+    def next_end(self, pt):
+        # type: (int) -> int
+        # Returns the end of the first sentence end found at or after pt, or
+        # None if there isn't one.
+        i = bisect_right(self._begins, pt) - 1
+        if i >= 0 and self._begins[i] < pt < self._ends[i]:
+            # Another end may be found from within this one.
+            end = self._search_within(i, pt)
+            if end is not None:
+                return end
+
+            i += 1
+        elif i < 0 or self._begins[i] != pt:
+            i += 1
+
+        return self._ends[i] if i < len(self._ends) else None
+
+    def _search_within(self, i, pt):
+        # type: (int, int) -> int
+        # Returns the end of a sentence end starting at pt or later within the
+        # i-th one, or None if there isn't one. Only newlines can start one
+        # there, so the text around it is read, and more of it for as long as
+        # the match may go on past what was read (a run of newlines).
+        size = self.view.size()
+        begin = pt - 1
+        window = _SENTENCE_SEARCH_WINDOW
+        while True:
+            end = min(size, self._ends[i] + window)
+            match = _RXC_SENTENCE_END.search(self.view.substr(Region(begin, end)), pt - begin)
+            if not match or begin + match.start() >= self._ends[i]:
+                return None
+
+            if begin + match.end() < end or end == size:
+                return begin + match.end()
+
+            window *= 2
+
+
+_RXC_SENTENCE_END = re.compile(
+    '('
+    '[\\.\\?\\!][\\)\\]"\']*[\\s\\n]+|'
+    '[^\n]\n(?=\n)|\n\n+|'
+    '^\n(?=[^\n])'
+    ')', re.MULTILINE)
+
+# The number of characters read after a sentence end that ) starts from within.
+_SENTENCE_SEARCH_WINDOW = 64
+
+_sentence_index = None  # type: SentenceIndex
+
+
+def sentence_index(view):
+    # type: (...) -> SentenceIndex
+    # Returns a SentenceIndex of the view. The last one is reused for as long
+    # as the view hasn't been modified (tracked by its change count).
+    global _sentence_index
+
+    if _sentence_index is None or not _sentence_index.is_valid(view):
+        _sentence_index = SentenceIndex(view)
+
+    return _sentence_index
+
+
 def find_sentences_forward(view, start_pt, count=1):
     if isinstance(start_pt, Region):
         start_pt = start_pt.b
 
+    index = sentence_index(view)
     pt = None
     for i in range(count):
-        match = view.find(
-            '('
-            '[\\.\\?\\!][\\)\\]"\']*[\\s\\n]+|'
-            '[^\n]\n(?=\n)|\n\n+|'
-            '^\n(?=[^\n])'
-            ')', start_pt)
-
-        # We need to check if something was *actually* found, because find()
-        # returns Region(-1) when nothing is found, but that evaluates to true
-        # and has a size zero region like a valid region e.g. Region(3).
-        if match == Region(-1):
+        end = index.next_end(start_pt)
+        if end is None:
             break
 
-        pt = match.b
-        start_pt = match.b
+        pt = end
+        start_pt = end
 
     if pt is not None:
         return Region(next_non_blank(view, pt))
@@ -568,40 +668,19 @@ def find_inner_paragraph(view, initial_loc):
     contiguous lines all having the same whitespace status (a line either
     consists entirely of whitespace characters or it does not).
     """
-    # Determine whether the initial point lies in an all-whitespace line.
-    def is_whitespace(region):
-        return len(view.substr(region).strip()) == 0
+    index = units.paragraph_index(view)
+    initial_loc = max(0, min(initial_loc, index.size))
+    _, first, last = index.blank_lines(initial_loc)
 
-    iws = is_whitespace(view.line(initial_loc))
+    begin = first if first > 1 else 0
 
-    # Search backward finding all lines with similar whitespace status.
-    # This will give use the value for begin.
-    p = initial_loc
-    while True:
-        line = view.line(p)
-        if is_whitespace(line) != iws:
-            break
-        elif line.begin() == 0:
-            p = 0
-            break
-
-        p = line.begin() - 1
-
-    begin = p + 1 if p > 0 else p
-
-    # To get the value for end, we do the same thing, this time searching forward.
-    p = initial_loc
-    while True:
-        line = view.line(p)
-        if is_whitespace(line) != iws:
-            break
-
-        p = line.end() + 1
-
-        if p >= view.size():
-            break
-
-    end = p
+    if not index.is_last_line(last):
+        end = index.line_end(last) + 1
+    elif last == index.size and index.line_begin(initial_loc) < last:
+        # An empty last line ends the paragraph before it.
+        end = index.size
+    else:
+        end = index.size + 1
 
     return (begin, end)
 
@@ -716,15 +795,16 @@ def find_line_text_object(view, s):
 
 # TODO: Move this to units.py.
 def word_reverse(view, pt, count=1, big=False):
+    text = units.ViewText(view, pt)
     t = pt
     for _ in range(count):
-        t = view.find_by_class(t, forward=False, classes=WORD_REVERSE_STOPS)
+        t = text.find_by_class(t, forward=False, classes=WORD_REVERSE_STOPS)
         if t == 0:
             break
 
         if big:
             # Skip over punctuation characters.
-            while not ((view.substr(t - 1) in '\n\t ') or (t <= 0)):
+            while not ((text.substr(t - 1) in '\n\t ') or (t <= 0)):
                 t -= 1
 
     return t
@@ -732,22 +812,23 @@ def word_reverse(view, pt, count=1, big=False):
 
 # TODO: Move this to units.py.
 def word_end_reverse(view, pt, count=1, big=False):
+    text = units.ViewText(view, pt)
     t = pt
     for i in range(count):
         if big:
             # Skip over punctuation characters.
-            while not ((view.substr(t - 1) in '\n\t ') or (t <= 0)):
+            while not ((text.substr(t - 1) in '\n\t ') or (t <= 0)):
                 t -= 1
 
         # `ge` should stop at the previous word end if starting at a space
         # immediately after a word.
-        if (i == 0 and view.substr(t).isspace() and not view.substr(t - 1).isspace()):
+        if (i == 0 and text.substr(t).isspace() and not text.substr(t - 1).isspace()):
             continue
 
-        if (not view.substr(t).isalnum() and not view.substr(t).isspace() and view.substr(t - 1).isalnum() and t > 0):
+        if (not text.substr(t).isalnum() and not text.substr(t).isspace() and text.substr(t - 1).isalnum() and t > 0):
             pass
         else:
-            t = view.find_by_class(t, forward=False, classes=WORD_END_REVERSE_STOPS)
+            t = text.find_by_class(t, forward=False, classes=WORD_END_REVERSE_STOPS)
 
         if t == 0:
             break
@@ -755,44 +836,6 @@ def word_end_reverse(view, pt, count=1, big=False):
     return max(t - 1, 0)
 
 
-def next_end_tag(view, pattern=RX_ANY_TAG, start=0, end=-1):
-    # Args:
-    #   view (sublime.View)
-    #   pattern (str)
-    #   start (int)
-    #   end (int)
-    #
-    # Returns:
-    #   tuple[Region, str, bool]
-    #   typle[None, None, None]
-    region = view.find(pattern, start, IGNORECASE)
-    if region.a == -1:
-        return None, None, None
-
-    match = re.search(pattern, view.substr(region))
-
-    return (region, match.group(1), match.group(0).startswith('</'))
-
-
-def previous_begin_tag(view, pattern, start=0, end=0):
-    assert pattern, 'bad call'
-    region = reverse_search_by_pt(view, pattern, start, end, IGNORECASE)
-    if not region:
-        return None, None, None
-
-    match = re.search(pattern, view.substr(region))
-
-    return (region, match.group(1), match.group(0)[1] != '/')
-
-
-def get_region_end(r):
-    return {'start': r.end()}
-
-
-def get_region_begin(r):
-    return {'start': 0, 'end': r.begin()}
-
-
 def get_closest_tag(view, pt):
     # Args:
     #   view (sublime.View)
@@ -815,78 +858,135 @@ def get_closest_tag(view, pt):
     return pt, next_tag
 
 
-def find_containing_tag(view, start):
-    # Args:
-    #   view (sublime.View)
-    #   start (int)
-    #
-    # Returns:
-    #   tuple[Region, Region, str]
-    #   tuple[None, None, None]
-    _, closest_tag = get_closest_tag(view, start)
+class TagIndex:
+
+    # The tags in a view, found by reading the view once, and the pairs of
+    # start and end tags, matched with a stack of start tags. An end tag pairs
+    # with the nearest unpaired start tag of the same name, and any start tags
+    # in between are left unpaired e.g. void elements like <br>. Use
+    # tag_index() to get one.
+
+    def __init__(self, view):
+        # type: (...) -> None
+        self.view_id = view.id()
+        self.change_count = view.change_count()
+
+        begins = []  # type: list
+        ends = []  # type: list
+        names = []  # type: list
+        pairs = []  # type: list
+        stack = []  # type: list
+        for match in _RXC_TAG.finditer(view.substr(Region(0, view.size()))):
+            i = len(begins)
+            begins.append(match.start())
+            ends.append(match.end())
+            names.append(match.group(1))
+            pairs.append(None)
+
+            name = match.group(1).lower()
+            if match.group().startswith('</'):
+                for k in range(len(stack) - 1, -1, -1):
+                    if stack[k][1] == name:
+                        pairs[stack[k][0]] = i
+                        pairs[i] = stack[k][0]
+                        del stack[k:]
+                        break
+            elif not match.group().endswith('/>'):
+                stack.append((i, name))
+
+        # The start tag of the innermost pair enclosing each tag. Pairs are
+        # always nested, so unpaired tags can be ignored.
+        enclosing = []  # type: list
+        stack = []
+        for i, j in enumerate(pairs):
+            if j is not None and j < i:
+                stack.pop()
+
+            enclosing.append(stack[-1] if stack else None)
+
+            if j is not None and j > i:
+                stack.append(i)
+
+        self._begins = begins
+        self._ends = ends
+        self._names = names
+        self._pairs = pairs
+        self._enclosing = enclosing
+
+    def is_valid(self, view):
+        # type: (...) -> bool
+        return self.view_id == view.id() and self.change_count == view.change_count()
+
+    def _tag_at(self, pt):
+        # type: (int) -> int
+        # Returns the index of the last tag that begins at or before pt.
+        return bisect_right(self._begins, pt) - 1
+
+    def _region(self, i):
+        # type: (int) -> Region
+        return Region(self._begins[i], self._ends[i])
+
+    def pair(self, pt):
+        # type: (int) -> Region
+        # Returns the tag paired with the tag at pt, or None if there is no
+        # tag at pt or it isn't paired.
+        i = self._tag_at(pt)
+        if i < 0 or pt >= self._ends[i] or self._pairs[i] is None:
+            return None
+
+        return self._region(self._pairs[i])
+
+    def enclosing(self, pt):
+        # type: (int) -> tuple
+        # Returns the start and end tags, and the tag name, of the innermost
+        # pair enclosing pt, where a paired tag at pt encloses pt.
+        i = self._tag_at(pt)
+        if i < 0:
+            return None, None, None
+
+        j = self._pairs[i]
+        if pt < self._ends[i] and j is not None:
+            i, j = min(i, j), max(i, j)
+        else:
+            i = self._enclosing[i] if j is None or j < i else i
+            if i is None:
+                return None, None, None
+
+            j = self._pairs[i]
 
-    if not closest_tag:
-        return None, None, None
+        return self._region(i), self._region(j), self._names[j]
 
-    start = closest_tag.a if ((closest_tag.contains(start)) and
-                              (view.substr(closest_tag)[1] == '/')) else start
 
-    end_region, tag_name = next_unbalanced_tag(
-        view,
-        search=next_end_tag,
-        search_args={'pattern': RX_ANY_TAG, 'start': start},
-        restart_at=get_region_end
-    )
+_RXC_TAG = re.compile(RX_ANY_TAG)
 
-    if not end_region:
-        return None, None, None
+_TAG_INDEX_CACHE_SIZE = 8
 
-    begin_region, _ = next_unbalanced_tag(
-        view,
-        search=previous_begin_tag,
-        search_args={
-            'pattern': RX_ANY_TAG_NAMED_TPL.format(tag_name),
-            'start': 0,
-            'end': end_region.a
-        },
-        restart_at=get_region_begin
-    )
+_tag_indexes = OrderedDict()  # type: OrderedDict
 
-    if not end_region:
-        return None, None, None
 
-    return begin_region, end_region, tag_name
+def tag_index(view):
+    # type: (...) -> TagIndex
+    # Returns a TagIndex of the view. Indexes are reused for as long as the
+    # view hasn't been modified (tracked by its change count).
+    key = view.id()
+    index = _tag_indexes.get(key)
+    if index is None or not index.is_valid(view):
+        index = TagIndex(view)
+        _tag_indexes[key] = index
+        while len(_tag_indexes) > _TAG_INDEX_CACHE_SIZE:
+            _tag_indexes.popitem(last=False)
+    else:
+        _tag_indexes.move_to_end(key)
+
+    return index
 
 
-def next_unbalanced_tag(view, search=None, search_args={}, restart_at=None, tags=[]):
+def find_containing_tag(view, start):
     # Args:
     #   view (sublime.View)
-    #   search (callable)
-    #   search_args (dict)
-    #   restart_at (callable)
-    #   tags (list[str])
+    #   start (int)
     #
     # Returns:
-    #   tuple[Region, str]
-    #   tuple[None, None]
-    assert search and restart_at, 'wrong call'
-    region, tag, is_end_tag = search(view, **search_args)
-
-    if not region:
-        return None, None
-
-    if not is_end_tag:
-        tags.append(tag)
-        search_args.update(restart_at(region))
-
-        return next_unbalanced_tag(view, search, search_args, restart_at, tags)
-
-    if not tags or (tag not in tags):
-        return region, tag
-
-    while tag != tags.pop():
-        continue
-
-    search_args.update(restart_at(region))
-
-    return next_unbalanced_tag(view, search, search_args, restart_at, tags)
+    #   tuple[Region, Region, str]
+    #   tuple[None, None, None]
+    return tag_index(view).enclosing(start)
@@ -15,9 +15,12 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_left
+from bisect import bisect_right
 import re
 
 from sublime import Region
+from sublime import CLASS_EMPTY_LINE
 from sublime import CLASS_LINE_END
 from sublime import CLASS_LINE_START
 from sublime import CLASS_PUNCTUATION_END
@@ -26,6 +29,7 @@ from sublime import CLASS_WORD_END
 from sublime import CLASS_WORD_START
 
 from NeoVintageous.nv.vi.utils import last_row
+from NeoVintageous.nv.vi.utils import line_index
 from NeoVintageous.nv.vi.utils import next_non_white_space_char
 from NeoVintageous.nv.vi.utils import row_at
 
@@ -40,6 +44,246 @@ _CLASS_VI_WORD_END = CLASS_WORD_END | CLASS_PUNCTUATION_END
 _CLASS_VI_INTERNAL_WORD_END = CLASS_WORD_END | CLASS_PUNCTUATION_END
 
 
+# The number of characters ViewText reads from the view at first. It reads twice
+# as much as it already has each time it needs more.
+_VIEW_TEXT_CHUNK_SIZE = 4096
+
+# The number of characters before a point that ViewText searches at first when
+# finding by class backwards.
+_VIEW_TEXT_REVERSE_WINDOW = 32
+
+_CLASS_PATTERNS = (
+    (CLASS_WORD_START, '(?<!a)(?=a)'),
+    (CLASS_WORD_END, '(?<=a)(?!a)'),
+    (CLASS_PUNCTUATION_START, '(?<!p)(?=p)'),
+    (CLASS_PUNCTUATION_END, '(?<=p)(?!p)'),
+    (CLASS_LINE_START, '(?:\\A|(?<=n))'),
+    (CLASS_LINE_END, '(?=n|\\Z)'),
+    (CLASS_EMPTY_LINE, '(?:\\A|(?<=n))(?=n|\\Z)'),
+)
+
+_SUPPORTED_CLASSES = CLASS_WORD_START | CLASS_WORD_END | CLASS_PUNCTUATION_START | CLASS_PUNCTUATION_END | \
+    CLASS_LINE_START | CLASS_LINE_END | CLASS_EMPTY_LINE
+
+
+class _CharClasses(dict):
+
+    # A str.translate() table from characters to their class: "a" for word
+    # characters, "p" for punctuation (word separators), "s" for white space,
+    # and "n" for newlines. Classes are worked out the first time a character
+    # is seen.
+
+    def __init__(self, separators):
+        # type: (str) -> None
+        super().__init__()
+        self.separators = separators
+
+    def __missing__(self, key):
+        char = chr(key)
+        if char == '\n':
+            value = 'n'
+        elif char.isspace():
+            value = 's'
+        elif char in self.separators:
+            value = 'p'
+        else:
+            value = 'a'
+
+        self[key] = value
+
+        return value
+
+
+_char_classes = {}  # type: dict
+_class_patterns = {}  # type: dict
+
+
+def _get_char_classes(separators):
+    # type: (str) -> _CharClasses
+    try:
+        return _char_classes[separators]
+    except KeyError:
+        return _char_classes.setdefault(separators, _CharClasses(separators))
+
+
+def _get_class_pattern(classes):
+    # type: (int) -> object
+    try:
+        return _class_patterns[classes]
+    except KeyError:
+        pattern = re.compile('|'.join(p for c, p in _CLASS_PATTERNS if classes & c))
+        return _class_patterns.setdefault(classes, pattern)
+
+
+class ViewText:
+
+    # A copy of the text of a view around a point, for the word motions, which
+    # make a lot of calls to substr(), line(), classify() and find_by_class()
+    # for each word they move over. The text is read from the view in chunks of
+    # whole lines, and characters are classified as words, punctuation and
+    # white space using the view's word separators, in the same way as
+    # find_by_class(). Classes are found with regular expressions over a string
+    # of the class of each character.
+
+    def __init__(self, view, pt):
+        # type: (...) -> None
+        self.view = view
+        self._size = view.size()
+        self._separators = view.settings().get('word_separators') or ''
+        pt = max(0, min(pt, self._size))
+        self._begin = view.line(pt).a
+        self._end = view.full_line(min(pt + _VIEW_TEXT_CHUNK_SIZE, self._size)).b
+        self._text = view.substr(Region(self._begin, self._end))
+        self._classes = {}  # type: dict
+
+    def _load(self, begin, end):
+        # type: (int, int) -> None
+        # Read the text from begin to end, if not already read.
+        if self._begin <= begin and end <= self._end:
+            return
+
+        begin = max(0, begin)
+        end = min(end, self._size)
+        if self._begin <= begin and end <= self._end:
+            return
+
+        grow = max(_VIEW_TEXT_CHUNK_SIZE, self._end - self._begin)
+        begin = min(begin, self._begin - grow) if begin < self._begin else self._begin
+        end = max(end, self._end + grow) if end > self._end else self._end
+
+        begin = self.view.line(max(0, begin)).a
+        end = self.view.full_line(min(end, self._size)).b
+
+        self._text = self.view.substr(Region(begin, end))
+        self._begin = begin
+        self._end = end
+        self._classes.clear()
+
+    def _class_string(self, separators):
+        # type: (str) -> str
+        try:
+            return self._classes[separators]
+        except KeyError:
+            classes = self._text.translate(_get_char_classes(separators))
+            self._classes[separators] = classes
+
+            return classes
+
+    def size(self):
+        # type: () -> int
+        return self._size
+
+    def substr(self, x):
+        # Like View.substr(), returns "\x00" for points outside of the view.
+        if isinstance(x, Region):
+            begin = max(0, x.begin())
+            end = min(x.end(), self._size)
+            self._load(begin, end)
+
+            return self._text[begin - self._begin:end - self._begin]
+
+        if x < 0 or x >= self._size:
+            return '\x00'
+
+        if not (self._begin <= x < self._end):
+            self._load(x, x + 1)
+
+        return self._text[x - self._begin]
+
+    def line(self, pt):
+        # type: (int) -> Region
+        pt = max(0, min(pt, self._size))
+        self._load(pt, pt + 1)
+        i = pt - self._begin
+        begin = self._text.rfind('\n', 0, i) + 1
+        end = self._text.find('\n', i)
+
+        return Region(self._begin + begin, self._begin + end if end >= 0 else self._end)
+
+    def classify(self, pt):
+        # type: (int) -> int
+        pt = max(0, min(pt, self._size))
+        self._load(pt - 1, pt + 1)
+        string = self._class_string(self._separators)
+        i = pt - self._begin
+        # The text always starts at the beginning of a line.
+        prev = string[i - 1] if i > 0 else 'n'
+        next_ = string[i] if i < len(string) else 'n'
+
+        classes = 0
+        if next_ == 'a' and prev != 'a':
+            classes |= CLASS_WORD_START
+        if prev == 'a' and next_ != 'a':
+            classes |= CLASS_WORD_END
+        if next_ == 'p' and prev != 'p':
+            classes |= CLASS_PUNCTUATION_START
+        if prev == 'p' and next_ != 'p':
+            classes |= CLASS_PUNCTUATION_END
+        if prev == 'n':
+            classes |= CLASS_LINE_START
+        if next_ == 'n':
+            classes |= CLASS_LINE_END
+        if prev == 'n' and next_ == 'n':
+            classes |= CLASS_EMPTY_LINE
+
+        return classes
+
+    def find_by_class(self, pt, forward, classes, separators=None):
+        # type: (int, bool, int, str) -> int
+        if classes & ~_SUPPORTED_CLASSES:
+            return self.view.find_by_class(pt, forward=forward, classes=classes, separators=separators)
+
+        if separators is None:
+            separators = self._separators
+
+        pattern = _get_class_pattern(classes)
+
+        if forward:
+            pt += 1
+            if pt >= self._size:
+                return self._size
+
+            self._load(pt, pt + 1)
+            while True:
+                string = self._class_string(separators)
+                match = pattern.search(string, pt - self._begin)
+                # The class of the point at the end of the text depends on the
+                # text after it, unless it's the end of the view.
+                if match and (match.start() < len(string) or self._end == self._size):
+                    return self._begin + match.start()
+
+                if self._end == self._size:
+                    return self._size
+
+                self._load(self._end, self._end + 1)
+
+        pt -= 1
+        if pt <= 0:
+            return 0
+
+        self._load(pt, pt + 1)
+        window = _VIEW_TEXT_REVERSE_WINDOW
+        while True:
+            string = self._class_string(separators)
+            end = pt - self._begin
+            begin = max(0, end - window)
+            last = None
+            for match in pattern.finditer(string, begin, end + 1):
+                if match.start() > end:
+                    break
+                last = match.start()
+
+            if last is not None:
+                return self._begin + last
+
+            if begin > 0:
+                window *= 4
+            elif self._begin == 0:
+                return 0
+            else:
+                self._load(self._begin - 1, pt + 1)
+
+
 def at_eol(view, pt):
     return (view.classify(pt) & CLASS_LINE_END) == CLASS_LINE_END
 
@@ -118,23 +362,25 @@ def word_starts(view, start, count=1, internal=False):
     assert start >= 0
     assert count > 0
 
+    text = ViewText(view, start)
+
     pt = start
     for i in range(count):
         # On the last motion iteration, we must do some special stuff if we are still on the
         # starting line of the motion.
-        if (internal and (i == count - 1) and (view.line(start) == view.line(pt))):
-            if view.substr(pt) == '\n':
+        if (internal and (i == count - 1) and (text.line(start) == text.line(pt))):
+            if text.substr(pt) == '\n':
                 return pt + 1
-            return next_word_start(view, pt, internal=True)
+            return next_word_start(text, pt, internal=True)
 
-        pt = next_word_start(view, pt)
+        pt = next_word_start(text, pt)
         if not internal or (i != count - 1):
-            pt = next_non_white_space_char(view, pt, white_space=' \t')
-            while not (view.size() == pt or view.line(pt).empty() or view.substr(view.line(pt)).strip()):
-                pt = next_word_start(view, pt)
-                pt = next_non_white_space_char(view, pt, white_space=' \t')
+            pt = next_non_white_space_char(text, pt, white_space=' \t')
+            while not (text.size() == pt or text.line(pt).empty() or text.substr(text.line(pt)).strip()):
+                pt = next_word_start(text, pt)
+                pt = next_non_white_space_char(text, pt, white_space=' \t')
 
-    if (internal and (view.line(start) != view.line(pt)) and (start != view.line(start).a and not view.substr(view.line(pt - 1)).isspace()) and at_eol(view, pt - 1)):  # FIXME # noqa: E501
+    if (internal and (text.line(start) != text.line(pt)) and (start != text.line(start).a and not text.substr(text.line(pt - 1)).isspace()) and at_eol(text, pt - 1)):  # FIXME # noqa: E501
         pt -= 1
 
     return pt
@@ -144,23 +390,25 @@ def big_word_starts(view, start, count=1, internal=False):
     assert start >= 0
     assert count > 0
 
+    text = ViewText(view, start)
+
     pt = start
     for i in range(count):
-        if internal and i == count - 1 and view.line(start) == view.line(pt):
-            if view.substr(pt) == '\n':
+        if internal and i == count - 1 and text.line(start) == text.line(pt):
+            if text.substr(pt) == '\n':
                 return pt + 1
-            return next_big_word_start(view, pt, internal=True)
+            return next_big_word_start(text, pt, internal=True)
 
-        pt = next_big_word_start(view, pt)
+        pt = next_big_word_start(text, pt)
         if not internal or i != count - 1:
-            pt = next_non_white_space_char(view, pt, white_space=' \t')
-            while not (view.size() == pt or
-                       view.line(pt).empty() or
-                       view.substr(view.line(pt)).strip()):
-                pt = next_big_word_start(view, pt)
-                pt = next_non_white_space_char(view, pt, white_space=' \t')
-
-    if (internal and (view.line(start) != view.line(pt)) and (start != view.line(start).a and not view.substr(view.line(pt - 1)).isspace()) and at_eol(view, pt - 1)):  # FIXME # noqa: E501
+            pt = next_non_white_space_char(text, pt, white_space=' \t')
+            while not (text.size() == pt or
+                       text.line(pt).empty() or
+                       text.substr(text.line(pt)).strip()):
+                pt = next_big_word_start(text, pt)
+                pt = next_non_white_space_char(text, pt, white_space=' \t')
+
+    if (internal and (text.line(start) != text.line(pt)) and (start != text.line(start).a and not text.substr(text.line(pt - 1)).isspace()) and at_eol(text, pt - 1)):  # FIXME # noqa: E501
         pt -= 1
 
     return pt
@@ -169,20 +417,22 @@ def big_word_starts(view, start, count=1, internal=False):
 def word_ends(view, start, count=1, big=False):
     assert start >= 0 and count > 0, 'bad call'
 
+    text = ViewText(view, start)
+
     pt = start
-    if not view.substr(start).isspace():
+    if not text.substr(start).isspace():
         pt = start + 1
 
     for i in range(count):
         if big:
             while True:
-                pt = next_word_end(view, pt)
-                if pt >= view.size() or view.substr(pt).isspace():
-                    if pt > view.size():
-                        pt = view.size()
+                pt = next_word_end(text, pt)
+                if pt >= text.size() or text.substr(pt).isspace():
+                    if pt > text.size():
+                        pt = text.size()
                     break
         else:
-            pt = next_word_end(view, pt)
+            pt = next_word_end(text, pt)
 
     # FIXME We should return the actual word end and not pt - 1 ??
     return pt
@@ -233,30 +483,188 @@ def inner_lines(view, s, count=1):
     return Region(begin, view.line(end).b)
 
 
+class ParagraphIndex:
+
+    # The empty lines, and the blank lines (lines that are empty or only white
+    # space), of a view, found by reading the view once, so that paragraph
+    # motions and text objects are a bisect per paragraph rather than a few API
+    # calls per line. Consecutive lines are kept as runs, each one the points
+    # of the first and last line of the run. Use paragraph_index() to get one.
+    #
+    # The text isn't kept once the runs are found; the lines are looked up in
+    # a LineIndex of the view.
+
+    def __init__(self, view):
+        # type: (...) -> None
+        self.view_id = view.id()
+        self.change_count = view.change_count()
+        text = view.substr(Region(0, view.size()))
+        self.size = len(text)
+        self._empty_begins, self._empty_ends = self._runs(_EMPTY_LINE_PATTERN, text)
+        self._blank_begins, self._blank_ends = self._runs(_BLANK_LINE_PATTERN, text)
+        self._lines = line_index(view, 0, last_row(view))
+
+    def _runs(self, pattern, text):
+        # type: (object, str) -> tuple
+        begins = []  # type: list
+        ends = []  # type: list
+        end = -2
+        for match in pattern.finditer(text):
+            if match.start() == end + 1:
+                ends[-1] = match.start()
+            else:
+                begins.append(match.start())
+                ends.append(match.start())
+
+            end = match.end()
+
+        return begins, ends
+
+    def is_valid(self, view):
+        # type: (...) -> bool
+        return self.view_id == view.id() and self.change_count == view.change_count()
+
+    def line_begin(self, pt):
+        # type: (int) -> int
+        return pt - self._lines.rowcol(pt)[1]
+
+    def line_end(self, pt):
+        # type: (int) -> int
+        return self._lines.line(self._lines.rowcol(pt)[0]).b
+
+    def is_last_line(self, pt):
+        # type: (int) -> bool
+        return self._lines.rowcol(pt)[0] == self._lines.last_row
+
+    def _run_at(self, begins, ends, pt):
+        # type: (list, list, int) -> int
+        # Returns the index of the run containing the line at pt, or -1.
+        line_begin = self.line_begin(pt)
+        i = bisect_right(begins, line_begin) - 1
+        if i >= 0 and line_begin <= ends[i]:
+            return i
+
+        return -1
+
+    def is_empty(self, pt):
+        # type: (int) -> bool
+        # Returns True if the line at pt is empty.
+        return self._run_at(self._empty_begins, self._empty_ends, pt) >= 0
+
+    def next_empty(self, pt):
+        # type: (int) -> int
+        # Returns the point of the first empty line after the line at pt, or
+        # None if there isn't one.
+        i = bisect_right(self._empty_ends, self.line_end(pt))
+        if i == len(self._empty_ends):
+            return None
+
+        return max(self._empty_begins[i], self.line_end(pt) + 1)
+
+    def next_non_empty(self, pt):
+        # type: (int) -> int
+        # Returns the point of the first non empty line after the line at pt,
+        # or None if there isn't one.
+        pt = self.line_end(pt) + 1
+        if pt > self.size:
+            return None
+
+        i = self._run_at(self._empty_begins, self._empty_ends, pt)
+        if i >= 0:
+            pt = self._empty_ends[i] + 1
+            if pt > self.size:
+                return None
+
+        return pt
+
+    def prev_empty(self, pt):
+        # type: (int) -> int
+        # Returns the point of the last empty line before the line at pt, or
+        # None if there isn't one.
+        line_begin = self.line_begin(pt)
+        i = bisect_left(self._empty_begins, line_begin) - 1
+        if i < 0:
+            return None
+
+        return min(self._empty_ends[i], line_begin - 1)
+
+    def prev_non_empty(self, pt):
+        # type: (int) -> int
+        # Returns the point of the last non empty line before the line at pt,
+        # or None if there isn't one.
+        pt = self.line_begin(pt)
+        if pt == 0:
+            return None
+
+        pt = self.line_begin(pt - 1)
+        i = self._run_at(self._empty_begins, self._empty_ends, pt)
+        if i >= 0:
+            if self._empty_begins[i] == 0:
+                return None
+
+            pt = self.line_begin(self._empty_begins[i] - 1)
+
+        return pt
+
+    def blank_lines(self, pt):
+        # type: (int) -> tuple
+        # Returns whether the line at pt is blank, and the points of the first
+        # and last lines of the lines around it that are the same.
+        i = self._run_at(self._blank_begins, self._blank_ends, pt)
+        if i >= 0:
+            return True, self._blank_begins[i], self._blank_ends[i]
+
+        line_begin = self.line_begin(pt)
+        i = bisect_right(self._blank_begins, line_begin)
+        first = self.line_end(self._blank_ends[i - 1]) + 1 if i > 0 else 0
+        last = self.line_begin(self._blank_begins[i] - 1) if i < len(self._blank_begins) else self.line_begin(self.size)
+
+        return False, first, last
+
+
+_EMPTY_LINE_PATTERN = re.compile('^$', re.MULTILINE)
+_BLANK_LINE_PATTERN = re.compile('^[^\\S\\n]*$', re.MULTILINE)
+
+_paragraph_index = None  # type: ParagraphIndex
+
+
+def paragraph_index(view):
+    # type: (...) -> ParagraphIndex
+    # Returns a ParagraphIndex of the view. The last one is reused for as long
+    # as the view hasn't been modified (tracked by its change count).
+    global _paragraph_index
+
+    if _paragraph_index is None or not _paragraph_index.is_valid(view):
+        _paragraph_index = ParagraphIndex(view)
+
+    return _paragraph_index
+
+
 def next_paragraph_start(view, pt, count=1, skip_empty=True):
-    if row_at(view, pt) == last_row(view):
-        if not view.line(view.size()).empty():
-            return view.size() - 1
+    index = paragraph_index(view)
+    pt = max(0, min(pt, index.size))
+    if index.is_last_line(pt):
+        if not index.is_empty(index.size):
+            return index.size - 1
 
-        return view.size()
+        return index.size
 
     # skip empty rows before moving for the first time
-    current_row = row_at(view, pt)
-    if (view.line(view.text_point(current_row + 1, 0)).empty() and view.line(pt).empty()):
-        pt, _ = _next_non_empty_row(view, pt)
+    if index.is_empty(index.line_end(pt) + 1) and index.is_empty(pt):
+        pt, _ = _next_non_empty_row(index, pt)
 
     for i in range(count):
-        pt, eof = _next_empty_row(view, pt)
+        pt, eof = _next_empty_row(index, pt)
         if eof:
-            if view.line(pt).empty():
+            if index.is_empty(pt):
                 return pt
 
             return pt - 1
 
         if skip_empty and (i != (count - 1)):
-            pt, eof = _next_non_empty_row(view, pt)
+            pt, eof = _next_non_empty_row(index, pt)
             if eof:
-                if not view.line(pt).empty():
+                if not index.is_empty(pt):
                     return pt - 1
 
                 return pt
@@ -264,74 +672,63 @@ def next_paragraph_start(view, pt, count=1, skip_empty=True):
     return pt
 
 
-def _next_empty_row(view, pt):
-    r = row_at(view, pt)
-    while True:
-        r += 1
-        pt = view.text_point(r, 0)
-        if row_at(view, pt) == last_row(view):
-            return view.size(), True
+def _next_empty_row(index, pt):
+    # The empty lines on the last line don't count.
+    pt = index.next_empty(pt)
+    if pt is None or index.is_last_line(pt):
+        return index.size, True
 
-        if view.line(pt).empty():
-            return pt, False
+    return pt, False
 
 
-def _next_non_empty_row(view, pt):
-    r = row_at(view, pt)
-    while True:
-        r += 1
-        reg = view.line(view.text_point(r, 0))
-        if r >= last_row(view):
-            return view.size(), True
+def _next_non_empty_row(index, pt):
+    # The non empty lines on the last line don't count.
+    pt = index.next_non_empty(pt)
+    if pt is None or index.is_last_line(pt):
+        return index.size, True
 
-        if not reg.empty():
-            return reg.a, False
+    return pt, False
 
 
 def prev_paragraph_start(view, pt, count=1, skip_empty=True):
+    index = paragraph_index(view)
+    pt = max(0, min(pt, index.size))
+
     # first row?
-    if row_at(view, pt) == 0:
+    if index.line_begin(pt) == 0:
         return 0
 
-    current_row = row_at(view, pt)
-    if (view.line(view.text_point(current_row - 1, 0)).empty() and view.line(view.text_point(current_row, 0)).empty()):
-        pt, bof = _prev_non_empty_row(view, pt)
+    if (index.is_empty(index.line_begin(pt) - 1) and index.is_empty(pt)):
+        pt, bof = _prev_non_empty_row(index, pt)
         if bof:
             return 0
 
     for i in range(count):
-        pt, bof = _prev_empty_row(view, pt)
+        pt, bof = _prev_empty_row(index, pt)
         if bof:
             return 0
 
         if skip_empty and (count > 1) and (i != count - 1):
-            pt, bof = _prev_non_empty_row(view, pt)
+            pt, bof = _prev_non_empty_row(index, pt)
             if bof:
                 return pt
 
-    return view.text_point(row_at(view, pt), 0)
+    return index.line_begin(pt)
 
 
-def _prev_empty_row(view, pt):
-    r = row_at(view, pt)
-    while True:
-        r -= 1
-        if r == 0:
-            return 0, True
+def _prev_empty_row(index, pt):
+    # The empty lines on the first line don't count.
+    pt = index.prev_empty(pt)
+    if not pt:
+        return 0, True
 
-        pt = view.text_point(r, 0)
-        if view.line(pt).empty():
-            return pt, False
+    return pt, False
 
 
-def _prev_non_empty_row(view, pt):
-    r = row_at(view, pt)
-    while True:
-        r -= 1
-        reg = view.line(view.text_point(r, 0))
-        # stop if we hit the first row
-        if r <= 0:
-            return 0, True
-
-        if not reg.empty():
-            return reg.a, False
+def _prev_non_empty_row(index, pt):
+    # The non empty lines on the first line don't count.
+    pt = index.prev_non_empty(pt)
+    if not pt:
+        return 0, True
+
+    return pt, False
@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_right
 from contextlib import contextmanager
 
 from sublime import Region
@@ -176,11 +177,105 @@ def col_at(view, pt):
     return view.rowcol(pt)[1]
 
 
+def get_xpos(view):
+    # type: (...) -> int
+    # Returns the column of the first caret, with tabs expanded.
+    sel = view.sel()[0]
+    pos = sel.b
+    if not sel.empty():
+        if sel.a < sel.b:
+            pos -= 1
+
+    tabs = view.substr(Region(view.line(pos).a, pos)).count('\t')
+    tab_size = view.settings().get('tab_size')
+
+    return view.rowcol(pos)[1] + ((tabs * tab_size) - tabs)
+
+
 def row_to_pt(view, row, col=0):
     # type: (...) -> int
     return view.text_point(row, col)
 
 
+class LineIndex:
+
+    # Converts between points and rows/cols for a range of rows in a view
+    # without an API call per conversion. The rows are read from the view in
+    # one go, so motions that visit many lines (e.g. a count) cost one read
+    # instead of several calls per line. Conversions outside of the range fall
+    # back to the view. Use line_index() to get one.
+
+    def __init__(self, view, first_row, last_row):
+        # type: (...) -> None
+        self.view = view
+        self.view_id = view.id()
+        self.change_count = view.change_count()
+        self.size = view.size()
+        self.buffer_last_row = view.rowcol(self.size)[0]
+        self.first_row = max(0, min(first_row, self.buffer_last_row))
+        self.last_row = max(self.first_row, min(last_row, self.buffer_last_row))
+        self.begin = view.text_point(self.first_row, 0)
+        self.end = view.line(view.text_point(self.last_row, 0)).b
+
+        # Line start points; a line ends one before the start of the next.
+        starts = [self.begin]
+        for line in view.substr(Region(self.begin, self.end)).split('\n')[:-1]:
+            starts.append(starts[-1] + len(line) + 1)
+
+        self._starts = starts
+
+    def covers(self, view, first_row, last_row):
+        # type: (...) -> bool
+        return (self.view_id == view.id() and
+                self.change_count == view.change_count() and
+                self.first_row <= max(0, first_row) and
+                self.last_row >= min(last_row, self.buffer_last_row))
+
+    def rowcol(self, pt):
+        # type: (int) -> tuple
+        if pt < self.begin or pt > self.end:
+            return self.view.rowcol(pt)
+
+        i = bisect_right(self._starts, pt) - 1
+
+        return self.first_row + i, pt - self._starts[i]
+
+    def text_point(self, row, col=0):
+        # type: (int, int) -> int
+        if row < self.first_row or row > self.last_row:
+            return self.view.text_point(row, col)
+
+        # Like the view, the point is limited to the size of the buffer.
+        return min(self._starts[row - self.first_row] + col, self.size)
+
+    def line(self, row):
+        # type: (int) -> Region
+        # The line at row, not including the newline.
+        if row < self.first_row or row > self.last_row:
+            return self.view.line(self.view.text_point(row, 0))
+
+        i = row - self.first_row
+        if row == self.last_row:
+            return Region(self._starts[i], self.end)
+
+        return Region(self._starts[i], self._starts[i + 1] - 1)
+
+
+_line_index = None  # type: LineIndex
+
+
+def line_index(view, first_row, last_row):
+    # type: (...) -> LineIndex
+    # Returns a LineIndex covering the rows. The last one is reused for as long
+    # as the view hasn't been modified (tracked by its change count).
+    global _line_index
+
+    if _line_index is None or not _line_index.covers(view, first_row, last_row):
+        _line_index = LineIndex(view, first_row, last_row)
+
+    return _line_index
+
+
 @contextmanager
 def gluing_undo_groups(view, state):
     state.processing_notation = True
@@ -20,6 +20,8 @@ import logging
 from sublime import active_window as _active_window
 from sublime import status_message as _status_message
 
+from NeoVintageous.nv.profiler import span
+
 _log = logging.getLogger(__name__)
 
 INSERT = 'mode_insert'
@@ -103,9 +105,11 @@ def run_window_command(cmd, args=None, window=None):
     if not window:
         window = _active_window()
     _log.info('command: %s %s', cmd, args)
-    window.run_command(cmd, args)
+    with span(cmd, 'command'):
+        window.run_command(cmd, args)
 
 
 def run_view_command(view, cmd, args=None):
     _log.info('command: %s %s', cmd, args)
-    view.run_command(cmd, args)
+    with span(cmd, 'command'):
+        view.run_command(cmd, args)
@@ -0,0 +1,215 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Remembers the command-line and search history, registers, file marks and
+# macros across restarts, see 'vintageous_viminfo' and |viminfo|.
+#
+# Changes are appended to a journal file as they happen, one JSON encoded
+# record per line, so the cost of a write doesn't depend on how much is stored.
+# Once the journal has grown to well beyond the size of the stored state it is
+# compacted, by rewriting it with one record for each stored item.
+#
+# The journal is loaded the first time one of the stores is accessed, rather
+# than when the plugin is loaded. Stores register the kinds of records they own
+# with a function to apply a record and a function to dump their state as
+# records. Records of a kind that hasn't been registered yet are kept until it
+# is registered.
+
+from collections import OrderedDict
+import json
+import logging
+import os
+
+from sublime import cache_path
+from sublime import load_settings
+
+
+_log = logging.getLogger(__name__)
+
+# Compact when the journal has this many more records than the last compaction.
+_COMPACT_THRESHOLD = 1000
+
+_providers = OrderedDict()  # type: OrderedDict
+_pending = OrderedDict()  # type: OrderedDict
+_file = None  # type: str
+_loaded = False
+_loading = False
+_records = 0
+_compacted_records = 0
+
+
+def _file_name():
+    # type: () -> str
+    return os.path.join(cache_path(), 'NeoVintageous', 'viminfo')
+
+
+def _is_enabled():
+    # type: () -> bool
+    return bool(load_settings('Preferences.sublime-settings').get('vintageous_viminfo'))
+
+
+def register(kind, apply, dump):
+    # type: (str, callable, callable) -> None
+    #
+    # Args:
+    #   :kind (str): The first item of the records owned by the store.
+    #   :apply (callable): Called with the rest of a record to apply it.
+    #   :dump (callable): Returns a list of records representing the state.
+    _providers[kind] = (apply, dump)
+
+    if kind in _pending:
+        _replay(_pending.pop(kind))
+
+
+def load():
+    # type: () -> None
+    # Load the journal, if enabled and not already loaded.
+    global _loaded
+
+    if _loaded:
+        return
+
+    _loaded = True
+
+    if not _is_enabled():
+        return
+
+    _open(_file_name())
+
+
+def write(kind, *args):
+    # type: (...) -> None
+    # Append a record to the journal.
+    if not _loaded:
+        load()
+
+    if _file is None or _loading:
+        return
+
+    global _records
+
+    try:
+        with open(_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps([kind] + list(args)) + '\n')
+    except (OSError, TypeError, ValueError) as e:
+        _log.warning('could not write viminfo record %s: %s', kind, e)
+        return
+
+    _records += 1
+
+    if _records - _compacted_records > _COMPACT_THRESHOLD and _records > 2 * _compacted_records:
+        compact()
+
+
+def compact():
+    # type: () -> None
+    # Rewrite the journal from the current state of the stores.
+    global _records, _compacted_records
+
+    if _file is None:
+        return
+
+    records = []
+    for apply, dump in _providers.values():
+        records.extend(dump())
+
+    for pending in _pending.values():
+        records.extend(pending)
+
+    tmp_file = _file + '.tmp'
+
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+
+        os.replace(tmp_file, _file)
+    except (OSError, TypeError, ValueError) as e:
+        _log.warning('could not compact viminfo %s: %s', _file, e)
+        return
+
+    _records = _compacted_records = len(records)
+
+    _log.debug('compacted viminfo %s to %s records', _file, _records)
+
+
+def _open(file):
+    # type: (str) -> None
+    global _file, _records, _compacted_records
+
+    _file = file
+    _records = _compacted_records = 0
+
+    try:
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        with open(file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        _log.warning('could not load viminfo %s: %s', file, e)
+        _file = None
+        return
+
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # An incomplete last line is left behind if writing was interrupted.
+            _log.debug('skipping invalid viminfo record %s', line)
+            continue
+
+        if isinstance(record, list) and record and isinstance(record[0], str):
+            records.append(record)
+
+    _records = _compacted_records = len(records)
+
+    _replay(records)
+
+    _log.debug('loaded %s viminfo records from %s', _records, file)
+
+
+def _replay(records):
+    # type: (list) -> None
+    global _loading
+
+    _loading = True
+    try:
+        for record in records:
+            provider = _providers.get(record[0])
+            if provider is None:
+                _pending.setdefault(record[0], []).append(record)
+                continue
+
+            try:
+                provider[0](*record[1:])
+            except Exception as e:
+                _log.debug('skipping invalid viminfo record %s: %s', record, e)
+    finally:
+        _loading = False
+
+
+def _reset():
+    # type: () -> None
+    # Forget the journal, for testing.
+    global _file, _loaded, _records, _compacted_records
+
+    _file = None
+    _loaded = False
+    _records = _compacted_records = 0
+    _pending.clear()
@@ -203,3 +203,13 @@ def plugin_unloaded():
     except Exception:
         import traceback
         traceback.print_exc()
+
+    # The profiler counts API calls by replacing the methods of the API
+    # classes, which are shared with other plugins, so put them back.
+    try:
+        from NeoVintageous.nv import profiler
+
+        profiler.stop()
+    except Exception:
+        import traceback
+        traceback.print_exc()
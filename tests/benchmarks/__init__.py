@@ -0,0 +1,49 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Benchmarks are not collected by the default test run, because their module
+# names don't match the "test*.py" pattern. To run them, use UnitTesting with a
+# custom pattern e.g. run "UnitTesting: Test Current Package with Coverage" with
+# the pattern set to "bench*.py" in unittesting.json.
+
+import timeit as _timeit
+
+
+def timeit(stmt, setup=None, number=100, repeat=3):
+    # Return the best time, in seconds, of running stmt number times.
+    #
+    # Args:
+    #   stmt (callable):
+    #   setup (callable): Called once before every repeat.
+    #   number (int):
+    #   repeat (int):
+    best = None
+    for i in range(repeat):
+        if setup:
+            setup()
+
+        t = _timeit.timeit(stmt, number=number)
+        if best is None or t < best:
+            best = t
+
+    return best
+
+
+def report(name, seconds, number):
+    # Print a benchmark result in a consistent format.
+    print('NeoVintageous: bench {:<48} {:>10.3f}ms total {:>10.1f}us per call'.format(
+        name, seconds * 1000, (seconds / number) * 1000000))
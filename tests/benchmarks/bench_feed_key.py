@@ -0,0 +1,60 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+
+class BenchFeedKey(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write('\n'.join('line {}'.format(i) for i in range(1000)))
+        self.select(0)
+        self.state.mode = unittest.NORMAL
+
+    def feed(self, *keys):
+        for key in keys:
+            self.view.window().run_command('_nv_feed_key', {'key': key})
+
+    def bench(self, name, *keys, number=200):
+        def setup():
+            self.select(0)
+
+        cached = timeit(lambda: self.feed(*keys), setup=setup, number=number)
+
+        # Without the cache every state read and write is a round-trip to the
+        # view settings, which is how key events were handled before the cache.
+        with unittest.mock.patch('NeoVintageous.nv.cmds.start_caching'), \
+                unittest.mock.patch('NeoVintageous.nv.cmds.stop_caching'):
+            uncached = timeit(lambda: self.feed(*keys), setup=setup, number=number)
+
+        report(name + ' (settings)', uncached, number)
+        report(name + ' (cached)', cached, number)
+
+    def test_j(self):
+        self.bench('_nv_feed_key j', 'j')
+
+    def test_w(self):
+        self.bench('_nv_feed_key w', 'w')
+
+    def test_count_j(self):
+        self.bench('_nv_feed_key 3j', '3', 'j')
+
+    def test_dw(self):
+        self.bench('_nv_feed_key dw', 'd', 'w', number=50)
@@ -0,0 +1,67 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+from NeoVintageous.nv.ex_cmds import do_ex_cmdline
+from NeoVintageous.nv.vi.search import find_lines_in_range
+
+
+class BenchGlobal(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # About 2MB, 50k lines; one line in a hundred has a match.
+        self.text = ''.join('line {} {}\n'.format(i, 'foo bar' if i % 100 == 0 else 'lorem ipsum dolor sit amet')
+                            for i in range(50000))
+        self.write(self.text)
+
+    def bench(self, name, pattern, number=5):
+        size = self.view.size()
+        t = timeit(lambda: find_lines_in_range(self.view, pattern, 0, size), number=number)
+        report(name, t, number)
+
+    def test_few_lines(self):
+        self.bench(':g/foo/', 'foo')
+
+    def test_every_line(self):
+        self.bench(':g/o/', 'o')
+
+    def test_every_line_empty_match(self):
+        self.bench(':g/^/', '^')
+
+    def bench_cmdline(self, cmdline, number=3):
+        def setup():
+            self.write(self.text)
+            self.select(0)
+
+        t = timeit(lambda: do_ex_cmdline(self.view.window(), cmdline), setup=setup, number=1, repeat=number)
+        report(cmdline, t, 1)
+
+    def test_delete(self):
+        self.bench_cmdline(':g/foo/d')
+
+    def test_delete_most_lines(self):
+        self.bench_cmdline(':v/foo/d')
+
+    def test_move_to_end(self):
+        self.bench_cmdline(':g/foo/m$')
+
+    def test_reverse(self):
+        self.bench_cmdline(':g/^/m0')
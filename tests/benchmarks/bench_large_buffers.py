@@ -0,0 +1,167 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# How the commands scale with the size of the buffer. Each benchmark is run on
+# generated buffers of 10k, 100k, and 1M lines, so a cost that grows with the
+# buffer rather than with the work done stands out.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+from NeoVintageous.nv.ex_cmds import do_ex_cmdline
+from NeoVintageous.nv.vi import search
+from NeoVintageous.nv.vi import text_objects
+
+# The number of lines of the generated buffers.
+_LINES = (10000, 100000, 1000000)
+
+
+def _text(lines):
+    # About 40 bytes a line; one line in a hundred has a match for "foo".
+    return '\n'.join('line {} {}'.format(i, 'foo bar' if i % 100 == 0 else 'lorem ipsum dolor sit amet')
+                     for i in range(lines)) + '\n'
+
+
+def _html(lines):
+    # A line per element, in a div of ten elements, in a single body.
+    return '<body>\n{}</body>\n'.format(''.join(
+        '<div>\n{}</div>\n'.format(''.join('  <p>paragraph {}</p>\n'.format(i + j) for j in range(8)))
+        for i in range(0, lines - 2, 10)))
+
+
+class LargeBufferTestCase(unittest.ViewTestCase):
+
+    def each_buffer(self, generate=_text, sizes=_LINES):
+        # Write each of the buffers, and yield the number of lines.
+        for lines in sizes:
+            self.write(generate(lines))
+            self.select(self.view.text_point(lines // 2, 0))
+            self.state.mode = unittest.NORMAL
+            yield lines
+
+
+class BenchFeedKey(LargeBufferTestCase):
+
+    def bench(self, name, keys, number=50):
+        for lines in self.each_buffer():
+            middle = self.view.text_point(lines // 2, 0)
+
+            def setup():
+                self.state.mode = unittest.NORMAL
+                self.select(middle)
+
+            def feed():
+                for key in keys:
+                    self.view.window().run_command('_nv_feed_key', {'key': key})
+
+            report('{} ({} lines)'.format(name, lines), timeit(feed, setup=setup, number=number), number)
+
+    def test_j(self):
+        self.bench('_nv_feed_key j', ['j'])
+
+    def test_w(self):
+        self.bench('_nv_feed_key w', ['w'])
+
+    def test_count_j(self):
+        self.bench('_nv_feed_key 1000j', ['1', '0', '0', '0', 'j'])
+
+    def test_G(self):
+        self.bench('_nv_feed_key G', ['G'])
+
+
+class BenchProcessNotation(LargeBufferTestCase):
+
+    def bench(self, name, keys, number=10):
+        for lines in self.each_buffer():
+            middle = self.view.text_point(lines // 2, 0)
+
+            def setup():
+                self.state.mode = unittest.NORMAL
+                self.select(middle)
+
+            def replay():
+                self.view.window().run_command('_nv_process_notation', {'keys': keys})
+
+            report('{} ({} lines)'.format(name, lines), timeit(replay, setup=setup, number=number), number)
+
+    def test_motions(self):
+        self.bench('_nv_process_notation 100 motions', 'jjwwbbkk' * 12 + 'jjww')
+
+    def test_search(self):
+        self.bench('_nv_process_notation /foo', '/foo<CR>')
+
+
+class BenchExSubstitute(LargeBufferTestCase):
+
+    def bench(self, name, cmdline, sizes=_LINES, number=1):
+        for lines in self.each_buffer(sizes=sizes):
+            text = self.content()
+
+            def setup():
+                self.write(text)
+
+            def substitute():
+                do_ex_cmdline(self.view.window(), cmdline)
+
+            report('{} ({} lines)'.format(name, lines), timeit(substitute, setup=setup, number=number), number)
+
+    def test_few_matches(self):
+        self.bench(':%s/foo/x/g', ':%s/foo/x/g')
+
+    def test_many_matches(self):
+        # A match on every line; a million substitutions take too long to be
+        # worth waiting for.
+        self.bench(':%s/lorem/x/g', ':%s/lorem/x/g', sizes=_LINES[:2])
+
+    def test_range(self):
+        self.bench(':.,.+100s/o/x/g', ':.,.+100s/o/x/g')
+
+
+class BenchReverseSearch(LargeBufferTestCase):
+
+    def bench(self, name, term, number=5):
+        for lines in self.each_buffer():
+            end = self.view.size()
+            report('{} ({} lines)'.format(name, lines),
+                   timeit(lambda: search.reverse_search(self.view, term, 0, end), number=number), number)
+
+    def test_near(self):
+        self.bench('reverse_search near', 'lorem')
+
+    def test_start_of_buffer(self):
+        self.bench('reverse_search start of buffer', '^line 0 ')
+
+    def test_not_found(self):
+        self.bench('reverse_search not found', 'nomatch')
+
+
+class BenchFindContainingTag(LargeBufferTestCase):
+
+    def bench(self, name, clear, number=10):
+        for lines in self.each_buffer(_html):
+            pt = self.view.text_point(lines // 2, 5)
+            setup = text_objects._tag_indexes.clear if clear else None
+            report('{} ({} lines)'.format(name, lines),
+                   timeit(lambda: text_objects.find_containing_tag(self.view, pt), setup=setup, number=number),
+                   number)
+
+    def test_first(self):
+        self.bench('find_containing_tag (first)', True, number=1)
+
+    def test_cached(self):
+        self.bench('find_containing_tag (cached)', False)
@@ -0,0 +1,58 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+from NeoVintageous.nv.state import State
+
+
+class BenchMacro(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write('\n'.join('line {}'.format(i) for i in range(1000)))
+        self.state.mode = unittest.NORMAL
+        patch = unittest.mock.patch.dict(State.macro_registers, clear=True)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def bench(self, name, steps, count, number=3):
+        dict.__setitem__(State.macro_registers, 'q', steps)
+
+        def setup():
+            self.select(0)
+
+        t = timeit(lambda: self.view.run_command('_vi_at', {'name': 'q', 'count': count}), setup=setup,
+                   number=number)
+        report(name, t, number)
+
+    def test_motions(self):
+        self.bench('1000@q motions', [
+            ('_vi_w', {'mode': unittest.NORMAL, 'count': 1}),
+            ('_vi_j', {'mode': unittest.NORMAL, 'count': 1, 'xpos': 0}),
+            ('_vi_zero', {'mode': unittest.NORMAL, 'count': 1}),
+        ], 999)
+
+    def test_insert(self):
+        self.bench('1000@q insert', [
+            ('_vi_big_a', {'mode': unittest.INTERNAL_NORMAL, 'count': 1}),
+            ('insert', {'characters': ' foo'}),
+            ('_enter_normal_mode', {'mode': unittest.INSERT}),
+            ('_vi_j', {'mode': unittest.NORMAL, 'count': 1, 'xpos': 0}),
+        ], 1000, number=1)
@@ -0,0 +1,56 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+from NeoVintageous.nv.vi import units
+from NeoVintageous.nv.vi.text_objects import find_paragraph_text_object
+from NeoVintageous.nv.vi.text_objects import find_sentences_forward
+
+
+class BenchParagraphMotions(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # About 1MB, 20k lines; paragraphs of 1 to 20 lines.
+        paragraphs = []
+        for i in range(2000):
+            paragraphs.append('\n'.join('Line {} of paragraph {}. It has two sentences.'.format(j, i)
+                                        for j in range(i % 20 + 1)))
+
+        self.write('\n\n'.join(paragraphs) + '\n')
+
+    def bench(self, name, fn, number=10):
+        report(name, timeit(fn, number=number), number)
+
+    def test_next_paragraph_start(self):
+        self.bench('50}', lambda: units.next_paragraph_start(self.view, 0, 50, skip_empty=True))
+
+    def test_prev_paragraph_start(self):
+        self.bench('50{', lambda: units.prev_paragraph_start(self.view, self.view.size(), 50))
+
+    def test_a_paragraph(self):
+        pt = self.view.text_point(10000, 0)
+        self.bench('5dap', lambda: find_paragraph_text_object(self.view, self.Region(pt), inclusive=True, count=5))
+
+    def test_sentences_forward(self):
+        self.bench('100)', lambda: find_sentences_forward(self.view, 0, count=100))
+
+    def test_build_index(self):
+        self.bench('paragraph index', lambda: units.ParagraphIndex(self.view))
@@ -0,0 +1,57 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
+
+
+class BenchProcessNotation(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write('\n'.join('line {}'.format(i) for i in range(1000)))
+        self.select(0)
+        self.state.mode = unittest.NORMAL
+
+    def replay(self, keys):
+        self.view.window().run_command('_nv_process_notation', {'keys': keys})
+
+    def feed(self, keys):
+        # How a replay dispatched the keys before: one command per key.
+        for key in KeySequenceTokenizer(keys).iter_tokenize():
+            self.view.window().run_command('_nv_feed_key', {'key': key})
+
+    def setup(self):
+        self.state.mode = unittest.NORMAL
+        self.select(0)
+
+    def test_motions(self):
+        keys = 'jjwwbbkk' * 125
+        number = 5
+        report('_nv_feed_key 1000 motion keys', timeit(lambda: self.feed(keys), setup=self.setup,
+                                                       number=number), number)
+        report('_nv_process_notation 1000 motion keys', timeit(lambda: self.replay(keys), setup=self.setup,
+                                                               number=number), number)
+
+    def test_insert(self):
+        keys = 'i' + 'abcdefghi' * 111 + '<Esc>'
+        number = 5
+        report('_nv_process_notation 1000 insert keys', timeit(lambda: self.replay(keys), setup=self.setup,
+                                                               number=number), number)
@@ -0,0 +1,90 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import OrderedDict
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+from NeoVintageous.nv.vi import search
+
+
+class BenchReverseSearch(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # About 4MB, 100k lines.
+        self.write('match\n' + '\n'.join('line {} of some text to search through'.format(i) for i in range(100000)))
+
+    def bench(self, name, term, end=None, flags=0, number=10):
+        end = self.view.size() if end is None else end
+
+        chunks = timeit(lambda: search.reverse_search(self.view, term, 0, end, flags), number=number)
+        lines = timeit(lambda: search._reverse_search_by_lines(self.view, term, 0, end, flags, True), number=number)
+
+        report(name + ' (lines)', lines, number)
+        report(name + ' (chunks)', chunks, number)
+
+    def test_near(self):
+        self.bench('reverse_search near', 'line 99990 ')
+
+    def test_far(self):
+        self.bench('reverse_search start of buffer', 'match')
+
+    def test_not_found(self):
+        self.bench('reverse_search not found', 'nomatch')
+
+    def test_regex(self):
+        self.bench('reverse_search regex', '^line 5\\d{4} ')
+
+    def test_literal(self):
+        self.bench('reverse_search literal', 'line 5000 ', flags=search.LITERAL)
+
+
+class BenchHilite(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # About 4MB, 100k lines, 200k matches.
+        self.write('\n'.join('line {} of some text to search through'.format(i) for i in range(100000)))
+        self.select(0)
+        self.settings().set('vintageous_hlsearch', True)
+
+        patch = unittest.mock.patch.object(search, '_hilite_cache', OrderedDict())
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_hilite(self):
+        def find_all():
+            # How matches were found before they were found in slices.
+            regions = self.view.find_all('o')
+            [region for region in regions for sel in self.view.sel() if region.contains(sel)]
+
+        # Only time what blocks the UI i.e. the first slice and the visible region.
+        with unittest.mock.patch.object(search, 'set_timeout'):
+            first = timeit(lambda: search._hilite(self.view, 'o', 0), setup=search._hilite_cache.clear, number=1)
+
+        search._hilite_cache.clear()
+        with unittest.mock.patch.object(search, 'set_timeout', side_effect=lambda f, d: f()):
+            search._hilite(self.view, 'o', 0)
+
+        cached = timeit(lambda: search._hilite(self.view, 'o', 0), number=10)
+
+        report('hilite (find_all)', timeit(find_all, number=1), 1)
+        report('hilite (first slice)', first, 1)
+        report('hilite (cached)', cached, 10)
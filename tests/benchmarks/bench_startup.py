@@ -0,0 +1,77 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# The cost of loading the plugin: importing its modules, and the plugin_loaded
+# hook. The modules are imported anew, and the loaded ones are put back after.
+
+import importlib
+import sys
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+
+def _is_plugin_module(name):
+    return name.startswith('NeoVintageous.') and not name.startswith('NeoVintageous.tests')
+
+
+def _unload():
+    for name in [name for name in sys.modules if _is_plugin_module(name)]:
+        del sys.modules[name]
+
+
+class BenchStartup(unittest.TestCase):
+
+    def setUp(self):
+        self.modules = {name: module for name, module in sys.modules.items() if _is_plugin_module(name)}
+        self.addCleanup(self.restore)
+
+    def restore(self):
+        _unload()
+        sys.modules.update(self.modules)
+        for name, module in self.modules.items():
+            parent, _, child = name.rpartition('.')
+            setattr(sys.modules[parent], child, module)
+
+    def test_import(self):
+        report('import plugin', timeit(lambda: importlib.import_module('NeoVintageous.plugin'),
+                                       setup=_unload, number=1, repeat=5), 1)
+
+    def test_plugin_loaded(self):
+        _unload()
+        plugin = importlib.import_module('NeoVintageous.plugin')
+        report('plugin_loaded', timeit(plugin.plugin_loaded, number=1, repeat=5), 1)
+
+    def test_first_lookup_of_every_command(self):
+        # The cost moved from the import to the first lookup of each command.
+        def setup():
+            _unload()
+            importlib.import_module('NeoVintageous.plugin')
+
+        def lookup():
+            keys = sys.modules['NeoVintageous.nv.vi.keys']
+            for mode, definitions in keys._definitions.items():
+                for seq in definitions:
+                    keys._create_definition(mode, seq)
+
+            plugin = sys.modules['NeoVintageous.nv.plugin']
+            for mode, definitions in plugin._definitions.items():
+                for seq in definitions:
+                    plugin.create_definition(mode, seq)
+
+        report('first lookup of every command', timeit(lookup, setup=setup, number=1, repeat=5), 1)
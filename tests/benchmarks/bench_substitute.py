@@ -0,0 +1,51 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import re
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+from NeoVintageous.nv.substitute import find_substitutions
+
+
+class BenchSubstitute(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # About 2MB, 50k lines; one line in a hundred has a match.
+        self.write(''.join('line {} {}\n'.format(i, 'foo bar' if i % 100 == 0 else 'lorem ipsum dolor sit amet')
+                           for i in range(50000)))
+
+    def bench(self, name, pattern, count=0, number=5):
+        regions = [self.Region(0, self.view.size())]
+        compiled = re.compile(pattern, re.MULTILINE)
+        t = timeit(lambda: list(find_substitutions(self.view, regions, compiled, 'x', count)), number=number)
+        report(name, t, number)
+
+    def test_few_matches(self):
+        self.bench(':%s/foo/x/g', 'foo')
+
+    def test_many_matches(self):
+        self.bench(':%s/o/x/g', 'o')
+
+    def test_first_match_per_line(self):
+        self.bench(':%s/o/x/', 'o', count=1)
+
+    def test_matched_line_by_line(self):
+        self.bench(':%s/\\s/x/g', '\\s')
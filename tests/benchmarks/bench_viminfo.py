@@ -0,0 +1,98 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from collections import deque
+import json
+import os
+import shutil
+import tempfile
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+from NeoVintageous.nv import history
+from NeoVintageous.nv import viminfo
+from NeoVintageous.nv.vi import registers
+
+
+class BenchViminfo(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.dir, 'viminfo')
+        self.addCleanup(shutil.rmtree, self.dir)
+
+        patches = (
+            unittest.mock.patch.object(viminfo, '_file_name', return_value=self.file),
+            unittest.mock.patch.object(viminfo, '_is_enabled', return_value=True),
+            unittest.mock.patch.object(history, '_storage', {}),
+            unittest.mock.patch.object(registers, '_data', {}),
+            unittest.mock.patch.object(registers, '_linewise', {}),
+        )
+
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.addCleanup(viminfo._reset)
+
+    def reset_stores(self):
+        for k in (history._HIST_CMD, history._HIST_SEARCH, history._HIST_EXPR, history._HIST_INPUT,
+                  history._HIST_DEBUG):
+            history._storage[k] = history._new_history()
+
+        registers._data.clear()
+        registers._data['0'] = None
+        registers._data['1-9'] = deque([None] * 9, maxlen=9)
+        registers._linewise.clear()
+
+        viminfo._reset()
+
+    def write_journal(self, records):
+        with open(self.file, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+
+    def bench(self, name, records, number=5):
+        self.write_journal(records)
+        t = timeit(viminfo.load, setup=self.reset_stores, number=1, repeat=number)
+        report(name, t, 1)
+
+    def test_load_history(self):
+        records = [['history', history._HIST_CMD, 'cmd {}'.format(i)] for i in range(10000)]
+        self.bench('viminfo load 10k history', records)
+
+    def test_load_registers(self):
+        text = '\n'.join('x' * 100 for i in range(1000)) + '\n'
+        records = [['register', name, [text], True] for name in 'abcdefghijklmnopqrstuvwxyz0"-']
+        records += [['register_shift', [text]] for i in range(100 - len(records))]
+        self.bench('viminfo load 100 large registers', records)
+
+    def test_load_history_and_registers(self):
+        text = '\n'.join('x' * 100 for i in range(1000)) + '\n'
+        records = [['history', history._HIST_SEARCH, 'pattern {}'.format(i)] for i in range(10000)]
+        records += [['register', 'abcdefghijklmnopqrstuvwxyz'[i % 26], [text], False] for i in range(100)]
+        self.bench('viminfo load 10k history + 100 large registers', records)
+
+    def test_write_history(self):
+        self.reset_stores()
+        viminfo.load()
+        number = 1000
+        items = iter(range(1000000))
+        t = timeit(lambda: history.history_add(':', 'cmd {}'.format(next(items))), number=number)
+        report('viminfo write history', t, number)
@@ -0,0 +1,60 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+from NeoVintageous.tests.benchmarks import report
+from NeoVintageous.tests.benchmarks import timeit
+
+from NeoVintageous.nv.vi import units
+from NeoVintageous.nv.vi.text_objects import word_end_reverse
+from NeoVintageous.nv.vi.text_objects import word_reverse
+
+
+class BenchWordMotions(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # About 400KB, 10k lines.
+        self.write('\n'.join('def fn_{0}(self, x): return x.y[{0}] + 1'.format(i) for i in range(10000)))
+
+    def bench(self, name, fn, number=10):
+        report(name, timeit(fn, number=number), number)
+
+    def test_word_starts(self):
+        self.bench('999w', lambda: units.word_starts(self.view, 0, count=999))
+
+    def test_word_starts_in_view(self):
+        # The view API calls 999w would make without reading the text once.
+        def word_starts():
+            pt = 0
+            for i in range(999):
+                pt = units.next_word_start(self.view, pt)
+            return pt
+
+        self.bench('999w (find_by_class in view)', word_starts)
+
+    def test_big_word_starts(self):
+        self.bench('999W', lambda: units.big_word_starts(self.view, 0, count=999))
+
+    def test_word_ends(self):
+        self.bench('d500e', lambda: units.word_ends(self.view, 0, count=500))
+
+    def test_word_reverse(self):
+        self.bench('999b', lambda: word_reverse(self.view, self.view.size(), count=999))
+
+    def test_word_end_reverse(self):
+        self.bench('999ge', lambda: word_end_reverse(self.view, self.view.size(), count=999))
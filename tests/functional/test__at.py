@@ -0,0 +1,63 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.state import State
+
+_X = ('_vi_x', {'mode': unittest.INTERNAL_NORMAL, 'count': 1, 'register': '"'})
+_J = ('_vi_j', {'mode': unittest.NORMAL, 'count': 1, 'xpos': 0})
+_STAR = ('_vi_star', {'mode': unittest.NORMAL, 'count': 1})
+
+
+class Test_at(unittest.FunctionalTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patch = unittest.mock.patch.dict(State.macro_registers, clear=True)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def at(self, steps, count=1):
+        dict.__setitem__(State.macro_registers, 'q', steps)
+        self.view.run_command('_vi_at', {'name': 'q', 'count': count})
+
+    def test_count_is_undone_in_one_step(self):
+        self.normal('|abcdef')
+        self.at([_X], 3)
+        self.assertContent('def')
+        self.view.run_command('undo')
+        self.assertContent('abcdef')
+
+    @unittest.mock_bell()
+    def test_failed_motion_aborts(self):
+        self.normal('|ab\nab\nab')
+        self.at([_J, _X], 5)
+        self.assertContent('ab\nb\nb')
+        self.assertBell()
+
+    def test_search_that_wraps_to_the_same_match_doesnt_abort(self):
+        self.normal('|foo bar')
+        self.at([_STAR, _X], 3)
+        self.assertContent(' bar')
+
+    def test_doesnt_end_the_undo_group_of_a_replay(self):
+        self.normal('|abcdef')
+        self.state.processing_notation = True
+        self.at([_X], 2)
+        self.assertTrue(self.state.processing_notation)
+        self.assertContent('cdef')
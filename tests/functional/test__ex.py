@@ -17,6 +17,11 @@
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.cmds import _nv_cmdline_feed_key
+from NeoVintageous.nv.history import _new_history
+from NeoVintageous.nv.history import _storage as _history_storage
+from NeoVintageous.nv.history import history_add
+
 
 class TestNvCmdlineEditing(unittest.ViewTestCase):
 
@@ -120,3 +125,28 @@ class TestNvCmdlineEditing(unittest.ViewTestCase):
         self.assertNormal(':abc |')
         self.feed('<C-w>')
         self.assertNormal(':|')
+
+    @unittest.mock.patch('NeoVintageous.nv.cmds.ui_blink')
+    @unittest.mock.patch('NeoVintageous.nv.history._storage', new_callable=lambda: {k: _new_history() for k in _history_storage})  # noqa: E501
+    def test_c_up_down_recalls_history_matching_prefix(self, _storage, ui_blink):
+        for item in ('set list', 'ls', 'sort', 'set nolist'):
+            history_add(':', item)
+
+        _nv_cmdline_feed_key.reset_last_history_index()
+        self.addCleanup(_nv_cmdline_feed_key.reset_last_history_index)
+
+        self.normal(':se|')
+        self.feed('<up>')
+        self.assertContent(':set nolist')
+        self.feed('<up>')
+        self.assertContent(':set list')
+        self.feed('<C-p>')
+        self.assertContent(':set list')
+        self.assertEqual(1, ui_blink.call_count)
+        self.feed('<down>')
+        self.assertContent(':set nolist')
+        self.feed('<C-n>')
+        self.assertContent(':se')
+        self.feed('<down>')
+        self.assertContent(':se')
+        self.assertEqual(2, ui_blink.call_count)
@@ -0,0 +1,64 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+
+class Test_ex_global(unittest.FunctionalTestCase):
+
+    def test_delete(self):
+        self.eq('|ax\nb\ncx\nd\n', ':g/x/d', 'b\n|d\n')
+        self.eq('|x\nx\nx\n', ':g/x/d', '|')
+        self.eq('|a\n\nb\n\n', ':g/^$/d', 'a\nb\n|')
+        self.eq('|ax\nb\ncx\nd\n', ':2,3g/x/d', 'ax\nb\n|d\n')
+
+    def test_delete_lines_that_dont_match(self):
+        self.eq('|ax\nb\ncx\nd\n', ':g!/x/d', 'ax\ncx\n|')
+        self.eq('|ax\nb\ncx\nd\n', ':v/x/d', 'ax\ncx\n|')
+        self.eq('|a\n\nb\n\nc', ':v/./d', 'a\nb\n|c')
+
+    def test_substitute(self):
+        self.eq('|ax\nb\ncx\nd\n', ':g/x/s/a/z/', 'zx\nb\n|cx\nd\n')
+        self.eq('|ab\nb', ':g/b/s/b/c/g', 'ac\n|c')
+
+    def test_command_is_run_on_each_line(self):
+        self.eq('|ax\nb\ncx\nd\n', ':g/x/co.', 'ax\nax\nb\ncx\n|cx\nd\n')
+        self.eq('|a\nb\nc\n', ':g/^/m0', '|c\nb\na\n')
+
+    def test_move(self):
+        self.eq('|ax\nb\ncx\nd\n', ':g/x/m$', 'b\nd\nax\n|cx\n')
+        self.eq('|ax\nb\ncx\nd', ':g/x/m$', 'b\nd\nax\n|cx')
+        self.eq('|ax\nb\ncx', ':g/x/m0', '|cx\nax\nb')
+        self.eq('|a\nb\nc', ':g/^/m0', '|c\nb\na')
+
+    def test_copy(self):
+        self.eq('|ax\nb\ncx\nd\n', ':g/x/t$', 'ax\nb\ncx\nd\nax\n|cx\n')
+        self.eq('|ax\nb\ncx\nd', ':g/x/t$', 'ax\nb\ncx\nd\nax\n|cx')
+        self.eq('|ax\nb\ncx\nd\n', ':g/x/t0', '|cx\nax\nax\nb\ncx\nd\n')
+        self.eq('|ax\nb\ncx\nd\n', ':g/x/t2', 'ax\nb\n|cx\nax\ncx\nd\n')
+
+    def test_command_with_a_range_is_run_on_each_line(self):
+        self.eq('|ax\nb\ncx\nd\ne\n', ':g/x/.,+1d', '|e\n')
+        self.eq('|a\nx\na\nx\n', ':g/x/-1s/a/z/', 'z\nx\n|z\nx\n')
+        self.eq('|ax\nb\ncx\nd\ne', ':g/x/.,+1m$', 'e\nax\nb\ncx\n|d')
+        self.eq('|ax\nb\ncx\nd\ne', ':g/x/.,+1t$', 'ax\nb\ncx\nd\ne\nax\nb\ncx\n|d')
+
+    def test_pattern_not_found(self):
+        self.eq('|a\nb\n', ':g/z/d', '|a\nb\n')
+
+    def test_cannot_do_global_recursive(self):
+        self.eq('|a\nb\n', ':g/a/g/b/d', '|a\nb\n')
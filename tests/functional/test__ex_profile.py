@@ -0,0 +1,59 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import tempfile
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import profiler
+
+
+class Test_ex_profile(unittest.FunctionalTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(profiler.stop)
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.fname = os.path.join(tmpdir, 'profile.json')
+
+    def test_profile_keys(self):
+        self.normal('1\n|2\n3\n')
+        self.feed(':profile start ' + self.fname)
+        self.assertTrue(profiler.is_profiling())
+        self.view.window().run_command('_nv_feed_key', {'key': 'j'})
+        self.feed(':profile stop')
+        self.assertFalse(profiler.is_profiling())
+        self.assertNormal('1\n2\n|3\n')
+
+        with open(self.fname, encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+
+        self.assertIn(('j', 'key'), [(event['name'], event['cat']) for event in events])
+        self.assertIn(('_vi_j', 'command'), [(event['name'], event['cat']) for event in events])
+
+    def test_dump_shows_summary(self):
+        self.feed(':profile start ' + self.fname)
+        self.view.window().run_command('_nv_feed_key', {'key': 'j'})
+        self.feed(':profile dump')
+        self.assertTrue(profiler.is_profiling())
+        self.assertTrue(os.path.isfile(self.fname))
+        panel = self.view.window().find_output_panel('vi_out')
+        self.assertIn('p95 ms', panel.substr(self.Region(0, panel.size())))
@@ -0,0 +1,29 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from sublime import platform
+
+from NeoVintageous.tests import unittest
+
+
+class Test_ex_read(unittest.FunctionalTestCase):
+
+    @unittest.skipIf(platform() == 'windows', 'Test does not work on Windows')
+    def test_read_command_output(self):
+        self.normal('a\n|b\nc\n')
+        self.feed(':r !echo hi')
+        self.assertContent('a\nb\nhi\nc\n')
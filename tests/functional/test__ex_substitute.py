@@ -73,3 +73,24 @@ class Test_ex_substitute(unittest.FunctionalTestCase):
         self.eq('aa\nb|b\ncc\n', ':%substitute/$/,/', 'aa,\nbb,\n|cc,\n')
         self.eq('a\n|b\n\nc\n\nd\n\n', ':%substitute/$/,/', 'a,\nb,\n,\nc,\n,\nd,\n|,\n')
         self.eq('a\n|b\n\nc\n\nd\n\n', ':%substitute/$/,/g', 'a,\nb,\n,\nc,\n,\nd,\n|,\n')
+
+    def test_only_changes_matches(self):
+        self.eq('a b\n|c d\ne f\n', ':%substitute/(\\w) (\\w)/\\2 \\1/', 'b a\nd c\n|f e\n')
+        self.eq('x\n|y\nx\n', ':%substitute/x/x/', 'x\ny\n|x\n')
+
+    def test_patterns_dont_match_across_lines(self):
+        self.eq('a \n| b\n', ':%substitute/\\s+/_/g', 'a_\n|_b\n')
+        self.eq('a\n|b\n', ':%substitute/[^x]b/y/', 'a\n|b\n')
+        self.eq('a\n|a\n', ':%substitute/a\\Z/b/', 'b\n|b\n')
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.status_message')
+    def test_reports_counts(self, status_message):
+        self.eq('xx\n|xx\nyy\nx\n', ':%substitute/x/y/g', 'yy\nyy\nyy\n|y\n')
+        status_message.assert_called_with('5 substitutions on 3 lines')
+        self.eq('xx\n|xx\n', ':substitute/x/y/', 'xx\n|yx\n')
+        status_message.assert_called_with('1 substitution on 1 line')
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.status_message')
+    def test_n_flag_counts_matches(self, status_message):
+        self.eq('xx\n|xx\nyy\nx\n', ':%substitute/x/y/gn', 'xx\n|xx\nyy\nx\n')
+        status_message.assert_called_with('5 matches on 3 lines')
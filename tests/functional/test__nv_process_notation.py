@@ -0,0 +1,68 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.mappings import mappings_add
+from NeoVintageous.nv.mappings import mappings_remove
+
+
+class Test_nv_process_notation(unittest.FunctionalTestCase):
+
+    def process_notation(self, keys):
+        # Returns the characters of the insert commands run.
+        window = self.view.window()
+        with unittest.mock.patch.object(window, 'run_command', wraps=window.run_command) as run_command:
+            window.run_command('_nv_process_notation', {'keys': keys})
+
+        return [args[1]['characters'] for args, kwargs in run_command.call_args_list if args[0] == 'insert']
+
+    def test_insert_is_one_command(self):
+        self.normal('x|y')
+        self.assertEqual(self.process_notation('iabc<Esc>'), ['abc'])
+        self.assertContent('xabcy')
+
+    def test_newlines_are_inserted_on_their_own(self):
+        self.normal('|x')
+        self.assertEqual(self.process_notation('iab<CR>cd<Esc>'), ['ab', '\n', 'cd'])
+        self.assertContent('ab\ncdx')
+
+    def test_replace(self):
+        self.normal('|abcd')
+        self.assertEqual(self.process_notation('Rxy<Esc>'), ['x', 'y'])
+        self.assertContent('xycd')
+
+    def test_leading_motions(self):
+        self.normal('|abc\nabc\n')
+        self.process_notation('jlx')
+        self.assertNormal('abc\na|c\n')
+
+    def test_mapping_is_expanded(self):
+        mappings_add(unittest.NORMAL, 'Q', 'dd')
+        self.addCleanup(mappings_remove, unittest.NORMAL, 'Q')
+        self.normal('1\n|2\n3\n4\n')
+        self.process_notation('jQ')
+        self.assertNormal('1\n2\n|4\n')
+
+    @unittest.mock.patch('NeoVintageous.nv.cmds._log')
+    @unittest.mock.patch('NeoVintageous.nv.cmds._feed_key', side_effect=ValueError)
+    def test_error_resets_the_views(self, feed_key, log):
+        self.normal('|abc')
+        self.view.window().run_command('_nv_process_notation', {'keys': 'x'})
+        self.assertTrue(log.exception.called)
+        self.assertIsNone(self.view.settings().get('vintage'))
+        self.assertFalse(self.view.settings().get('command_mode'))
@@ -31,6 +31,13 @@ class Test_percent(unittest.FunctionalTestCase):
         self.eq('{}12|', 'n_%', '{}12|', 'should NOT jump backwards')
         self.eq('12{}3|4{}', 'n_%', '12{}34{|}', 'should jump forward')
 
+    def test_percent_nested(self):
+        self.eq('|(a(b)c)', 'n_%', '(a(b)c|)')
+        self.eq('(a|(b)c)', 'n_%', '(a(b|)c)')
+        self.eq('(a(b)c|)', 'n_%', '|(a(b)c)')
+        self.eq('|(a\\(b)', 'n_%', '(a\\(b|)', 'should skip escaped brackets')
+        self.eq('|(a(b)', 'n_%', '|(a(b)', 'should not jump to unbalanced bracket')
+
     def test_percent_mutiple_selection(self):
         self.eq('1|{ab}2|{cd}3|{ef}x', 'n_%', '1{ab|}2{cd|}3{ef|}x')
         self.eq('1|{ab}2{cd}3|{ef}x', 'n_%', '1{ab|}2{cd}3{ef|}x')
@@ -69,6 +76,18 @@ class Test_percent(unittest.FunctionalTestCase):
         self.eq('|abc (abc) abc', '%', 'N_|abc (abc)| abc')
 
 
+class Test_percent_in_html_syntax(unittest.FunctionalTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.view.assign_syntax('Packages/HTML/HTML.sublime-syntax')
+
+    def test_percent(self):
+        self.eq('<d|iv><div>x</div></div>', 'n_%', '<div><div>x</div>|</div>')
+        self.eq('<div><div>x</div></d|iv>', 'n_%', '|<div><div>x</div></div>')
+        self.eq('<div><d|iv>x</div></div>', 'n_%', '<div><div>x|</div></div>')
+
+
 class Test_percent_in_php_syntax(unittest.FunctionalTestCase):
 
     def setUp(self):
@@ -39,6 +39,10 @@ class TestSurround_cs(unittest.FunctionalTestCase):
         self.eq('x"|abc"y', 'cs"(', 'x|( abc )y')
         self.eq('x"|abc"y', 'cs")', 'x|(abc)y')
 
+    def test_nested_punctuation_marks(self):
+        self.eq('x(a(b)c|d)y', 'cs)]', 'x|[a(b)cd]y')
+        self.eq('x(a(b|)cd)y', 'cs)]', 'x(a|[b]cd)y')
+
     def test_brace_punctuation_marks(self):
         self.eq('x{a|bc}y', 'cs{(', 'x|( abc )y')
         self.eq('x{a|bc}y', 'cs}(', 'x|( abc )y')
@@ -126,6 +126,11 @@ class TestSurround_ds(unittest.FunctionalTestCase):
             self.eq(seed, 'ds' + c, expected)  # Close target
             self.eq(seed, 'ds' + a, expected)  # Close alias target
 
+    def test_should_delete_enclosing_punctuation_targets(self):
+        for o, c, a in punctuation_targets_data:
+            self.eq('x{0}a{0}b{1}c|d{1}y'.format(o, c), 'ds' + c, 'x|a{}b{}cdy'.format(o, c))
+            self.eq('x{0}a{0}b|{1}cd{1}y'.format(o, c), 'ds' + c, 'x{}a|bcd{}y'.format(o, c))
+
     def test_should_do_nothing_when_no_target_is_found(self):
         for t in quote_targets + other_targets + punctuation_targets + noop_targets + invalid_targets:
             self.eq('x a|bc y', 'ds' + t, 'x a|bc y')
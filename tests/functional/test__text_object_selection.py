@@ -24,6 +24,10 @@ class TestObjectSelection(unittest.FunctionalTestCase):
         self.eq('x<p>a|bc</p>x', 'v_at', 'x|<p>abc</p>|x')
         self.eq('x<p><b>_</b>a|bc<i>_</i>e</p>x', 'v_at', 'x|<p><b>_</b>abc<i>_</i>e</p>|x')
 
+    def test_v_i_paren(self):
+        self.eq('x(a(b)c|d)y', 'v_i(', 'x(|a(b)cd|)y')
+        self.eq('x(a(|b)cd)y', 'v_i(', 'x(a(|b|)cd)y')
+
     def test_v_iw(self):
         self.eq('x    fi|zz    xx', 'v_iw', 'x    |fizz|    xx')
         self.eq('x  |  fizz    xx', 'v_iw', 'x|    |fizz    xx')
@@ -115,6 +119,9 @@ class TestObjectSelection(unittest.FunctionalTestCase):
     def test_v_it(self):
         self.eq('x<p>a|bc</p>x', 'v_it', 'x<p>|abc|</p>x')
         self.eq('x<p>_<i>_</i>a|bc<i>_</i>d</p>x', 'v_it', 'x<p>|_<i>_</i>abc<i>_</i>d|</p>x')
+        self.eq('<div><div>a</div>b|c</div>', 'v_it', '<div>|<div>a</div>bc|</div>')
+        self.eq('<div><div>a|bc</div></div>', 'v_it', '<div><div>|abc|</div></div>')
+        self.eq('<p>a<br>b<br/>c|d</p>', 'v_it', '<p>|a<br>b<br/>cd|</p>')
 
     def test_161(self):
         self.eq(
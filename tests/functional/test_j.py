@@ -0,0 +1,32 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+
+class Test_j(unittest.FunctionalTestCase):
+
+    def test_b_j(self):
+        self.eq('x\na|b|c\nabc\nabc\nx', 'b_j', 'x\na|b|c\na|b|c\nabc\nx')
+        self.eq('x\na|b|c\nabc\nabc\nx', 'b_2j', 'x\na|b|c\na|b|c\na|b|c\nx')
+        self.eq('x\n|ab|c\nabc\nabc\nx', 'b_2j', 'x\n|ab|c\n|ab|c\n|ab|c\nx')
+
+    def test_b_j_stops_at_empty_line(self):
+        self.eq('x\na|b|c\nabc\n\nabc\nx', 'b_5j', 'x\na|b|c\na|b|c\n\nabc\nx')
+
+    def test_b_j_stops_at_short_line(self):
+        self.eq('x\nab|cd|e\nabcde\nab\nabcde\nx', 'b_5j', 'x\nab|cd|e\nab|cd|e\nab\nabcde\nx')
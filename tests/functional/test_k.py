@@ -0,0 +1,32 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+
+class Test_k(unittest.FunctionalTestCase):
+
+    def test_b_k(self):
+        self.eq('x\nabc\nabc\na|b|c\nx', 'b_k', 'x\nabc\na|b|c\na|b|c\nx')
+        self.eq('x\nabc\nabc\na|b|c\nx', 'b_2k', 'x\na|b|c\na|b|c\na|b|c\nx')
+        self.eq('x\nabc\nabc\n|ab|c\nx', 'b_2k', 'x\n|ab|c\n|ab|c\n|ab|c\nx')
+
+    def test_b_k_stops_at_empty_line(self):
+        self.eq('x\nabc\n\nabc\na|b|c\nx', 'b_5k', 'x\nabc\n\na|b|c\na|b|c\nx')
+
+    def test_b_k_stops_at_short_line(self):
+        self.eq('x\nabcde\nab\nabcde\nab|cd|e\nx', 'b_5k', 'x\nabcde\nab\nab|cd|e\nab|cd|e\nx')
@@ -0,0 +1,40 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A stand-in for the jump history of the Default package of Sublime Text.
+
+_histories = {}  # type: dict
+
+
+class JumpHistory:
+
+    def __init__(self):
+        self.history = []  # type: list
+
+    def push_selection(self, view):
+        self.history.append((view.id(), list(view.sel())))
+        del self.history[:-100]
+
+    def jump_back(self, in_widget=False):
+        if self.history:
+            return self.history.pop()
+
+        return None
+
+
+def get_jump_history(window_id):
+    return _histories.setdefault(window_id, JumpHistory())
@@ -0,0 +1,99 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# Run the tests, or the benchmarks, without Sublime Text.
+#
+# The sublime and sublime_plugin modules are replaced by the stand-ins in this
+# directory, and the package is loaded as NeoVintageous, whatever the name of
+# the directory it is in.
+#
+# Usage:
+#
+#   python tests/headless/run.py
+#   python tests/headless/run.py tests.nv tests.functional.test_w
+#   python tests/headless/run.py --pattern 'bench*.py'
+#
+# Returns a non-zero exit status if a test fails.
+
+import argparse
+import fnmatch
+import importlib
+import os
+import sys
+import types
+import unittest
+
+_HEADLESS_PATH = os.path.dirname(os.path.abspath(__file__))
+_PACKAGE_PATH = os.path.dirname(os.path.dirname(_HEADLESS_PATH))
+_TESTS_PATH = os.path.join(_PACKAGE_PATH, 'tests')
+
+
+def _load_package():
+    sys.path.insert(0, _HEADLESS_PATH)
+
+    package = types.ModuleType('NeoVintageous')
+    package.__path__ = [_PACKAGE_PATH]
+    package.__file__ = os.path.join(_PACKAGE_PATH, '__init__.py')
+    sys.modules['NeoVintageous'] = package
+
+    import sublime
+    import sublime_plugin
+
+    sublime.active_window()
+    sublime_plugin.reload_plugin('NeoVintageous.plugin')
+
+
+def _find_modules(pattern, path=_TESTS_PATH):
+    # Returns the names of the test modules in the directory that match the
+    # pattern.
+    modules = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if os.path.isfile(os.path.join(root, d, '__init__.py')))
+        for name in sorted(fnmatch.filter(files, pattern)):
+            module = os.path.relpath(os.path.join(root, name[:-3]), _PACKAGE_PATH)
+            modules.append("NeoVintageous." + module.replace(os.sep, "."))
+
+    return modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the NeoVintageous tests without Sublime Text.')
+    parser.add_argument('names', nargs='*', help='test packages, modules, classes, or methods e.g. tests.nv.test_shell')
+    parser.add_argument('-p', '--pattern', default='test*.py', help='pattern of the test modules to run')
+    parser.add_argument('-v', '--verbose', action='store_const', const=2, default=1, dest='verbosity')
+    parser.add_argument('-f', '--failfast', action='store_true')
+    args = parser.parse_args(argv)
+
+    _load_package()
+
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for name in args.names or ['tests']:
+        path = os.path.join(_PACKAGE_PATH, *name.split('.'))
+        if os.path.isdir(path):
+            for module in _find_modules(args.pattern, path):
+                suite.addTests(loader.loadTestsFromModule(importlib.import_module(module)))
+        else:
+            suite.addTests(loader.loadTestsFromName('NeoVintageous.' + name))
+
+    result = unittest.TextTestRunner(verbosity=args.verbosity, failfast=args.failfast).run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1863 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A stand-in for the Sublime Text API, used to run the tests and benchmarks
+# without Sublime Text, see run.py.
+#
+# Only the parts of the API that NeoVintageous uses are provided. A view is a
+# text buffer with selections, settings, regions, an undo stack, and the
+# builtin text commands NeoVintageous runs. Syntaxes aren't parsed, so the
+# scope of every point is the scope of the syntax, and there is no layout, so
+# the whole buffer is visible and lines are never wrapped. The commands of the
+# Default package that reformat text, e.g. wrap_lines, do nothing.
+#
+# Like Sublime Text, commands run synchronously, an exception raised by a
+# command is printed rather than raised, and the edits made by a command run
+# from outside of any other command are undone as one group. Callbacks passed
+# to set_timeout() are run after that command returns.
+
+from bisect import bisect_right
+from itertools import accumulate
+import atexit
+import glob
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+
+import sublime_plugin
+
+
+LITERAL = 1
+IGNORECASE = 2
+
+CLASS_WORD_START = 1
+CLASS_WORD_END = 2
+CLASS_PUNCTUATION_START = 4
+CLASS_PUNCTUATION_END = 8
+CLASS_SUB_WORD_START = 16
+CLASS_SUB_WORD_END = 32
+CLASS_LINE_START = 64
+CLASS_LINE_END = 128
+CLASS_EMPTY_LINE = 256
+
+OP_EQUAL = 0
+OP_NOT_EQUAL = 1
+OP_REGEX_MATCH = 2
+OP_NOT_REGEX_MATCH = 3
+OP_REGEX_CONTAINS = 4
+OP_NOT_REGEX_CONTAINS = 5
+
+DRAW_EMPTY = 1
+HIDE_ON_MINIMAP = 2
+DRAW_EMPTY_AS_OVERWRITE = 4
+PERSISTENT = 16
+DRAW_OUTLINED = 32
+DRAW_NO_FILL = 32
+HIDDEN = 128
+DRAW_NO_OUTLINE = 256
+DRAW_SOLID_UNDERLINE = 512
+DRAW_STIPPLED_UNDERLINE = 1024
+DRAW_SQUIGGLY_UNDERLINE = 2048
+
+ENCODED_POSITION = 1
+TRANSIENT = 4
+FORCE_GROUP = 8
+
+MONOSPACE_FONT = 1
+KEEP_OPEN_ON_FOCUS_LOST = 2
+
+DIALOG_CANCEL = 0
+DIALOG_YES = 1
+DIALOG_NO = 2
+
+_WORD_SEPARATORS = './\\()"\'-:,.;<>~!@#$%^&*|+=[]{}`~?'
+
+# The builtin preferences. The preferences of the package are loaded on top.
+_DEFAULT_PREFERENCES = {
+    'auto_indent': True,
+    'ignored_packages': ['Six', 'Vintage', 'Vintageous'],
+    'tab_size': 4,
+    'translate_tabs_to_spaces': False,
+    'trim_automatic_white_space': True,
+    'word_separators': _WORD_SEPARATORS,
+    'wrap_width': 0,
+}
+
+_PACKAGE_PATH = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_PACKAGE_NAME = 'NeoVintageous'
+
+# The packages and cache directories are temporary, so a run doesn't read or
+# write the files of a Sublime Text installation, e.g. the viminfo file.
+_DATA_PATH = tempfile.mkdtemp(prefix='NeoVintageous-')
+atexit.register(shutil.rmtree, _DATA_PATH, True)
+
+_clipboard = ''
+_settings = {}  # type: dict
+_status_messages = []  # type: list
+_timeouts = []  # type: list
+_windows = []  # type: list
+_ids = [0]
+
+# The number of commands running, and whether the timeouts are being run.
+_depth = 0
+_running_timeouts = False
+
+# The size of the chunks the text of a view is kept in while it's modified.
+_CHUNK_SIZE = 65536
+
+# The maximum number of timeouts run after a command returns. Callbacks that
+# reschedule themselves are given up on after that many.
+_MAX_TIMEOUTS = 1000
+
+
+def _next_id():
+    _ids[0] += 1
+
+    return _ids[0]
+
+
+def _strip_json_comments(text):
+    # Strip the comments and the trailing commas of a settings file.
+    text = re.sub(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', lambda m: m.group(1) or '', text, flags=re.S)
+
+    return re.sub(r',(\s*[\]}])', r'\1', text)
+
+
+class Region:
+
+    __slots__ = ['a', 'b', 'xpos']
+
+    def __init__(self, a, b=None, xpos=-1):
+        if b is None:
+            b = a
+
+        self.a = a
+        self.b = b
+        self.xpos = xpos
+
+    def __str__(self):
+        return '(' + str(self.a) + ', ' + str(self.b) + ')'
+
+    def __repr__(self):
+        return '(' + str(self.a) + ', ' + str(self.b) + ')'
+
+    def __len__(self):
+        return self.size()
+
+    def __eq__(self, rhs):
+        return isinstance(rhs, Region) and self.a == rhs.a and self.b == rhs.b
+
+    def __lt__(self, rhs):
+        lhs_begin = self.begin()
+        rhs_begin = rhs.begin()
+
+        if lhs_begin == rhs_begin:
+            return self.end() < rhs.end()
+
+        return lhs_begin < rhs_begin
+
+    def __contains__(self, v):
+        if isinstance(v, Region):
+            return v.a in self and v.b in self
+
+        return self.begin() <= v <= self.end()
+
+    def empty(self):
+        return self.a == self.b
+
+    def begin(self):
+        return min(self.a, self.b)
+
+    def end(self):
+        return max(self.a, self.b)
+
+    def size(self):
+        return abs(self.a - self.b)
+
+    def contains(self, x):
+        if isinstance(x, Region):
+            return self.contains(x.a) and self.contains(x.b)
+
+        return self.begin() <= x <= self.end()
+
+    def cover(self, rhs):
+        a = min(self.begin(), rhs.begin())
+        b = max(self.end(), rhs.end())
+
+        if self.a < self.b:
+            return Region(a, b)
+
+        return Region(b, a)
+
+    def intersection(self, rhs):
+        if self.end() <= rhs.begin() or self.begin() >= rhs.end():
+            return Region(0)
+
+        return Region(max(self.begin(), rhs.begin()), min(self.end(), rhs.end()))
+
+    def intersects(self, rhs):
+        lb, le = self.begin(), self.end()
+        rb, re_ = rhs.begin(), rhs.end()
+
+        return (lb == rb and le == re_) or (lb < rb < le) or (rb < lb < re_)
+
+    def to_tuple(self):
+        return (self.a, self.b)
+
+
+class Selection:
+
+    def __init__(self, view):
+        self._view = view
+        self._regions = []  # type: list
+
+    def __len__(self):
+        return len(self._regions)
+
+    def __getitem__(self, index):
+        r = self._regions[index]
+
+        return Region(r.a, r.b, r.xpos)
+
+    def __iter__(self):
+        return iter([Region(r.a, r.b, r.xpos) for r in self._regions])
+
+    def __eq__(self, rhs):
+        return isinstance(rhs, Selection) and self._regions == rhs._regions
+
+    def __repr__(self):
+        return 'Selection(' + repr(self._regions) + ')'
+
+    def is_valid(self):
+        return self._view.is_valid()
+
+    def clear(self):
+        self._regions = []
+
+    def add(self, x):
+        if not isinstance(x, Region):
+            x = Region(x)
+
+        size = self._view.size()
+        x = Region(max(0, min(x.a, size)), max(0, min(x.b, size)), x.xpos)
+        self._regions.append(x)
+        self._normalize()
+
+    def add_all(self, regions):
+        for region in regions:
+            self.add(region)
+
+    def subtract(self, region):
+        regions = []
+        for r in self._regions:
+            if not r.intersects(region):
+                regions.append(r)
+                continue
+
+            if r.begin() < region.begin():
+                regions.append(Region(r.begin(), region.begin()))
+
+            if r.end() > region.end():
+                regions.append(Region(region.end(), r.end()))
+
+        self._regions = regions
+
+    def contains(self, region):
+        return any(r.contains(region) for r in self._regions)
+
+    def _set(self, regions):
+        self._regions = [Region(r.a, r.b) for r in regions]
+        self._normalize()
+
+    def _normalize(self):
+        # Sort the regions, and merge the regions that overlap, like Sublime
+        # Text. A caret touching a region is merged into it.
+        regions = sorted(self._regions, key=lambda r: (r.begin(), r.end()))
+        merged = []  # type: list
+        for r in regions:
+            if merged:
+                last = merged[-1]
+                overlaps = r.begin() < last.end() or (r.begin() == last.end() and (r.empty() or last.empty()))
+                if overlaps:
+                    merged[-1] = last.cover(r) if not last.empty() or r.empty() else r.cover(last)
+                    continue
+
+            merged.append(r)
+
+        self._regions = merged
+
+
+class Settings:
+
+    def __init__(self, parent=None, values=None):
+        self._parent = parent
+        self._values = dict(values or {})
+        self._on_change = {}  # type: dict
+
+    def get(self, key, default=None):
+        # Like Sublime Text, a copy of the value is returned.
+        if key in self._values:
+            return json.loads(json.dumps(self._values[key]))
+
+        if self._parent:
+            return self._parent.get(key, default)
+
+        return default
+
+    def has(self, key):
+        return key in self._values or bool(self._parent and self._parent.has(key))
+
+    def set(self, key, value):
+        # Like Sublime Text, values are stored as JSON.
+        self._values[key] = json.loads(json.dumps(value))
+        self._changed()
+
+    def erase(self, key):
+        if key in self._values:
+            del self._values[key]
+            self._changed()
+
+    def add_on_change(self, tag, callback):
+        self._on_change[tag] = callback
+
+    def clear_on_change(self, tag):
+        self._on_change.pop(tag, None)
+
+    def _changed(self):
+        for callback in list(self._on_change.values()):
+            callback()
+
+
+class Edit:
+
+    def __init__(self, view):
+        self._view = view
+
+
+class _UndoGroup:
+
+    def __init__(self, sel):
+        self.ops = []  # type: list
+        self.sel = sel
+        self.sel_after = sel
+
+
+class View:
+
+    def __init__(self, window, settings=None, panel=None):
+        self._id = _next_id()
+        self._buffer_id = _next_id()
+        self.view_id = self._id
+        self._window = window
+        self._panel = panel
+        self._valid = True
+        self._joined = ''
+        self._chunks = None
+        self._size = 0
+        self._starts = None
+        self._sel = Selection(self)
+        self._sel.add(Region(0))
+        self._settings = Settings(load_settings('Preferences.sublime-settings'), settings)
+        self._regions = {}  # type: dict
+        self._status = {}  # type: dict
+        self._commands = {}  # type: dict
+        self._command_history = []  # type: list
+        self._change_count = 0
+        self._saved_change_count = 0
+        self._undo = []  # type: list
+        self._redo = []  # type: list
+        self._group = None
+        self._undoing = False
+        self._glue_mark = None
+        self._file_name = None
+        self._name = ''
+        self._scratch = False
+        self._read_only = False
+        self._overwrite = False
+        self._syntax = 'Packages/Text/Plain text.tmLanguage'
+        self._viewport_position = (0.0, 0.0)
+
+    def __eq__(self, rhs):
+        return isinstance(rhs, View) and self._id == rhs._id
+
+    @property
+    def _text(self):
+        # The text is kept in chunks while it's modified, so a command that
+        # makes many edits, e.g. a substitute, doesn't copy all of the text
+        # for each edit. It's joined again when it's read.
+        if self._chunks is not None:
+            self._joined = ''.join(self._chunks)
+            self._chunks = None
+
+        return self._joined
+
+    def _replace_text(self, begin, end, text):
+        # Replace the text between the points, and return the text replaced.
+        if self._chunks is None:
+            self._chunks = [self._joined[i:i + _CHUNK_SIZE] for i in range(0, self._size, _CHUNK_SIZE)] or ['']
+
+        offsets = [0]
+        offsets.extend(accumulate(len(chunk) for chunk in self._chunks))
+        first = max(0, bisect_right(offsets, begin) - 1)
+        last = min(max(first, bisect_right(offsets, end) - 1), len(self._chunks) - 1)
+        joined = ''.join(self._chunks[first:last + 1])
+        begin -= offsets[first]
+        end -= offsets[first]
+        removed = joined[begin:end]
+        joined = joined[:begin] + text + joined[end:]
+        self._chunks[first:last + 1] = [joined[i:i + _CHUNK_SIZE] for i in range(0, len(joined), _CHUNK_SIZE)]
+        self._size += len(text) - len(removed)
+
+        return removed
+
+    def __hash__(self):
+        return self._id
+
+    def __repr__(self):
+        return 'View(' + str(self._id) + ')'
+
+    def id(self):
+        return self._id
+
+    def buffer_id(self):
+        return self._buffer_id
+
+    def is_valid(self):
+        return self._valid
+
+    def is_primary(self):
+        return True
+
+    def window(self):
+        return self._window if self._valid else None
+
+    def file_name(self):
+        return self._file_name
+
+    def name(self):
+        return self._name
+
+    def set_name(self, name):
+        self._name = name
+
+    def retarget(self, new_fname):
+        self._file_name = new_fname
+
+    def is_loading(self):
+        return False
+
+    def is_dirty(self):
+        return self._change_count != self._saved_change_count and not self._scratch
+
+    def is_read_only(self):
+        return self._read_only
+
+    def set_read_only(self, read_only):
+        self._read_only = read_only
+
+    def is_scratch(self):
+        return self._scratch
+
+    def set_scratch(self, scratch):
+        self._scratch = scratch
+
+    def encoding(self):
+        return 'UTF-8'
+
+    def line_endings(self):
+        return 'Unix'
+
+    def settings(self):
+        return self._settings
+
+    def meta_info(self, key, pt):
+        if key == 'shellVariables':
+            comment = _LINE_COMMENTS.get(_syntax_scope(self._syntax))
+
+            return [{'name': 'TM_COMMENT_START', 'value': comment}] if comment else []
+
+        return None
+
+    def close(self):
+        if self._window:
+            self._window._close_view(self)
+
+        return True
+
+    def change_count(self):
+        return self._change_count
+
+    def size(self):
+        return self._size
+
+    def substr(self, x):
+        if isinstance(x, Region):
+            return self._text[max(0, x.begin()):max(0, x.end())]
+
+        if 0 <= x < self._size:
+            return self._text[x]
+
+        return '\x00'
+
+    def begin_edit(self, edit_token=None, cmd=None, args=None):
+        return Edit(self)
+
+    def end_edit(self, edit):
+        pass
+
+    def insert(self, edit, pt, text):
+        pt = max(0, min(pt, self._size))
+        if '\t' in text and self._settings.get('translate_tabs_to_spaces'):
+            text = _expand_tabs(text, self.rowcol(pt)[1], self._settings.get('tab_size', 4))
+
+        self._modify(pt, pt, text)
+
+        return len(text)
+
+    def erase(self, edit, region):
+        self._modify(region.begin(), region.end(), '')
+
+    def replace(self, edit, region, text):
+        self._modify(region.begin(), region.end(), text)
+
+    def sel(self):
+        return self._sel
+
+    def line(self, x):
+        if isinstance(x, Region):
+            a = self.line(x.begin()).a
+            b = self.line(x.end()).b
+
+            return Region(a, b)
+
+        x = max(0, min(x, self._size))
+        a = self._text.rfind('\n', 0, x) + 1
+        b = self._text.find('\n', x)
+
+        return Region(a, self._size if b < 0 else b)
+
+    def full_line(self, x):
+        line = self.line(x)
+
+        return Region(line.a, min(line.b + 1, self._size))
+
+    def lines(self, region):
+        lines = []
+        line = self.line(region.begin())
+        while True:
+            lines.append(line)
+            if line.b + 1 >= region.end() or line.b >= self._size:
+                break
+
+            line = self.line(line.b + 1)
+
+        return lines
+
+    def split_by_newlines(self, region):
+        regions = []
+        begin = region.begin()
+        for text in self.substr(region).split('\n'):
+            regions.append(Region(begin, begin + len(text)))
+            begin += len(text) + 1
+
+        # Like Sublime Text, a trailing newline doesn't start another region.
+        if len(regions) > 1 and regions[-1].empty():
+            regions.pop()
+
+        return regions
+
+    def rowcol(self, pt):
+        pt = max(0, min(pt, self._size))
+        starts = self._line_starts()
+        row = bisect_right(starts, pt) - 1
+
+        return (row, pt - starts[row])
+
+    def text_point(self, row, col):
+        starts = self._line_starts()
+        if row >= len(starts):
+            return self._size
+
+        row = max(0, row)
+
+        # Like Sublime Text, the column is limited to the size of the buffer,
+        # but not to the line.
+        return min(starts[row] + col, self._size)
+
+    def _line_starts(self):
+        if self._starts is None:
+            self._starts = [0]
+            self._starts.extend(accumulate(map((1).__add__, map(len, self._text.split('\n')[:-1]))))
+
+        return self._starts
+
+    def _char_class(self, pt, separators):
+        # Returns the class of the character at the point, 'w' for a word
+        # character, 'p' for punctuation, 's' for white space, and None for
+        # no character.
+        if pt < 0 or pt >= self._size:
+            return None
+
+        c = self._text[pt]
+        if c.isspace():
+            return 's'
+
+        if c in separators:
+            return 'p'
+
+        return 'w'
+
+    def classify(self, pt, separators=None):
+        if separators is None:
+            separators = self._settings.get('word_separators', _WORD_SEPARATORS)
+
+        prev = self._char_class(pt - 1, separators)
+        char = self._char_class(pt, separators)
+        classes = 0
+
+        if char == 'w' and prev != 'w':
+            classes |= CLASS_WORD_START
+        if prev == 'w' and char != 'w':
+            classes |= CLASS_WORD_END
+        if char == 'p' and prev != 'p':
+            classes |= CLASS_PUNCTUATION_START
+        if prev == 'p' and char != 'p':
+            classes |= CLASS_PUNCTUATION_END
+
+        line_start = pt <= 0 or self._text[pt - 1] == '\n'
+        line_end = pt >= self._size or self._text[pt] == '\n'
+
+        if line_start:
+            classes |= CLASS_LINE_START
+        if line_end:
+            classes |= CLASS_LINE_END
+        if line_start and line_end:
+            classes |= CLASS_EMPTY_LINE
+
+        return classes
+
+    def find_by_class(self, pt, forward, classes, separators=None):
+        if forward:
+            for p in range(pt + 1, self._size):
+                if self.classify(p, separators) & classes:
+                    return p
+
+            return self._size
+
+        for p in range(pt - 1, 0, -1):
+            if self.classify(p, separators) & classes:
+                return p
+
+        return 0
+
+    def expand_by_class(self, x, classes, separators=None):
+        if not isinstance(x, Region):
+            x = Region(x)
+
+        a = x.begin()
+        if not (a > 0 and self.classify(a, separators) & classes):
+            a = self.find_by_class(a, False, classes, separators)
+
+        b = x.end()
+        if not (b < self._size and self.classify(b, separators) & classes and b > x.begin()):
+            b = self.find_by_class(b, True, classes, separators)
+
+        return Region(a, b)
+
+    def word(self, x):
+        if isinstance(x, Region):
+            return self.word(x.begin()).cover(self.word(x.end()))
+
+        separators = self._settings.get('word_separators', _WORD_SEPARATORS)
+        kind = self._char_class(x, separators)
+        if kind != 'w' and self._char_class(x - 1, separators) == 'w':
+            kind = 'w'
+
+        if kind is None or (kind == 's' and self.substr(x) == '\n'):
+            return Region(x)
+
+        a = x
+        while a > 0 and self._char_class(a - 1, separators) == kind and self._text[a - 1] != '\n':
+            a -= 1
+
+        b = x
+        while b < self._size and self._char_class(b, separators) == kind and self._text[b] != '\n':
+            b += 1
+
+        return Region(a, b)
+
+    def _compile(self, pattern, flags):
+        if flags & LITERAL:
+            pattern = re.escape(pattern)
+        else:
+            # The word boundaries of the Boost syntax that Sublime Text uses.
+            pattern = re.sub(r'(?<!\\)((?:\\\\)*)\\([<>])',
+                             lambda m: m.group(1) + ('\\b(?=\\w)' if m.group(2) == '<' else '\\b(?<=\\w)'), pattern)
+
+        return re.compile(pattern, re.M | (re.I if flags & IGNORECASE else 0))
+
+    def find(self, pattern, start_pt, flags=0):
+        try:
+            match = self._compile(pattern, flags).search(self._text, max(0, start_pt))
+        except re.error:
+            return Region(-1, -1)
+
+        if match is None:
+            return Region(-1, -1)
+
+        return Region(match.start(), match.end())
+
+    def find_all(self, pattern, flags=0, fmt=None, extractions=None):
+        try:
+            matches = list(self._compile(pattern, flags).finditer(self._text))
+        except re.error:
+            return []
+
+        if fmt is not None and extractions is not None:
+            template = re.sub(r'\$(\d+)', r'\\g<\1>', fmt)
+            for match in matches:
+                extractions.append(match.expand(template))
+
+        return [Region(m.start(), m.end()) for m in matches]
+
+    def add_regions(self, key, regions, scope='', icon='', flags=0):
+        self._regions[key] = [Region(r.a, r.b) for r in regions]
+
+    def get_regions(self, key):
+        return [Region(r.a, r.b) for r in self._regions.get(key, [])]
+
+    def erase_regions(self, key):
+        self._regions.pop(key, None)
+
+    def set_status(self, key, value):
+        self._status[key] = value
+
+    def get_status(self, key):
+        return self._status.get(key, '')
+
+    def erase_status(self, key):
+        self._status.pop(key, None)
+
+    def command_history(self, index, modifying_only=False):
+        try:
+            name, args, repeat = self._command_history[index - 1 if index <= 0 else index]
+        except IndexError:
+            return ('', None, 0)
+
+        return (name, args, repeat)
+
+    def has_non_empty_selection_region(self):
+        return any(not r.empty() for r in self._sel)
+
+    def show(self, x, show_surrounds=True):
+        pass
+
+    def show_at_center(self, x):
+        pass
+
+    def visible_region(self):
+        return Region(0, self._size)
+
+    def viewport_position(self):
+        return self._viewport_position
+
+    def set_viewport_position(self, xy, animate=True):
+        self._viewport_position = xy
+
+    def viewport_extent(self):
+        return (1000.0, 1000.0)
+
+    def layout_extent(self):
+        return (1000.0, self.line_height() * (self._text.count('\n') + 1))
+
+    def line_height(self):
+        return 16.0
+
+    def em_width(self):
+        return 8.0
+
+    def text_to_layout(self, pt):
+        row, col = self.rowcol(pt)
+
+        return (col * self.em_width(), row * self.line_height())
+
+    def layout_to_text(self, vector):
+        return self.text_point(int(vector[1] / self.line_height()), int(vector[0] / self.em_width()))
+
+    def window_to_layout(self, vector):
+        return vector
+
+    def folded_regions(self):
+        return []
+
+    def fold(self, x):
+        return False
+
+    def unfold(self, x):
+        return []
+
+    def indented_region(self, pt):
+        return Region(pt)
+
+    def indentation_level(self, pt):
+        return 0
+
+    def scope_name(self, pt):
+        return _syntax_scope(self._syntax) + ' '
+
+    def match_selector(self, pt, selector):
+        return self.score_selector(pt, selector) > 0
+
+    def score_selector(self, pt, selector):
+        return score_selector(self.scope_name(pt), selector)
+
+    def extract_scope(self, pt):
+        return self.line(pt)
+
+    def symbols(self):
+        return []
+
+    def indexed_symbols(self):
+        return []
+
+    def settings_syntax(self):
+        return self._syntax
+
+    def set_syntax_file(self, syntax_file):
+        self._syntax = syntax_file
+        self._settings.set('syntax', syntax_file)
+
+    def assign_syntax(self, syntax_file):
+        self.set_syntax_file(syntax_file)
+
+    def set_overwrite_status(self, value):
+        self._overwrite = value
+
+    def overwrite_status(self):
+        return self._overwrite
+
+    def run_command(self, cmd, args=None):
+        _run_command(self, cmd, args)
+
+    def _command(self, cmd):
+        # Returns the text command of the view, if there is one.
+        if cmd not in self._commands:
+            cls = sublime_plugin.text_command_classes.get(cmd)
+            self._commands[cmd] = cls(self) if cls else None
+
+        return self._commands[cmd]
+
+    def _run_text_command(self, cmd, args):
+        command = self._command(cmd)
+        if command:
+            command.run_(0, args)
+        elif cmd in _BUILTIN_TEXT_COMMANDS:
+            _BUILTIN_TEXT_COMMANDS[cmd](self, **(args or {}))
+        else:
+            return False
+
+        return True
+
+    def _record_command(self, cmd, args):
+        if cmd == 'insert' and self._command_history and self._command_history[-1][0] == 'insert':
+            characters = self._command_history[-1][1]['characters'] + args['characters']
+            self._command_history[-1] = ('insert', {'characters': characters}, 1)
+        else:
+            self._command_history.append((cmd, args, 1))
+            del self._command_history[:-64]
+
+    def _modify(self, begin, end, text):
+        if self._read_only:
+            return
+
+        begin = max(0, begin)
+        end = min(end, self._size)
+        if begin >= end and not text:
+            return
+
+        removed = self._replace_text(begin, end, text)
+        self._starts = None
+        self._change_count += 1
+
+        if not self._undoing:
+            if self._group is None:
+                self._group = _UndoGroup(list(self._sel))
+
+            self._group.ops.append((begin, removed, text))
+            self._redo = []
+
+        shift = len(text) - len(removed)
+
+        def adjust(pt):
+            if pt < begin or (pt == begin and end > begin):
+                return pt
+
+            if pt >= end:
+                return pt + shift
+
+            return begin + min(pt - begin, len(text))
+
+        self._sel._set([Region(adjust(r.a), adjust(r.b)) for r in self._sel._regions])
+        for key, regions in self._regions.items():
+            self._regions[key] = [Region(adjust(r.a), adjust(r.b)) for r in regions]
+
+    def _end_undo_group(self):
+        # Called when the command run from outside of any other command
+        # returns.
+        group = self._group
+        if group is not None:
+            self._group = None
+            group.sel_after = list(self._sel)
+            self._undo.append(group)
+
+    def _glue(self):
+        if self._glue_mark is None:
+            return
+
+        groups = self._undo[self._glue_mark:]
+        del self._undo[self._glue_mark:]
+        self._glue_mark = None
+
+        if not groups:
+            return
+
+        if self._group is None:
+            self._group = _UndoGroup(groups[0].sel)
+            self._group.ops = [op for group in groups for op in group.ops]
+        else:
+            self._group.sel = groups[0].sel
+            self._group.ops = [op for group in groups for op in group.ops] + self._group.ops
+
+    def _undo_group(self):
+        self._end_undo_group()
+        if not self._undo:
+            return
+
+        group = self._undo.pop()
+        self._undoing = True
+        try:
+            for begin, removed, text in reversed(group.ops):
+                self._modify(begin, begin + len(text), removed)
+        finally:
+            self._undoing = False
+
+        self._sel._set(group.sel)
+        self._redo.append(group)
+
+    def _redo_group(self):
+        if not self._redo:
+            return
+
+        group = self._redo.pop()
+        self._undoing = True
+        try:
+            for begin, removed, text in group.ops:
+                self._modify(begin, begin + len(removed), text)
+        finally:
+            self._undoing = False
+
+        self._sel._set(group.sel_after)
+        self._undo.append(group)
+
+
+def _indent(view):
+    if view.settings().get('translate_tabs_to_spaces'):
+        return ' ' * view.settings().get('tab_size', 4)
+
+    return '\t'
+
+
+def _expand_tabs(text, col, tab_size):
+    # Replace the tabs with spaces, up to the next tab stop.
+    expanded = ''
+    for c in text:
+        if c == '\t':
+            c = ' ' * (tab_size - col % tab_size)
+        expanded += c
+        col = 0 if c == '\n' else col + len(c)
+
+    return expanded
+
+
+def _insert(view, characters, overwrite=False):
+    # Replace each selection with the characters. A newline is indented like
+    # the line it's inserted in, if auto_indent is enabled. In overwrite mode
+    # the characters replace those after an empty selection, up to the end of
+    # the line.
+    for region in reversed(list(view.sel())):
+        text = characters
+        if '\n' in text and view.settings().get('auto_indent'):
+            line = view.line(region.begin())
+            indent = re.match('[ \t]*', view.substr(Region(line.a, region.begin()))).group(0)
+            text = text.replace('\n', '\n' + indent)
+
+        if overwrite and region.empty() and '\n' not in text:
+            view._modify(region.b, min(region.b + len(text), view.line(region.b).end()), '')
+
+        view._modify(region.begin(), region.end(), text)
+
+    view._sel._set([Region(r.b) for r in view._sel._regions])
+
+
+def _cmd_insert(view, characters=''):
+    _insert(view, characters, view.overwrite_status())
+
+
+def _cmd_insert_snippet(view, contents='', name=None, **kwargs):
+    _insert(view, re.sub(r'\$\{?\d+\}?', '', contents))
+
+
+def _cmd_append(view, characters='', force=False, scroll_to_end=False, **kwargs):
+    view._modify(view.size(), view.size(), characters)
+
+
+def _cmd_left_delete(view):
+    for region in reversed(list(view.sel())):
+        if not region.empty():
+            view._modify(region.begin(), region.end(), '')
+        elif region.b > 0:
+            view._modify(region.b - 1, region.b, '')
+
+
+def _cmd_right_delete(view):
+    for region in reversed(list(view.sel())):
+        if not region.empty():
+            view._modify(region.begin(), region.end(), '')
+        else:
+            view._modify(region.b, region.b + 1, '')
+
+
+def _cmd_undo(view):
+    view._undo_group()
+
+
+def _cmd_redo(view):
+    view._redo_group()
+
+
+def _cmd_mark_undo_groups_for_gluing(view):
+    view._end_undo_group()
+    view._glue_mark = len(view._undo)
+
+
+def _cmd_glue_marked_undo_groups(view):
+    view._glue()
+
+
+def _cmd_unmark_undo_groups_for_gluing(view):
+    view._glue_mark = None
+
+
+def _cmd_move(view, by, forward, extend=False, **kwargs):
+    regions = []
+    for r in view.sel():
+        b = r.b
+        if by == 'characters':
+            b = min(b + 1, view.size()) if forward else max(b - 1, 0)
+        elif by in ('lines', 'pages'):
+            row, col = view.rowcol(b)
+            rows = 1 if by == 'lines' else int(view.viewport_extent()[1] / view.line_height())
+            row = row + rows if forward else row - rows
+            if row < 0:
+                b = 0
+            else:
+                line = view.line(view.text_point(row, 0))
+                b = min(line.a + col, line.b)
+        elif by in ('words', 'word_ends', 'subwords', 'subword_ends'):
+            classes = CLASS_WORD_START if by in ('words', 'subwords') else CLASS_WORD_END
+            b = view.find_by_class(b, forward, classes | CLASS_LINE_END if forward else classes)
+
+        regions.append(Region(r.a if extend else b, b))
+
+    view.sel()._set(regions)
+
+
+def _cmd_move_to(view, to, extend=False):
+    regions = []
+    for r in view.sel():
+        if to in ('bol', 'hardbol'):
+            b = view.line(r.b).a
+        elif to in ('eol', 'hardeol'):
+            b = view.line(r.b).b
+        elif to == 'bof':
+            b = 0
+        elif to == 'eof':
+            b = view.size()
+        else:
+            b = r.b
+
+        regions.append(Region(r.a if extend else b, b))
+
+    view.sel()._set(regions)
+
+
+def _cmd_run_macro_file(view, file):
+    if file.endswith('Add Line Before.sublime-macro'):
+        _cmd_move_to(view, 'hardbol')
+        _insert(view, '\n')
+        _cmd_move(view, 'lines', False)
+    elif file.endswith('Add Line.sublime-macro'):
+        _cmd_move_to(view, 'hardeol')
+        _insert(view, '\n')
+
+
+def _cmd_indent(view):
+    indent = _indent(view)
+    for region in reversed(list(view.sel())):
+        lines = view.lines(region)
+        for line in reversed(lines):
+            if len(lines) == 1 or not line.empty():
+                view._modify(line.a, line.a, indent)
+
+
+def _cmd_unindent(view):
+    tab_size = view.settings().get('tab_size', 4)
+    for region in reversed(list(view.sel())):
+        for line in reversed(view.lines(region)):
+            text = view.substr(line)
+            if text.startswith('\t'):
+                size = 1
+            else:
+                size = min(len(text) - len(text.lstrip(' ')), tab_size)
+
+            view._modify(line.a, line.a + size, '')
+
+
+def _cmd_swap_case(view):
+    for region in view.sel():
+        view._modify(region.begin(), region.end(), view.substr(region).swapcase())
+
+
+def _cmd_upper_case(view):
+    for region in view.sel():
+        view._modify(region.begin(), region.end(), view.substr(region).upper())
+
+
+def _cmd_lower_case(view):
+    for region in view.sel():
+        view._modify(region.begin(), region.end(), view.substr(region).lower())
+
+
+def _cmd_copy(view):
+    set_clipboard('\n'.join(view.substr(r) for r in view.sel() if not r.empty()))
+
+
+def _cmd_select_all(view):
+    view.sel()._set([Region(0, view.size())])
+
+
+def _cmd_single_selection(view):
+    view.sel()._set([view.sel()[0]])
+
+
+def _cmd_swap_line(view, up):
+    # Swap the line of the first selection with the line above, or below.
+    row, col = view.rowcol(view.sel()[0].b)
+    other = row - 1 if up else row + 1
+    lines = view.substr(Region(0, view.size())).split('\n')
+    if other < 0 or other >= len(lines):
+        return
+
+    first = min(row, other)
+    begin = view.text_point(first, 0)
+    end = view.line(view.text_point(first + 1, 0)).b
+    view._modify(begin, end, lines[first + 1] + '\n' + lines[first])
+    view.sel()._set([Region(view.text_point(other, col))])
+
+
+def _cmd_reindent(view, force_indent=True):
+    # Indent the blank lines of the selections like the line above.
+    for region in reversed(list(view.sel())):
+        line = view.line(region.b)
+        if view.substr(line).strip() or line.a == 0:
+            continue
+
+        above = view.line(line.a - 1)
+        while above.a > 0 and not view.substr(above).strip():
+            above = view.line(above.a - 1)
+
+        indent = re.match('[ \t]*', view.substr(above)).group(0)
+        view._modify(line.a, line.b, indent)
+
+    view._sel._set([Region(view.line(r.b).b) if not view.substr(view.line(r.b)).strip() else r
+                    for r in view._sel._regions])
+
+
+def _cmd_toggle_comment(view, block=False):
+    # Toggle the line comments of the lines of the selections, like the
+    # command of the Default package.
+    comment = _LINE_COMMENTS.get(_syntax_scope(view._syntax))
+    if not comment:
+        return
+
+    for region in reversed(list(view.sel())):
+        lines = view.lines(region)
+        texts = [view.substr(line) for line in lines]
+        commented = [t.lstrip().startswith(comment.strip()) for t in texts if t.strip()]
+        if commented and all(commented):
+            for line, text in reversed(list(zip(lines, texts))):
+                begin = line.a + len(text) - len(text.lstrip())
+                if view.substr(Region(begin, begin + len(comment))) == comment:
+                    view._modify(begin, begin + len(comment), '')
+                elif text.strip():
+                    view._modify(begin, begin + len(comment.strip()), '')
+        elif len(texts) == 1 and texts[0].strip() == comment.strip():
+            view._modify(lines[0].a, lines[0].b, '')
+        else:
+            blank = all(not t.strip() for t in texts)
+            indents = [len(t) - len(t.lstrip()) for t in texts if t.strip() or blank]
+            column = min(indents)
+            for line, text in reversed(list(zip(lines, texts))):
+                if text.strip() or blank:
+                    view._modify(line.a + column, line.a + column, comment)
+
+
+def _cmd_noop(view, **kwargs):
+    pass
+
+
+_BUILTIN_TEXT_COMMANDS = {
+    'append': _cmd_append,
+    'copy': _cmd_copy,
+    'glue_marked_undo_groups': _cmd_glue_marked_undo_groups,
+    'hide_auto_complete': _cmd_noop,
+    'indent': _cmd_indent,
+    'insert': _cmd_insert,
+    'insert_snippet': _cmd_insert_snippet,
+    'left_delete': _cmd_left_delete,
+    'lower_case': _cmd_lower_case,
+    'mark_undo_groups_for_gluing': _cmd_mark_undo_groups_for_gluing,
+    'move': _cmd_move,
+    'move_to': _cmd_move_to,
+    'redo': _cmd_redo,
+    'redo_or_repeat': _cmd_redo,
+    'reindent': _cmd_reindent,
+    'right_delete': _cmd_right_delete,
+    'run_macro_file': _cmd_run_macro_file,
+    'scroll_lines': _cmd_noop,
+    'select_all': _cmd_select_all,
+    'single_selection': _cmd_single_selection,
+    'soft_redo': _cmd_redo,
+    'soft_undo': _cmd_undo,
+    'swap_case': _cmd_swap_case,
+    'swap_line_down': lambda view: _cmd_swap_line(view, False),
+    'swap_line_up': lambda view: _cmd_swap_line(view, True),
+    'toggle_comment': _cmd_toggle_comment,
+    'undo': _cmd_undo,
+    'unindent': _cmd_unindent,
+    'unmark_undo_groups_for_gluing': _cmd_unmark_undo_groups_for_gluing,
+    'upper_case': _cmd_upper_case,
+}
+
+
+class Window:
+
+    def __init__(self):
+        self._id = _next_id()
+        self._views = []  # type: list
+        self._active_view = None
+        self._panels = {}  # type: dict
+        self._active_panel = None
+        self._settings = Settings()
+        self._template_settings = Settings()
+        self._commands = {}  # type: dict
+        self._layout = {'cols': [0.0, 1.0], 'rows': [0.0, 1.0], 'cells': [[0, 0, 1, 1]]}
+        self._active_group = 0
+        self._visible = {'menu': True, 'minimap': True, 'sidebar': True, 'status_bar': True, 'tabs': True}
+        self._project_data = None
+        self._quick_panel = None
+        self._input_panel = None
+
+    def __eq__(self, rhs):
+        return isinstance(rhs, Window) and self._id == rhs._id
+
+    def __hash__(self):
+        return self._id
+
+    def id(self):
+        return self._id
+
+    def is_valid(self):
+        return self in _windows
+
+    def settings(self):
+        return self._settings
+
+    def template_settings(self):
+        return self._template_settings
+
+    def views(self):
+        return list(self._views)
+
+    def active_view(self):
+        return self._active_view
+
+    def active_sheet(self):
+        return self._active_view
+
+    def active_group(self):
+        return self._active_group
+
+    def num_groups(self):
+        return len(self._layout['cells'])
+
+    def focus_group(self, idx):
+        if 0 <= idx < self.num_groups():
+            self._active_group = idx
+
+    def views_in_group(self, group):
+        return list(self._views) if group == 0 else []
+
+    def active_view_in_group(self, group):
+        return self._active_view if group == 0 else None
+
+    def get_view_index(self, view):
+        if view in self._views:
+            return (0, self._views.index(view))
+
+        return (-1, -1)
+
+    def set_view_index(self, view, group, idx):
+        if view in self._views:
+            self._views.remove(view)
+            self._views.insert(idx, view)
+
+    def layout(self):
+        return self._layout
+
+    def get_layout(self):
+        return self._layout
+
+    def set_layout(self, layout):
+        self._layout = layout
+        self._active_group = min(self._active_group, self.num_groups() - 1)
+
+    def new_file(self, flags=0, syntax=''):
+        view = View(self)
+        self._views.append(view)
+        _notify('on_new', view)
+        self.focus_view(view)
+
+        return view
+
+    def open_file(self, fname, flags=0, group=-1):
+        row = col = 0
+        if flags & ENCODED_POSITION:
+            match = re.match(r'^(.*?)(?::(\d+))?(?::(\d+))?$', fname)
+            fname = match.group(1)
+            row = int(match.group(2) or 1) - 1
+            col = int(match.group(3) or 1) - 1
+
+        view = self.find_open_file(fname)
+        if not view:
+            view = View(self)
+            view._file_name = os.path.abspath(fname)
+            if os.path.isfile(fname):
+                with open(fname, encoding='utf-8', newline='') as f:
+                    view._undoing = True
+                    view._modify(0, 0, f.read())
+                    view._undoing = False
+                    view._saved_change_count = view._change_count
+
+            self._views.append(view)
+            _notify('on_load', view)
+
+        if flags & ENCODED_POSITION:
+            view.sel()._set([Region(view.text_point(row, col))])
+
+        self.focus_view(view)
+
+        return view
+
+    def find_open_file(self, fname):
+        fname = os.path.abspath(fname)
+        for view in self._views:
+            if view.file_name() == fname:
+                return view
+
+        return None
+
+    def focus_view(self, view):
+        if view in self._views and view != self._active_view:
+            if self._active_view:
+                _notify('on_deactivated', self._active_view)
+
+            self._active_view = view
+            _notify('on_activated', view)
+
+    def focus_sheet(self, sheet):
+        self.focus_view(sheet)
+
+    def _close_view(self, view):
+        if view not in self._views:
+            return
+
+        _notify('on_pre_close', view)
+        index = self._views.index(view)
+        self._views.remove(view)
+        view._valid = False
+        _notify('on_close', view)
+
+        if view == self._active_view:
+            self._active_view = None
+            if self._views:
+                self.focus_view(self._views[max(0, index - 1)])
+
+    def create_output_panel(self, name, unlisted=False):
+        panel = self._panels.get(name)
+        if not panel:
+            panel = View(self, {'is_widget': True}, panel=name)
+            self._panels[name] = panel
+        else:
+            panel._undoing = True
+            panel._modify(0, panel.size(), '')
+            panel._undoing = False
+
+        return panel
+
+    def find_output_panel(self, name):
+        return self._panels.get(name)
+
+    def get_output_panel(self, name):
+        return self._panels.get(name) or self.create_output_panel(name)
+
+    def destroy_output_panel(self, name):
+        self._panels.pop(name, None)
+
+    def active_panel(self):
+        return self._active_panel
+
+    def panels(self):
+        return ['output.' + name for name in self._panels]
+
+    def show_input_panel(self, caption, initial_text, on_done, on_change, on_cancel):
+        panel = View(self, {'is_widget': True}, panel='input')
+        panel._modify(0, 0, initial_text)
+        panel.sel()._set([Region(panel.size())])
+        self._input_panel = (panel, on_done, on_change, on_cancel)
+
+        return panel
+
+    def show_quick_panel(self, items, on_select, flags=0, selected_index=-1, on_highlight=None):
+        self._quick_panel = (items, on_select, on_highlight)
+
+    def run_command(self, cmd, args=None):
+        _run_command(self, cmd, args)
+
+    def _command(self, cmd):
+        if cmd not in self._commands:
+            cls = sublime_plugin.window_command_classes.get(cmd)
+            self._commands[cmd] = cls(self) if cls else None
+
+        return self._commands[cmd]
+
+    def _run_window_command(self, cmd, args):
+        command = self._command(cmd)
+        if command:
+            command.run_(0, args)
+        elif cmd in _BUILTIN_WINDOW_COMMANDS:
+            _BUILTIN_WINDOW_COMMANDS[cmd](self, **(args or {}))
+        elif self._active_view:
+            return self._active_view._run_text_command(cmd, args)
+        else:
+            return False
+
+        return True
+
+    def extract_variables(self):
+        return {
+            'packages': packages_path(),
+            'platform': platform().title(),
+        }
+
+    def folders(self):
+        return []
+
+    def project_file_name(self):
+        return None
+
+    def project_data(self):
+        return self._project_data
+
+    def set_project_data(self, data):
+        self._project_data = data
+
+    def lookup_symbol_in_index(self, symbol):
+        return []
+
+    def lookup_symbol_in_open_files(self, symbol):
+        return []
+
+    def is_menu_visible(self):
+        return self._visible['menu']
+
+    def set_menu_visible(self, flag):
+        self._visible['menu'] = flag
+
+    def is_minimap_visible(self):
+        return self._visible['minimap']
+
+    def set_minimap_visible(self, flag):
+        self._visible['minimap'] = flag
+
+    def is_sidebar_visible(self):
+        return self._visible['sidebar']
+
+    def set_sidebar_visible(self, flag):
+        self._visible['sidebar'] = flag
+
+    def is_status_bar_visible(self):
+        return self._visible['status_bar']
+
+    def set_status_bar_visible(self, flag):
+        self._visible['status_bar'] = flag
+
+    def get_tabs_visible(self):
+        return self._visible['tabs']
+
+    def set_tabs_visible(self, flag):
+        self._visible['tabs'] = flag
+
+
+def _win_new_file(window, **kwargs):
+    window.new_file()
+
+
+def _win_close(window, **kwargs):
+    if window._active_view:
+        window._active_view.close()
+
+
+def _win_close_all(window, **kwargs):
+    for view in window.views():
+        view.close()
+
+
+def _win_show_panel(window, panel, **kwargs):
+    window._active_panel = panel
+
+
+def _win_hide_panel(window, **kwargs):
+    window._active_panel = None
+
+
+def _win_toggle(name):
+    def toggle(window, **kwargs):
+        window._visible[name] = not window._visible[name]
+
+    return toggle
+
+
+def _win_noop(window, **kwargs):
+    pass
+
+
+_BUILTIN_WINDOW_COMMANDS = {
+    'close': _win_close,
+    'close_all': _win_close_all,
+    'close_file': _win_close,
+    'hide_overlay': _win_noop,
+    'hide_panel': _win_hide_panel,
+    'new_file': _win_new_file,
+    'set_layout': lambda window, **layout: window.set_layout(layout),
+    'show_overlay': _win_noop,
+    'show_panel': _win_show_panel,
+    'toggle_menu': _win_toggle('menu'),
+    'toggle_minimap': _win_toggle('minimap'),
+    'toggle_side_bar': _win_toggle('sidebar'),
+    'toggle_status_bar': _win_toggle('status_bar'),
+    'toggle_tabs': _win_toggle('tabs'),
+}
+
+
+def _run_command(target, cmd, args):
+    global _depth
+
+    if args is not None:
+        # Like Sublime Text, the args are passed as JSON.
+        args = json.loads(json.dumps(args))
+
+    view = target if isinstance(target, View) else (target.active_view() if isinstance(target, Window) else None)
+    if _depth == 0 and view and isinstance(target, View):
+        view._record_command(cmd, args or {})
+
+    _depth += 1
+    try:
+        if isinstance(target, View):
+            target._run_text_command(cmd, args)
+        elif isinstance(target, Window):
+            target._run_window_command(cmd, args)
+        else:
+            cls = sublime_plugin.application_command_classes.get(cmd)
+            if cls:
+                cls().run_(0, args)
+    except Exception:
+        traceback.print_exc()
+    finally:
+        _depth -= 1
+
+    if _depth == 0:
+        for window in _windows:
+            for v in window._views + list(window._panels.values()):
+                v._end_undo_group()
+
+        run_timeouts()
+
+
+def _notify(event, view, *args):
+    for listener in sublime_plugin.all_callbacks.get(event, []):
+        try:
+            getattr(listener, event)(view, *args)
+        except Exception:
+            traceback.print_exc()
+
+
+def run_timeouts():
+    # Run the callbacks passed to set_timeout(), in order of their delay.
+    global _running_timeouts
+
+    if _running_timeouts:
+        return
+
+    _running_timeouts = True
+    try:
+        for i in range(_MAX_TIMEOUTS):
+            if not _timeouts:
+                break
+
+            _timeouts.sort(key=lambda t: t[0])
+            due, callback = _timeouts.pop(0)
+            try:
+                callback()
+            except Exception:
+                traceback.print_exc()
+    finally:
+        _running_timeouts = False
+
+
+def set_timeout(callback, delay=0):
+    _timeouts.append((time.time() + delay / 1000.0, callback))
+
+    if _depth == 0:
+        run_timeouts()
+
+
+def set_timeout_async(callback, delay=0):
+    set_timeout(callback, delay)
+
+
+def active_window():
+    if not _windows:
+        _windows.append(Window())
+
+    return _windows[0]
+
+
+def windows():
+    return list(_windows)
+
+
+def run_command(cmd, args=None):
+    _run_command(None, cmd, args)
+
+
+def status_message(msg):
+    _status_messages.append(msg)
+    del _status_messages[:-100]
+
+
+def error_message(msg):
+    print('error: ' + str(msg), file=sys.stderr)
+
+
+def message_dialog(msg):
+    pass
+
+
+def ok_cancel_dialog(msg, ok_title=''):
+    return False
+
+
+def yes_no_cancel_dialog(msg, yes_title='', no_title=''):
+    return DIALOG_CANCEL
+
+
+def get_clipboard(size_limit=16777216):
+    return _clipboard
+
+
+def set_clipboard(text):
+    global _clipboard
+    _clipboard = text
+
+
+def load_settings(base_name):
+    if base_name not in _settings:
+        settings = Settings()
+        if base_name == 'Preferences.sublime-settings':
+            settings._values.update(_DEFAULT_PREFERENCES)
+
+        path = os.path.join(_PACKAGE_PATH, base_name)
+        if os.path.isfile(path):
+            with open(path, encoding='utf-8') as f:
+                settings._values.update(json.loads(_strip_json_comments(f.read())))
+
+        _settings[base_name] = settings
+
+    return _settings[base_name]
+
+
+def save_settings(base_name):
+    pass
+
+
+def _resource_path(name):
+    prefix = 'Packages/' + _PACKAGE_NAME + '/'
+    if name.startswith(prefix):
+        return os.path.join(_PACKAGE_PATH, name[len(prefix):])
+
+    return None
+
+
+def load_resource(name):
+    path = _resource_path(name)
+    if not path or not os.path.isfile(path):
+        raise IOError('resource not found')
+
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def load_binary_resource(name):
+    path = _resource_path(name)
+    if not path or not os.path.isfile(path):
+        raise IOError('resource not found')
+
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def find_resources(pattern):
+    resources = []
+    for root, dirs, files in os.walk(_PACKAGE_PATH):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in glob.fnmatch.filter(files, pattern):
+            path = os.path.relpath(os.path.join(root, name), _PACKAGE_PATH)
+            resources.append('Packages/' + _PACKAGE_NAME + '/' + path.replace(os.sep, '/'))
+
+    return sorted(resources)
+
+
+def packages_path():
+    return os.path.join(_DATA_PATH, 'Packages')
+
+
+def installed_packages_path():
+    return os.path.join(_DATA_PATH, 'Installed Packages')
+
+
+def cache_path():
+    return os.path.join(_DATA_PATH, 'Cache')
+
+
+def executable_path():
+    return sys.executable
+
+
+def version():
+    return '3176'
+
+
+def channel():
+    return 'stable'
+
+
+def platform():
+    if sys.platform.startswith('win'):
+        return 'windows'
+
+    if sys.platform == 'darwin':
+        return 'osx'
+
+    return 'linux'
+
+
+def arch():
+    return 'x64'
+
+
+def score_selector(scope_name, selector):
+    # Only selectors of a single scope are matched, e.g. "text.html, text.xml".
+    score = 0
+    scope = scope_name.strip()
+    for alternative in selector.split(','):
+        parts = alternative.split()
+        if len(parts) == 1 and (scope == parts[0] or scope.startswith(parts[0] + '.')):
+            score = max(score, parts[0].count('.') + 1)
+
+    return score
+
+
+# The line comments, by the scope of the syntax.
+_LINE_COMMENTS = {
+    'source.c': '// ',
+    'source.c++': '// ',
+    'source.java': '// ',
+    'source.js': '// ',
+    'source.php': '// ',
+    'source.python': '# ',
+    'source.ruby': '# ',
+    'source.shell': '# ',
+    'source.yaml': '# ',
+}
+
+
+def _syntax_scope(syntax):
+    # Returns the scope of a syntax of the package, read from the syntax file,
+    # or else one made up from the syntax name.
+    try:
+        match = re.search(r'^scope:\s*(\S+)', load_resource(syntax), re.M)
+        if match:
+            return match.group(1)
+    except IOError:
+        pass
+
+    name = os.path.splitext(os.path.basename(syntax))[0].lower()
+    if name == 'plain text':
+        return 'text.plain'
+
+    if name in ('html', 'xml'):
+        return 'text.' + name
+
+    return 'source.' + name.replace(' ', '_')
+
+
+def log_commands(flag):
+    pass
+
+
+def log_input(flag):
+    pass
+
+
+def log_result_regex(flag):
+    pass
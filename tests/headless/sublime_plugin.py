@@ -0,0 +1,170 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+# A stand-in for the Sublime Text plugin API, see sublime.py.
+
+import importlib
+
+
+application_command_classes = {}  # type: dict
+window_command_classes = {}  # type: dict
+text_command_classes = {}  # type: dict
+
+# The event listeners, by the name of the event.
+all_callbacks = {}  # type: dict
+
+
+def reload_plugin(modulename):
+    # Load a plugin module, and register its commands and event listeners.
+    #
+    # Unlike Sublime Text, a module that is already loaded isn't reloaded, so
+    # the commands registered before keep working.
+    module = importlib.import_module(modulename)
+
+    for value in list(module.__dict__.values()):
+        if not isinstance(value, type):
+            continue
+
+        if issubclass(value, TextCommand) and value is not TextCommand:
+            text_command_classes[_command_name(value)] = value
+        elif issubclass(value, WindowCommand) and value is not WindowCommand:
+            window_command_classes[_command_name(value)] = value
+        elif issubclass(value, ApplicationCommand) and value is not ApplicationCommand:
+            application_command_classes[_command_name(value)] = value
+        elif issubclass(value, EventListener) and value is not EventListener:
+            _add_listener(value())
+
+    if 'plugin_loaded' in module.__dict__:
+        module.plugin_loaded()
+
+    return module
+
+
+def _add_listener(listener):
+    for name in dir(listener):
+        if name.startswith('on_') and callable(getattr(listener, name)):
+            callbacks = all_callbacks.setdefault(name, [])
+            if not any(type(c) is type(listener) for c in callbacks):
+                callbacks.append(listener)
+
+
+def _command_name(cls):
+    # The name of a command, as Sublime Text derives it from the class name.
+    # For example, "ToggleSideBarCommand" is named "toggle_side_bar".
+    clsname = cls.__name__
+    name = clsname[0].lower()
+    last_upper = False
+    for c in clsname[1:]:
+        if c.isupper() and not last_upper:
+            name += '_'
+            name += c.lower()
+        else:
+            name += c
+
+        last_upper = c.isupper()
+
+    if name.endswith('_command'):
+        name = name[0:-8]
+
+    return name
+
+
+class Command:
+
+    def name(self):
+        return _command_name(self.__class__)
+
+    def is_enabled(self):
+        return True
+
+    def is_visible(self):
+        return True
+
+    def is_checked(self):
+        return False
+
+    def description(self):
+        return None
+
+    def filter_args(self, args):
+        if args:
+            if 'event' in args and not self.want_event():
+                args = args.copy()
+                del args['event']
+
+        return args
+
+    def want_event(self):
+        return False
+
+
+class ApplicationCommand(Command):
+
+    def run_(self, edit_token, args):
+        args = self.filter_args(args)
+        if args:
+            return self.run(**args)
+        else:
+            return self.run()
+
+
+class WindowCommand(Command):
+
+    def __init__(self, window):
+        self.window = window
+
+    def run_(self, edit_token, args):
+        args = self.filter_args(args)
+        if args:
+            return self.run(**args)
+        else:
+            return self.run()
+
+
+class TextCommand(Command):
+
+    def __init__(self, view):
+        self.view = view
+
+    def run_(self, edit_token, args):
+        args = self.filter_args(args)
+        edit = self.view.begin_edit(edit_token, self.name(), args)
+        try:
+            if args:
+                return self.run(edit, **args)
+            else:
+                return self.run(edit)
+        finally:
+            self.view.end_edit(edit)
+
+
+class EventListener:
+    pass
+
+
+class ViewEventListener:
+
+    @classmethod
+    def is_applicable(cls, settings):
+        return True
+
+    @classmethod
+    def applies_to_primary_view_only(cls):
+        return True
+
+    def __init__(self, view):
+        self.view = view
@@ -17,6 +17,7 @@
 
 import unittest
 
+from NeoVintageous.nv.ex import parser
 from NeoVintageous.nv.ex.parser import _ParserState
 from NeoVintageous.nv.ex.parser import parse_command_line
 from NeoVintageous.nv.ex.parser import TokenComma
@@ -328,3 +329,51 @@ class TestParseLineRefParseWriteCommand(unittest.TestCase):
     def test_can_parse_alias(self):
         parsed = parse_command_line('w')
         self.assertEqual(parsed.command.content, 'write')
+
+
+class TestParseCommandLineCache(unittest.TestCase):
+
+    def setUp(self):
+        parser._cache.clear()
+
+    def tearDown(self):
+        parser._cache.clear()
+
+    def test_returns_equal_copies(self):
+        first = parse_command_line('1,2s/a/b/')
+        second = parse_command_line('1,2s/a/b/')
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.line_range, second.line_range)
+        self.assertIsNot(first.command, second.command)
+        self.assertEqual(first.line_range, second.line_range)
+        self.assertEqual(str(first), str(second))
+        self.assertEqual(1, len(parser._cache))
+
+    def test_mutating_params_does_not_leak_into_cache(self):
+        first = parse_command_line('s/a/b/')
+        first.command.params['view'] = 'x'
+        first.line_range.start.append(TokenDigits('1'))
+        second = parse_command_line('s/a/b/')
+        self.assertNotIn('view', second.command.params)
+        self.assertEqual([], second.line_range.start)
+
+    def test_empty_command_line(self):
+        parse_command_line('')
+        parsed = parse_command_line('')
+        self.assertIsNone(parsed.line_range)
+        self.assertIsNone(parsed.command)
+
+    def test_errors_are_not_cached(self):
+        self.assertRaises(ValueError, parse_command_line, '.10')
+        self.assertRaises(ValueError, parse_command_line, '.10')
+        self.assertEqual(0, len(parser._cache))
+
+    def test_evicts_least_recently_used(self):
+        size = parser._CACHE_SIZE
+        for i in range(size):
+            parse_command_line(str(i))
+        parse_command_line('0')
+        parse_command_line(str(size))
+        self.assertEqual(size, len(parser._cache))
+        self.assertIn('0', parser._cache)
+        self.assertNotIn('1', parser._cache)
@@ -15,8 +15,12 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import re
 import unittest
 
+from NeoVintageous.nv.ex.scanner import _route_first_chars
+from NeoVintageous.nv.ex.scanner import _routes_any_char
+from NeoVintageous.nv.ex.scanner import _routes_by_char
 from NeoVintageous.nv.ex.scanner import _scan_command
 from NeoVintageous.nv.ex.scanner import _ScannerState
 from NeoVintageous.nv.ex.scanner import Scanner
@@ -32,6 +36,7 @@ from NeoVintageous.nv.ex.scanner import TokenSearchBackward
 from NeoVintageous.nv.ex.scanner import TokenSearchForward
 from NeoVintageous.nv.ex.scanner import TokenSemicolon
 from NeoVintageous.nv.ex.tokens import TokenCommand
+from NeoVintageous.nv.ex_routes import ex_routes
 
 
 class TestScannerState(unittest.TestCase):
@@ -242,7 +247,7 @@ class TestScanner(unittest.TestCase):
     def test_can_scan_empty_range(self):
         scanner = Scanner("s")
         tokens = list(scanner.scan())
-        self.assertEqual([TokenCommand('substitute', addressable=True), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True), TokenEof()], tokens)  # noqa: E501
         self.assertEqual(1, scanner.state.position)
 
     def test_can_scan_dot_offset_search_forward(self):
@@ -278,19 +283,19 @@ class TestScannerCommandName(unittest.TestCase):
     def test_can_instantiate(self):
         scanner = Scanner("substitute")
         tokens = list(scanner.scan())
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=None), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=None), TokenEof()], tokens)  # noqa: E501
 
     def test_can_scan_substitute_paramaters(self):
         scanner = Scanner("substitute:foo:bar:")
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": [], "count": 1}
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
     def test_can_scan_substitute_paramaters_with_flags(self):
         scanner = Scanner("substitute:foo:bar:r")
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": ['r'], "count": 1}
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
     def test_scan_can_fail_if_substitute_paramaters_flags_have_wrong_order(self):
         scanner = Scanner("substitute:foo:bar:r&")
@@ -300,13 +305,13 @@ class TestScannerCommandName(unittest.TestCase):
         scanner = Scanner("substitute:foo:bar: 10")
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": [], "count": 10}
-        self.assertEqual([TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)
+        self.assertEqual([TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
     def test_can_scan_substitute_paramater_with_range(self):
         scanner = Scanner(r'%substitute:foo:bar: 10')
         tokens = list(scanner.scan())
         params = {"pattern": "foo", "replacement": "bar", "flags": [], "count": 10}
-        self.assertEqual([TokenPercent(), TokenCommand('substitute', addressable=True, params=params), TokenEof()], tokens)  # noqa: E501
+        self.assertEqual([TokenPercent(), TokenCommand('substitute', addressable=True, cooperates_with_global=True, params=params), TokenEof()], tokens)  # noqa: E501
 
 
 class TestScannerMarksScanner(unittest.TestCase):
@@ -453,9 +458,9 @@ class Test_scan_command(unittest.TestCase):
         assert_command('clos', (None, [TokenCommand('close'), TokenEof()]))  # noqa: E501
         assert_command('close!', (None, [TokenCommand('close', forced=True), TokenEof()]))  # noqa: E501
         assert_command('close', (None, [TokenCommand('close'), TokenEof()]))  # noqa: E501
-        assert_command('copy 3', (None, [TokenCommand('copy', params={'address': '3'}, addressable=True), TokenEof()]))  # noqa: E501
+        assert_command('copy 3', (None, [TokenCommand('copy', params={'address': '3'}, addressable=True, cooperates_with_global=True), TokenEof()]))  # noqa: E501
         assert_command('cquit', (None, [TokenCommand('cquit'), TokenEof()]))  # noqa: E501
-        assert_command('delete', (None, [TokenCommand('delete', params={'register': '"', 'count': None}, addressable=True), TokenEof()]))  # noqa: E501
+        assert_command('delete', (None, [TokenCommand('delete', params={'register': '"', 'count': None}, addressable=True, cooperates_with_global=True), TokenEof()]))  # noqa: E501
         assert_command('f', (None, [TokenCommand('file'), TokenEof()]))  # noqa: E501
         assert_command('file', (None, [TokenCommand('file'), TokenEof()]))  # noqa: E501
         assert_command('files', (None, [TokenCommand('buffers'), TokenEof()]))  # noqa: E501
@@ -475,3 +480,33 @@ class Test_scan_command(unittest.TestCase):
         assert_command('tabc', (None, [TokenCommand('tabclose'), TokenEof()]))  # noqa: E501
         assert_command('tabNext', (None, [TokenCommand('tabprevious'), TokenEof()]))  # noqa: E501
         assert_command('tabN', (None, [TokenCommand('tabprevious'), TokenEof()]))  # noqa: E501
+
+
+class TestScannerRoutes(unittest.TestCase):
+
+    def test_route_first_chars(self):
+        self.assertEqual(_route_first_chars(r'bf(?:irst)?'), {'b'})
+        self.assertEqual(_route_first_chars(r'^cd(?=[^d]|$)'), {'c'})
+        self.assertEqual(_route_first_chars(r'!(?=.+)'), {'!'})
+        self.assertEqual(_route_first_chars(r'&&?'), {'&'})
+        self.assertEqual(_route_first_chars(r'(?:files|ls|buffers)!?'), {'f', 'l', 'b'})
+        self.assertIsNone(_route_first_chars(r'(?:a|.b)'))
+        self.assertIsNone(_route_first_chars(r'.*'))
+        self.assertIsNone(_route_first_chars(r'[ab]'))
+
+    def test_resolves_same_route_as_ordered_routes(self):
+        def linear(source):
+            for route, command in ex_routes.items():
+                if re.compile(route).match(source):
+                    return command
+
+        def indexed(source):
+            for pattern, command in _routes_by_char.get(source[:1], _routes_any_char):
+                if pattern.match(source):
+                    return command
+
+        for source in ('!ls', '&&', 'bN', 'bro', 'br', 'bp', 'cd', 'cdd', 'clo', 'co', 'cq', 'd', 'e', 'exi', 'f',
+                       'files', 'ls', 'buffers', 'g/x/p', 'm', 'new', 'nn', 'no', 'nun', 'on', 'ono', 'ou', 'p',
+                       'pw', 'q', 'qa', 'r', 'reg', 's/x/y/', 'se', 'setl', 'sh', 'sp', 'tabN', 'tabn', 'unvsplit',
+                       'w', 'wa', 'wq', 'wqa', 'x', 'xa', 'y', 'z', '', ' '):
+            self.assertIs(indexed(source), linear(source), source)
@@ -15,6 +15,8 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+import re
+
 import sublime
 
 from NeoVintageous.tests import unittest
@@ -24,9 +26,11 @@ from NeoVintageous.nv.ex.tokens import TokenComma
 from NeoVintageous.nv.ex.tokens import TokenDigits
 from NeoVintageous.nv.ex.tokens import TokenDollar
 from NeoVintageous.nv.ex_cmds import _parse_user_cmdline
+from NeoVintageous.nv.ex_cmds import _SubstituteConfirm
 from NeoVintageous.nv.ex_cmds import do_ex_cmdline
 from NeoVintageous.nv.ex_cmds import do_ex_command
 from NeoVintageous.nv.ex_cmds import do_ex_user_cmdline
+from NeoVintageous.nv.substitute import find_substitutions
 
 
 _mock = {}
@@ -660,3 +664,73 @@ class Test_parse_user_cmdline(unittest.TestCase):
         self.assert_parsed(':Name foo=', None)
         self.assert_parsed(':Name foo=<', None)
         self.assert_parsed(':Name$', None)
+
+
+class TestSubstituteConfirm(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patch = unittest.mock.patch.object(_SubstituteConfirm, 'prompt')
+        self.prompt = patch.start()
+        self.addCleanup(patch.stop)
+
+    def confirm(self, text, keys, pattern='x', replacement='y', count=0):
+        self.normal(text)
+        region = self.Region(0, self.view.size())
+        substitutions = find_substitutions(self.view, [region], re.compile(pattern, re.M), replacement, count)
+        confirm = _SubstituteConfirm(self.view, substitutions, pattern)
+        confirm.start()
+        for key in keys:
+            confirm.on_key(key)
+
+        return confirm
+
+    def test_y_confirms_and_n_skips(self):
+        self.confirm('|x\nx\nx\n', 'yny')
+        self.assertNormal('y\nx\n|y\n')
+
+    def test_a_confirms_all_remaining(self):
+        self.confirm('|xx\n  x\n', 'na')
+        self.assertNormal('xy\n  |y\n')
+
+    def test_l_confirms_and_quits(self):
+        self.confirm('|x\nx\nx\n', 'yl')
+        self.assertNormal('y\n|y\nx\n')
+
+    def test_q_quits(self):
+        self.confirm('|x\nx\nx\n', 'yq')
+        self.assertNormal('|y\nx\nx\n')
+        self.confirm('x\n|x\nx\n', 'nq')
+        self.assertNormal('x\n|x\nx\n')
+
+    def test_count_is_per_line(self):
+        self.confirm('|xx\nxx\n', 'ny', count=1)
+        self.assertNormal('xx\n|yx\n')
+
+    def test_nothing_changes_until_done(self):
+        self.confirm('|x\nx\nx\n', 'yy')
+        self.assertContent('x\nx\nx\n')
+        self.assertEqual(3, self.prompt.call_count)
+
+    def test_other_keys_prompt_again(self):
+        confirm = self.confirm('|x\nx\n', 'z')
+        self.assertEqual(2, self.prompt.call_count)
+        confirm.on_key('y')
+        confirm.on_key('y')
+        self.assertNormal('y\n|y\n')
+
+    def test_keys_after_done_are_ignored(self):
+        confirm = self.confirm('|x\nx\n', 'l')
+        confirm.on_key('y')
+        self.assertNormal('|y\nx\n')
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.status_message')
+    def test_pattern_not_found(self, status_message):
+        self.confirm('|a\n', '')
+        status_message.assert_called_once_with('E486: Pattern not found: x')
+        self.assertEqual(0, self.prompt.call_count)
+
+    @unittest.mock.patch('NeoVintageous.nv.ex_cmds.status_message')
+    def test_reports_counts(self, status_message):
+        self.confirm('|xx\nx\nx\n', 'yyny')
+        status_message.assert_called_once_with('3 substitutions on 2 lines')
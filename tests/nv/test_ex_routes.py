@@ -23,14 +23,18 @@ from NeoVintageous.nv.ex.scanner import _ScannerState
 from NeoVintageous.nv.ex_routes import _ex_route_buffers
 from NeoVintageous.nv.ex_routes import _ex_route_cd
 from NeoVintageous.nv.ex_routes import _ex_route_close
+from NeoVintageous.nv.ex_routes import _ex_route_copy
 from NeoVintageous.nv.ex_routes import _ex_route_exit
 from NeoVintageous.nv.ex_routes import _ex_route_file
 from NeoVintageous.nv.ex_routes import _ex_route_global
+from NeoVintageous.nv.ex_routes import _ex_route_move
 from NeoVintageous.nv.ex_routes import _ex_route_noremap
 from NeoVintageous.nv.ex_routes import _ex_route_only
 from NeoVintageous.nv.ex_routes import _ex_route_onoremap
+from NeoVintageous.nv.ex_routes import _ex_route_profile
 from NeoVintageous.nv.ex_routes import _ex_route_substitute
 from NeoVintageous.nv.ex_routes import _ex_route_tabnext
+from NeoVintageous.nv.ex_routes import _ex_route_vglobal
 from NeoVintageous.nv.ex_routes import ex_routes
 from NeoVintageous.nv.ex_routes import TokenCommand
 from NeoVintageous.nv.ex_routes import TokenEof
@@ -175,6 +179,36 @@ class Test_ex_route_global(unittest.TestCase):
         self.assertEqual(actual, (None, [TokenCommand('global', addressable=True, forced=True, params={'pattern': '111', 'cmd': 'delete'}), TokenEof()]))  # noqa: E501
 
 
+class Test_ex_route_copy(unittest.TestCase):
+
+    def test_cooperates_with_global(self):
+        for address in ('$', '0', '12'):
+            _, tokens = _ex_route_copy(_ScannerState(' ' + address))
+            self.assertTrue(tokens[0].cooperates_with_global, address)
+
+        _, tokens = _ex_route_copy(_ScannerState('.'))
+        self.assertFalse(tokens[0].cooperates_with_global)
+
+
+class Test_ex_route_move(unittest.TestCase):
+
+    def test_cooperates_with_global(self):
+        for address in ('$', '0'):
+            _, tokens = _ex_route_move(_ScannerState(' ' + address))
+            self.assertTrue(tokens[0].cooperates_with_global, address)
+
+        for address in ('', '.', '12'):
+            _, tokens = _ex_route_move(_ScannerState(address))
+            self.assertFalse(tokens[0].cooperates_with_global, address)
+
+
+class Test_ex_route_vglobal(unittest.TestCase):
+
+    def test_can_scan(self):
+        actual = _ex_route_vglobal(_ScannerState('/111/delete'))
+        self.assertEqual(actual, (None, [TokenCommand('global', addressable=True, forced=True, params={'pattern': '111', 'cmd': 'delete'}), TokenEof()]))  # noqa: E501
+
+
 class Test_ex_route_noremap(unittest.TestCase):
 
     def test_ex_route_noremap(self):
@@ -215,11 +249,31 @@ class Test_ex_route_onoremap(unittest.TestCase):
         self.assertEqual(actual, (None, [TokenCommand('onoremap', params={'keys': 'L', 'command': '$'}), TokenEof()]))
 
 
+class Test_ex_route_profile(unittest.TestCase):
+
+    def test_can_scan(self):
+        actual = _ex_route_profile(_ScannerState(' start /tmp/nv.json'))
+        self.assertEqual(actual, (None, [TokenCommand('profile', params={'subcommand': 'start', 'fname': '/tmp/nv.json'}), TokenEof()]))  # noqa: E501
+
+        actual = _ex_route_profile(_ScannerState(' dump'))
+        self.assertEqual(actual, (None, [TokenCommand('profile', params={'subcommand': 'dump', 'fname': None}), TokenEof()]))  # noqa: E501
+
+    def test_raises_exception(self):
+        with self.assertRaisesRegex(Exception, 'E475'):
+            _ex_route_profile(_ScannerState(''))
+
+        with self.assertRaisesRegex(Exception, 'E475'):
+            _ex_route_profile(_ScannerState(' func'))
+
+
 class Test_ex_route_substitute(unittest.TestCase):
 
     def test_none(self):
         actual = _ex_route_substitute(_ScannerState(''))
-        self.assertEqual(actual, (None, [TokenCommand('substitute', addressable=True), TokenEof()]))
+        self.assertEqual(actual, (None, [
+            TokenCommand('substitute', addressable=True, cooperates_with_global=True),
+            TokenEof()
+        ]))
 
     def test_raises_exception(self):
         with self.assertRaisesRegex(ValueError, 'bad command'):
@@ -231,7 +285,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def _test_ex_route_substitute(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -242,7 +296,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def test_empty(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('///')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': '',
                 'replacement': '',
                 'count': 1,
@@ -253,7 +307,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def test_flags(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/g')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -263,7 +317,7 @@ class Test_ex_route_substitute(unittest.TestCase):
 
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/i')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -273,7 +327,7 @@ class Test_ex_route_substitute(unittest.TestCase):
 
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def/gi')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -284,7 +338,7 @@ class Test_ex_route_substitute(unittest.TestCase):
     def test_closing_delimiter_is_not_required(self):
         self.assertEqual(
             _ex_route_substitute(_ScannerState('/abc/def')),
-            (None, [TokenCommand('substitute', addressable=True, params={
+            (None, [TokenCommand('substitute', addressable=True, cooperates_with_global=True, params={
                 'pattern': 'abc',
                 'replacement': 'def',
                 'count': 1,
@@ -405,6 +459,8 @@ class TestRoutes(unittest.TestCase):
         assert_route('ounmap')
         assert_route('p')
         assert_route('print')
+        assert_route('prof')
+        assert_route('profile')
         assert_route('pw')
         assert_route('pwd')
         assert_route('q')
@@ -445,6 +501,7 @@ class TestRoutes(unittest.TestCase):
         assert_route('tabprevious')
         assert_route('tabr', name='tabfirst')
         assert_route('tabrewind', name='tabfirst')
+        assert_route('t', name='copy')
         assert_route('unm')
         assert_route('unmap')
         assert_route('vn')
@@ -25,6 +25,7 @@ from NeoVintageous.nv.history import _HIST_INPUT
 from NeoVintageous.nv.history import _HIST_INVALID
 from NeoVintageous.nv.history import _HIST_SEARCH
 from NeoVintageous.nv.history import _history
+from NeoVintageous.nv.history import _HistoryItems
 from NeoVintageous.nv.history import _name2type
 from NeoVintageous.nv.history import history_add
 from NeoVintageous.nv.history import history_clear
@@ -33,15 +34,17 @@ from NeoVintageous.nv.history import history_get
 from NeoVintageous.nv.history import history_get_type
 from NeoVintageous.nv.history import history_len
 from NeoVintageous.nv.history import history_nr
+from NeoVintageous.nv.history import HistoryRecall
 
 # We need to patch the entries storage dictionary so that out tests don't mess
 # up our userland entries, which would obviously be bad.
+from NeoVintageous.nv.history import _new_history
 from NeoVintageous.nv.history import _storage as _storage_struct_
 
 
 # Reusable mappings test patcher (also passes a clean storage structure to tests).
 _patch_storage = unittest.mock.patch('NeoVintageous.nv.history._storage',
-                                     new_callable=lambda: {k: {'num': 0, 'items': {}} for k in _storage_struct_})
+                                     new_callable=lambda: {k: _new_history() for k in _storage_struct_})
 
 
 _patch_max_items = lambda n: unittest.mock.patch('NeoVintageous.nv.history._MAX_ITEMS', n)  # noqa: E731
@@ -169,7 +172,7 @@ class TestHistory(unittest.TestCase):
     @_patch_storage
     def test_history_del(self, _storage):
         _storage[_HIST_SEARCH]['num'] = 9
-        _storage[_HIST_SEARCH]['items'] = {1: 'a', 2: 'b', 3: 'c', 7: 'g', 9: 'i'}
+        _storage[_HIST_SEARCH]['items'] = _HistoryItems([(1, 'a'), (2, 'b'), (3, 'c'), (7, 'g'), (9, 'i')])
 
         self.assertEqual(9, history_nr('/'))
         self.assertTrue(history_del('/', 2))
@@ -405,3 +408,54 @@ class TestHistory(unittest.TestCase):
             ">    3  i3\n"
             "     #  debug history"
         ), _history('all'))
+
+    @_patch_storage
+    def test_history_add_moves_duplicate_to_newest(self, _storage):
+        self.assertTrue(history_add(':', 'a'))
+        self.assertTrue(history_add(':', 'b'))
+        self.assertTrue(history_add(':', 'c'))
+        self.assertTrue(history_add(':', 'a'))
+        self.assertEqual(_storage[_HIST_CMD]['items'], {2: 'b', 3: 'c', 4: 'a'})
+        self.assertEqual(['b', 'c', 'a'], list(_storage[_HIST_CMD]['items'].values()))
+        self.assertEqual(4, _storage[_HIST_CMD]['items'].number_of('a'))
+        self.assertIsNone(_storage[_HIST_CMD]['items'].number_of('x'))
+
+    @_patch_max_items(3)
+    @_patch_storage
+    def test_history_add_evicts_oldest(self, _storage):
+        for item in ('a', 'b', 'c', 'b', 'd'):
+            self.assertTrue(history_add(':', item))
+        self.assertEqual(_storage[_HIST_CMD]['items'], {3: 'c', 4: 'b', 5: 'd'})
+        self.assertIsNone(_storage[_HIST_CMD]['items'].number_of('a'))
+        self.assertEqual('c', history_get(':', -3))
+        self.assertEqual('', history_get(':', -4))
+
+
+class TestHistoryRecall(unittest.TestCase):
+
+    @_patch_storage
+    def test_recall_without_prefix(self, _storage):
+        for item in ('a', 'b', 'c'):
+            history_add(':', item)
+        recall = HistoryRecall(':')
+        self.assertEqual('c', recall.get(1))
+        self.assertEqual('b', recall.get(2))
+        self.assertEqual('a', recall.get(3))
+        self.assertIsNone(recall.get(4))
+        self.assertIsNone(recall.get(0))
+        self.assertEqual('b', recall.get(2))
+
+    @_patch_storage
+    def test_recall_with_prefix(self, _storage):
+        for item in ('set list', 'ls', 'sort', 'set nolist', 'buffers'):
+            history_add(':', item)
+        recall = HistoryRecall(':', 'se')
+        self.assertEqual('set nolist', recall.get(1))
+        self.assertEqual('set list', recall.get(2))
+        self.assertIsNone(recall.get(3))
+        self.assertEqual('set nolist', recall.get(1))
+
+    @_patch_storage
+    def test_recall_empty_and_invalid_history(self, _storage):
+        self.assertIsNone(HistoryRecall(':').get(1))
+        self.assertIsNone(HistoryRecall('x').get(1))
@@ -21,6 +21,7 @@ from NeoVintageous.nv.mappings import _expand_first
 from NeoVintageous.nv.mappings import _find_full_match
 from NeoVintageous.nv.mappings import _find_partial_match
 from NeoVintageous.nv.mappings import _get_seqs
+from NeoVintageous.nv.mappings import _Trie
 from NeoVintageous.nv.mappings import CMD_TYPE_USER
 from NeoVintageous.nv.mappings import INSERT
 from NeoVintageous.nv.mappings import Mapping
@@ -76,6 +77,36 @@ class TestMapping(unittest.TestCase):
             mapping.sequence
 
 
+class TestTrie(unittest.TestCase):
+
+    def test_get(self):
+        trie = _Trie([('a', 1), ('abc', 2), ('b', 3)])
+        self.assertEqual(trie.get('a'), 1)
+        self.assertEqual(trie.get('abc'), 2)
+        self.assertEqual(trie.get('b'), 3)
+        self.assertIsNone(trie.get(''))
+        self.assertIsNone(trie.get('ab'))
+        self.assertIsNone(trie.get('abcd'))
+        self.assertIsNone(trie.get('x'))
+
+    def test_has_longer(self):
+        trie = _Trie([('a', 1), ('abc', 2), ('b', 3)])
+        self.assertTrue(trie.has_longer(''))
+        self.assertTrue(trie.has_longer('a'))
+        self.assertTrue(trie.has_longer('ab'))
+        self.assertFalse(trie.has_longer('abc'))
+        self.assertFalse(trie.has_longer('b'))
+        self.assertFalse(trie.has_longer('x'))
+        self.assertFalse(_Trie().has_longer(''))
+
+    def test_iter_prefixed_is_sorted(self):
+        trie = _Trie([('yc', 1), ('Y', 1), ('x', 1), ('ya', 1), ('Ya', 1), ('yb', 1)])
+        self.assertEqual(list(trie.iter_prefixed('')), ['Y', 'Ya', 'x', 'ya', 'yb', 'yc'])
+        self.assertEqual(list(trie.iter_prefixed('y')), ['ya', 'yb', 'yc'])
+        self.assertEqual(list(trie.iter_prefixed('Y')), ['Y', 'Ya'])
+        self.assertEqual(list(trie.iter_prefixed('z')), [])
+
+
 class TestMappings(unittest.TestCase):
 
     @_patch_mappings
@@ -369,3 +400,6 @@ class TestMappings(unittest.TestCase):
         mappings_add(unittest.NORMAL, 'd', 'y')
         mappings_add(unittest.NORMAL, 'ddd', 'y')
         self.assertEquals(mappings_is_incomplete(unittest.NORMAL, 'dd'), True)
+
+        mappings_remove(unittest.NORMAL, 'ddd')
+        self.assertFalse(mappings_is_incomplete(unittest.NORMAL, 'dd'))
@@ -0,0 +1,104 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import importlib
+
+import sublime
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import profiler
+
+
+class TestProfiler(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(profiler.stop)
+
+    def test_no_spans_when_not_profiling(self):
+        with profiler.span('x', 'test'):
+            pass
+
+        profiler.start()
+        profiler.stop()
+        self.assertEqual(profiler.summary(), [])
+
+    def test_span(self):
+        profiler.start()
+        with profiler.span('x', 'test', {'keys': 'jj'}):
+            self.view.size()
+            self.view.sel()[0]
+
+        trace = profiler.to_trace()
+        self.assertEqual(len(trace['traceEvents']), 1)
+        event = trace['traceEvents'][0]
+        self.assertEqual(event['name'], 'x')
+        self.assertEqual(event['cat'], 'test')
+        self.assertEqual(event['ph'], 'X')
+        self.assertEqual(event['ts'], 0)
+        self.assertEqual(event['args'], {'api_calls': 3, 'keys': 'jj'})
+
+    def test_pause(self):
+        profiler.start()
+        profiler.pause()
+        with profiler.span('x', 'test'):
+            pass
+
+        profiler.resume()
+        with profiler.span('y', 'test'):
+            pass
+
+        self.assertEqual([event['name'] for event in profiler.to_trace()['traceEvents']], ['y'])
+
+    def test_start_discards_spans(self):
+        profiler.start()
+        with profiler.span('x', 'test'):
+            pass
+
+        profiler.start()
+        self.assertEqual(profiler.to_trace()['traceEvents'], [])
+
+    def test_summary(self):
+        profiler.start()
+        for i in range(1, 101):
+            profiler._spans.append(('x', 'test', i, i / 1000.0, 2, None))
+        profiler._spans.append(('y', 'test', 0, 0.5, 0, None))
+
+        self.assertEqual(profiler.summary(), [
+            ('test', 'y', 1, 500.0, 500.0, 500.0, 500.0, 0),
+            ('test', 'x', 100, 50.0, 95.0, 99.0, 100.0, 2),
+        ])
+
+    def test_stop_restores_api_methods(self):
+        size = sublime.View.size
+        profiler.start()
+        self.assertIsNot(sublime.View.size, size)
+        profiler.stop()
+        self.assertIs(sublime.View.size, size)
+
+    def test_start_after_reload_counts_api_calls_once(self):
+        size = sublime.View.size
+        profiler.start()
+        importlib.reload(profiler)
+        profiler.start()
+        with profiler.span('x', 'test'):
+            self.view.size()
+
+        self.assertEqual(profiler.to_trace()['traceEvents'][0]['args'], {'api_calls': 1})
+        profiler.stop()
+        self.assertIs(sublime.View.size, size)
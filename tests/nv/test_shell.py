@@ -0,0 +1,144 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import time
+
+from sublime import platform
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import shell
+from NeoVintageous.nv.shell import _Filter
+
+
+@unittest.skipIf(platform() == 'windows', 'Test does not work on Windows')
+class TestFilter(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.outputs = []
+        self.addCleanup(shell.cancel_filter, self.view)
+
+    def on_done(self, view, edit, outputs):
+        self.outputs.append(outputs)
+
+    def filter(self, cmd, inputs):
+        running = _Filter(self.view, cmd, inputs, self.on_done)
+        running.run(None)
+
+        return running
+
+    def test_outputs_are_in_the_order_of_the_inputs(self):
+        self.filter('sort', ['b\na\n', 'd\nc\n', ''])
+        self.assertEqual([['a\nb\n', 'c\nd\n', '']], self.outputs)
+
+    def test_input_is_streamed(self):
+        text = 'x' * 99 + '\n'
+        self.filter('cat', [text * 10000])
+        self.assertEqual([[text * 10000]], self.outputs)
+
+    def test_no_input(self):
+        self.filter('echo hi', [None])
+        self.assertEqual([['hi\n']], self.outputs)
+
+    def test_stderr_is_captured(self):
+        self.filter('echo hi >&2', [None])
+        self.assertEqual([['hi\n']], self.outputs)
+
+    @unittest.mock.patch('NeoVintageous.nv.shell._WAIT', 0)
+    @unittest.mock.patch('NeoVintageous.nv.shell.set_timeout')
+    def test_finishes_in_the_background(self, set_timeout):
+        running = self.filter('sleep 0.1; cat', ['a\n'])
+        self.assertEqual([], self.outputs)
+        self.assertTrue(running.done.wait(5))
+        self.assertEqual(1, set_timeout.call_count)
+        shell.finish_filter(self.view, None)
+        self.assertEqual([['a\n']], self.outputs)
+
+    @unittest.mock.patch('NeoVintageous.nv.shell._WAIT', 0)
+    @unittest.mock.patch('NeoVintageous.nv.shell.set_timeout')
+    def test_output_is_discarded_if_the_view_changes(self, set_timeout):
+        running = self.filter('sleep 0.1; cat', ['a\n'])
+        self.write('b\n')
+        self.assertTrue(running.done.wait(5))
+        shell.finish_filter(self.view, None)
+        self.assertEqual([], self.outputs)
+
+    @unittest.mock.patch('NeoVintageous.nv.shell._WAIT', 0)
+    @unittest.mock.patch('NeoVintageous.nv.shell._TIMEOUT', 0.1)
+    @unittest.mock.patch('NeoVintageous.nv.shell.set_timeout')
+    def test_timeout(self, set_timeout):
+        running = self.filter('exec sleep 5', ['a\n'])
+        self.assertTrue(running.done.wait(5))
+        self.assertTrue(running.timed_out)
+        shell.finish_filter(self.view, None)
+        self.assertEqual([], self.outputs)
+
+    @unittest.mock.patch('NeoVintageous.nv.shell._WAIT', 0)
+    @unittest.mock.patch('NeoVintageous.nv.shell.set_timeout')
+    def test_another_filter_cancels_the_running_one(self, set_timeout):
+        first = self.filter('exec sleep 5', ['a\n'])
+        second = self.filter('cat', ['b\n'])
+        self.assertTrue(first.done.wait(5))
+        self.assertTrue(first.cancelled)
+        self.assertTrue(second.done.wait(5))
+        shell.finish_filter(self.view, None)
+        self.assertEqual([['b\n']], self.outputs)
+
+
+@unittest.skipIf(platform() == 'windows', 'Test does not work on Windows')
+class TestRunToPanel(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.window = self.view.window()
+        self.addCleanup(shell.cancel_output, self.window)
+        # Make sure the output panel doesn't hide the overall progress panel.
+        self.addCleanup(self.window.run_command, 'show_panel', {'panel': 'output.UnitTesting'})
+
+    def output(self):
+        panel = self.window.get_output_panel('vi_out')
+
+        return panel.substr(self.Region(0, panel.size()))
+
+    def test_output(self):
+        shell.run_to_panel(self.window, self.view, 'echo a; echo b >&2')
+        self.assertEqual('a\nb\n', self.output())
+
+    @unittest.mock.patch('NeoVintageous.nv.shell._WAIT', 0)
+    @unittest.mock.patch('NeoVintageous.nv.shell.set_timeout')
+    def test_output_is_appended_while_running(self, set_timeout):
+        shell.run_to_panel(self.window, self.view, 'echo a; sleep 1; echo b')
+        running = shell._outputs[self.window.id()]
+        for _ in range(100):
+            if running.lines or self.output():
+                break
+            time.sleep(0.01)
+        set_timeout.call_args[0][0]()
+        self.assertFalse(running.done.is_set())
+        self.assertEqual('a\n', self.output())
+        self.assertTrue(running.done.wait(5))
+        set_timeout.call_args[0][0]()
+        self.assertEqual('a\nb\n', self.output())
+        self.assertNotIn(self.window.id(), shell._outputs)
+
+    @unittest.mock.patch('NeoVintageous.nv.shell._OUTPUT_SIZE', 10)
+    def test_scrollback_is_bounded(self):
+        shell.run_to_panel(self.window, self.view, 'seq 100')
+        self.assertEqual('98\n99\n100\n', self.output())
+        self.window.get_output_panel('vi_out').run_command('_nv_shell_output', {'characters': '101\n'})
+        self.assertEqual('99\n100\n101\n', self.output())
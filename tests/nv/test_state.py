@@ -288,3 +288,43 @@ class TestStateSetCommand(unittest.ViewTestCase):
         self.state.set_command(operator)
 
         self.assertEqual(self.state.mode, unittest.OPERATOR_PENDING)
+
+
+class TestStateCommandDefs(unittest.ViewTestCase):
+
+    def test_action_is_decoded_once(self):
+        self.state.action = cmd_defs.ViDeleteLine()
+        state = self.state
+        action = state.action
+        self.assertIsInstance(action, cmd_defs.ViDeleteLine)
+        self.assertIs(state.action, action)
+        self.assertIs(self.state.action, action)
+
+    def test_motion_is_decoded_once(self):
+        self.state.motion = cmd_defs.ViMoveRightByChars()
+        motion = self.state.motion
+        self.assertIsInstance(motion, cmd_defs.ViMoveRightByChars)
+        self.assertIs(self.state.motion, motion)
+
+    def test_does_not_store_the_instance_that_is_set(self):
+        motion = cmd_defs.ViMoveRightByChars()
+        self.state.motion = motion
+        self.assertIsNot(self.state.motion, motion)
+
+    def test_setting_invalidates_decoded_command(self):
+        self.state.action = cmd_defs.ViDeleteLine()
+        action = self.state.action
+        self.state.action = cmd_defs.ViDeleteByChars()
+        self.assertIsInstance(self.state.action, cmd_defs.ViDeleteByChars)
+        self.state.action = None
+        self.assertIsNone(self.state.action)
+        self.state.action = cmd_defs.ViDeleteLine()
+        self.assertIsNot(self.state.action, action)
+
+    def test_storing_the_decoded_command_keeps_it(self):
+        self.state.motion = cmd_defs.ViSearchCharForward()
+        motion = self.state.motion
+        motion.accept('x')
+        self.state.motion = motion
+        self.assertIs(self.state.motion, motion)
+        self.assertEqual(self.state.motion.inp, 'x')
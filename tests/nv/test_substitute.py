@@ -0,0 +1,95 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import re
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import substitute
+from NeoVintageous.nv.substitute import find_substitutions
+
+
+class TestFindSubstitutions(unittest.ViewTestCase):
+
+    def find(self, pattern, replacement, count=0, region=None):
+        if region is None:
+            region = self.Region(0, self.view.size())
+
+        return [(s.begin, s.end, s.line, s.text, s.changed)
+                for s in find_substitutions(self.view, [region], re.compile(pattern, re.M), replacement, count)]
+
+    def test_finds_all_matches(self):
+        self.write('ab\nb\nabb\n')
+        self.assertEqual([(1, 2, 0, 'x', True), (3, 4, 3, 'x', True), (6, 7, 5, 'x', True), (7, 8, 5, 'x', True)],
+                         self.find('b', 'x'))
+
+    def test_count_is_per_line(self):
+        self.write('ab\nb\nabb\n')
+        self.assertEqual([(1, 2, 0, 'x', True), (3, 4, 3, 'x', True), (6, 7, 5, 'x', True)],
+                         self.find('b', 'x', count=1))
+
+    def test_expands_groups(self):
+        self.write('ab\nab\n')
+        self.assertEqual([(0, 2, 0, 'ba', True), (3, 5, 3, 'ba', True)], self.find('(a)(b)', '\\2\\1'))
+
+    def test_unchanged(self):
+        self.write('ab\n')
+        self.assertEqual([(0, 1, 0, 'a', False)], self.find('a', 'a'))
+
+    def test_region(self):
+        self.write('a\na\na\na\n')
+        self.assertEqual([(2, 3, 2, 'x', True), (4, 5, 4, 'x', True)], self.find('a', 'x', region=self.Region(2, 6)))
+
+    def test_end_of_lines(self):
+        self.write('a\n\nb')
+        self.assertEqual([(1, 1, 0, ',', True), (2, 2, 2, ',', True), (4, 4, 3, ',', True)], self.find('$', ','))
+        self.write('a\n\nb\n')
+        self.assertEqual([(1, 1, 0, ',', True), (2, 2, 2, ',', True), (4, 4, 3, ',', True)], self.find('$', ','))
+
+    def test_invalid_group_reference(self):
+        self.write('ab\n')
+        with self.assertRaises((re.error, IndexError)):
+            self.find('a', '\\2')
+
+    @unittest.mock.patch('NeoVintageous.nv.substitute._CHUNK_SIZE', 7)
+    def test_same_as_substituting_each_line(self):
+        self.write('foo bar\n\n  baz foo\nfoofoo\n\tqux \nbar\n foo \n')
+        lines = self.view.substr(self.Region(0, self.view.size() - 1)).split('\n')
+        for pattern in ('foo', 'o*', '^', '$', '^ *', ' *$', '\\s+', '[^a-z]', '\\bfoo', '\\B', 'o(?=\\s)', '(?<=\\s)b',
+                        '(?s).', '\\Z', '\\Ab'):
+            for count in (0, 1):
+                compiled = re.compile(pattern, re.M)
+                expected = '\n'.join(compiled.sub('<\\g<0>>', line, count) for line in lines) + '\n'
+                text = self.view.substr(self.Region(0, self.view.size()))
+                for s in reversed(list(find_substitutions(self.view, [self.Region(0, self.view.size())], compiled,
+                                                          '<\\g<0>>', count))):
+                    text = text[:s.begin] + s.text + text[s.end:]
+
+                self.assertEqual(expected, text, 'pattern {!r} count {}'.format(pattern, count))
+
+
+class TestIsLineSafe(unittest.TestCase):
+
+    def test_is_line_safe(self):
+        for pattern in ('foo', 'a.b', '^a$', '\\w+\\d\\S', '\\bx\\b', '(a)\\1', '[a-z]', '(?:a)', '(?=a)', '(?<!a)b',
+                        '(?P<x>a)(?P=x)', '\\.\\(\\['):
+            self.assertTrue(substitute._is_line_safe(pattern), pattern)
+
+    def test_is_not_line_safe(self):
+        for pattern in ('a\nb', 'a\\nb', '\\s', '\\W', '\\D', '[^a]', '\\Z', '\\Ab', '\\B', '\\x0a', '\\012', '(?s).',
+                        '(?i)a', '\t'):
+            self.assertFalse(substitute._is_line_safe(pattern), pattern)
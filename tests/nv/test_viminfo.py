@@ -0,0 +1,179 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+import shutil
+import tempfile
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv import history
+from NeoVintageous.nv import viminfo
+
+
+class ViminfoTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.dir, 'NeoVintageous', 'viminfo')
+        self.addCleanup(shutil.rmtree, self.dir)
+
+        self.store = {}
+
+        patches = (
+            unittest.mock.patch.object(viminfo, '_file_name', return_value=self.file),
+            unittest.mock.patch.object(viminfo, '_is_enabled', return_value=True),
+            unittest.mock.patch.dict(viminfo._providers, clear=True),
+        )
+
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        viminfo._reset()
+        self.addCleanup(viminfo._reset)
+
+    def register_store(self):
+        viminfo.register('set', self.store.__setitem__, lambda: [['set', k, v] for k, v in sorted(self.store.items())])
+
+    def restart(self):
+        self.store.clear()
+        viminfo._reset()
+        self.register_store()
+        viminfo.load()
+
+    def records(self):
+        with open(self.file, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+
+class TestViminfo(ViminfoTestCase):
+
+    def test_write_appends_records(self):
+        self.register_store()
+        viminfo.write('set', 'a', 1)
+        viminfo.write('set', 'b', [1, 2])
+        self.assertEqual([['set', 'a', 1], ['set', 'b', [1, 2]]], self.records())
+
+    def test_load_replays_records(self):
+        self.register_store()
+        viminfo.write('set', 'a', 1)
+        viminfo.write('set', 'b', 2)
+        viminfo.write('set', 'a', 3)
+        self.restart()
+        self.assertEqual({'a': 3, 'b': 2}, self.store)
+
+    def test_load_is_lazy_and_only_once(self):
+        self.register_store()
+        viminfo.write('set', 'a', 1)
+        self.restart()
+        self.store.clear()
+        viminfo.load()
+        self.assertEqual({}, self.store)
+
+    def test_replayed_records_are_not_written_again(self):
+        self.register_store()
+        viminfo.write('set', 'a', 1)
+        self.restart()
+        self.assertEqual([['set', 'a', 1]], self.records())
+
+    def test_disabled(self):
+        with unittest.mock.patch.object(viminfo, '_is_enabled', return_value=False):
+            self.register_store()
+            viminfo.write('set', 'a', 1)
+        self.assertFalse(os.path.exists(self.file))
+
+    def test_records_are_applied_when_kind_is_registered(self):
+        with open(self.file_with_dir(), 'w', encoding='utf-8') as f:
+            f.write('["set", "a", 1]\n')
+        viminfo.load()
+        self.assertEqual({}, self.store)
+        self.register_store()
+        self.assertEqual({'a': 1}, self.store)
+
+    def test_invalid_records_are_skipped(self):
+        with open(self.file_with_dir(), 'w', encoding='utf-8') as f:
+            f.write('["set", "a", 1]\n{}\n"x"\n["set", "b"]\n["set", "c", 3]\n["set", "d"')
+        self.register_store()
+        viminfo.load()
+        self.assertEqual({'a': 1, 'c': 3}, self.store)
+
+    @unittest.mock.patch('NeoVintageous.nv.viminfo._COMPACT_THRESHOLD', 5)
+    def test_compacts_when_journal_grows(self):
+        self.register_store()
+        for i in range(6):
+            self.store['a'] = i
+            viminfo.write('set', 'a', i)
+        self.assertEqual([['set', 'a', 5]], self.records())
+        self.store['b'] = 1
+        viminfo.write('set', 'b', 1)
+        self.assertEqual([['set', 'a', 5], ['set', 'b', 1]], self.records())
+        self.restart()
+        self.assertEqual({'a': 5, 'b': 1}, self.store)
+
+    def test_compact_keeps_records_of_unregistered_kinds(self):
+        with open(self.file_with_dir(), 'w', encoding='utf-8') as f:
+            f.write('["other", 1]\n')
+        self.register_store()
+        viminfo.load()
+        self.store['a'] = 1
+        viminfo.compact()
+        self.assertEqual([['set', 'a', 1], ['other', 1]], self.records())
+
+    def file_with_dir(self):
+        os.makedirs(os.path.dirname(self.file))
+        return self.file
+
+
+class TestViminfoHistory(ViminfoTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patch = unittest.mock.patch.object(history, '_storage', {k: history._new_history() for k in history._storage})
+        patch.start()
+        self.addCleanup(patch.stop)
+        viminfo.register('history', history._add, history._viminfo_dump)
+        viminfo.register('histdel', history._viminfo_delete, list)
+
+    def restart(self):
+        for k in history._storage:
+            history._storage[k] = history._new_history()
+        viminfo._reset()
+        viminfo.register('history', history._add, history._viminfo_dump)
+        viminfo.register('histdel', history._viminfo_delete, list)
+        viminfo.load()
+
+    def test_history_is_remembered(self):
+        history.history_add(':', 'ls')
+        history.history_add(':', 'buffers')
+        history.history_add('/', 'foo')
+        history.history_add(':', 'ls')
+        history.history_add(':', 'only')
+        history.history_del(':', -1)
+        self.restart()
+        self.assertEqual(['buffers', 'ls'], list(history._storage[history._HIST_CMD]['items'].values()))
+        self.assertEqual('ls', history.history_get(':'))
+        self.assertEqual('foo', history.history_get('/'))
+
+    def test_cleared_history_is_remembered(self):
+        history.history_add(':', 'ls')
+        history.history_add('/', 'foo')
+        history.history_del('/')
+        self.restart()
+        self.assertEqual('ls', history.history_get(':'))
+        self.assertEqual('', history.history_get('/'))
@@ -18,7 +18,10 @@
 from unittest import mock
 import unittest
 
+from NeoVintageous.nv import plugin
+from NeoVintageous.nv.vi import keys
 from NeoVintageous.nv.vi.cmd_base import ViMissingCommandDef
+from NeoVintageous.nv.vi.keys import assign
 from NeoVintageous.nv.vi.keys import KeySequenceTokenizer
 from NeoVintageous.nv.vi.keys import seq_to_command
 from NeoVintageous.nv.vi.keys import seqs
@@ -118,6 +121,7 @@ class TestSeqToCommand(unittest.TestCase):
             'b': {'s': 'plugin_bsv', 'ep': ep, 'dp': dp, 'dp2': dp},
             'c': {'s': 'plugin_csv'}
         }
+        plugin.create_definition.return_value = None
 
         class StateModeA():
             mode = 'a'
@@ -164,6 +168,51 @@ class TestSeqToCommand(unittest.TestCase):
     def test_unknown_sequence(self):
         self.assertIsInstance(seq_to_command(seq='foobar', state=None, mode='a'), ViMissingCommandDef)
 
+    @mock.patch.dict('NeoVintageous.nv.vi.keys._definitions', {}, clear=True)
+    @mock.patch.dict('NeoVintageous.nv.vi.keys.mappings', {'a': {}, 'b': {}}, clear=True)
+    def test_definitions_are_created_on_first_lookup(self):
+        created = []
+
+        @assign(seq='s', modes=('a', 'b'), name='x')
+        class Definition():
+            def __init__(self, name):
+                created.append(name)
+
+        self.assertEqual(created, [])
+
+        command = seq_to_command(seq='s', state=None, mode='a')
+        self.assertIsInstance(command, Definition)
+        self.assertIs(seq_to_command(seq='s', state=None, mode='a'), command)
+        self.assertEqual(created, ['x'])
+
+        self.assertIsNot(seq_to_command(seq='s', state=None, mode='b'), command)
+        self.assertEqual(created, ['x', 'x'])
+
+        keys.mappings['a'].clear()
+        self.assertIsInstance(seq_to_command(seq='s', state=None, mode='a'), Definition)
+        self.assertEqual(created, ['x', 'x', 'x'])
+
+    @mock.patch.dict('NeoVintageous.nv.plugin.classes', {})
+    @mock.patch.dict('NeoVintageous.nv.plugin._definitions', {}, clear=True)
+    @mock.patch.dict('NeoVintageous.nv.plugin.mappings', {'a': {}}, clear=True)
+    @mock.patch.dict('NeoVintageous.nv.vi.keys.mappings', {'a': {'s': 'asv'}}, clear=True)
+    def test_plugin_definitions_are_created_on_first_lookup(self):
+        created = []
+
+        @plugin.register(seq='s', modes=('a',), name='x')
+        class Definition():
+            def __init__(self, name):
+                created.append(name)
+
+        self.assertEqual(created, [])
+        self.assertIs(plugin.classes['Definition'], Definition)
+
+        command = seq_to_command(seq='s', state=None, mode='a')
+        self.assertIsInstance(command, Definition)
+        self.assertIs(seq_to_command(seq='s', state=None, mode='a'), command)
+        self.assertEqual(created, ['x'])
+        self.assertIsInstance(seq_to_command(seq='t', state=None, mode='a'), ViMissingCommandDef)
+
 
 _known_seqs_dataset = (
     (seqs.A, 'a'),
@@ -0,0 +1,68 @@
+# Copyright (C) 2018 The NeoVintageous Team (NeoVintageous).
+#
+# This file is part of NeoVintageous.
+#
+# NeoVintageous is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# NeoVintageous is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
+
+from NeoVintageous.tests import unittest
+
+from NeoVintageous.nv.vi.macros import compile_macro
+
+
+class TestCompileMacro(unittest.TestCase):
+
+    def test_empty(self):
+        self.assertEqual([], compile_macro([]))
+
+    def test_copies_args(self):
+        steps = [('_vi_dd', {'mode': 'mode_internal_normal', 'count': 1})]
+        ops = compile_macro(steps)
+        self.assertEqual([('_vi_dd', {'mode': 'mode_internal_normal', 'count': 1}, None, False)], ops)
+        ops[0][1]['count'] = 2
+        self.assertEqual(1, steps[0][1]['count'])
+
+    def test_none_args(self):
+        self.assertEqual([('_vi_q', {}, None, False)], compile_macro([('_vi_q', None)]))
+
+    def test_merges_consecutive_inserts(self):
+        ops = compile_macro([
+            ('_enter_insert_mode', {'mode': 'mode_normal', 'count': 1}),
+            ('insert', {'characters': 'ab'}),
+            ('insert', {'characters': 'c'}),
+            ('insert', {'characters': '\n'}),
+            ('_enter_normal_mode', {'mode': 'mode_insert'}),
+            ('insert', {'characters': 'x'}),
+        ])
+        self.assertEqual([
+            ('_enter_insert_mode', {'mode': 'mode_normal', 'count': 1}, None, False),
+            ('insert', {'characters': 'abc\n'}, None, False),
+            ('_enter_normal_mode', {'mode': 'mode_insert'}, None, False),
+            ('insert', {'characters': 'x'}, None, False),
+        ], ops)
+
+    def test_finds_xpos_args(self):
+        ops = compile_macro([('_vi_j', {'mode': 'mode_normal', 'count': 1, 'xpos': 3})])
+        self.assertIs(ops[0][1], ops[0][2])
+
+    def test_finds_motion_xpos_args(self):
+        ops = compile_macro([('_vi_d', {'mode': 'mode_internal_normal', 'count': 1, 'motion': {
+            'motion': '_vi_j',
+            'motion_args': {'mode': 'mode_internal_normal', 'count': 1, 'xpos': 3}
+        }})])
+        self.assertIs(ops[0][1]['motion']['motion_args'], ops[0][2])
+        self.assertFalse(ops[0][3])
+
+    def test_failing_motions(self):
+        ops = compile_macro([('_vi_j', {'count': 1}), ('_vi_zero', {'count': 1}), ('_vi_w', {'count': 1})])
+        self.assertEqual([True, False, True], [op[3] for op in ops])
@@ -15,10 +15,20 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from collections import OrderedDict
+
+from sublime import IGNORECASE
 from sublime import LITERAL
+from sublime import Region
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.vi import search
+from NeoVintageous.nv.vi.search import BufferSearchBase
+from NeoVintageous.nv.vi.search import _current_matches
+from NeoVintageous.nv.vi.search import _hilite
+from NeoVintageous.nv.vi.search import _is_portable
+from NeoVintageous.nv.vi.search import find_lines_in_range
 from NeoVintageous.nv.vi.search import find_wrapping
 from NeoVintageous.nv.vi.search import reverse_search
 from NeoVintageous.nv.vi.search import reverse_search_by_pt
@@ -42,6 +52,33 @@ class TestFindWrapping(unittest.ViewTestCase):
         self.assertEqual(self.Region(12, 15), find_wrapping(self.view, 'xxx', 4, self.view.size()))
 
 
+class TestFindLinesInRange(unittest.ViewTestCase):
+
+    def test_finds_each_line_once(self):
+        self.write('ab\nb\nabb\nc\n')
+        self.assertEqual([self.Region(0, 3), self.Region(3, 5), self.Region(5, 9)],
+                         find_lines_in_range(self.view, 'b', 0, self.view.size()))
+
+    def test_empty_matches(self):
+        self.write('a\n\nb\n')
+        self.assertEqual([self.Region(0, 2), self.Region(2, 3), self.Region(3, 5)],
+                         find_lines_in_range(self.view, '^', 0, self.view.size()))
+        self.assertEqual([self.Region(2, 3)], find_lines_in_range(self.view, '^$', 0, self.view.size()))
+
+    def test_last_line_without_newline(self):
+        self.write('a\nb')
+        self.assertEqual([self.Region(0, 2), self.Region(2, 3)],
+                         find_lines_in_range(self.view, '^', 0, self.view.size()))
+
+    def test_range(self):
+        self.write('a\na\na\na\n')
+        self.assertEqual([self.Region(2, 4), self.Region(4, 6)], find_lines_in_range(self.view, 'a', 2, 6))
+
+    def test_not_found(self):
+        self.write('a\nb\n')
+        self.assertEqual([], find_lines_in_range(self.view, 'x', 0, self.view.size()))
+
+
 class TestReverseSearchByPt(unittest.ViewTestCase):
 
     def test_found_literal_returns_region(self):
@@ -168,3 +205,160 @@ class TestReverseSearch(unittest.ViewTestCase):
         # self.assertEqual(None, reverse_search(self.view, 'a', start=0, end=2, flags=LITERAL))
         # self.assertEqual(None, reverse_search(self.view, 'a', start=0, end=1, flags=LITERAL))
         # self.assertEqual(None, reverse_search(self.view, 'a', start=0, end=0, flags=LITERAL))
+
+
+class TestReverseSearchInChunks(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patch = unittest.mock.patch('NeoVintageous.nv.vi.search._REVERSE_SEARCH_CHUNK_SIZE', 4)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_finds_match_before_first_chunk(self):
+        self.write('aaa\nxxx\nxxx\nxxx\nxxx')
+        self.assertEqual(self.Region(2, 3), reverse_search(self.view, 'a', start=0, end=19))
+        self.assertEqual(self.Region(2, 3), reverse_search_by_pt(self.view, 'a', start=0, end=19))
+        self.assertEqual(None, reverse_search_by_pt(self.view, 'a', start=3, end=19))
+
+    def test_finds_last_match(self):
+        self.write('ab\nxx ab ab\nxxx\nxab')
+        self.assertEqual(self.Region(17, 19), reverse_search(self.view, 'ab', start=0, end=19))
+        self.assertEqual(self.Region(9, 11), reverse_search(self.view, 'ab', start=0, end=18))
+        self.assertEqual(self.Region(6, 8), reverse_search(self.view, 'ab', start=0, end=10))
+        self.assertEqual(self.Region(0, 2), reverse_search(self.view, 'ab', start=0, end=7))
+
+    def test_match_can_span_lines(self):
+        self.write('xxx\nab\ncd\nxxx\nxxx')
+        self.assertEqual(self.Region(4, 8), reverse_search(self.view, 'ab\\s+c', start=0, end=17))
+        self.assertEqual(None, reverse_search(self.view, 'ab\\s+c', start=0, end=7))
+
+    def test_assertions_see_text_outside_of_range(self):
+        self.write('xa\nax\nxxx\nxxx')
+        self.assertEqual(self.Region(3, 4), reverse_search(self.view, '^a', start=0, end=13))
+        self.assertEqual(self.Region(1, 2), reverse_search(self.view, 'a$', start=0, end=13))
+        self.assertEqual(self.Region(3, 4), reverse_search_by_pt(self.view, '(?<=a\\n)a', start=3, end=13))
+        self.assertEqual(self.Region(1, 2), reverse_search_by_pt(self.view, '\\Ba', start=1, end=2))
+        self.assertEqual(self.Region(0, 1), reverse_search_by_pt(self.view, 'x(?=a\\n)', start=0, end=1))
+
+    def test_ignorecase(self):
+        self.write('A\nxxx\nxxx\nxxx')
+        self.assertEqual(self.Region(0, 1), reverse_search(self.view, 'a', start=0, end=13, flags=IGNORECASE))
+        self.assertEqual(None, reverse_search(self.view, 'a', start=0, end=13))
+
+    def test_literal(self):
+        self.write('a.b\nxxx\nx.x\nxxx')
+        self.assertEqual(self.Region(0, 3), reverse_search(self.view, 'a.b', start=0, end=15, flags=LITERAL))
+        self.assertEqual(None, reverse_search(self.view, 'x.x.', start=0, end=15, flags=LITERAL))
+
+    def test_pattern_that_is_not_portable(self):
+        self.write('xfoo\nfoo\nxxx')
+        self.assertEqual(self.Region(5, 8), reverse_search(self.view, '\\<foo', start=0, end=12))
+
+
+class TestIsPortable(unittest.TestCase):
+
+    def test_portable(self):
+        for pattern in ('', 'foo', 'a.b', '^foo$', 'a+b*c?', 'a{2,3}', '[a-z]+', '[^\\]]', '(a|b)', '(?:a)',
+                        '(?=a)', '(?!a)', '(?<=a)', '(?<!a)', '\\bfoo\\b', '\\d\\D\\s\\S\\w\\W', '\\t\\n\\r',
+                        '\\.\\(\\)\\[\\]', '\\x41', '(a)\\1', '<.*?>', 'a\\+\\+'):
+            self.assertTrue(_is_portable(pattern), pattern)
+
+    def test_not_portable(self):
+        for pattern in ('\\<foo', 'foo\\>', '\\Afoo', 'foo\\Z', '\\h', '\\p{L}', '\\x{41}', '\\Kfoo',
+                        '\\Qa.b\\E', '[[:alpha:]]', '(?i)foo', '(?<name>a)', '(?>a)', '(?#x)', 'a++', 'a*+',
+                        'a?+', 'a{2}+', '\\v', '\\0'):
+            self.assertFalse(_is_portable(pattern), pattern)
+
+
+class TestHilite(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.settings().set('vintageous_hlsearch', True)
+        self.timeouts = []
+
+        patches = (
+            unittest.mock.patch.object(search, '_hilite_cache', OrderedDict()),
+            unittest.mock.patch.object(search, 'set_timeout', side_effect=lambda f, d: self.timeouts.append(f)),
+        )
+
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def run_timeouts(self):
+        while self.timeouts:
+            self.timeouts.pop(0)()
+
+    def test_small_buffer_is_highlighted_straight_away(self):
+        self.normal('x fizz |fizz\nfizz')
+        _hilite(self.view, 'fizz', 0)
+        self.assertSearch('x |fizz| |fizz|\n|fizz|')
+        self.assertSearchCurrent('x fizz |fizz|\nfizz')
+        self.assertEqual([], self.timeouts)
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._HILITE_SLICE_SIZE', 4)
+    def test_large_buffer_is_highlighted_in_slices(self):
+        self.normal('fizz\nx\nx fizz\n|fizz\nx\nfizz\nx')
+        _hilite(self.view, 'fizz', 0)
+        self.assertTrue(self.timeouts)
+        self.run_timeouts()
+        self.assertSearch('|fizz|\nx\nx |fizz|\n|fizz|\nx\n|fizz|\nx')
+        self.assertSearchCurrent('fizz\nx\nx fizz\n|fizz|\nx\nfizz\nx')
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._HILITE_SLICE_SIZE', 4)
+    def test_match_longer_than_slice(self):
+        self.normal('|x\nfizzbuzz\nfizzbuzz' + ('x' * 300))
+        _hilite(self.view, 'fizzbuzz\\nfizz', 0)
+        self.run_timeouts()
+        self.assertSearch('x\n|fizzbuzz\nfizz|buzz' + ('x' * 300))
+
+    def test_matches_are_reused(self):
+        self.normal('|fizz fizz')
+        _hilite(self.view, 'fizz', 0)
+        self.select(6)
+        with unittest.mock.patch.object(search, '_find_matches') as find_matches:
+            _hilite(self.view, 'fizz', 0)
+            self.assertEqual(0, find_matches.call_count)
+
+        self.assertSearch('|fizz| |fizz|')
+        self.assertSearchCurrent('fizz |fizz|')
+
+    def test_matches_are_found_again_when_buffer_changes(self):
+        self.normal('|fizz fizz')
+        _hilite(self.view, 'fizz', 0)
+        self.write('fizz buzz fizz')
+        self.select(0)
+        _hilite(self.view, 'fizz', 0)
+        self.assertSearch('|fizz| buzz |fizz|')
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.search._HILITE_SLICE_SIZE', 4)
+    def test_slices_stop_when_buffer_changes(self):
+        self.normal('|fizz\nx\nx\nfizz')
+        _hilite(self.view, 'fizz', 0)
+        self.write('buzz')
+        self.run_timeouts()
+        self.assertEqual({}, search._hilite_cache)
+
+    def test_hlsearch_disabled(self):
+        self.normal('|fizz fizz')
+        _hilite(self.view, 'fizz', 0)
+        self.settings().set('vintageous_hlsearch', False)
+        BufferSearchBase(self.view).hilite('fizz')
+        self.assertEqual([], self.view.get_regions('vi_search'))
+        self.assertEqual([], self.view.get_regions('vi_search_current'))
+
+
+class TestCurrentMatches(unittest.TestCase):
+
+    def test_current_matches(self):
+        matches = [Region(0, 3), Region(3, 6), Region(8, 8), Region(10, 12)]
+        starts = [0, 3, 8, 10]
+        self.assertEqual([Region(3, 6), Region(0, 3)], _current_matches(matches, starts, [Region(3)]))
+        self.assertEqual([Region(3, 6)], _current_matches(matches, starts, [Region(4, 5)]))
+        self.assertEqual([], _current_matches(matches, starts, [Region(7)]))
+        self.assertEqual([Region(8, 8)], _current_matches(matches, starts, [Region(8)]))
+        self.assertEqual([], _current_matches(matches, starts, [Region(2, 4)]))
+        self.assertEqual([Region(10, 12), Region(0, 3)], _current_matches(matches, starts, [Region(11), Region(1)]))
+        self.assertEqual([], _current_matches([], [], [Region(0)]))
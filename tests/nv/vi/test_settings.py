@@ -23,6 +23,8 @@ from NeoVintageous.nv.vi.settings import _VI_OPTIONS
 from NeoVintageous.nv.vi.settings import _vi_user_setting
 from NeoVintageous.nv.vi.settings import _VintageSettings
 from NeoVintageous.nv.vi.settings import SettingsManager
+from NeoVintageous.nv.vi.settings import start_caching
+from NeoVintageous.nv.vi.settings import stop_caching
 
 
 class TestSublimeSettings(unittest.ViewTestCase):
@@ -124,3 +126,44 @@ class TestViEditorSettings(unittest.ViewTestCase):
         self.settsman.view.window().settings().set('vintageous_foo', 100)
         self.assertEqual(self.settsman['foo'], 100)
         del _VI_OPTIONS['foo']
+
+
+class TestVintageSettingsCaching(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.view.settings().erase('vintage')
+        start_caching()
+
+    def tearDown(self):
+        stop_caching(write_back=False)
+        super().tearDown()
+
+    def test_reads_and_writes_are_served_from_memory(self):
+        setts = _VintageSettings(view=self.view)
+        setts['foo'] = 100
+        self.assertEqual(setts['foo'], 100)
+        self.assertEqual(_VintageSettings(view=self.view)['foo'], 100)
+        self.assertEqual(self.view.settings().get('vintage'), {})
+
+    def test_writes_back_when_caching_stops(self):
+        _VintageSettings(view=self.view)['foo'] = 100
+        stop_caching()
+        self.assertEqual(self.view.settings().get('vintage'), {'foo': 100})
+        start_caching()
+
+    def test_nested_caching_writes_back_on_outermost_stop(self):
+        start_caching()
+        _VintageSettings(view=self.view)['foo'] = 100
+        stop_caching()
+        self.assertEqual(self.view.settings().get('vintage'), {})
+        stop_caching()
+        self.assertEqual(self.view.settings().get('vintage'), {'foo': 100})
+        start_caching()
+
+    def test_can_discard_cache(self):
+        _VintageSettings(view=self.view)['foo'] = 100
+        stop_caching(write_back=False)
+        self.assertEqual(self.view.settings().get('vintage'), {})
+        self.assertEqual(_VintageSettings(view=self.view)['foo'], None)
+        start_caching()
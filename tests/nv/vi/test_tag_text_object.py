@@ -21,34 +21,12 @@ from NeoVintageous.tests import unittest
 
 from NeoVintageous.nv.vi.text_objects import find_containing_tag
 from NeoVintageous.nv.vi.text_objects import get_closest_tag
-from NeoVintageous.nv.vi.text_objects import get_region_end
-from NeoVintageous.nv.vi.text_objects import next_end_tag
-from NeoVintageous.nv.vi.text_objects import next_unbalanced_tag
-from NeoVintageous.nv.vi.text_objects import previous_begin_tag
+from NeoVintageous.nv.vi.text_objects import tag_index
 
 
 test_data = namedtuple('test_data', 'content args expected msg')
 
 
-TESTS_SEARCH_TAG_FORWARD = (
-    test_data(content='<a>foo', args={'start': 0}, expected=(unittest.Region(0, 3), 'a', False), msg='find tag'),
-    test_data(content='<a>foo', args={'start': 1}, expected=(None, None, None), msg="don't find tag"),
-    test_data(content='<a>foo</a>', args={'start': 1}, expected=(unittest.Region(6, 10), 'a', True), msg='find other tag'),  # noqa: E501
-    test_data(content='<a hey="ho">foo', args={'start': 0}, expected=(unittest.Region(0, 12), 'a', False), msg='find tag with attributes'),  # noqa: E501
-)
-
-TESTS_SEARCH_TAG_BACKWARD = (
-    test_data(content='<a>foo', args={'pattern': r'</?(a) *?.*?>', 'start': 0, 'end': 6}, expected=(unittest.Region(0, 3), 'a', True), msg='find tag'),  # noqa: E501
-    test_data(content='<a>foo', args={'pattern': r'</?(a) *?.*?>', 'start': 0, 'end': 0}, expected=(None, None, None), msg="don't find tag"),  # noqa: E501
-    test_data(content='</a>foo', args={'pattern': r'</?(a) *?.*?>', 'start': 0, 'end': 6}, expected=(unittest.Region(0, 4), 'a', False), msg='find a closing tag'),  # noqa: E501
-    test_data(content='<a>foo</a>', args={'pattern': r'</?(a) *?.*?>', 'start': 0, 'end': 5}, expected=(unittest.Region(0, 3), 'a', True), msg='find other tag'),  # noqa: E501
-    test_data(content='<a hey="ho">foo', args={'pattern': r'</?(a) *?.*?>', 'start': 0, 'end': 14}, expected=(unittest.Region(0, 12), 'a', True), msg='find tag with attributes'),  # noqa: E501
-)
-
-TESTS_NEXT_UNBALANCED_END_TAG = (
-    test_data(content='<p>foo <p>bar</p> baz</p>', args={'search': next_end_tag, 'search_args': {'start': 3}, 'restart_at': get_region_end}, expected=(unittest.Region(21, 25), 'p'), msg='find end tag skipping nested'),  # noqa: E501
-)
-
 TESTS_CONTAINING_TAG = (
     test_data(content='<a>foo</a>', args={'start': 4}, expected=(unittest.Region(0, 3), unittest.Region(6, 10), 'a'), msg='find tag'),  # noqa: E501
     test_data(content='<div>foo</div>', args={'start': 5}, expected=(unittest.Region(0, 5), unittest.Region(8, 14), 'div'), msg='find long tag'),  # noqa: E501
@@ -57,6 +35,12 @@ TESTS_CONTAINING_TAG = (
     test_data(content='<div>foo</div>', args={'start': 13}, expected=(unittest.Region(0, 5), unittest.Region(8, 14), 'div'), msg='find tag from within end tag'),  # noqa: E501
     test_data(content='<div>foo <p>bar</p></div>', args={'start': 12}, expected=(unittest.Region(9, 12), unittest.Region(15, 19), 'p'), msg='find nested tag from inside'),  # noqa: E501
     test_data(content='<head><link rel="shortcut icon" href="favicon.png"></head>', args={'start': 16}, expected=(unittest.Region(0, 6), unittest.Region(51, 58), 'head'), msg='find head'),  # noqa: E501
+    test_data(content='<div><div>a</div>b</div>', args={'start': 17}, expected=(unittest.Region(0, 5), unittest.Region(18, 24), 'div'), msg='find outer tag of same name'),  # noqa: E501
+    test_data(content='<div><div>a</div>b</div>', args={'start': 10}, expected=(unittest.Region(5, 10), unittest.Region(11, 17), 'div'), msg='find inner tag of same name'),  # noqa: E501
+    test_data(content='<p>a<br/>b</p>', args={'start': 6}, expected=(unittest.Region(0, 3), unittest.Region(10, 14), 'p'), msg='find tag skipping self-closing tag'),  # noqa: E501
+    test_data(content='<P>a</p>', args={'start': 3}, expected=(unittest.Region(0, 3), unittest.Region(4, 8), 'p'), msg='find tag ignoring case'),  # noqa: E501
+    test_data(content='<p>a</i>b', args={'start': 5}, expected=(None, None, None), msg='unbalanced tags'),
+    test_data(content='a<p>b</p>', args={'start': 0}, expected=(None, None, None), msg='no containing tag'),
 )
 
 
@@ -81,37 +65,39 @@ class TestTextObjects(unittest.ViewTestCase):
         self.assertEqual((9, self.Region(9, 13)), get_closest_tag(self.view, 9))
 
 
-class Test_next_unbalanced_end_tag(unittest.ViewTestCase):
-
-    def test_next_unbalanced_end_tag(self):
-        self.view.set_syntax_file('Packages/HTML/HTML.tmLanguage')
-        for (i, data) in enumerate(TESTS_NEXT_UNBALANCED_END_TAG):
-            self.write(data.content)
-            actual = next_unbalanced_tag(self.view, **data.args)
-
-            msg = "failed at test index {0}: {1}".format(i, data.msg)
-            self.assertEqual(data.expected, actual, msg)
-
-
-class Test_TagSearch(unittest.ViewTestCase):
-
-    def test_next_end_tag(self):
-        self.view.set_syntax_file('Packages/HTML/HTML.tmLanguage')
-        for (i, data) in enumerate(TESTS_SEARCH_TAG_FORWARD):
-            self.write(data.content)
-            actual = next_end_tag(self.view, **data.args)
-
-            msg = "failed at test index {0}: {1}".format(i, data.msg)
-            self.assertEqual(data.expected, actual, msg)
-
-    def test_previous_begin_tag(self):
-        self.view.set_syntax_file('Packages/HTML/HTML.tmLanguage')
-        for (i, data) in enumerate(TESTS_SEARCH_TAG_BACKWARD):
-            self.write(data.content)
-            actual = previous_begin_tag(self.view, **data.args)
-
-            msg = "failed at test index {0}: {1}".format(i, data.msg)
-            self.assertEqual(data.expected, actual, msg)
+class TestTagIndex(unittest.ViewTestCase):
+
+    def test_pair(self):
+        self.write('<div>a<p>b</p><br></div>')
+        index = tag_index(self.view)
+        self.assertEqual(self.Region(18, 24), index.pair(0))
+        self.assertEqual(self.Region(18, 24), index.pair(4))
+        self.assertEqual(None, index.pair(5))
+        self.assertEqual(self.Region(10, 14), index.pair(6))
+        self.assertEqual(self.Region(6, 9), index.pair(13))
+        self.assertEqual(None, index.pair(14))
+        self.assertEqual(self.Region(0, 5), index.pair(23))
+        self.assertEqual(None, index.pair(24))
+
+    def test_enclosing(self):
+        self.write('a<div>b<p>c</p>d<br>e</div>f')
+        index = tag_index(self.view)
+        self.assertEqual((None, None, None), index.enclosing(0))
+        self.assertEqual((self.Region(1, 6), self.Region(21, 27), 'div'), index.enclosing(1))
+        self.assertEqual((self.Region(1, 6), self.Region(21, 27), 'div'), index.enclosing(6))
+        self.assertEqual((self.Region(7, 10), self.Region(11, 15), 'p'), index.enclosing(10))
+        self.assertEqual((self.Region(1, 6), self.Region(21, 27), 'div'), index.enclosing(15))
+        self.assertEqual((self.Region(1, 6), self.Region(21, 27), 'div'), index.enclosing(17))
+        self.assertEqual((self.Region(1, 6), self.Region(21, 27), 'div'), index.enclosing(26))
+        self.assertEqual((None, None, None), index.enclosing(27))
+
+    def test_is_reused_until_view_is_modified(self):
+        self.write('<p>a</p>')
+        index = tag_index(self.view)
+        self.assertIs(index, tag_index(self.view))
+        self.write('<p>a</p><i>b</i>')
+        self.assertIsNot(index, tag_index(self.view))
+        self.assertEqual(self.Region(8, 11), tag_index(self.view).pair(12))
 
 
 class Test_FindContainingTag(unittest.ViewTestCase):
@@ -19,6 +19,7 @@ from collections import namedtuple
 
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.vi.text_objects import bracket_index
 from NeoVintageous.nv.vi.text_objects import find_prev_lone_bracket
 from NeoVintageous.nv.vi.text_objects import find_next_lone_bracket
 from NeoVintageous.nv.vi.text_objects import is_at_space
@@ -52,12 +53,21 @@ TESTS = (
 
     test(content='a\\{bc', start=2, brackets=('\\{', '\\}'), expected=None, msg='should not find escaped bracket at caret position'),  # noqa: E501
     test(content='a\\{bc', start=3, brackets=('\\{', '\\}'), expected=None, msg='should not find escaped bracket'),
+    test(content='{a\\{b}', start=5, brackets=('\\{', '\\}'), expected=unittest.Region(0, 1), msg='should skip escaped bracket'),  # noqa: E501
+    test(content='{a\\\\{b}', start=6, brackets=('\\{', '\\}'), expected=unittest.Region(4, 5), msg='should not skip bracket after escaped backslash'),  # noqa: E501
+    test(content='{a} b', start=4, brackets=('\\{', '\\}'), expected=None, msg='should not find closed bracket'),
+    test(content='{a}}{b}', start=1, brackets=('\\{', '\\}'), expected=unittest.Region(0, 1), msg='should not be affected by unbalanced bracket'),  # noqa: E501
 )
 
 TESTS_NEXT_BRACKET = (
     test(content='a\\}bc', start=2, brackets=('\\{', '\\}'), expected=None, msg='should not find escaped bracket at caret position'),  # noqa: E501
     test(content='a\\}bc', start=0, brackets=('\\{', '\\}'), expected=None, msg='should not find escaped bracket'),
     test(content='foo {bar foo bar}', start=16, brackets=('\\{', '\\}'), expected=unittest.Region(16, 17), msg='should find next bracket at caret position'),  # noqa: E501
+    test(content='{a{b}c{d}e}', start=1, brackets=('\\{', '\\}'), expected=unittest.Region(10, 11), msg='should skip nested brackets'),  # noqa: E501
+    test(content='{a{b}c{d}e}', start=0, brackets=('\\{', '\\}'), expected=unittest.Region(10, 11), msg='should find pair of bracket at caret position'),  # noqa: E501
+    test(content='{a\\}b}', start=1, brackets=('\\{', '\\}'), expected=unittest.Region(5, 6), msg='should skip escaped bracket'),  # noqa: E501
+    test(content='{a{b}', start=1, brackets=('\\{', '\\}'), expected=None, msg='should not find unbalanced bracket'),
+    test(content='a{b}c}', start=0, brackets=('\\{', '\\}'), expected=unittest.Region(5, 6), msg='should find unbalanced bracket after caret'),  # noqa: E501
 )
 
 
@@ -85,6 +95,50 @@ class Test_next_bracket(unittest.ViewTestCase):
             self.assertEqual(data.expected, actual, "failed at test index {0}: {1}".format(i, data.msg))
 
 
+class TestBracketIndex(unittest.ViewTestCase):
+
+    def test_pair(self):
+        self.write('x(a(b)c)y)')
+        index = bracket_index(self.view, '(', ')')
+        self.assertEqual(7, index.pair(1))
+        self.assertEqual(1, index.pair(7))
+        self.assertEqual(5, index.pair(3))
+        self.assertEqual(3, index.pair(5))
+        self.assertEqual(None, index.pair(0))
+        self.assertEqual(None, index.pair(9))
+
+    def test_enclosing(self):
+        self.write('x(a(b)c)y')
+        index = bracket_index(self.view, '(', ')')
+        self.assertEqual((None, None), index.enclosing(0))
+        self.assertEqual((1, 7), index.enclosing(1))
+        self.assertEqual((1, 7), index.enclosing(2))
+        self.assertEqual((3, 5), index.enclosing(3))
+        self.assertEqual((3, 5), index.enclosing(4))
+        self.assertEqual((3, 5), index.enclosing(5))
+        self.assertEqual((1, 7), index.enclosing(6))
+        self.assertEqual((1, 7), index.enclosing(7))
+        self.assertEqual((None, None), index.enclosing(8))
+        self.assertEqual((None, None), index.enclosing(9))
+
+    def test_enclosing_unbalanced(self):
+        self.write('a)b(c')
+        index = bracket_index(self.view, '(', ')')
+        self.assertEqual((None, 1), index.enclosing(0))
+        self.assertEqual((None, 1), index.enclosing(1))
+        self.assertEqual((None, None), index.enclosing(2))
+        self.assertEqual((3, None), index.enclosing(4))
+
+    def test_is_reused_until_view_is_modified(self):
+        self.write('(a)')
+        index = bracket_index(self.view, '(', ')')
+        self.assertIs(index, bracket_index(self.view, '(', ')'))
+        self.assertIsNot(index, bracket_index(self.view, '[', ']'))
+        self.write('(a)(b)')
+        index = bracket_index(self.view, '(', ')')
+        self.assertEqual(5, index.pair(3))
+
+
 class TestIsAtSpace(unittest.ViewTestCase):
 
     def test_basic(self):
@@ -57,3 +57,23 @@ class TestFindSentencesForward(unittest.ViewTestCase):
             self.assertEqual(find_sentences_forward(self.view, 0, count=4), self.Region(34))
             self.assertEqual(find_sentences_forward(self.view, 0, count=5), self.Region(41))
             self.assertEqual(find_sentences_forward(self.view, 0, count=6), self.Region(41))
+
+    def test_find_sentences_forward_from_within_sentence_end(self):
+        self.normal('|a. \n\nb')
+        self.assertEqual(find_sentences_forward(self.view, 1), self.Region(5))
+        self.assertEqual(find_sentences_forward(self.view, 2), self.Region(4))
+        self.assertEqual(find_sentences_forward(self.view, 3), self.Region(5))
+        self.assertIsNone(find_sentences_forward(self.view, 5))
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.text_objects._SENTENCE_SEARCH_WINDOW', 2)
+    def test_find_sentences_forward_from_within_sentence_end_followed_by_newlines(self):
+        self.normal('|a. ' + '\n' * 10 + 'b')
+        self.assertEqual(find_sentences_forward(self.view, 2), self.Region(4))
+        self.assertEqual(find_sentences_forward(self.view, 3), self.Region(13))
+        self.assertEqual(find_sentences_forward(self.view, 8), self.Region(13))
+
+    def test_find_sentences_forward_after_modification(self):
+        self.normal('|x y. a b')
+        self.assertEqual(find_sentences_forward(self.view, 0), self.Region(5))
+        self.normal('|x y z. a b')
+        self.assertEqual(find_sentences_forward(self.view, 0), self.Region(7))
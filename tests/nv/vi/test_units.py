@@ -15,9 +15,20 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
+from sublime import CLASS_EMPTY_LINE
+from sublime import CLASS_LINE_END
+from sublime import CLASS_LINE_START
+from sublime import CLASS_PUNCTUATION_END
+from sublime import CLASS_PUNCTUATION_START
+from sublime import CLASS_WORD_END
+from sublime import CLASS_WORD_START
+
 from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.vi import units
+from NeoVintageous.nv.vi.units import ViewText
 from NeoVintageous.nv.vi.units import next_paragraph_start
+from NeoVintageous.nv.vi.units import paragraph_index
 from NeoVintageous.nv.vi.units import prev_paragraph_start
 
 
@@ -76,3 +87,111 @@ class TestPrevParagraphStart(unittest.ViewTestCase):
         self.normal('1\n\n4\n\n7\n\n0\n\n3\n')
         self.assertEqual(5, prev_paragraph_start(self.view, 14, count=3))
         self.assertEqual(0, prev_paragraph_start(self.view, 5, count=3))
+
+
+class TestParagraphIndex(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write('a\n\n\nb\n \nc\n\n')
+        self.index = paragraph_index(self.view)
+
+    def test_is_empty(self):
+        self.assertEqual(
+            [False, False, True, True, False, False, False, False, False, False, True, True],
+            [self.index.is_empty(pt) for pt in range(12)])
+
+    def test_next_empty(self):
+        self.assertEqual(2, self.index.next_empty(0))
+        self.assertEqual(3, self.index.next_empty(2))
+        self.assertEqual(10, self.index.next_empty(3))
+        self.assertEqual(11, self.index.next_empty(10))
+        self.assertIsNone(self.index.next_empty(11))
+
+    def test_next_non_empty(self):
+        self.assertEqual(4, self.index.next_non_empty(0))
+        self.assertEqual(6, self.index.next_non_empty(4))
+        self.assertIsNone(self.index.next_non_empty(10))
+
+    def test_prev_empty(self):
+        self.assertEqual(3, self.index.prev_empty(4))
+        self.assertEqual(2, self.index.prev_empty(3))
+        self.assertIsNone(self.index.prev_empty(2))
+        self.assertEqual(10, self.index.prev_empty(11))
+
+    def test_prev_non_empty(self):
+        self.assertEqual(0, self.index.prev_non_empty(4))
+        self.assertEqual(8, self.index.prev_non_empty(10))
+        self.assertIsNone(self.index.prev_non_empty(0))
+
+    def test_blank_lines(self):
+        self.assertEqual((False, 0, 0), self.index.blank_lines(0))
+        self.assertEqual((True, 2, 3), self.index.blank_lines(3))
+        self.assertEqual((False, 4, 4), self.index.blank_lines(5))
+        self.assertEqual((True, 6, 6), self.index.blank_lines(6))
+        self.assertEqual((False, 8, 8), self.index.blank_lines(8))
+        self.assertEqual((True, 10, 11), self.index.blank_lines(11))
+
+    def test_is_reused_until_view_is_modified(self):
+        self.assertIs(self.index, paragraph_index(self.view))
+        self.write('a\n\nb')
+        self.assertIsNot(self.index, paragraph_index(self.view))
+        self.assertEqual(2, paragraph_index(self.view).next_empty(0))
+
+
+_CLASSES = (
+    CLASS_WORD_START,
+    CLASS_WORD_END,
+    CLASS_PUNCTUATION_START,
+    CLASS_PUNCTUATION_END,
+    CLASS_LINE_START,
+    CLASS_LINE_END,
+    CLASS_EMPTY_LINE,
+    CLASS_WORD_START | CLASS_PUNCTUATION_START | CLASS_LINE_END,
+    CLASS_WORD_END | CLASS_PUNCTUATION_END,
+    CLASS_WORD_START | CLASS_EMPTY_LINE | CLASS_PUNCTUATION_START,
+)
+
+
+class TestViewText(unittest.ViewTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.write('fizz(buzz) \n\n  a.b-c\t\n_x__ ==\n\u00e9t\u00e9 \n')
+
+    def assertSameAsView(self, text):
+        view = self.view
+        size = view.size()
+        for pt in range(-1, size + 2):
+            self.assertEqual(view.substr(pt), text.substr(pt), 'substr {}'.format(pt))
+
+        for pt in range(0, size + 1):
+            self.assertEqual(view.line(pt), text.line(pt), 'line {}'.format(pt))
+            self.assertEqual(view.classify(pt), text.classify(pt), 'classify {}'.format(pt))
+            for classes in _CLASSES:
+                for forward in (True, False):
+                    for separators in (None, ''):
+                        self.assertEqual(
+                            view.find_by_class(pt, forward=forward, classes=classes, separators=separators),
+                            text.find_by_class(pt, forward=forward, classes=classes, separators=separators),
+                            'find_by_class {} {} {} {}'.format(pt, forward, classes, separators))
+
+        self.assertEqual(view.substr(self.Region(2, 20)), text.substr(self.Region(2, 20)))
+
+    def test_is_same_as_view(self):
+        self.assertSameAsView(ViewText(self.view, 0))
+
+    @unittest.mock.patch('NeoVintageous.nv.vi.units._VIEW_TEXT_CHUNK_SIZE', 1)
+    @unittest.mock.patch('NeoVintageous.nv.vi.units._VIEW_TEXT_REVERSE_WINDOW', 1)
+    def test_is_same_as_view_when_reading_in_small_chunks(self):
+        for pt in range(0, self.view.size() + 1):
+            self.assertSameAsView(ViewText(self.view, pt))
+
+    def test_word_motions_dont_find_by_class_in_view(self):
+        self.write(' '.join('word' for i in range(1000)))
+        with unittest.mock.patch.object(self.view, 'find_by_class') as find_by_class:
+            self.assertEqual(2500, units.word_starts(self.view, 0, count=500))
+            self.assertEqual(2499, units.word_ends(self.view, 0, count=500))
+            self.assertEqual(2500, units.big_word_starts(self.view, 0, count=500))
+
+        self.assertEqual(0, find_by_class.call_count)
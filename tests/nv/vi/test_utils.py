@@ -31,8 +31,10 @@
 # You should have received a copy of the GNU General Public License
 # along with NeoVintageous.  If not, see <https://www.gnu.org/licenses/>.
 
-import unittest
+from NeoVintageous.tests import unittest
 
+from NeoVintageous.nv.vi.utils import line_index
+from NeoVintageous.nv.vi.utils import LineIndex
 from NeoVintageous.nv.vi.utils import translate_char
 
 
@@ -47,3 +49,40 @@ class TestTranslateChar(unittest.TestCase):
         self.assertEqual(translate_char('<tab>'), '\t')
         self.assertEqual(translate_char('a'), 'a')
         self.assertEqual(translate_char('w'), 'w')
+
+
+class TestLineIndex(unittest.ViewTestCase):
+
+    def assertIndexMatchesView(self, index):
+        for pt in range(self.view.size() + 1):
+            self.assertEqual(self.view.rowcol(pt), index.rowcol(pt), 'pt {}'.format(pt))
+
+        for row in range(self.view.rowcol(self.view.size())[0] + 1):
+            self.assertEqual(self.view.text_point(row, 0), index.text_point(row), 'row {}'.format(row))
+            self.assertEqual(self.view.text_point(row, 1), index.text_point(row, 1), 'row {}'.format(row))
+            self.assertEqual(self.view.line(self.view.text_point(row, 0)), index.line(row), 'row {}'.format(row))
+
+    def test_all_rows(self):
+        self.write('abc\n\n\tx\nfizz buzz\n')
+        self.assertIndexMatchesView(LineIndex(self.view, 0, 100))
+
+    def test_some_rows(self):
+        self.write('abc\n\n\tx\nfizz buzz\nlast')
+        index = LineIndex(self.view, 1, 3)
+        self.assertEqual(1, index.first_row)
+        self.assertEqual(3, index.last_row)
+        self.assertIndexMatchesView(index)
+
+    def test_empty(self):
+        self.write('')
+        self.assertIndexMatchesView(LineIndex(self.view, 0, 0))
+
+    def test_line_index_is_reused_until_modified(self):
+        self.write('abc\nabc\nabc\n')
+        index = line_index(self.view, 0, 2)
+        self.assertIs(index, line_index(self.view, 1, 2))
+        self.assertIsNot(index, line_index(self.view, 0, 3))
+        index = line_index(self.view, 0, 3)
+        self.assertIs(index, line_index(self.view, 0, 100))
+        self.write('abc\n')
+        self.assertIsNot(index, line_index(self.view, 0, 3))
@@ -984,6 +984,8 @@ _SEQ2CMD = {
     'i{':           {'command': '_vi_select_text_object', 'args': {'text_object': '{', 'inclusive': False}},  # noqa: E241,E501
     'i}':           {'command': '_vi_select_text_object', 'args': {'text_object': '}', 'inclusive': False}},  # noqa: E241,E501
     'J':            {'command': '_vi_big_j'},  # noqa: E241
+    'j':            {'command': '_vi_j', 'args': {'mode': 'mode_internal_normal', 'count': 1}},  # noqa: E241
+    'k':            {'command': '_vi_k', 'args': {'mode': 'mode_internal_normal', 'count': 1}},  # noqa: E241
     'L':            {'command': '_vi_big_l'},  # noqa: E241
     'l':            {'command': '_vi_l', 'args': {'mode': 'mode_internal_normal', 'count': 1}},  # noqa: E241
     'M':            {'command': '_vi_big_m'},  # noqa: E241